@@ -35,12 +35,6 @@ import socket
 import math
 import csv
 
-try:
-    # Python 3
-    import queue
-except ImportError:
-    # Python 2.7
-    import Queue as queue
 import multiprocessing
 
 import dendropy
@@ -53,6 +47,7 @@ from dendropy.utility import messaging
 from dendropy.utility import timeprocessing
 from dendropy.utility import bitprocessing
 from dendropy.utility import textprocessing
+from dendropy.dataio import treeindex
 
 ##############################################################################
 ## Preamble
@@ -90,7 +85,11 @@ def _read_into_tree_array(
         error_message_func,
         log_frequency,
         debug_mode,
+        source_tree_offset=None,
         ):
+    if source_tree_offset is None:
+        # offset (in the source) of the first tree analyzed
+        source_tree_offset = tree_offset
     if not log_frequency:
         tree_array.read_from_files(
             files=tree_sources,
@@ -111,15 +110,11 @@ def _read_into_tree_array(
                         or (current_tree_offset >= 0 and log_frequency > 0 and (current_tree_offset % log_frequency) == 0)
                         )
                     ):
-                if current_tree_offset >= tree_offset:
-                    coda = " (analyzing)"
-                else:
-                    coda = " (burning-in)"
-                info_message_func("'{source_name}': tree at offset {current_tree_offset}{coda}".format(
+                info_message_func("'{source_name}': tree at offset {current_tree_offset} (analyzing)".format(
                     source_name=source_name,
                     current_tree_offset=current_tree_offset,
-                    coda=coda,
                     ), wrap=False)
+        # burn-in trees are skipped over by the yielder without being built
         tree_yielder = dendropy.Tree.yield_from_files(
                 tree_sources,
                 schema=schema,
@@ -127,6 +122,10 @@ def _read_into_tree_array(
                 store_tree_weights=use_tree_weights,
                 preserve_underscores=preserve_underscores,
                 rooting=rooting,
+                tree_offset=tree_offset,
+                encode_split_bitmasks=tree_array.ignore_node_ages,
+                # reading of sources is overlapped with their processing
+                prefetch_files=True,
                 ignore_unrecognized_keyword_arguments=True,
                 )
         current_source_index = None
@@ -136,7 +135,7 @@ def _read_into_tree_array(
                 current_yielder_index = tree_yielder.current_file_index
                 if current_yielder_index != current_source_index:
                     current_source_index = current_yielder_index
-                    current_tree_offset = 0
+                    current_tree_offset = source_tree_offset
                     source_name = tree_yielder.current_file_name
                     if source_name is None:
                         source_name = "<stdin>"
@@ -144,19 +143,33 @@ def _read_into_tree_array(
                         info_message_func("Analyzing {} of {}: '{}'".format(current_source_index+1, len(tree_sources), source_name), wrap=False)
                     else:
                         info_message_func("Analyzing: '{}'".format(source_name), wrap=False)
-                if current_tree_offset >= tree_offset:
+                    if tree_offset > 0:
+                        info_message_func("'{}': skipped {} tree(s) (burning-in)".format(source_name, tree_offset), wrap=False)
+                if isinstance(tree, dendropy.Tree):
                     tree_array.add_tree(tree=tree, is_bipartitions_updated=False)
-                    _log_progress(source_name, current_tree_offset)
                 else:
-                    _log_progress(source_name, current_tree_offset)
+                    # split bitmask encoding of tree
+                    tree_array.add_split_bitmask_encoding(tree)
+                _log_progress(source_name, current_tree_offset)
                 current_tree_offset += 1
         except (Exception, KeyboardInterrupt) as e:
             if debug_mode and not isinstance(e, KeyboardInterrupt):
                 raise
             e.exception_tree_source_name = tree_yielder.current_file_name
+            if tree_yielder.current_file_index != current_source_index:
+                # error while skipping over the burn-in trees of a new source
+                current_tree_offset = None
             e.exception_tree_offset = current_tree_offset
             raise e
 
+def _scan_tree_file_segment(segment):
+    # executed in a worker process; a segment that spans more than one
+    # collection of trees is returned as None
+    try:
+        return segment.scan()
+    except ValueError:
+        return None
+
 class TreeAnalysisWorker(multiprocessing.Process):
 
     def __init__(self,
@@ -196,15 +209,6 @@ class TreeAnalysisWorker(multiprocessing.Process):
         self.messenger = messenger
         self.messenger_lock = messenger_lock
         self.kill_received = False
-        self.tree_array = dendropy.TreeArray(
-                taxon_namespace=self.taxon_namespace,
-                is_rooted_trees=self.is_source_trees_rooted,
-                ignore_edge_lengths=self.ignore_edge_lengths,
-                ignore_node_ages=self.ignore_node_ages,
-                use_tree_weights=self.use_tree_weights,
-                ultrametricity_precision=self.ultrametricity_precision,
-                )
-        self.tree_array.worker_name = self.name
         self.num_tasks_received = 0
         self.num_tasks_completed = 0
         self.debug_mode = debug_mode
@@ -232,15 +236,37 @@ class TreeAnalysisWorker(multiprocessing.Process):
 
     def run(self):
         while not self.kill_received:
-            try:
-                tree_source = self.work_queue.get_nowait()
-            except queue.Empty:
+            task = self.work_queue.get()
+            if task is None:
                 break
+            task_index, tree_source = task
             self.num_tasks_received += 1
+            if isinstance(tree_source, treeindex.TreeFileSegment):
+                # only burn-in trees in the segment itself are skipped
+                tree_offset = max(self.tree_offset - tree_source.tree_offset, 0)
+                source_tree_offset = tree_source.tree_offset + tree_offset
+                task_name = "'{}' (trees at offsets {} to {})".format(
+                        tree_source.path,
+                        source_tree_offset,
+                        tree_source.tree_offset + tree_source.num_trees - 1)
+                tree_source = tree_source.open()
+            else:
+                task_name = "'{}'".format(tree_source)
+                tree_offset = self.tree_offset
+                source_tree_offset = None
             # self.send_info("Received task {task_count}: '{task_name}'".format(
-            self.send_info("Received task: '{task_name}'".format(
+            self.send_info("Received task: {task_name}".format(
                 task_count=self.num_tasks_received,
-                task_name=tree_source), wrap=False)
+                task_name=task_name), wrap=False)
+            tree_array = dendropy.TreeArray(
+                    taxon_namespace=self.taxon_namespace,
+                    is_rooted_trees=self.is_source_trees_rooted,
+                    ignore_edge_lengths=self.ignore_edge_lengths,
+                    ignore_node_ages=self.ignore_node_ages,
+                    use_tree_weights=self.use_tree_weights,
+                    ultrametricity_precision=self.ultrametricity_precision,
+                    )
+            tree_array.worker_name = self.name
             # self.tree_array.read_from_files(
             #     files=[tree_source],
             #     schema=self.source_schema,
@@ -252,18 +278,19 @@ class TreeAnalysisWorker(multiprocessing.Process):
             #     )
             try:
                 _read_into_tree_array(
-                        tree_array=self.tree_array,
+                        tree_array=tree_array,
                         tree_sources=[tree_source],
                         schema=self.source_schema,
                         taxon_namespace=self.taxon_namespace,
                         rooting=self.rooting_interpretation,
-                        tree_offset=self.tree_offset,
+                        tree_offset=tree_offset,
                         use_tree_weights=self.use_tree_weights,
                         preserve_underscores=self.preserve_underscores,
                         info_message_func=self.send_info,
                         error_message_func=self.send_error,
                         log_frequency=self.log_frequency,
                         debug_mode=self.debug_mode,
+                        source_tree_offset=source_tree_offset,
                         )
             except (KeyboardInterrupt, Exception) as e:
                 e.worker_name = self.name
@@ -272,14 +299,14 @@ class TreeAnalysisWorker(multiprocessing.Process):
             if self.kill_received:
                 break
             self.num_tasks_completed += 1
+            # results are collated by the main process in task order
+            self.results_queue.put((task_index, tree_array))
             # self.send_info("Completed task {task_count}: '{task_name}'".format(
-            self.send_info("Completed task: '{task_name}'".format(
+            self.send_info("Completed task: {task_name}".format(
                 task_count=self.num_tasks_received,
-                task_name=tree_source), wrap=False)
+                task_name=task_name), wrap=False)
         if self.kill_received:
             self.send_warning("Terminating in response to kill request")
-        else:
-            self.results_queue.put(self.tree_array)
 
 class TreeProcessor(object):
 
@@ -406,9 +433,18 @@ class TreeProcessor(object):
 
         # load up queue
         self.info_message("Creating work queue")
+        tasks = self.split_tree_sources(
+                tree_sources=tree_sources,
+                schema=schema,
+                tree_offset=tree_offset)
         work_queue = multiprocessing.Queue()
-        for f in tree_sources:
-            work_queue.put(f)
+        for task_index, task in enumerate(tasks):
+            work_queue.put((task_index, task))
+        # the queue is fed in the background, so it may appear to be empty
+        # before all the tasks have been put on it: each worker process
+        # instead stops when it receives a 'None' task
+        for idx in range(self.num_processes):
+            work_queue.put(None)
 
         # launch processes
         self.info_message("Launching {} worker processes".format(self.num_processes))
@@ -447,15 +483,23 @@ class TreeProcessor(object):
                 use_tree_weights=self.use_tree_weights,
                 ultrametricity_precision=self.ultrametricity_precision,
                 )
+        # results are merged in the order of the tasks (i.e., of the trees in
+        # the sources) regardless of the order in which they are completed
+        pending_results = {}
+        next_task_index = 0
         try:
-            while result_count < self.num_processes:
+            while result_count < len(tasks):
                 result = results_queue.get()
                 if isinstance(result, Exception) or isinstance(result, KeyboardInterrupt):
                     self.info_message("Exception raised in worker process '{}'".format(result.worker_name))
                     raise result
-                master_tree_array.update(result)
-                self.info_message("Recovered results from worker process '{}'".format(result.worker_name))
+                task_index, tree_array = result
+                pending_results[task_index] = tree_array
+                self.info_message("Recovered results of task {} of {} from worker process '{}'".format(task_index+1, len(tasks), tree_array.worker_name))
                 result_count += 1
+                while next_task_index in pending_results:
+                    master_tree_array.update(pending_results.pop(next_task_index))
+                    next_task_index += 1
                 # self.info_message("Recovered results from {} of {} worker processes".format(result_count, self.num_processes))
         except (Exception, KeyboardInterrupt) as e:
             for worker in workers:
@@ -464,6 +508,72 @@ class TreeProcessor(object):
         self.info_message("All {} worker processes terminated".format(self.num_processes))
         return master_tree_array
 
+    def split_tree_sources(self,
+            tree_sources,
+            schema,
+            tree_offset=0):
+        """
+        Returns the list of tasks for the worker processes: each NEXUS or
+        NEWICK source file is split into (up to) one segment of trees per
+        process, so that a single large file is processed by all the
+        processes; other sources are processed whole.
+
+        Segment boundaries are located at approximately evenly-spaced byte
+        offsets of each file rather than by indexing the whole file, and the
+        segments are then scanned (to count their trees, so that the burn-in
+        can be excluded) in parallel. Files in which a segment spans more than
+        one collection of trees (e.g., NEXUS files with multiple "TREES"
+        blocks) are indexed and split exactly instead.
+        """
+        located = []
+        for tree_source in tree_sources:
+            segments = None
+            if (textprocessing.is_str_type(tree_source)
+                    and schema in ("nexus/newick", "nexus", "newick")):
+                try:
+                    segments = treeindex.TreeFileSegment.locate(
+                            tree_source,
+                            self.num_processes,
+                            schema=schema)
+                except ValueError:
+                    # not in expected format: let reader report the error
+                    pass
+            located.append((tree_source, segments))
+        scanned_segments = [segment for tree_source, segments in located if segments for segment in segments]
+        if scanned_segments:
+            pool = multiprocessing.Pool(processes=min(self.num_processes, len(scanned_segments)))
+            try:
+                scanned_segments = pool.map(_scan_tree_file_segment, scanned_segments)
+            finally:
+                pool.close()
+                pool.join()
+        tasks = []
+        for tree_source, segments in located:
+            if segments is None:
+                tasks.append(tree_source)
+                continue
+            segments, scanned_segments = scanned_segments[:len(segments)], scanned_segments[len(segments):]
+            if None in segments:
+                tree_index = treeindex.TreeFileIndex.build(tree_source, schema=schema)
+                segments = tree_index.split(self.num_processes, tree_offset=tree_offset)
+                num_trees = sum(len(segment) for segment in segments)
+            else:
+                source_tree_offset = 0
+                for segment in segments:
+                    segment.tree_offset = source_tree_offset
+                    source_tree_offset += len(segment)
+                # burn-in trees in the first remaining segment are skipped
+                # by the worker
+                segments = [segment for segment in segments
+                        if len(segment) > 0 and segment.tree_offset + len(segment) > tree_offset]
+                num_trees = max(source_tree_offset - tree_offset, 0)
+            if tree_offset > 0:
+                self.info_message("'{}': skipped {} tree(s) (burning-in)".format(tree_source, tree_offset), wrap=False)
+            self.info_message("'{}': {} tree(s) split into {} segment(s)".format(
+                tree_source, num_trees, len(segments)), wrap=False)
+            tasks.extend(segments)
+        return tasks
+
     def discover_taxa(self,
             treefile,
             schema,
@@ -624,7 +734,8 @@ def main():
             metavar="TREE-FILEPATH",
             help= (
                 "Source(s) of trees to summarize. At least one valid"
-                " source of trees must be provided. Use '-' to specify"
+                " source of trees must be provided. Files compressed"
+                " with gzip, bzip2 or xz are read directly. Use '-' to specify"
                 " reading from standard input (note that this requires"
                 " the input file format to be explicitly set using"
                 " the '--source-format' option)."
@@ -1022,7 +1133,8 @@ def main():
             const="max",
             dest="multiprocess",
             help=(
-                 "Run in parallel mode using as many processors as available, up to the number of sources."
+                 "Run in parallel mode using as many processors as available (up to the number of sources,"
+                 " unless the sources are NEXUS or NEWICK files, which are split among the processes)."
                  ))
     multiprocessing_options.add_argument("-m", "--multiprocessing",
             dest="multiprocess",
@@ -1315,30 +1427,40 @@ def main():
     ## Multiprocessing Setup
 
     num_cpus = multiprocessing.cpu_count()
-    if len(tree_sources) > 1 and args.multiprocess is not None:
-        if (
-                args.multiprocess.lower() == "max"
-                or args.multiprocess == "#"
-                or args.multiprocess == "*"
-            ):
-            num_processes = min(num_cpus, len(tree_sources))
-        # elif args.multiprocess == "@":
-        #     num_processes = len(tree_sources)
-        else:
-            try:
-                num_processes = int(args.multiprocess)
-            except ValueError:
-                messenger.error("'{}' is not a valid number of processes (must be a positive integer)".format(args.multiprocess))
-                sys.exit(1)
-            if num_processes > num_cpus:
-                messenger.warning("Number of requested processes ({}) exceeds number of CPU's ({})".format(num_processes, num_cpus))
-        if num_processes <= 0:
-            messenger.error("Maximum number of processes set to {}: cannot run SumTrees with less than 1 process".format(num_processes))
+    # NEXUS and NEWICK files are split so that a single file can be
+    # processed by multiple processes
+    is_sources_splittable = (
+            tree_sources[0] is not sys.stdin
+            and args.input_format in ("nexus/newick", "nexus", "newick"))
+    if args.multiprocess is None:
+        num_processes = 1
+    elif (
+            args.multiprocess.lower() == "max"
+            or args.multiprocess == "#"
+            or args.multiprocess == "*"
+        ):
+        num_processes = num_cpus
+    # elif args.multiprocess == "@":
+    #     num_processes = len(tree_sources)
+    else:
+        try:
+            num_processes = int(args.multiprocess)
+        except ValueError:
+            messenger.error("'{}' is not a valid number of processes (must be a positive integer)".format(args.multiprocess))
             sys.exit(1)
+        if num_processes > num_cpus:
+            messenger.warning("Number of requested processes ({}) exceeds number of CPU's ({})".format(num_processes, num_cpus))
+    if num_processes <= 0:
+        messenger.error("Maximum number of processes set to {}: cannot run SumTrees with less than 1 process".format(num_processes))
+        sys.exit(1)
+    # a single process (e.g., '-m 1') runs serially, without splitting
+    if num_processes > 1 and (len(tree_sources) > 1 or is_sources_splittable):
+        if not is_sources_splittable and args.multiprocess.lower() in ("max", "#", "*"):
+            num_processes = min(num_processes, len(tree_sources))
     else:
-        if args.multiprocess is not None and args.multiprocess > 1:
+        if num_processes > 1:
             messenger.info("Number of valid sources is less than 2: forcing serial processing")
-        if len(tree_sources) > 1 and num_cpus > 1:
+        if len(tree_sources) > 1 and num_cpus > 1 and args.multiprocess is None:
             messenger.info(
                     ("Multiple processors ({num_cpus}) available:"
                     " consider using the '-M' or '-m' options to"
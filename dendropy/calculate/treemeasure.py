@@ -56,7 +56,8 @@ class PhylogeneticDistanceMatrix(object):
         self._num_edges = None
         self._taxon_phylogenetic_distances = {}
         self._taxon_phylogenetic_path_steps = {}
-        self._mrca = {}
+        self._taxon_leaf_nodes = {}
+        self._lca_index = None
 
     def compile(self, tree, is_bipartitions_updated=False):
         """
@@ -71,7 +72,6 @@ class PhylogeneticDistanceMatrix(object):
         # for i1, t1 in enumerate(self.taxon_namespace):
         #     self._taxon_phylogenetic_distances[t1] = {}
         #     self._taxon_phylogenetic_path_steps[t1] = {}
-        #     self._mrca[t1] = {}
         self._tree_length = 0.0
         self._num_edges = 0
         for node in tree.postorder_node_iter():
@@ -83,6 +83,7 @@ class PhylogeneticDistanceMatrix(object):
             children = node.child_nodes()
             if len(children) == 0:
                 node.desc_paths = {node : (0,0)}
+                self._taxon_leaf_nodes[node.taxon] = node
             else:
                 node.desc_paths = {}
                 for cidx1, c1 in enumerate(children):
@@ -93,16 +94,15 @@ class PhylogeneticDistanceMatrix(object):
                             self._mapped_taxa.add(desc1.taxon)
                             self._taxon_phylogenetic_distances[desc1.taxon] = {}
                             self._taxon_phylogenetic_path_steps[desc1.taxon] = {}
-                            self._mrca[desc1.taxon] = {}
                         for c2 in children[cidx1+1:]:
                             for desc2, (desc2_plen, desc2_psteps) in c2.desc_paths.items():
                                 self._mapped_taxa.add(desc2.taxon)
-                                self._mrca[desc1.taxon][desc2.taxon] = c1.parent_node
                                 pat_dist = node.desc_paths[desc1][0] + desc2_plen + c2.edge.length
                                 self._taxon_phylogenetic_distances[desc1.taxon][desc2.taxon] = pat_dist
                                 path_steps = node.desc_paths[desc1][1] + desc2_psteps + 1
                                 self._taxon_phylogenetic_path_steps[desc1.taxon][desc2.taxon] = path_steps
                     del(c1.desc_paths)
+        self._lca_index = tree._get_lca_index()
         # assert self._tree_length == tree.length()
 
     def __eq__(self, o):
@@ -112,7 +112,8 @@ class PhylogeneticDistanceMatrix(object):
                 and (self._mapped_taxa == o._mapped_taxa)
                 and (self._taxon_phylogenetic_distances == o._taxon_phylogenetic_distances)
                 and (self._taxon_phylogenetic_path_steps == o._taxon_phylogenetic_path_steps)
-                and (self._mrca == o._mrca)
+                and (self._taxon_leaf_nodes == o._taxon_leaf_nodes)
+                and (self._lca_index is o._lca_index)
                 and (self._tree_length == o._tree_length)
                 and (self._num_edges == o._num_edges)
                 )
@@ -132,10 +133,11 @@ class PhylogeneticDistanceMatrix(object):
         o._mapped_taxa = set(self._mapped_taxa)
         o._tree_length = self._tree_length
         o._num_edges = self._num_edges
+        o._taxon_leaf_nodes = dict(self._taxon_leaf_nodes)
+        o._lca_index = self._lca_index
         for src, dest in (
                 (self._taxon_phylogenetic_distances, o._taxon_phylogenetic_distances,),
                 (self._taxon_phylogenetic_path_steps, o._taxon_phylogenetic_path_steps,),
-                (self._mrca, o._mrca,),
                 ):
             for t1 in src:
                 dest[t1] = {}
@@ -179,10 +181,9 @@ class PhylogeneticDistanceMatrix(object):
         """
         if taxon1 is taxon2:
             return taxon1
-        try:
-            return self._mrca[taxon1][taxon2]
-        except KeyError:
-            return self._mrca[taxon2][taxon1]
+        return self._lca_index.mrca(
+                self._taxon_leaf_nodes[taxon1],
+                self._taxon_leaf_nodes[taxon2])
 
     def max_pairwise_distance_taxa(self,
             is_weighted_edge_distances=True):
@@ -633,7 +634,6 @@ class PhylogeneticDistanceMatrix(object):
         for attr_name in (
                 "_taxon_phylogenetic_distances",
                 "_taxon_phylogenetic_path_steps",
-                "_mrca",
                 ):
             src = getattr(self, attr_name)
             dest = {}
@@ -644,6 +644,8 @@ class PhylogeneticDistanceMatrix(object):
                     x2 = current_to_shuffled_taxon_map[t2]
                     dest[x1][x2] = src[t1][t2]
             setattr(self, attr_name, dest)
+        self._taxon_leaf_nodes = dict((current_to_shuffled_taxon_map.get(t, t), nd)
+                for t, nd in self._taxon_leaf_nodes.items())
         return current_to_shuffled_taxon_map
 
     def as_data_table(self, is_weighted_edge_distances=True):
@@ -753,11 +755,12 @@ class PatrisiticDistanceMatrix(PhylogeneticDistanceMatrix):
 
 def patristic_distance(tree, taxon1, taxon2, is_bipartitions_updated=False):
     """
-    Given a tree with bipartitions encoded, and two taxa on that tree, returns the
-    patristic distance between the two. Much more inefficient than constructing
-    a PhylogeneticDistanceMatrix object.
+    Given a tree and two taxa on that tree, returns the patristic distance
+    between the two. ``is_bipartitions_updated`` is ignored, and is accepted
+    for compatibility only. More efficient than constructing a
+    PhylogeneticDistanceMatrix object if only a few distances are needed.
     """
-    mrca = tree.mrca(taxa=[taxon1, taxon2], is_bipartitions_updated=is_bipartitions_updated)
+    mrca = tree.mrca(taxa=[taxon1, taxon2])
     dist = 0
     n = tree.find_node(lambda x: x.taxon == taxon1)
     while n != mrca:
@@ -22,6 +22,7 @@ from dendropy.dataio import newickwriter
 from dendropy.dataio import newickyielder
 from dendropy.dataio import fastareader
 from dendropy.dataio import fastawriter
+from dendropy.dataio import fastayielder
 from dendropy.dataio import nexusreader
 from dendropy.dataio import nexuswriter
 from dendropy.dataio import nexusyielder
@@ -30,23 +31,30 @@ from dendropy.dataio import nexmlwriter
 from dendropy.dataio import nexmlyielder
 from dendropy.dataio import phylipreader
 from dendropy.dataio import phylipwriter
+from dendropy.dataio import phylipyielder
+from dendropy.dataio import binaryreader
+from dendropy.dataio import binarywriter
+from dendropy.dataio import binaryyielder
+from dendropy.dataio import treeindex
+from dendropy.dataio import parsecache
 from dendropy.utility import container
 
 _IOServices = collections.namedtuple(
         "_IOServices",
-        ["reader", "writer", "tree_yielder"]
+        ["reader", "writer", "tree_yielder", "sequence_yielder", "sequence_writer", "tree_writer"]
         )
 
 _IO_SERVICE_REGISTRY = container.CaseInsensitiveDict()
-_IO_SERVICE_REGISTRY["newick"] = _IOServices(newickreader.NewickReader, newickwriter.NewickWriter, newickyielder.NewickTreeDataYielder)
-_IO_SERVICE_REGISTRY["nexus"] = _IOServices(nexusreader.NexusReader, nexuswriter.NexusWriter, nexusyielder.NexusTreeDataYielder)
-_IO_SERVICE_REGISTRY["nexus/newick"] = _IOServices(None, None, nexusyielder.NexusNewickTreeDataYielder)
-_IO_SERVICE_REGISTRY["nexml"] = _IOServices(nexmlreader.NexmlReader, nexmlwriter.NexmlWriter, nexmlyielder.NexmlTreeDataYielder)
-_IO_SERVICE_REGISTRY["fasta"] = _IOServices(fastareader.FastaReader, fastawriter.FastaWriter, None)
-_IO_SERVICE_REGISTRY["dnafasta"] = _IOServices(fastareader.DnaFastaReader, fastawriter.FastaWriter, None)
-_IO_SERVICE_REGISTRY["rnafasta"] = _IOServices(fastareader.RnaFastaReader, fastawriter.FastaWriter, None)
-_IO_SERVICE_REGISTRY["proteinfasta"] = _IOServices(fastareader.ProteinFastaReader, fastawriter.FastaWriter, None)
-_IO_SERVICE_REGISTRY["phylip"] = _IOServices(phylipreader.PhylipReader, phylipwriter.PhylipWriter, None)
+_IO_SERVICE_REGISTRY["newick"] = _IOServices(newickreader.NewickReader, newickwriter.NewickWriter, newickyielder.NewickTreeDataYielder, None, None, newickwriter.NewickTreeStreamWriter)
+_IO_SERVICE_REGISTRY["nexus"] = _IOServices(nexusreader.NexusReader, nexuswriter.NexusWriter, nexusyielder.NexusTreeDataYielder, None, None, nexuswriter.NexusTreeStreamWriter)
+_IO_SERVICE_REGISTRY["nexus/newick"] = _IOServices(None, None, nexusyielder.NexusNewickTreeDataYielder, None, None, None)
+_IO_SERVICE_REGISTRY["nexml"] = _IOServices(nexmlreader.NexmlReader, nexmlwriter.NexmlWriter, nexmlyielder.NexmlTreeDataYielder, None, None, None)
+_IO_SERVICE_REGISTRY["fasta"] = _IOServices(fastareader.FastaReader, fastawriter.FastaWriter, None, fastayielder.FastaSequenceDataYielder, fastawriter.FastaSequenceStreamWriter, None)
+_IO_SERVICE_REGISTRY["dnafasta"] = _IOServices(fastareader.DnaFastaReader, fastawriter.FastaWriter, None, fastayielder.DnaFastaSequenceDataYielder, fastawriter.DnaFastaSequenceStreamWriter, None)
+_IO_SERVICE_REGISTRY["rnafasta"] = _IOServices(fastareader.RnaFastaReader, fastawriter.FastaWriter, None, fastayielder.RnaFastaSequenceDataYielder, fastawriter.RnaFastaSequenceStreamWriter, None)
+_IO_SERVICE_REGISTRY["proteinfasta"] = _IOServices(fastareader.ProteinFastaReader, fastawriter.FastaWriter, None, fastayielder.ProteinFastaSequenceDataYielder, fastawriter.ProteinFastaSequenceStreamWriter, None)
+_IO_SERVICE_REGISTRY["phylip"] = _IOServices(phylipreader.PhylipReader, phylipwriter.PhylipWriter, None, phylipyielder.PhylipSequenceDataYielder, phylipwriter.PhylipSequenceStreamWriter, None)
+_IO_SERVICE_REGISTRY["dendropy-binary"] = _IOServices(binaryreader.BinaryReader, binarywriter.BinaryWriter, binaryyielder.BinaryTreeDataYielder, None, None, binarywriter.BinaryTreeStreamWriter)
 
 def get_reader(schema, **kwargs):
     try:
@@ -89,9 +97,50 @@ def get_tree_yielder(
     except KeyError:
         raise NotImplementedError("'{}' is not a supported data yielding schema".format(schema))
 
-def register_service(schema, reader=None, writer=None, tree_yielder=None):
+def get_sequence_yielder(
+        files,
+        schema,
+        **kwargs):
+    try:
+        yielder_type =_IO_SERVICE_REGISTRY[schema].sequence_yielder
+        if yielder_type is None:
+            raise KeyError
+        yielder = yielder_type(
+                files=files,
+                **kwargs)
+        return yielder
+    except KeyError:
+        raise NotImplementedError("'{}' is not a supported sequence yielding schema".format(schema))
+
+def get_sequence_writer(
+        stream,
+        schema,
+        **kwargs):
+    try:
+        writer_type =_IO_SERVICE_REGISTRY[schema].sequence_writer
+        if writer_type is None:
+            raise KeyError
+        writer = writer_type(stream, **kwargs)
+        return writer
+    except KeyError:
+        raise NotImplementedError("'{}' is not a supported sequence writing schema".format(schema))
+
+def get_tree_writer(
+        stream,
+        schema,
+        **kwargs):
+    try:
+        writer_type =_IO_SERVICE_REGISTRY[schema].tree_writer
+        if writer_type is None:
+            raise KeyError
+        writer = writer_type(stream, **kwargs)
+        return writer
+    except KeyError:
+        raise NotImplementedError("'{}' is not a supported tree stream writing schema".format(schema))
+
+def register_service(schema, reader=None, writer=None, tree_yielder=None, sequence_yielder=None, sequence_writer=None, tree_writer=None):
     global _IO_SERVICE_REGISTRY
-    _IO_SERVICE_REGISTRY[schema] = _IOServices(reader, writer, tree_yielder)
+    _IO_SERVICE_REGISTRY[schema] = _IOServices(reader, writer, tree_yielder, sequence_yielder, sequence_writer, tree_writer)
 
 def register_reader(schema, reader):
     global _IO_SERVICE_REGISTRY
@@ -100,7 +149,10 @@ def register_reader(schema, reader):
         register_service(schema=schema,
                 reader=reader,
                 writer=current.writer,
-                tree_yielder=current.tree_yielder)
+                tree_yielder=current.tree_yielder,
+                sequence_yielder=current.sequence_yielder,
+                sequence_writer=current.sequence_writer,
+                tree_writer=current.tree_writer)
     except KeyError:
         register_service(schema=schema, reader=reader)
 
@@ -0,0 +1,463 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+Support for reading and writing data in the DendroPy binary format.
+
+A document in this format consists of a signature, the format version, and a
+sequence of records. Each record consists of a 4-byte record type, the size
+of the record body in bytes (as an unsigned 64-bit integer), and the record
+body. Numbers are stored in little-endian byte order, strings are stored as
+their length (as an unsigned 32-bit integer) followed by their UTF-8
+encoding, and arrays of numbers are stored as their packed values, so that
+documents can be memory-mapped and their arrays loaded without parsing.
+"""
+
+import sys
+import io
+import mmap
+import array
+import struct
+import numbers
+from dendropy.utility import textprocessing
+from dendropy.utility import filesys
+from dendropy.utility import error
+
+SIGNATURE = b"\x89DPY\r\n\x1a\n"
+FORMAT_VERSION = 1
+
+TAXON_NAMESPACE_RECORD = b"TXNS"
+TREE_LIST_RECORD = b"TREL"
+TREE_ARRAY_RECORD = b"TARR"
+CHAR_MATRIX_RECORD = b"CHRM"
+ANNOTATIONS_RECORD = b"ANNO"
+
+_RECORD_HEADER = struct.Struct("<4sQ")
+_INT8 = struct.Struct("<b")
+_INT32 = struct.Struct("<i")
+_UINT32 = struct.Struct("<I")
+_INT64 = struct.Struct("<q")
+_UINT64 = struct.Struct("<Q")
+_FLOAT64 = struct.Struct("<d")
+_NULL_STRING_LENGTH = 0xFFFFFFFF
+
+# Annotation value types
+_NONE_VALUE = 0
+_BOOL_VALUE = 1
+_INT_VALUE = 2
+_FLOAT_VALUE = 3
+_STR_VALUE = 4
+_LONG_INT_VALUE = 5
+_LIST_VALUE = 6
+_TUPLE_VALUE = 7
+
+def _uint64_typecode():
+    for typecode in ("L", "Q"):
+        try:
+            if array.array(typecode).itemsize == 8:
+                return typecode
+        except ValueError:
+            pass
+    raise NotImplementedError("No 64-bit unsigned integer array type on this platform")
+UINT64_TYPECODE = _uint64_typecode()
+INT16_TYPECODE = "h"
+INT32_TYPECODE = "i"
+FLOAT64_TYPECODE = "d"
+_IS_BIG_ENDIAN = sys.byteorder == "big"
+_IS_PY2 = sys.version_info.major < 3
+
+class BinaryFormatError(error.DataParseError):
+
+    def __init__(self, message, stream=None):
+        error.DataParseError.__init__(self,
+                message=message,
+                stream=stream)
+
+def write_signature(stream):
+    """
+    Writes the signature and format version that start a document.
+    """
+    stream.write(SIGNATURE + _UINT32.pack(FORMAT_VERSION))
+
+def write_record(stream, record_type, body):
+    """
+    Writes a record of type ``record_type`` with body ``body`` (bytes).
+    """
+    write_record_header(stream, record_type, len(body))
+    stream.write(body)
+
+def write_record_header(stream, record_type, size):
+    """
+    Writes the header of a record of type ``record_type`` with a body of
+    ``size`` bytes, which must follow.
+    """
+    stream.write(_RECORD_HEADER.pack(record_type, size))
+
+def iter_records(buffer, stream=None):
+    """
+    Iterates over the records of the document in ``buffer``, yielding the
+    record type of each record and a |BinaryDecoder| positioned at the start
+    of its body.
+    """
+    signature_size = len(SIGNATURE)
+    if len(buffer) == 0:
+        raise BinaryFormatError("No data in source", stream=stream)
+    if buffer[:signature_size] != SIGNATURE or len(buffer) < signature_size + _UINT32.size:
+        raise BinaryFormatError("Data source is not in the DendroPy binary format", stream=stream)
+    version = _UINT32.unpack_from(buffer, signature_size)[0]
+    if version > FORMAT_VERSION:
+        raise BinaryFormatError("Unsupported DendroPy binary format version: {}".format(version), stream=stream)
+    offset = signature_size + _UINT32.size
+    end = len(buffer)
+    while offset < end:
+        if offset + _RECORD_HEADER.size > end:
+            raise BinaryFormatError("Unexpected end of data", stream=stream)
+        record_type, size = _RECORD_HEADER.unpack_from(buffer, offset)
+        offset += _RECORD_HEADER.size
+        if offset + size > end:
+            raise BinaryFormatError("Unexpected end of data", stream=stream)
+        yield record_type, BinaryDecoder(buffer, offset)
+        offset += size
+
+def get_source_buffer(stream):
+    """
+    Returns the contents of ``stream`` as a buffer: the file is memory-mapped
+    if ``stream`` is backed by one; otherwise its contents are read.
+    """
+    try:
+        fileno = stream.fileno()
+    except (AttributeError, ValueError, EnvironmentError):
+        fileno = None
+    if fileno is not None and filesys.is_compressed_stream(stream):
+        # the file descriptor is that of the compressed data
+        fileno = None
+    if fileno is not None:
+        try:
+            return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        except (ValueError, EnvironmentError):
+            # e.g., empty files or pipes
+            pass
+    if isinstance(stream, io.TextIOBase):
+        try:
+            stream = stream.buffer
+        except AttributeError:
+            raise TypeError("Binary data cannot be read from text stream: {}".format(stream))
+    data = stream.read()
+    if not isinstance(data, bytes):
+        raise TypeError("Binary data cannot be read from text stream: {}".format(stream))
+    return data
+
+def get_destination_stream(stream):
+    """
+    Returns the binary stream underlying ``stream``.
+    """
+    if isinstance(stream, io.TextIOBase):
+        try:
+            buffer = stream.buffer
+        except AttributeError:
+            raise TypeError("Binary data cannot be written to text stream: {}".format(stream))
+        stream.flush()
+        return buffer
+    return stream
+
+def bitmask_words(bitmask, num_words):
+    """
+    Returns the list of the ``num_words`` 64-bit words of ``bitmask``, least
+    significant word first.
+    """
+    words = []
+    for idx in range(num_words):
+        words.append(bitmask & 0xFFFFFFFFFFFFFFFF)
+        bitmask >>= 64
+    return words
+
+def bitmasks_from_words(words, num_words):
+    """
+    Returns the list of bitmasks given by consecutive sequences of
+    ``num_words`` 64-bit words in ``words``.
+    """
+    if num_words == 1:
+        return list(words)
+    bitmasks = []
+    for start in range(0, len(words), num_words):
+        bitmask = 0
+        for idx in range(start + num_words - 1, start - 1, -1):
+            bitmask = (bitmask << 64) | words[idx]
+        bitmasks.append(bitmask)
+    return bitmasks
+
+def remap_bitmask(bitmask, bit_bitmasks):
+    """
+    Returns ``bitmask`` with each set bit replaced by the corresponding
+    element of ``bit_bitmasks`` (e.g., to convert the leafset bitmask of a
+    tree from one ordering of taxa to another).
+    """
+    remapped_bitmask = 0
+    idx = 0
+    while bitmask:
+        if bitmask & 1:
+            remapped_bitmask |= bit_bitmasks[idx]
+        bitmask >>= 1
+        idx += 1
+    return remapped_bitmask
+
+class BinaryEncoder(object):
+    """
+    Accumulates the encoded body of a record.
+    """
+
+    def __init__(self):
+        self._parts = []
+
+    def getvalue(self):
+        return b"".join(self._parts)
+
+    def write_int8(self, value):
+        self._parts.append(_INT8.pack(value))
+
+    def write_int32(self, value):
+        self._parts.append(_INT32.pack(value))
+
+    def write_uint32(self, value):
+        self._parts.append(_UINT32.pack(value))
+
+    def write_uint64(self, value):
+        self._parts.append(_UINT64.pack(value))
+
+    def write_float64(self, value):
+        """
+        Writes a double, with |None| written as NaN.
+        """
+        if value is None:
+            value = float("nan")
+        self._parts.append(_FLOAT64.pack(value))
+
+    def write_optional_bool(self, value):
+        if value is None:
+            self.write_int8(-1)
+        else:
+            self.write_int8(1 if value else 0)
+
+    def write_string(self, value):
+        if value is None:
+            self.write_uint32(_NULL_STRING_LENGTH)
+            return
+        if not isinstance(value, bytes):
+            if not textprocessing.is_str_type(value):
+                value = str(value)
+            value = value.encode("utf-8")
+        self.write_uint32(len(value))
+        self._parts.append(value)
+
+    def write_array(self, typecode, values):
+        """
+        Writes the values of the sequence ``values`` packed as numbers of the
+        array type ``typecode`` (without their count).
+        """
+        if not isinstance(values, array.array) or values.typecode != typecode:
+            values = array.array(typecode, values)
+        if _IS_BIG_ENDIAN:
+            values = array.array(typecode, values)
+            values.byteswap()
+        if _IS_PY2:
+            self._parts.append(values.tostring())
+        else:
+            self._parts.append(values.tobytes())
+
+    def write_bytes(self, data):
+        self._parts.append(data)
+
+    def write_annotations(self, annotations):
+        if annotations is None:
+            self.write_uint32(0)
+            return
+        annotations = list(annotations)
+        self.write_uint32(len(annotations))
+        for annotation in annotations:
+            self.write_string(annotation.name)
+            self.write_annotation_value(annotation.value)
+            self.write_string(annotation.datatype_hint)
+            self.write_string(annotation.name_prefix)
+            self.write_string(annotation.namespace)
+            self.write_int8(1 if annotation.annotate_as_reference else 0)
+            self.write_int8(1 if annotation.is_hidden else 0)
+            self.write_string(annotation.real_value_format_specifier)
+            if annotation.has_annotations:
+                self.write_annotations(annotation.annotations)
+            else:
+                self.write_uint32(0)
+
+    def write_annotation_value(self, value):
+        if value is None:
+            self.write_int8(_NONE_VALUE)
+        elif isinstance(value, bool):
+            self.write_int8(_BOOL_VALUE)
+            self.write_int8(1 if value else 0)
+        elif isinstance(value, float):
+            self.write_int8(_FLOAT_VALUE)
+            self.write_float64(value)
+        elif textprocessing.is_str_type(value):
+            self.write_int8(_STR_VALUE)
+            self.write_string(value)
+        elif isinstance(value, numbers.Integral):
+            if -(2**63) <= value < 2**63:
+                self.write_int8(_INT_VALUE)
+                self._parts.append(_INT64.pack(value))
+            else:
+                self.write_int8(_LONG_INT_VALUE)
+                self.write_string(str(value))
+        elif isinstance(value, (list, tuple)):
+            self.write_int8(_TUPLE_VALUE if isinstance(value, tuple) else _LIST_VALUE)
+            self.write_uint32(len(value))
+            for element in value:
+                self.write_annotation_value(element)
+        else:
+            raise ValueError("Annotation value of type '{}' cannot be represented in the binary format: {}".format(
+                type(value).__name__, repr(value)))
+
+class BinaryDecoder(object):
+    """
+    Decodes values from a buffer (e.g., a memory-mapped file), starting at
+    ``offset``.
+    """
+
+    def __init__(self, buffer, offset=0):
+        self.buffer = buffer
+        self.offset = offset
+
+    def read_int8(self):
+        value = _INT8.unpack_from(self.buffer, self.offset)[0]
+        self.offset += 1
+        return value
+
+    def read_int32(self):
+        value = _INT32.unpack_from(self.buffer, self.offset)[0]
+        self.offset += 4
+        return value
+
+    def read_uint32(self):
+        value = _UINT32.unpack_from(self.buffer, self.offset)[0]
+        self.offset += 4
+        return value
+
+    def read_uint64(self):
+        value = _UINT64.unpack_from(self.buffer, self.offset)[0]
+        self.offset += 8
+        return value
+
+    def read_float64(self):
+        """
+        Reads a double, returning |None| for NaN.
+        """
+        value = _FLOAT64.unpack_from(self.buffer, self.offset)[0]
+        self.offset += 8
+        if value != value:
+            return None
+        return value
+
+    def read_optional_bool(self):
+        value = self.read_int8()
+        if value < 0:
+            return None
+        return value == 1
+
+    def read_string(self):
+        length = self.read_uint32()
+        if length == _NULL_STRING_LENGTH:
+            return None
+        value = self.buffer[self.offset:self.offset+length]
+        self.offset += length
+        if _IS_PY2:
+            return value
+        return value.decode("utf-8")
+
+    def read_array(self, typecode, count):
+        values = array.array(typecode)
+        size = count * values.itemsize
+        data = self.buffer[self.offset:self.offset+size]
+        if len(data) != size:
+            raise BinaryFormatError("Unexpected end of data")
+        if _IS_PY2:
+            values.fromstring(data)
+        else:
+            values.frombytes(data)
+        if _IS_BIG_ENDIAN:
+            values.byteswap()
+        self.offset += size
+        return values
+
+    def skip(self, size):
+        self.offset += size
+
+    def read_annotations(self, annotations_target):
+        """
+        Reads annotations, adding them to the annotations of
+        ``annotations_target`` (which may be |None|, in which case they are
+        discarded).
+        """
+        num_annotations = self.read_uint32()
+        for idx in range(num_annotations):
+            name = self.read_string()
+            value = self.read_annotation_value()
+            datatype_hint = self.read_string()
+            name_prefix = self.read_string()
+            namespace = self.read_string()
+            annotate_as_reference = self.read_int8() == 1
+            is_hidden = self.read_int8() == 1
+            real_value_format_specifier = self.read_string()
+            if annotations_target is not None:
+                annotation = annotations_target.annotations.add_new(
+                        name=name,
+                        value=value,
+                        datatype_hint=datatype_hint,
+                        name_prefix=name_prefix,
+                        namespace=namespace,
+                        annotate_as_reference=annotate_as_reference,
+                        is_hidden=is_hidden,
+                        real_value_format_specifier=real_value_format_specifier)
+            else:
+                annotation = None
+            self.read_annotations(annotation)
+
+    def read_annotation_value(self):
+        value_type = self.read_int8()
+        if value_type == _NONE_VALUE:
+            return None
+        elif value_type == _BOOL_VALUE:
+            return self.read_int8() == 1
+        elif value_type == _INT_VALUE:
+            value = _INT64.unpack_from(self.buffer, self.offset)[0]
+            self.offset += 8
+            return value
+        elif value_type == _FLOAT_VALUE:
+            value = _FLOAT64.unpack_from(self.buffer, self.offset)[0]
+            self.offset += 8
+            return value
+        elif value_type == _STR_VALUE:
+            return self.read_string()
+        elif value_type == _LONG_INT_VALUE:
+            return int(self.read_string())
+        elif value_type == _LIST_VALUE or value_type == _TUPLE_VALUE:
+            num_elements = self.read_uint32()
+            value = [self.read_annotation_value() for idx in range(num_elements)]
+            if value_type == _TUPLE_VALUE:
+                value = tuple(value)
+            return value
+        else:
+            raise BinaryFormatError("Unrecognized annotation value type: {}".format(value_type))
+
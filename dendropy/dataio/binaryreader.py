@@ -0,0 +1,381 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+Implementation of DendroPy binary format data reader.
+"""
+
+from dendropy.dataio import ioservice
+from dendropy.dataio import binaryprocessing
+from dendropy.dataio import newickreader
+
+class BinaryReader(ioservice.DataReader):
+    """
+    Reads data in the DendroPy binary format (as written by
+    `binarywriter.BinaryWriter`). Sources that are files are memory-mapped
+    rather than read.
+    """
+
+    def __init__(self, **kwargs):
+        """
+
+        Keyword Arguments
+        -----------------
+        suppress_annotations : boolean, default: |False|
+            If |True|, metadata annotations will not be read.
+        case_sensitive_taxon_labels : boolean, default: |True|
+            If |False|, then taxa are matched to the taxa of taxon namespaces
+            that already have taxa regardless of the case of their labels.
+        ignore_unrecognized_keyword_arguments : boolean, default: |False|
+            If |True|, then unsupported or unrecognized keyword arguments will
+            not result in an error. Default is |False|: unsupported keyword
+            arguments will result in an error.
+        """
+        ioservice.DataReader.__init__(self)
+        self.suppress_annotations = kwargs.pop("suppress_annotations", False)
+        self.case_sensitive_taxon_labels = kwargs.pop("case_sensitive_taxon_labels", True)
+        # data types of character matrices are as stored
+        kwargs.pop("data_type", None)
+        self.check_for_unused_keyword_arguments(kwargs)
+
+    ###########################################################################
+    ## Reader Interface
+
+    def _read(self,
+            stream,
+            taxon_namespace_factory=None,
+            tree_list_factory=None,
+            char_matrix_factory=None,
+            state_alphabet_factory=None,
+            global_annotations_target=None):
+        taxon_namespaces = []
+        tree_lists = []
+        char_matrices = []
+        # taxon namespaces and their taxa, in order of their records
+        taxon_namespace_taxa = []
+        buffer = binaryprocessing.get_source_buffer(stream)
+        for record_type, decoder in binaryprocessing.iter_records(buffer, stream=stream):
+            if record_type == binaryprocessing.TAXON_NAMESPACE_RECORD:
+                if self.attached_taxon_namespace is not None:
+                    taxon_namespace = self.attached_taxon_namespace
+                else:
+                    taxon_namespace = taxon_namespace_factory(label=None)
+                    taxon_namespaces.append(taxon_namespace)
+                taxa = self.decode_taxon_namespace(decoder, taxon_namespace)
+                taxon_namespace_taxa.append((taxon_namespace, taxa))
+            elif record_type == binaryprocessing.TREE_LIST_RECORD:
+                if tree_list_factory is None:
+                    continue
+                label = decoder.read_string()
+                taxon_namespace, taxa = taxon_namespace_taxa[decoder.read_uint32()]
+                tree_list = tree_list_factory(
+                        taxon_namespace=taxon_namespace,
+                        label=label)
+                self.read_annotations(decoder, tree_list)
+                num_trees = decoder.read_uint32()
+                for tree_idx in range(num_trees):
+                    tree_size = decoder.read_uint64()
+                    self.decode_tree(decoder, tree_list.new_tree(), taxa)
+                tree_lists.append(tree_list)
+            elif record_type == binaryprocessing.TREE_ARRAY_RECORD:
+                if tree_list_factory is None:
+                    continue
+                taxon_namespace, taxa = taxon_namespace_taxa[decoder.read_uint32()]
+                tree_list = tree_list_factory(
+                        taxon_namespace=taxon_namespace,
+                        label=None)
+                for split_bitmask_encoding in self.decode_tree_array(decoder, taxon_namespace, taxa):
+                    tree_list.append(self.build_tree_from_split_bitmask_encoding(
+                            split_bitmask_encoding,
+                            tree_list.tree_type,
+                            taxon_namespace))
+                tree_lists.append(tree_list)
+            elif record_type == binaryprocessing.CHAR_MATRIX_RECORD:
+                if char_matrix_factory is None:
+                    continue
+                char_matrices.append(self.decode_char_matrix(
+                        decoder,
+                        taxon_namespace_taxa,
+                        char_matrix_factory,
+                        state_alphabet_factory))
+            elif record_type == binaryprocessing.ANNOTATIONS_RECORD:
+                if global_annotations_target is not None:
+                    self.read_annotations(decoder, global_annotations_target)
+        return self.Product(
+                taxon_namespaces=taxon_namespaces,
+                tree_lists=tree_lists,
+                char_matrices=char_matrices)
+
+    ###########################################################################
+    ## Decoding
+
+    def read_annotations(self, decoder, annotated):
+        if self.suppress_annotations:
+            annotated = None
+        decoder.read_annotations(annotated)
+
+    def read_sparse_annotations(self, decoder, annotated_items):
+        num_annotated = decoder.read_uint32()
+        for idx in range(num_annotated):
+            item_idx = decoder.read_uint32()
+            self.read_annotations(decoder, annotated_items[item_idx])
+
+    def decode_taxon_namespace(self, decoder, taxon_namespace):
+        """
+        Decodes a taxon namespace record into ``taxon_namespace``, returning
+        the list of its taxa, in order. Taxa are added to ``taxon_namespace``
+        as they are, unless it already has taxa, in which case taxa with the
+        same labels (in a case-sensitive manner, unless
+        ``case_sensitive_taxon_labels`` is |False|) are used.
+        """
+        label = decoder.read_string()
+        if label is not None and taxon_namespace.label is None:
+            taxon_namespace.label = label
+        self.read_annotations(decoder, taxon_namespace)
+        num_taxa = decoder.read_uint32()
+        is_new_taxon_namespace = len(taxon_namespace) == 0
+        taxa = []
+        for taxon_idx in range(num_taxa):
+            taxon_label = decoder.read_string()
+            if is_new_taxon_namespace or taxon_label is None:
+                taxon = taxon_namespace.new_taxon(label=taxon_label)
+            else:
+                taxon = taxon_namespace.require_taxon(label=taxon_label,
+                        is_case_sensitive=self.case_sensitive_taxon_labels)
+            taxa.append(taxon)
+        self.read_sparse_annotations(decoder, taxa)
+        return taxa
+
+    def decode_tree(self, decoder, tree, taxa):
+        """
+        Decodes the tree that starts at the current position of ``decoder``
+        into ``tree``, using ``taxa`` (the taxa of the taxon namespace record
+        of the trees) to look up taxa.
+        """
+        tree.label = decoder.read_string()
+        is_rooted = decoder.read_optional_bool()
+        if is_rooted is not None:
+            tree.is_rooted = is_rooted
+        tree.weight = decoder.read_float64()
+        self.read_annotations(decoder, tree)
+        num_nodes = decoder.read_uint32()
+        parent_indexes = decoder.read_array(binaryprocessing.INT32_TYPECODE, num_nodes)
+        taxon_indexes = decoder.read_array(binaryprocessing.INT32_TYPECODE, num_nodes)
+        edge_lengths = decoder.read_array(binaryprocessing.FLOAT64_TYPECODE, num_nodes)
+        node_factory = tree.node_factory
+        nodes = [tree.seed_node]
+        for node_idx in range(1, num_nodes):
+            node = node_factory()
+            nodes[parent_indexes[node_idx]].add_child(node)
+            nodes.append(node)
+        for node, taxon_idx, edge_length in zip(nodes, taxon_indexes, edge_lengths):
+            if taxon_idx >= 0:
+                node.taxon = taxa[taxon_idx]
+            if edge_length == edge_length:
+                node.edge.length = edge_length
+        for node_idx in range(decoder.read_uint32()):
+            node_idx = decoder.read_uint32()
+            nodes[node_idx].label = decoder.read_string()
+        for node_idx in range(decoder.read_uint32()):
+            node_idx = decoder.read_uint32()
+            nodes[node_idx].edge.label = decoder.read_string()
+        self.read_sparse_annotations(decoder, nodes)
+        self.read_sparse_annotations(decoder, [node.edge for node in nodes])
+        return tree
+
+    def encode_tree_split_bitmasks(self, decoder, taxon_bitmasks):
+        """
+        Returns the |SplitBitmaskEncoding| of the tree that starts at the
+        current position of ``decoder`` (as for :meth:`decode_tree()`), using
+        ``taxon_bitmasks`` (the bitmasks of the taxa of the taxon namespace
+        record of the trees) as the leafset bitmasks of the nodes of the taxa,
+        or |None| if the tree has internal nodes with taxa or leaves without
+        taxa (which cannot be encoded in this way).
+        """
+        decoder.read_string()
+        is_rooted = decoder.read_optional_bool()
+        weight = decoder.read_float64()
+        decoder.read_annotations(None)
+        num_nodes = decoder.read_uint32()
+        parent_indexes = decoder.read_array(binaryprocessing.INT32_TYPECODE, num_nodes)
+        taxon_indexes = decoder.read_array(binaryprocessing.INT32_TYPECODE, num_nodes)
+        edge_lengths = [None if length != length else length
+                for length in decoder.read_array(binaryprocessing.FLOAT64_TYPECODE, num_nodes)]
+        child_nodes = [[] for node_idx in range(num_nodes)]
+        for node_idx in range(1, num_nodes):
+            child_nodes[parent_indexes[node_idx]].append(node_idx)
+        leafset_bitmasks = [0] * num_nodes
+        for node_idx, taxon_idx in enumerate(taxon_indexes):
+            if (taxon_idx >= 0) == bool(child_nodes[node_idx]):
+                return None
+            if taxon_idx >= 0:
+                leafset_bitmasks[node_idx] = taxon_bitmasks[taxon_idx]
+        encoding = newickreader.calc_split_bitmask_encoding(
+                child_nodes=child_nodes,
+                edge_lengths=edge_lengths,
+                leafset_bitmasks=leafset_bitmasks,
+                is_rooted=bool(is_rooted))
+        if encoding is None:
+            return None
+        split_bitmasks, edge_lengths, leafset_bitmask = encoding
+        return newickreader.SplitBitmaskEncoding(
+                split_bitmasks=split_bitmasks,
+                edge_lengths=edge_lengths,
+                leafset_bitmask=leafset_bitmask,
+                is_rooted=is_rooted,
+                weight=weight)
+
+    def decode_tree_array(self, decoder, taxon_namespace, taxa):
+        """
+        Decodes the tree array record that starts at the current position of
+        ``decoder`` (after the index of its taxon namespace record), yielding
+        the |SplitBitmaskEncoding| of each tree, with bitmasks based on
+        ``taxon_namespace``.
+        """
+        is_rooted = decoder.read_optional_bool()
+        num_words = decoder.read_uint32()
+        num_trees = decoder.read_uint32()
+        split_counts = decoder.read_array(binaryprocessing.INT32_TYPECODE, num_trees)
+        num_splits = sum(split_counts)
+        split_bitmasks = binaryprocessing.bitmasks_from_words(
+                decoder.read_array(binaryprocessing.UINT64_TYPECODE, num_splits * num_words),
+                num_words)
+        edge_lengths = [None if length != length else length
+                for length in decoder.read_array(binaryprocessing.FLOAT64_TYPECODE, num_splits)]
+        leafset_bitmasks = binaryprocessing.bitmasks_from_words(
+                decoder.read_array(binaryprocessing.UINT64_TYPECODE, num_trees * num_words),
+                num_words)
+        weights = decoder.read_array(binaryprocessing.FLOAT64_TYPECODE, num_trees)
+        taxon_bitmasks = [taxon_namespace.taxon_bitmask(taxon) for taxon in taxa]
+        if any(taxon_bitmask != (1 << taxon_idx) for taxon_idx, taxon_bitmask in enumerate(taxon_bitmasks)):
+            remap_fn = lambda bitmask: binaryprocessing.remap_bitmask(bitmask, taxon_bitmasks)
+        else:
+            remap_fn = None
+        start = 0
+        for tree_idx in range(num_trees):
+            end = start + split_counts[tree_idx]
+            tree_split_bitmasks = split_bitmasks[start:end]
+            leafset_bitmask = leafset_bitmasks[tree_idx]
+            if remap_fn is not None:
+                leafset_bitmask = remap_fn(leafset_bitmask)
+                tree_split_bitmasks = [remap_fn(b) for b in tree_split_bitmasks]
+                if not is_rooted:
+                    lowest_relevant_bit = leafset_bitmask & -leafset_bitmask
+                    tree_split_bitmasks = [((~b) & leafset_bitmask) if (b & lowest_relevant_bit) else b
+                            for b in tree_split_bitmasks]
+            yield newickreader.SplitBitmaskEncoding(
+                    split_bitmasks=tree_split_bitmasks,
+                    edge_lengths=edge_lengths[start:end],
+                    leafset_bitmask=leafset_bitmask,
+                    is_rooted=is_rooted,
+                    weight=weights[tree_idx])
+            start = end
+
+    def build_tree_from_split_bitmask_encoding(self,
+            split_bitmask_encoding,
+            tree_type,
+            taxon_namespace):
+        if split_bitmask_encoding.edge_lengths is None:
+            split_edge_lengths = None
+        else:
+            split_edge_lengths = dict(zip(
+                split_bitmask_encoding.split_bitmasks,
+                split_bitmask_encoding.edge_lengths))
+        tree = tree_type.from_split_bitmasks(
+                split_bitmasks=split_bitmask_encoding.split_bitmasks,
+                taxon_namespace=taxon_namespace,
+                is_rooted=split_bitmask_encoding.is_rooted,
+                split_edge_lengths=split_edge_lengths)
+        tree.weight = split_bitmask_encoding.weight
+        return tree
+
+    def decode_char_matrix(self,
+            decoder,
+            taxon_namespace_taxa,
+            char_matrix_factory,
+            state_alphabet_factory):
+        label = decoder.read_string()
+        data_type = decoder.read_string()
+        taxon_namespace, taxa = taxon_namespace_taxa[decoder.read_uint32()]
+        annotations_decoder_offset = decoder.offset
+        decoder.read_annotations(None)
+        is_continuous = data_type == "continuous"
+        if decoder.read_int8():
+            state_alphabet = self.decode_state_alphabet(decoder, state_alphabet_factory)
+            char_matrix = char_matrix_factory(
+                    data_type,
+                    label=label,
+                    taxon_namespace=taxon_namespace,
+                    default_state_alphabet=state_alphabet)
+        else:
+            char_matrix = char_matrix_factory(
+                    data_type,
+                    label=label,
+                    taxon_namespace=taxon_namespace)
+            state_alphabet = getattr(char_matrix, "default_state_alphabet", None)
+        end_offset = decoder.offset
+        decoder.offset = annotations_decoder_offset
+        self.read_annotations(decoder, char_matrix)
+        decoder.offset = end_offset
+        num_sequences = decoder.read_uint32()
+        for seq_idx in range(num_sequences):
+            taxon = taxa[decoder.read_uint32()]
+            num_values = decoder.read_uint32()
+            if is_continuous:
+                values = [None if value != value else value
+                        for value in decoder.read_array(binaryprocessing.FLOAT64_TYPECODE, num_values)]
+            else:
+                states = state_alphabet.states
+                values = [states[state_idx]
+                        for state_idx in decoder.read_array(binaryprocessing.INT16_TYPECODE, num_values)]
+            char_matrix.new_sequence(taxon, values)
+        return char_matrix
+
+    def decode_state_alphabet(self, decoder, state_alphabet_factory):
+        state_alphabet = state_alphabet_factory()
+        state_alphabet.autocompile_lookup_tables = False
+        state_alphabet.label = decoder.read_string()
+        num_states = decoder.read_uint32()
+        states = []
+        for state_idx in range(num_states):
+            state_denomination = decoder.read_int8()
+            symbol = decoder.read_string()
+            symbol_synonyms = [decoder.read_string() for idx in range(decoder.read_uint32())]
+            member_state_indexes = [decoder.read_uint32() for idx in range(decoder.read_uint32())]
+            if state_denomination == state_alphabet.FUNDAMENTAL_STATE:
+                state = state_alphabet.new_fundamental_state(symbol)
+            else:
+                state = state_alphabet.new_multistate(
+                        symbol=symbol,
+                        state_denomination=state_denomination,
+                        member_states=[states[idx] for idx in member_state_indexes])
+            states.append(state)
+            for symbol_synonym in symbol_synonyms:
+                state_alphabet.new_symbol_synonym(symbol_synonym, symbol)
+        gap_state_idx = decoder.read_int32()
+        no_data_state_idx = decoder.read_int32()
+        state_alphabet.autocompile_lookup_tables = True
+        state_alphabet.compile_lookup_mappings()
+        if gap_state_idx >= 0:
+            state_alphabet.gap_symbol = states[gap_state_idx].symbol
+        if no_data_state_idx >= 0:
+            state_alphabet.no_data_symbol = states[no_data_state_idx].symbol
+        if gap_state_idx >= 0 or no_data_state_idx >= 0:
+            state_alphabet.compile_lookup_mappings()
+        return state_alphabet
+
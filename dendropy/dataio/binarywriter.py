@@ -0,0 +1,425 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+Implementation of DendroPy binary format data writer.
+"""
+
+import shutil
+import tempfile
+from dendropy.dataio import ioservice
+from dendropy.dataio import binaryprocessing
+
+class BinaryWriter(ioservice.DataWriter):
+    """
+    Writes data in the DendroPy binary format.
+
+    Taxon namespaces are stored as the labels of their taxa, trees as the
+    preorder indexes of the parents of their nodes, the taxon indexes of their
+    nodes and the lengths of their edges (as packed arrays), and character
+    matrices as the packed indexes of the states of their sequences (or
+    packed values, for continuous data). Character subsets and types of
+    characters are not stored.
+    """
+
+    def __init__(self, **kwargs):
+        """
+
+        Keyword Arguments
+        -----------------
+        suppress_annotations : boolean, default: |False|
+            If |True|, metadata annotations will not be written.
+        ignore_unrecognized_keyword_arguments : boolean, default: |False|
+            If |True|, then unsupported or unrecognized keyword arguments will
+            not result in an error. Default is |False|: unsupported keyword
+            arguments will result in an error.
+        """
+        ioservice.DataWriter.__init__(self)
+        self.suppress_annotations = kwargs.pop("suppress_annotations", False)
+        self.check_for_unused_keyword_arguments(kwargs)
+        self._taxon_namespace_indexes = None
+        self._taxon_indexes = None
+
+    ###########################################################################
+    ## Writer Interface
+
+    def _write(self,
+            stream,
+            taxon_namespaces=None,
+            tree_lists=None,
+            char_matrices=None,
+            global_annotations_target=None):
+        stream = binaryprocessing.get_destination_stream(stream)
+        if self.attached_taxon_namespace is not None:
+            taxon_namespaces = [self.attached_taxon_namespace]
+            if tree_lists is not None:
+                tree_lists = [tree_list for tree_list in tree_lists
+                        if tree_list.taxon_namespace is self.attached_taxon_namespace]
+            if char_matrices is not None:
+                char_matrices = [char_matrix for char_matrix in char_matrices
+                        if char_matrix.taxon_namespace is self.attached_taxon_namespace]
+        else:
+            taxon_namespaces = list(taxon_namespaces or [])
+            for data_object in list(tree_lists or []) + list(char_matrices or []):
+                if data_object.taxon_namespace not in taxon_namespaces:
+                    taxon_namespaces.append(data_object.taxon_namespace)
+        binaryprocessing.write_signature(stream)
+        self._write_taxon_namespaces(stream, taxon_namespaces)
+        if global_annotations_target is not None \
+                and not self.suppress_annotations \
+                and global_annotations_target.has_annotations:
+            encoder = binaryprocessing.BinaryEncoder()
+            encoder.write_annotations(global_annotations_target.annotations)
+            binaryprocessing.write_record(stream, binaryprocessing.ANNOTATIONS_RECORD, encoder.getvalue())
+        for tree_list in tree_lists or []:
+            binaryprocessing.write_record(stream,
+                    binaryprocessing.TREE_LIST_RECORD,
+                    self._encode_tree_list(tree_list))
+        for char_matrix in char_matrices or []:
+            binaryprocessing.write_record(stream,
+                    binaryprocessing.CHAR_MATRIX_RECORD,
+                    self._encode_char_matrix(char_matrix))
+
+    def write_tree_array(self, tree_array, stream):
+        """
+        Writes the tree structures stored by ``tree_array`` (a |TreeArray|)
+        as they are stored, so that they can be read back into a
+        |TreeArray| without any trees being built.
+        """
+        stream = binaryprocessing.get_destination_stream(stream)
+        binaryprocessing.write_signature(stream)
+        self._write_taxon_namespaces(stream, [tree_array.taxon_namespace])
+        binaryprocessing.write_record(stream,
+                binaryprocessing.TREE_ARRAY_RECORD,
+                self._encode_tree_array(tree_array))
+
+    ###########################################################################
+    ## Encoding
+
+    def _write_taxon_namespaces(self, stream, taxon_namespaces):
+        self._taxon_namespace_indexes = {}
+        self._taxon_indexes = {}
+        for taxon_namespace in taxon_namespaces:
+            self._taxon_namespace_indexes[taxon_namespace] = len(self._taxon_namespace_indexes)
+            taxon_indexes = {}
+            for taxon in taxon_namespace:
+                taxon_indexes[taxon] = len(taxon_indexes)
+            self._taxon_indexes[taxon_namespace] = taxon_indexes
+            binaryprocessing.write_record(stream,
+                    binaryprocessing.TAXON_NAMESPACE_RECORD,
+                    self._encode_taxon_namespace(taxon_namespace))
+
+    def _encode_taxon_namespace(self, taxon_namespace):
+        encoder = binaryprocessing.BinaryEncoder()
+        encoder.write_string(taxon_namespace.label)
+        self._write_annotations(encoder, taxon_namespace)
+        encoder.write_uint32(len(taxon_namespace))
+        annotated_taxa = []
+        for taxon_idx, taxon in enumerate(taxon_namespace):
+            encoder.write_string(taxon.label)
+            if taxon.has_annotations:
+                annotated_taxa.append((taxon_idx, taxon))
+        self._write_sparse_annotations(encoder, annotated_taxa)
+        return encoder.getvalue()
+
+    def _encode_tree_list(self, tree_list):
+        encoder = binaryprocessing.BinaryEncoder()
+        encoder.write_string(tree_list.label)
+        encoder.write_uint32(self._taxon_namespace_indexes[tree_list.taxon_namespace])
+        self._write_annotations(encoder, tree_list)
+        encoder.write_uint32(len(tree_list))
+        taxon_indexes = self._taxon_indexes[tree_list.taxon_namespace]
+        for tree in tree_list:
+            tree_data = self._encode_tree(tree, taxon_indexes)
+            encoder.write_uint64(len(tree_data))
+            encoder.write_bytes(tree_data)
+        return encoder.getvalue()
+
+    def _encode_tree(self, tree, taxon_indexes):
+        encoder = binaryprocessing.BinaryEncoder()
+        encoder.write_string(tree.label)
+        encoder.write_optional_bool(tree.is_rooted)
+        encoder.write_float64(None if tree.weight is None else float(tree.weight))
+        self._write_annotations(encoder, tree)
+        node_indexes = {}
+        parent_indexes = []
+        node_taxon_indexes = []
+        edge_lengths = []
+        node_labels = []
+        edge_labels = []
+        annotated_nodes = []
+        annotated_edges = []
+        for node_idx, node in enumerate(tree.preorder_node_iter()):
+            node_indexes[node] = node_idx
+            if node.parent_node is None:
+                parent_indexes.append(-1)
+            else:
+                parent_indexes.append(node_indexes[node.parent_node])
+            if node.taxon is None:
+                node_taxon_indexes.append(-1)
+            else:
+                try:
+                    node_taxon_indexes.append(taxon_indexes[node.taxon])
+                except KeyError:
+                    raise ValueError("Taxon {} of tree is not in the taxon namespace of the tree".format(repr(node.taxon)))
+            edge = node.edge
+            edge_lengths.append(float("nan") if edge.length is None else float(edge.length))
+            if node.label is not None:
+                node_labels.append((node_idx, node.label))
+            if edge.label is not None:
+                edge_labels.append((node_idx, edge.label))
+            if node.has_annotations:
+                annotated_nodes.append((node_idx, node))
+            if edge.has_annotations:
+                annotated_edges.append((node_idx, edge))
+        encoder.write_uint32(len(parent_indexes))
+        encoder.write_array(binaryprocessing.INT32_TYPECODE, parent_indexes)
+        encoder.write_array(binaryprocessing.INT32_TYPECODE, node_taxon_indexes)
+        encoder.write_array(binaryprocessing.FLOAT64_TYPECODE, edge_lengths)
+        for labels in (node_labels, edge_labels):
+            encoder.write_uint32(len(labels))
+            for node_idx, label in labels:
+                encoder.write_uint32(node_idx)
+                encoder.write_string(label)
+        self._write_sparse_annotations(encoder, annotated_nodes)
+        self._write_sparse_annotations(encoder, annotated_edges)
+        return encoder.getvalue()
+
+    def _encode_tree_array(self, tree_array):
+        encoder = binaryprocessing.BinaryEncoder()
+        encoder.write_uint32(self._taxon_namespace_indexes[tree_array.taxon_namespace])
+        encoder.write_optional_bool(tree_array.is_rooted_trees)
+        num_words = max(1, (tree_array.taxon_namespace.all_taxa_bitmask().bit_length() + 63) // 64)
+        for leafset_bitmask in tree_array._tree_leafset_bitmasks:
+            num_words = max(num_words, (leafset_bitmask.bit_length() + 63) // 64)
+        encoder.write_uint32(num_words)
+        encoder.write_uint32(len(tree_array._tree_split_bitmasks))
+        encoder.write_array(binaryprocessing.INT32_TYPECODE,
+                [len(split_bitmasks) for split_bitmasks in tree_array._tree_split_bitmasks])
+        split_words = []
+        edge_lengths = []
+        for split_bitmasks, tree_edge_lengths in zip(tree_array._tree_split_bitmasks, tree_array._tree_edge_lengths):
+            for split_bitmask in split_bitmasks:
+                split_words.extend(binaryprocessing.bitmask_words(split_bitmask, num_words))
+            edge_lengths.extend(float("nan") if length is None else float(length)
+                    for length in tree_edge_lengths)
+        encoder.write_array(binaryprocessing.UINT64_TYPECODE, split_words)
+        encoder.write_array(binaryprocessing.FLOAT64_TYPECODE, edge_lengths)
+        leafset_words = []
+        for leafset_bitmask in tree_array._tree_leafset_bitmasks:
+            leafset_words.extend(binaryprocessing.bitmask_words(leafset_bitmask, num_words))
+        encoder.write_array(binaryprocessing.UINT64_TYPECODE, leafset_words)
+        encoder.write_array(binaryprocessing.FLOAT64_TYPECODE, tree_array._tree_weights)
+        return encoder.getvalue()
+
+    def _encode_char_matrix(self, char_matrix):
+        encoder = binaryprocessing.BinaryEncoder()
+        encoder.write_string(char_matrix.label)
+        encoder.write_string(char_matrix.data_type)
+        encoder.write_uint32(self._taxon_namespace_indexes[char_matrix.taxon_namespace])
+        self._write_annotations(encoder, char_matrix)
+        is_continuous = char_matrix.data_type == "continuous"
+        # the state alphabet is stored unless fixed by the data type
+        if not is_continuous and getattr(char_matrix, "datatype_alphabet", None) is None:
+            if len(char_matrix.state_alphabets) > 1:
+                raise ValueError("Character matrices with multiple state alphabets are not supported by the binary format")
+            encoder.write_int8(1)
+            self._write_state_alphabet(encoder, char_matrix.default_state_alphabet)
+        else:
+            encoder.write_int8(0)
+        taxon_indexes = self._taxon_indexes[char_matrix.taxon_namespace]
+        encoder.write_uint32(len(char_matrix))
+        for taxon in char_matrix:
+            seq = char_matrix[taxon]
+            encoder.write_uint32(taxon_indexes[taxon])
+            encoder.write_uint32(len(seq))
+            if is_continuous:
+                encoder.write_array(binaryprocessing.FLOAT64_TYPECODE,
+                        [float("nan") if value is None else value for value in seq])
+            else:
+                encoder.write_array(binaryprocessing.INT16_TYPECODE,
+                        [state._index for state in seq])
+        return encoder.getvalue()
+
+    def _write_state_alphabet(self, encoder, state_alphabet):
+        states = state_alphabet.states
+        encoder.write_string(state_alphabet.label)
+        encoder.write_uint32(len(states))
+        for state in states:
+            encoder.write_int8(state.state_denomination)
+            encoder.write_string(state.symbol)
+            encoder.write_uint32(len(state.symbol_synonyms))
+            for symbol in state.symbol_synonyms:
+                encoder.write_string(symbol)
+            if state.member_states is None:
+                encoder.write_uint32(0)
+            else:
+                encoder.write_uint32(len(state.member_states))
+                for member_state in state.member_states:
+                    encoder.write_uint32(member_state._index)
+        for state in (state_alphabet.gap_state, state_alphabet.no_data_state):
+            encoder.write_int32(-1 if state is None else state._index)
+
+    def _write_annotations(self, encoder, annotated):
+        if self.suppress_annotations or not annotated.has_annotations:
+            encoder.write_annotations(None)
+        else:
+            encoder.write_annotations(annotated.annotations)
+
+    def _write_sparse_annotations(self, encoder, indexed_annotated):
+        if self.suppress_annotations:
+            indexed_annotated = []
+        encoder.write_uint32(len(indexed_annotated))
+        for idx, annotated in indexed_annotated:
+            encoder.write_uint32(idx)
+            encoder.write_annotations(annotated.annotations)
+
+##############################################################################
+## BinaryTreeStreamWriter
+
+class _TaxonIndexMap(dict):
+    """
+    Maps the taxa of a taxon namespace to their indexes, picking up the taxa
+    added to the namespace since they were last mapped.
+    """
+
+    def __init__(self, taxon_namespace):
+        dict.__init__(self)
+        self.taxon_namespace = taxon_namespace
+
+    def __missing__(self, taxon):
+        taxon_namespace = self.taxon_namespace
+        for taxon_idx in range(len(self), len(taxon_namespace)):
+            self[taxon_namespace[taxon_idx]] = taxon_idx
+        if taxon not in self:
+            raise KeyError(taxon)
+        return dict.__getitem__(self, taxon)
+
+class BinaryTreeStreamWriter(ioservice.TreeStreamWriter):
+    """
+    Writes trees in the DendroPy binary format one at a time. As the taxon
+    namespace is written before the trees, but may gain taxa as trees are
+    given (e.g., as they are yielded from a source), the encoded trees are
+    spooled to a temporary file and written out, after the taxon namespace,
+    when the writer is closed.
+    """
+
+    def __init__(self, stream, **kwargs):
+        """
+
+        Parameters
+        ----------
+        stream : file or file-like object
+            Destination for data.
+
+        Keyword Arguments
+        -----------------
+
+        taxon_namespace : |TaxonNamespace| instance
+            The operational taxonomic unit concept namespace of the trees to be
+            written. If not specified, then the taxon namespace of the first
+            tree written will be used.
+        flush_interval : int
+            If specified, then the spooled trees are flushed after every
+            ``flush_interval`` trees.
+
+        All other keyword arguments are as for |BinaryWriter|.
+        """
+        ioservice.TreeStreamWriter.__init__(self,
+                stream,
+                taxon_namespace=kwargs.pop("taxon_namespace", None),
+                flush_interval=kwargs.pop("flush_interval", None))
+        self._binary_writer = BinaryWriter(**kwargs)
+        self._spool = tempfile.TemporaryFile()
+        self.spooled_size = 0
+        self._taxon_indexes = None
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def _write_tree(self, tree):
+        if self._taxon_indexes is None:
+            self._taxon_indexes = _TaxonIndexMap(self.taxon_namespace)
+        tree_data = self._binary_writer._encode_tree(tree, self._taxon_indexes)
+        encoder = binaryprocessing.BinaryEncoder()
+        encoder.write_uint64(len(tree_data))
+        encoder.write_bytes(tree_data)
+        tree_data = encoder.getvalue()
+        self._spool.write(tree_data)
+        self.spooled_size += len(tree_data)
+
+    def _write_split_bitmasks(self,
+            split_bitmasks,
+            edge_lengths,
+            leafset_bitmask,
+            is_rooted,
+            weight):
+        from dendropy.datamodel import treemodel
+        if edge_lengths is None:
+            split_edge_lengths = None
+        else:
+            split_edge_lengths = dict(zip(split_bitmasks, edge_lengths))
+        tree = treemodel.Tree.from_split_bitmasks(
+                split_bitmasks=split_bitmasks,
+                taxon_namespace=self.taxon_namespace,
+                is_rooted=is_rooted,
+                split_edge_lengths=split_edge_lengths)
+        tree.weight = weight
+        self._write_tree(tree)
+
+    def flush(self):
+        self._spool.flush()
+
+    def close(self):
+        """
+        Writes the taxon namespace and the spooled trees to the stream. The
+        stream itself is not closed.
+        """
+        if self._spool is None:
+            return
+        if self.taxon_namespace is None:
+            from dendropy.datamodel import taxonmodel
+            self.taxon_namespace = taxonmodel.TaxonNamespace()
+        stream = binaryprocessing.get_destination_stream(self.stream)
+        binaryprocessing.write_signature(stream)
+        self._binary_writer._write_taxon_namespaces(stream, [self.taxon_namespace])
+        encoder = binaryprocessing.BinaryEncoder()
+        encoder.write_string(None)
+        encoder.write_uint32(0)
+        encoder.write_annotations(None)
+        encoder.write_uint32(self.num_trees_written)
+        header = encoder.getvalue()
+        binaryprocessing.write_record_header(stream,
+                binaryprocessing.TREE_LIST_RECORD,
+                len(header) + self.spooled_size)
+        stream.write(header)
+        self._spool.seek(0)
+        shutil.copyfileobj(self._spool, stream)
+        self.discard()
+
+    def discard(self):
+        """
+        Discards the spooled trees, without writing anything to the stream.
+        """
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+
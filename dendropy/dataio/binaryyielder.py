@@ -0,0 +1,123 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+Implementation of DendroPy binary format tree iterator.
+"""
+
+from dendropy.dataio import ioservice
+from dendropy.dataio import binaryprocessing
+from dendropy.dataio import binaryreader
+
+class BinaryTreeDataYielder(ioservice.TreeDataYielder):
+
+    is_read_ahead_supported = False
+
+    def __init__(self,
+            files=None,
+            taxon_namespace=None,
+            tree_type=None,
+            **kwargs):
+        """
+
+        Parameters
+        ----------
+        files : iterable of sources
+            Iterable of sources, which can either be strings specifying file
+            paths or file-like objects open for reading. If a source element is
+            a string, then it is assumed to be a path to a file. Otherwise, the
+            source is assumed to be a file-like object.
+        taxon_namespace : |TaxonNamespace| instance
+            The operational taxonomic unit concept namespace to use to manage
+            taxon definitions.
+        tree_offset : int
+            Number of trees at the start of each source (e.g., a burn-in) to
+            be skipped over without being built.
+        encode_split_bitmasks : bool
+            If |True|, then, instead of building a tree, the
+            |SplitBitmaskEncoding| of a tree is yielded: trees stored from a
+            |TreeArray| are yielded as stored, and other trees are encoded
+            directly from their stored topologies (unless they have internal
+            nodes with taxa).
+        read_ahead : bool or int
+            Ignored: sources are read as binary data.
+        prefetch_files : bool
+            Ignored: sources are read as binary data.
+        \*\*kwargs : keyword arguments
+            These will be passed directly to the base
+            `binaryreader.BinaryReader` class. See `binaryreader.BinaryReader`
+            for details.
+        """
+        ioservice.TreeDataYielder.__init__(self,
+                files=files,
+                taxon_namespace=taxon_namespace,
+                tree_type=tree_type,
+                tree_offset=kwargs.pop("tree_offset", None),
+                encode_split_bitmasks=kwargs.pop("encode_split_bitmasks", False),
+                read_ahead=kwargs.pop("read_ahead", None),
+                prefetch_files=kwargs.pop("prefetch_files", False))
+        self.binary_reader = binaryreader.BinaryReader(**kwargs)
+        self.binary_reader.attached_taxon_namespace = self.attached_taxon_namespace
+
+    ###########################################################################
+    ## Implementation of DataYielder interface
+
+    def _yield_items_from_stream(self, stream):
+        buffer = binaryprocessing.get_source_buffer(stream)
+        taxon_namespace = self.attached_taxon_namespace
+        taxon_namespace_taxa = []
+        num_trees_to_skip = self.tree_offset
+        for record_type, decoder in binaryprocessing.iter_records(buffer, stream=stream):
+            if record_type == binaryprocessing.TAXON_NAMESPACE_RECORD:
+                taxon_namespace_taxa.append(self.binary_reader.decode_taxon_namespace(decoder, taxon_namespace))
+            elif record_type == binaryprocessing.TREE_LIST_RECORD:
+                decoder.read_string()
+                taxa = taxon_namespace_taxa[decoder.read_uint32()]
+                decoder.read_annotations(None)
+                num_trees = decoder.read_uint32()
+                taxon_bitmasks = None
+                for tree_idx in range(num_trees):
+                    tree_size = decoder.read_uint64()
+                    if num_trees_to_skip > 0:
+                        num_trees_to_skip -= 1
+                        decoder.skip(tree_size)
+                        continue
+                    if self.encode_split_bitmasks:
+                        if taxon_bitmasks is None:
+                            taxon_bitmasks = [taxon_namespace.taxon_bitmask(taxon) for taxon in taxa]
+                        tree_offset = decoder.offset
+                        split_bitmask_encoding = self.binary_reader.encode_tree_split_bitmasks(decoder, taxon_bitmasks)
+                        if split_bitmask_encoding is not None:
+                            decoder.offset = tree_offset + tree_size
+                            yield split_bitmask_encoding
+                            continue
+                        decoder.offset = tree_offset
+                    yield self.binary_reader.decode_tree(decoder, self.tree_factory(), taxa)
+            elif record_type == binaryprocessing.TREE_ARRAY_RECORD:
+                taxa = taxon_namespace_taxa[decoder.read_uint32()]
+                for split_bitmask_encoding in self.binary_reader.decode_tree_array(decoder, taxon_namespace, taxa):
+                    if num_trees_to_skip > 0:
+                        num_trees_to_skip -= 1
+                        continue
+                    if self.encode_split_bitmasks:
+                        yield split_bitmask_encoding
+                    else:
+                        yield self.binary_reader.build_tree_from_split_bitmask_encoding(
+                                split_bitmask_encoding,
+                                self.tree_type,
+                                taxon_namespace)
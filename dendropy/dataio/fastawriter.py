@@ -21,6 +21,8 @@ Implementation of FASTA-format data writer.
 """
 
 from dendropy.dataio import ioservice
+from dendropy.utility import deprecate
+from dendropy.utility import textprocessing
 
 class FastaWriter(ioservice.DataWriter):
     """
@@ -54,21 +56,103 @@ class FastaWriter(ioservice.DataWriter):
             self._write_char_matrix(stream, char_matrix)
 
     def _write_char_matrix(self, stream, char_matrix):
+        sequence_writer = FastaSequenceStreamWriter(
+                stream,
+                wrap=self.wrap,
+                wrap_width=self.wrap_width)
         for taxon in char_matrix:
-            stream.write(">{}\n".format(taxon.label))
-            seq = char_matrix[taxon]
-            if self.wrap:
-                col_count = 0
-                for c in seq:
-                    if col_count == self.wrap_width:
-                        stream.write("\n")
-                        col_count = 0
-                    stream.write(str(c))
-                    col_count += 1
+            sequence_writer.write_sequence(taxon.label, char_matrix[taxon])
+
+class FastaSequenceStreamWriter(ioservice.SequenceStreamWriter):
+    """
+    Writes sequences in FASTA format one at a time.
+    """
+
+    def __init__(self, stream, **kwargs):
+        """
+
+        Parameters
+        ----------
+        stream : file or file-like object
+            Destination for data.
+
+        Keyword Arguments
+        -----------------
+
+        state_alphabet : |StateAlphabet| instance
+            If specified, then sequences that are not given as strings of
+            symbols are taken to be iterables of the indexes of their states
+            in this alphabet.
+        data_type : str
+            If specified (and ``state_alphabet`` is not), then the (fixed)
+            state alphabet of this character data type (e.g., "dna") is used
+            as ``state_alphabet``.
+        wrap: boolean, default: |True|
+            If |False|, then sequences are written out as single, unbroken lines.
+            Defaults to |True|: wraps sequences at 70 colums.
+        """
+        ioservice.SequenceStreamWriter.__init__(self,
+                stream,
+                state_alphabet=kwargs.pop("state_alphabet", None),
+                data_type=kwargs.pop("data_type", None))
+        self.wrap = kwargs.pop("wrap", True)
+        self.wrap_width = kwargs.pop("wrap_width", 70)
+        self.check_for_unused_keyword_arguments(kwargs)
+
+    def write_sequence(self, label, sequence):
+        if not self.wrap or textprocessing.is_str_type(sequence):
+            ioservice.SequenceStreamWriter.write_sequence(self, label, sequence)
+            return
+        # states may be represented by more than one character (e.g.,
+        # continuous values or multistate symbols), so lines are wrapped
+        # every ``wrap_width`` states rather than characters
+        symbols = self._get_state_symbols(label, sequence)
+        self._write_sequence(label, symbols)
+        self.num_sequences_written += 1
+
+    def _write_sequence(self, label, symbols):
+        self.stream.write(">{}\n".format(label))
+        if self.wrap:
+            wrap_width = self.wrap_width
+            if textprocessing.is_str_type(symbols):
+                lines = [symbols[i:i+wrap_width] for i in range(0, len(symbols), wrap_width)]
             else:
-                s = "".join("{}".format(c) for c in seq)
-                stream.write("{}\n".format(s))
-            stream.write("\n\n")
+                lines = ["".join(symbols[i:i+wrap_width]) for i in range(0, len(symbols), wrap_width)]
+            self.stream.write("\n".join(lines))
+        else:
+            self.stream.write("{}\n".format(symbols))
+        self.stream.write("\n\n")
+
+
+class DnaFastaSequenceStreamWriter(FastaSequenceStreamWriter):
+
+    def __init__(self, stream, **kwargs):
+        deprecate.dendropy_deprecation_warning(
+                preamble="Deprecated since DendroPy 4:",
+                old_construct="dendropy.CharacterMatrix.get_sequence_stream_writer(stream=..., schema='dnafasta', ...)",
+                new_construct="dendropy.CharacterMatrix.get_sequence_stream_writer(stream=..., schema='fasta', data_type='dna', ...)",
+                stacklevel=5)
+        kwargs.setdefault("data_type", "dna")
+        FastaSequenceStreamWriter.__init__(self, stream, **kwargs)
+
+class RnaFastaSequenceStreamWriter(FastaSequenceStreamWriter):
 
+    def __init__(self, stream, **kwargs):
+        deprecate.dendropy_deprecation_warning(
+                preamble="Deprecated since DendroPy 4:",
+                old_construct="dendropy.CharacterMatrix.get_sequence_stream_writer(stream=..., schema='rnafasta', ...)",
+                new_construct="dendropy.CharacterMatrix.get_sequence_stream_writer(stream=..., schema='fasta', data_type='rna', ...)",
+                stacklevel=5)
+        kwargs.setdefault("data_type", "rna")
+        FastaSequenceStreamWriter.__init__(self, stream, **kwargs)
 
+class ProteinFastaSequenceStreamWriter(FastaSequenceStreamWriter):
 
+    def __init__(self, stream, **kwargs):
+        deprecate.dendropy_deprecation_warning(
+                preamble="Deprecated since DendroPy 4:",
+                old_construct="dendropy.CharacterMatrix.get_sequence_stream_writer(stream=..., schema='proteinfasta', ...)",
+                new_construct="dendropy.CharacterMatrix.get_sequence_stream_writer(stream=..., schema='fasta', data_type='protein', ...)",
+                stacklevel=5)
+        kwargs.setdefault("data_type", "protein")
+        FastaSequenceStreamWriter.__init__(self, stream, **kwargs)
@@ -0,0 +1,144 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+Implementation of FASTA-format sequence iterator.
+"""
+
+from dendropy.dataio import ioservice
+from dendropy.utility.error import DataParseError
+from dendropy.utility import deprecate
+
+class FastaSequenceDataYielder(ioservice.SequenceDataYielder):
+
+    def __init__(self,
+            files=None,
+            **kwargs):
+        """
+
+        Parameters
+        ----------
+        files : iterable of sources
+            Iterable of sources, which can either be strings specifying file
+            paths or file-like objects open for reading. If a source element is
+            a string, then it is assumed to be a path to a file. Otherwise, the
+            source is assumed to be a file-like object.
+
+        Keyword Arguments
+        -----------------
+        state_alphabet : |StateAlphabet| instance
+            If specified, then sequences are yielded as arrays of the indexes
+            of their states in this alphabet. Default is |None|: sequences
+            are yielded as strings of their symbols.
+        data_type : str
+            If specified (and ``state_alphabet`` is not), then sequences are
+            yielded as strings of their symbols after checking that the
+            symbols are recognized by the (fixed) state alphabet of this
+            character data type: "dna", "rna", "protein", "restriction", or
+            "infinite".
+        ignore_invalid_chars : bool
+            If |True| then symbols that are not recognized by
+            ``state_alphabet`` (or the state alphabet of ``data_type``) will
+            be ignored. Default is |False|: invalid symbols result in errors.
+        read_ahead : bool or int
+            If |True| or a positive integer, then each source is read (and,
+            if it is a compressed file, decompressed) and decoded by a
+            background thread, up to this many blocks (or a default number
+            of blocks, if |True|) ahead of the parsing of the source.
+        prefetch_files : bool
+            If |True|, then the background reading of each source is started
+            while the preceding source is being parsed (implies
+            ``read_ahead``).
+        ignore_unrecognized_keyword_arguments : boolean, default: |False|
+            If |True|, then unsupported or unrecognized keyword arguments will
+            not result in an error. Default is |False|: unsupported keyword
+            arguments will result in an error.
+        """
+        ioservice.SequenceDataYielder.__init__(self,
+                files=files,
+                state_alphabet=kwargs.pop("state_alphabet", None),
+                ignore_invalid_chars=kwargs.pop("ignore_invalid_chars", False),
+                read_ahead=kwargs.pop("read_ahead", None),
+                prefetch_files=kwargs.pop("prefetch_files", False),
+                data_type=kwargs.pop("data_type", None))
+        self.check_for_unused_keyword_arguments(kwargs)
+
+    ###########################################################################
+    ## Implementation of DataYielder interface
+
+    def _yield_items_from_stream(self, stream):
+        labels = set()
+        curr_label = None
+        curr_line_num = None
+        curr_parts = None
+        for line_index, line in enumerate(stream):
+            s = line.strip()
+            if not s:
+                continue
+            if s.startswith('>'):
+                name = s[1:].strip()
+                if name in labels:
+                    raise DataParseError(message="FASTA error: Repeated sequence name ('{}') found".format(name), line_num=line_index + 1, stream=stream)
+                if curr_parts is not None:
+                    if not curr_parts:
+                        raise DataParseError(message="FASTA error: Expected sequence, but found another sequence name ('{}')".format(name), line_num=line_index + 1, stream=stream)
+                    yield self.sequence_record(curr_label, "".join(curr_parts), curr_line_num)
+                labels.add(name)
+                curr_label = name
+                curr_line_num = line_index + 1
+                curr_parts = []
+            elif curr_parts is None:
+                raise DataParseError(message="FASTA error: Expecting a lines starting with > before sequences", line_num=line_index + 1, stream=stream)
+            else:
+                curr_parts.append("".join(s.split()))
+        if curr_parts is not None:
+            yield self.sequence_record(curr_label, "".join(curr_parts), curr_line_num)
+
+
+class DnaFastaSequenceDataYielder(FastaSequenceDataYielder):
+
+    def __init__(self, files=None, **kwargs):
+        deprecate.dendropy_deprecation_warning(
+                preamble="Deprecated since DendroPy 4:",
+                old_construct="dendropy.CharacterMatrix.yield_sequences_from_files(files=..., schema='dnafasta', ...)",
+                new_construct="dendropy.CharacterMatrix.yield_sequences_from_files(files=..., schema='fasta', data_type='dna', ...)",
+                stacklevel=5)
+        kwargs.setdefault("data_type", "dna")
+        FastaSequenceDataYielder.__init__(self, files=files, **kwargs)
+
+class RnaFastaSequenceDataYielder(FastaSequenceDataYielder):
+
+    def __init__(self, files=None, **kwargs):
+        deprecate.dendropy_deprecation_warning(
+                preamble="Deprecated since DendroPy 4:",
+                old_construct="dendropy.CharacterMatrix.yield_sequences_from_files(files=..., schema='rnafasta', ...)",
+                new_construct="dendropy.CharacterMatrix.yield_sequences_from_files(files=..., schema='fasta', data_type='rna', ...)",
+                stacklevel=5)
+        kwargs.setdefault("data_type", "rna")
+        FastaSequenceDataYielder.__init__(self, files=files, **kwargs)
+
+class ProteinFastaSequenceDataYielder(FastaSequenceDataYielder):
+
+    def __init__(self, files=None, **kwargs):
+        deprecate.dendropy_deprecation_warning(
+                preamble="Deprecated since DendroPy 4:",
+                old_construct="dendropy.CharacterMatrix.yield_sequences_from_files(files=..., schema='proteinfasta', ...)",
+                new_construct="dendropy.CharacterMatrix.yield_sequences_from_files(files=..., schema='fasta', data_type='protein', ...)",
+                stacklevel=5)
+        kwargs.setdefault("data_type", "protein")
+        FastaSequenceDataYielder.__init__(self, files=files, **kwargs)
@@ -17,11 +17,19 @@
 ##############################################################################
 
 import sys
+import array
 import collections
+import threading
 import warnings
+try:
+    from Queue import Queue, Empty, Full
+except ImportError:
+    from queue import Queue, Empty, Full # python 3.x
 from dendropy.datamodel import taxonmodel
 from dendropy.utility import deprecate
+from dendropy.utility import error
 from dendropy.utility import textprocessing
+from dendropy.utility import filesys
 if not (sys.version_info.major >= 3 and sys.version_info.minor >= 4):
     from dendropy.utility.filesys import pre_py34_open as open
 
@@ -494,14 +502,180 @@ class DataWriter(IOService):
                 char_matrices=[char_matrix],
                 global_annotations_target=None)
 
+    def write_tree_array(self, tree_array, stream):
+        """
+        Writes the tree structures stored by ``tree_array`` (a |TreeArray|)
+        to the file-like object ``stream``. Only supported by writers of
+        schemas that can store tree structures as they are stored by
+        |TreeArray|.
+        """
+        raise NotImplementedError("Writing of TreeArray objects is not supported by this writer")
+
+###############################################################################
+## ReadAheadStream
+
+class ReadAheadStream(object):
+    """
+    A read-only, file-like text stream over a source that is read (and, if
+    given as the path to a compressed file, decompressed) and decoded
+    in blocks by a background thread, which stays up to a bounded number of
+    blocks ahead of the consumer. This allows the I/O of a source to be
+    overlapped with the parsing of what has already been read.
+    """
+
+    DEFAULT_BLOCK_SIZE = 1 << 16
+    DEFAULT_MAX_BLOCKS = 16
+
+    def __init__(self, src, max_blocks=None, block_size=None):
+        """
+        Parameters
+        ----------
+        src : string or file-like object
+            A path to a file (which may be compressed) or a file-like
+            object open for reading text. A file opened from a path is closed
+            once it has been read or once this stream is closed; a file-like
+            object is left open.
+        max_blocks : int
+            Maximum number of blocks read ahead of the consumer.
+        block_size : int
+            Number of characters in each block.
+        """
+        if textprocessing.is_str_type(src):
+            self.name = src
+        else:
+            self.name = getattr(src, "name", None)
+        if not max_blocks or max_blocks is True:
+            max_blocks = ReadAheadStream.DEFAULT_MAX_BLOCKS
+        if block_size is None:
+            block_size = ReadAheadStream.DEFAULT_BLOCK_SIZE
+        self.block_size = block_size
+        self._src = src
+        self._queue = Queue(maxsize=max_blocks)
+        self._is_stopped = threading.Event()
+        self._block = ""
+        self._pos = 0
+        self._is_exhausted = False
+        self.closed = False
+        self._thread = threading.Thread(target=self._enqueue_blocks)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _put(self, item):
+        while not self._is_stopped.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
+
+    def _enqueue_blocks(self):
+        src = None
+        try:
+            if textprocessing.is_str_type(self._src):
+                src = filesys.open_source_path(self._src)
+            else:
+                src = self._src
+            while True:
+                block = src.read(self.block_size)
+                if not self._put(block) or not block:
+                    break
+        except Exception as e:
+            self._put(e)
+        finally:
+            # only files opened here are closed
+            if src is not None and src is not self._src:
+                src.close()
+
+    def _next_block(self):
+        if self._is_exhausted:
+            return False
+        block = self._queue.get()
+        if isinstance(block, Exception):
+            self._is_exhausted = True
+            raise block
+        if not block:
+            self._is_exhausted = True
+            return False
+        if self._pos < len(self._block):
+            self._block = self._block[self._pos:] + block
+        else:
+            self._block = block
+        self._pos = 0
+        return True
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            while self._next_block():
+                pass
+            size = len(self._block) - self._pos
+        else:
+            while len(self._block) - self._pos < size and self._next_block():
+                pass
+        s = self._block[self._pos:self._pos + size]
+        self._pos += len(s)
+        return s
+
+    def readline(self):
+        while True:
+            idx = self._block.find("\n", self._pos)
+            if idx >= 0:
+                idx += 1
+                break
+            if not self._next_block():
+                idx = len(self._block)
+                break
+        s = self._block[self._pos:idx]
+        self._pos = idx
+        return s
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self.readline()
+        if not line:
+            raise StopIteration
+        return line
+    next = __next__
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self._is_stopped.set()
+        self._thread.join()
+        self._block = ""
+        self._pos = 0
+        self._is_exhausted = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
 ###############################################################################
 ## DataYielder
 
 class DataYielder(IOService):
 
-    def __init__(self, files=None):
+    # whether the sources are read as text (and hence can be read ahead of
+    # parsing by a background thread)
+    is_read_ahead_supported = True
+
+    def __init__(self,
+            files=None,
+            read_ahead=None,
+            prefetch_files=False):
         IOService.__init__(self)
         self.files = files
+        # if not |None| or |False|, then the number of blocks of each source
+        # to be read and decoded ahead of parsing by a background thread
+        self.read_ahead = read_ahead
+        # if |True|, then the reading ahead of the next source is started
+        # while the current one is being parsed
+        self.prefetch_files = prefetch_files
         self._current_file_index = None
         self._current_file = None
         self._current_file_name = None
@@ -524,14 +698,52 @@ class DataYielder(IOService):
     current_file_name = property(_get_current_file_name)
 
     def __iter__(self):
-        for current_file_index, current_file in enumerate(self.files):
-            self._current_file_index = current_file_index
-            for item in self.iterate_over_file(current_file):
-                yield item
+        if self.prefetch_files and self.is_read_ahead_supported:
+            files = self._iter_prefetched_files()
+        else:
+            files = self.files
+        try:
+            for current_file_index, current_file in enumerate(files):
+                self._current_file_index = current_file_index
+                for item in self.iterate_over_file(current_file):
+                    yield item
+        finally:
+            if files is not self.files:
+                # stops the reading of prefetched sources if iteration is
+                # abandoned
+                files.close()
+
+    def _iter_prefetched_files(self):
+        """
+        Iterates over the sources, wrapped as |ReadAheadStream| objects, with
+        the reading of each source starting when the previous one is
+        yielded.
+        """
+        # the stream being yielded, and the stream of the next source, the
+        # reading of which has already started
+        streams = []
+        try:
+            for src in self.files:
+                streams.append(ReadAheadStream(src, max_blocks=self.read_ahead))
+                if len(streams) > 1:
+                    yield streams[0]
+                    streams.pop(0)
+            while streams:
+                yield streams[0]
+                streams.pop(0)
+        finally:
+            for stream in streams:
+                stream.close()
 
     def iterate_over_file(self, current_file):
-        if textprocessing.is_str_type(current_file):
-            self._current_file = open(current_file, "r")
+        if isinstance(current_file, ReadAheadStream):
+            self._current_file = current_file
+            self._current_file_name = current_file.name
+        elif self.read_ahead and self.is_read_ahead_supported:
+            self._current_file = ReadAheadStream(current_file, max_blocks=self.read_ahead)
+            self._current_file_name = self._current_file.name
+        elif textprocessing.is_str_type(current_file):
+            self._current_file = filesys.open_source_path(current_file)
             self._current_file_name = current_file
         else:
             self._current_file = current_file
@@ -557,14 +769,399 @@ class TreeDataYielder(DataYielder):
     def __init__(self,
             files=None,
             taxon_namespace=None,
-            tree_type=None):
-        DataYielder.__init__(self, files=files)
+            tree_type=None,
+            tree_offset=None,
+            encode_split_bitmasks=False,
+            read_ahead=None,
+            prefetch_files=False):
+        DataYielder.__init__(self,
+                files=files,
+                read_ahead=read_ahead,
+                prefetch_files=prefetch_files)
         self.taxon_namespace = taxon_namespace
         assert self.taxon_namespace is not None
         self.attached_taxon_namespace = self.taxon_namespace
         self.tree_type = tree_type
+        if tree_offset is None:
+            tree_offset = 0
+        elif tree_offset < 0:
+            raise ValueError("Negative tree offsets are not supported when yielding trees (unless a tree index is used): {}".format(tree_offset))
+        # number of trees at the start of each source to be skipped over
+        # without being built
+        self.tree_offset = tree_offset
+        # if True, then implementations may yield the split bitmask encodings
+        # of trees (as stored by |TreeArray|) instead of building trees
+        self.encode_split_bitmasks = encode_split_bitmasks
 
     def tree_factory(self):
         return self.tree_type(taxon_namespace=self.taxon_namespace)
 
+    def taxon_bitmask_fn(self, taxon_namespace):
+        """
+        Returns the function to be used to look up the leafset bitmasks of
+        taxa when encoding trees of ``taxon_namespace`` as split bitmasks, or
+        |None| if trees are not to be encoded.
+        """
+        if self.encode_split_bitmasks:
+            return taxon_namespace.taxon_bitmask
+        return None
+
+
+###############################################################################
+## SequenceDataYielder
+
+SequenceRecord = collections.namedtuple("SequenceRecord", ["label", "sequence"])
+
+def _get_data_type_state_alphabet(data_type):
+    """
+    Returns the (fixed) state alphabet of the character data type
+    ``data_type`` (e.g., "dna", "rna" or "protein").
+    """
+    from dendropy.datamodel import charmatrixmodel
+    state_alphabet = charmatrixmodel.get_char_matrix_type(data_type).datatype_alphabet
+    if state_alphabet is None:
+        raise ValueError("Data type '{}' does not have a fixed state alphabet".format(data_type))
+    return state_alphabet
+
+class SequenceDataYielder(DataYielder):
+    """
+    Base class for iterators over the sequences of character data sources
+    that yield each sequence as a |SequenceRecord| as soon as it has been
+    read, without building a character matrix.
+    """
+
+    def __init__(self,
+            files=None,
+            state_alphabet=None,
+            ignore_invalid_chars=False,
+            read_ahead=None,
+            prefetch_files=False,
+            data_type=None):
+        DataYielder.__init__(self,
+                files=files,
+                read_ahead=read_ahead,
+                prefetch_files=prefetch_files)
+        self.state_alphabet = state_alphabet
+        self.ignore_invalid_chars = ignore_invalid_chars
+        self.data_type = data_type
+        self._valid_symbols = None
+        if self.state_alphabet is not None:
+            self._symbol_index_map = dict((symbol, state.index)
+                    for symbol, state in self.state_alphabet.full_symbol_state_map.items())
+        else:
+            self._symbol_index_map = None
+            if self.data_type is not None:
+                # sequences are yielded as strings, but only of the symbols
+                # of the data type
+                self._valid_symbols = frozenset(
+                        _get_data_type_state_alphabet(self.data_type).full_symbol_state_map)
+
+    def sequence_record(self, label, symbols, line_num=None):
+        """
+        Returns the |SequenceRecord| of the sequence ``label``, given as the
+        string of its state ``symbols`` (without whitespace). If a state
+        alphabet has been specified, then the sequence is coded as an array
+        of the indexes of the states of the symbols in the alphabet; otherwise
+        the string of symbols is used as is (after checking the symbols
+        against the state alphabet of the data type, if specified).
+        """
+        symbol_index_map = self._symbol_index_map
+        if symbol_index_map is None:
+            valid_symbols = self._valid_symbols
+            if valid_symbols is not None and not valid_symbols.issuperset(symbols):
+                symbols = "".join(self._iter_valid_symbols(label, symbols, valid_symbols, line_num))
+            return SequenceRecord(label, symbols)
+        try:
+            sequence = array.array("h", [symbol_index_map[c] for c in symbols])
+        except KeyError:
+            sequence = array.array("h", [symbol_index_map[c]
+                for c in self._iter_valid_symbols(label, symbols, symbol_index_map, line_num)])
+        return SequenceRecord(label, sequence)
+
+    def _iter_valid_symbols(self, label, symbols, valid_symbols, line_num):
+        for c in symbols:
+            if c in valid_symbols:
+                yield c
+            elif not self.ignore_invalid_chars:
+                raise error.DataParseError(
+                        message="Unrecognized sequence symbol for sequence '{}': '{}'".format(label, c),
+                        line_num=line_num,
+                        stream=self.current_file)
+
+###############################################################################
+## SequenceStreamWriter
+
+class SequenceStreamWriter(IOService):
+    """
+    Base class for writers that write sequences to a stream one at a time,
+    as they are given (e.g., as yielded by a |SequenceDataYielder|), without
+    a character matrix being built.
+    """
+
+    def __init__(self, stream, state_alphabet=None, data_type=None):
+        """
+        Parameters
+        ----------
+        stream : file or file-like object
+            Destination for data.
+        state_alphabet : |StateAlphabet| instance
+            If specified, then sequences that are not given as strings
+            of symbols are taken to be iterables of the indexes of their
+            states in this alphabet. Default is |None|: such sequences are
+            taken to be iterables of state identities (or other values) that
+            are written out as their string representations.
+        data_type : str
+            If specified (and ``state_alphabet`` is not), then the (fixed)
+            state alphabet of this character data type (e.g., "dna") is used
+            as ``state_alphabet``.
+        """
+        IOService.__init__(self)
+        self.stream = stream
+        if state_alphabet is None and data_type is not None:
+            state_alphabet = _get_data_type_state_alphabet(data_type)
+        self.data_type = data_type
+        self.state_alphabet = state_alphabet
+        if self.state_alphabet is not None:
+            self._index_symbol_map = dict((state.index, str(state))
+                    for state in self.state_alphabet.state_iter())
+        else:
+            self._index_symbol_map = None
+        self.num_sequences_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
 
+    def write_sequence(self, label, sequence):
+        """
+        Writes out ``sequence``, which can be given as a string of symbols,
+        an iterable of state identities, or (if a state alphabet has been
+        specified) an iterable of state indexes, under ``label``.
+        """
+        if textprocessing.is_str_type(sequence):
+            symbols = sequence
+        else:
+            symbols = "".join(self._get_state_symbols(label, sequence))
+        self._write_sequence(label, symbols)
+        self.num_sequences_written += 1
+
+    def write_sequences(self, records):
+        """
+        Writes out each of the ``(label, sequence)`` pairs (e.g.,
+        |SequenceRecord| objects) in ``records``.
+        """
+        for label, sequence in records:
+            self.write_sequence(label, sequence)
+
+    def close(self):
+        """
+        Completes the data written to the stream. The stream itself is not
+        closed.
+        """
+        pass
+
+    def _get_state_symbols(self, label, sequence):
+        """
+        Returns a list of the symbols of the states in ``sequence``, an
+        iterable of state identities or (if a state alphabet has been
+        specified) state indexes.
+        """
+        if self._index_symbol_map is not None:
+            try:
+                return [self._index_symbol_map[i] for i in sequence]
+            except KeyError as e:
+                raise ValueError("Invalid state index for sequence '{}': {}".format(label, e))
+        return [str(c) for c in sequence]
+
+    def _write_sequence(self, label, symbols):
+        """
+        Deriving classes should implement this method to write out the
+        sequence of ``symbols`` (a string) under ``label`` in schema-specific
+        formatting.
+        """
+        raise NotImplementedError
+
+
+###############################################################################
+## TreeStreamWriter
+
+class TreeStreamWriter(IOService):
+    """
+    Base class for writers that write trees to a stream one at a time, as they
+    are given (e.g., as generated by a simulation, or as yielded by a
+    |TreeDataYielder|), without a |TreeList| being built.
+    """
+
+    def __init__(self, stream, taxon_namespace=None, flush_interval=None):
+        """
+        Parameters
+        ----------
+        stream : file or file-like object
+            Destination for data.
+        taxon_namespace : |TaxonNamespace| instance
+            The operational taxonomic unit concept namespace of the trees to be
+            written. If not specified, then the taxon namespace of the first
+            tree written will be used. All trees written must reference this
+            taxon namespace.
+        flush_interval : int
+            If specified, then the stream is flushed after every
+            ``flush_interval`` trees. Default is |None|: the stream is not
+            explicitly flushed.
+        """
+        IOService.__init__(self)
+        self.stream = stream
+        self.taxon_namespace = taxon_namespace
+        self.flush_interval = flush_interval
+        self.num_trees_written = 0
+        self._bit_taxon_map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+
+    def write_tree(self, tree):
+        """
+        Writes out ``tree``.
+        """
+        self._set_taxon_namespace(tree)
+        self._write_tree(tree)
+        self._tree_written()
+
+    def write_trees(self, trees):
+        """
+        Writes out each of the trees in ``trees`` (e.g., a generator of |Tree|
+        objects).
+        """
+        for tree in trees:
+            self.write_tree(tree)
+
+    def write_split_bitmasks(self,
+            split_bitmasks,
+            edge_lengths=None,
+            leafset_bitmask=None,
+            is_rooted=None,
+            weight=None):
+        """
+        Writes out the tree given by its ``split_bitmasks``, without a |Tree|
+        object being built. The arguments are given in the same order as the
+        fields of a |SplitBitmaskEncoding| (as yielded by tree yielders with
+        ``encode_split_bitmasks=True``), so that this can be called as
+        ``writer.write_split_bitmasks(*split_bitmask_encoding)``.
+
+        Parameters
+        ----------
+        split_bitmasks : iterable of ints
+            The split bitmasks of the edges of the tree, with the bits
+            corresponding to the taxa of the taxon namespace of the writer,
+            which must be set.
+        edge_lengths : iterable
+            The lengths of the edges subtending the splits, in the same order
+            as ``split_bitmasks``. Default is |None|: no edge lengths.
+        leafset_bitmask : int
+            The bitmask of the taxa of the leaves of the tree. Default is
+            |None|: the tree spans all the taxa of the taxon namespace.
+        is_rooted : bool
+            Rooting state of the tree. Default is |None|: the rooting state is
+            not known.
+        weight : float
+            Weight of the tree.
+        """
+        if self.taxon_namespace is None:
+            raise TypeError("Taxon namespace must be specified to write split bitmasks")
+        if leafset_bitmask is None:
+            leafset_bitmask = self.taxon_namespace.all_taxa_bitmask()
+        self._write_split_bitmasks(
+                split_bitmasks=split_bitmasks,
+                edge_lengths=edge_lengths,
+                leafset_bitmask=leafset_bitmask,
+                is_rooted=is_rooted,
+                weight=weight)
+        self._tree_written()
+
+    def write_tree_array(self, tree_array):
+        """
+        Writes out the trees stored in ``tree_array`` (a |TreeArray|) directly
+        from their split bitmasks and edge lengths, without the trees being
+        restored as |Tree| objects.
+        """
+        self._set_taxon_namespace(tree_array)
+        edge_lengths = tree_array._tree_edge_lengths
+        if tree_array.ignore_edge_lengths or len(edge_lengths) != len(tree_array._tree_split_bitmasks):
+            edge_lengths = [None] * len(tree_array._tree_split_bitmasks)
+        for split_bitmasks, tree_edge_lengths, leafset_bitmask, weight in zip(
+                tree_array._tree_split_bitmasks,
+                edge_lengths,
+                tree_array._tree_leafset_bitmasks,
+                tree_array._tree_weights):
+            self.write_split_bitmasks(
+                    split_bitmasks=split_bitmasks,
+                    edge_lengths=tree_edge_lengths,
+                    leafset_bitmask=leafset_bitmask,
+                    is_rooted=tree_array.is_rooted_trees,
+                    weight=weight)
+
+    def close(self):
+        """
+        Completes the data written to the stream. The stream itself is not
+        closed.
+        """
+        pass
+
+    def flush(self):
+        """
+        Flushes the stream.
+        """
+        self.stream.flush()
+
+    def taxon_for_bit(self, bit):
+        """
+        Returns the |Taxon| of the taxon namespace of the writer corresponding
+        to the (single-bit) bitmask ``bit``.
+        """
+        try:
+            return self._bit_taxon_map[bit]
+        except (TypeError, KeyError):
+            # taxa may have been added to the namespace since the map was
+            # built
+            self._bit_taxon_map = dict((self.taxon_namespace.taxon_bitmask(taxon), taxon)
+                    for taxon in self.taxon_namespace)
+            try:
+                return self._bit_taxon_map[bit]
+            except KeyError:
+                raise ValueError("Split bitmask references taxon not in taxon namespace: {}".format(bit))
+
+    def _set_taxon_namespace(self, item):
+        if self.taxon_namespace is None:
+            self.taxon_namespace = item.taxon_namespace
+        elif item.taxon_namespace is not self.taxon_namespace:
+            raise error.TaxonNamespaceIdentityError(self, item)
+
+    def _tree_written(self):
+        self.num_trees_written += 1
+        if self.flush_interval and self.num_trees_written % self.flush_interval == 0:
+            self.flush()
+
+    def _write_tree(self, tree):
+        """
+        Deriving classes should implement this method to write out ``tree``
+        in schema-specific formatting.
+        """
+        raise NotImplementedError
+
+    def _write_split_bitmasks(self,
+            split_bitmasks,
+            edge_lengths,
+            leafset_bitmask,
+            is_rooted,
+            weight):
+        """
+        Deriving classes should implement this method to write out the tree
+        given by ``split_bitmasks`` in schema-specific formatting.
+        """
+        raise NotImplementedError
@@ -21,6 +21,7 @@ Parsing of NEWICK-format tree from a stream.
 """
 
 import re
+import collections
 import warnings
 try:
     from StringIO import StringIO # Python 2 legacy support: StringIO in this module is the one needed (not io)
@@ -32,6 +33,92 @@ from dendropy.dataio import tokenizer
 from dendropy.dataio import nexusprocessing
 from dendropy.dataio import ioservice
 
+# Tokens of a tree statement without comments: punctuation, quoted labels, and
+# unquoted labels or edge lengths (quote characters in the last are invalid)
+_PLAIN_TREE_STATEMENT_TOKEN_PATTERN = re.compile(r"[(),:]|'[^']*'(?![^\s(),:])|[^\s(),:]+")
+# Characters that require a tree statement to be processed by the full parser
+_NON_PLAIN_TREE_STATEMENT_PATTERN = re.compile(r"[\[\]{}=\\\"]")
+
+# The structure of a tree as stored by |TreeArray|: the split bitmasks and
+# edge lengths of its bipartitions (in post-order), the leafset bitmask of the
+# tree, its rooting state, and its weight
+SplitBitmaskEncoding = collections.namedtuple("SplitBitmaskEncoding", [
+    "split_bitmasks",
+    "edge_lengths",
+    "leafset_bitmask",
+    "is_rooted",
+    "weight",
+    ])
+
+def calc_split_bitmask_encoding(child_nodes, edge_lengths, leafset_bitmasks, is_rooted):
+    """
+    Calculates the split bitmasks, edge lengths and leafset bitmask of a tree
+    given as lists indexed by node (with the seed node at index 0): the
+    indexes of the child nodes of each node, the length of the edge of each
+    node, and the leafset bitmask of each leaf node (0 for other nodes). The
+    results are as given by :meth:`Tree.encode_bipartitions()` (i.e., with
+    unifurcations suppressed and the basal bifurcation of an unrooted tree
+    collapsed), with the bipartitions in post-order. The lists are modified in
+    the process. Returns |None| if the tree has no leaves with taxa.
+    """
+    seed_child_nodes = child_nodes[0]
+    if not is_rooted and len(seed_child_nodes) == 2:
+        # as :meth:`Tree.collapse_basal_bifurcation()`
+        if len(child_nodes[seed_child_nodes[1]]) >= 2:
+            to_keep, to_del = seed_child_nodes
+        elif len(child_nodes[seed_child_nodes[0]]) >= 2:
+            to_del, to_keep = seed_child_nodes
+        else:
+            to_del = None
+        if to_del is not None:
+            if edge_lengths[to_keep] is not None and edge_lengths[to_del] is not None:
+                edge_lengths[to_keep] += edge_lengths[to_del]
+            pos = seed_child_nodes.index(to_del)
+            seed_child_nodes[pos:pos+1] = child_nodes[to_del]
+    # Post-order traversal; as with :meth:`Tree.encode_bipartitions()`,
+    # the edge of a node with a single child is merged with the edge of
+    # its child (or whatever has replaced its child).
+    split_nodes = []
+    replaced_nodes = {}
+    stack = [(0, False)]
+    while stack:
+        node, is_children_visited = stack.pop()
+        children = child_nodes[node]
+        if not is_children_visited:
+            stack.append((node, True))
+            stack.extend([(ch, False) for ch in reversed(children)])
+        elif len(children) == 1:
+            child = replaced_nodes.get(children[0], children[0])
+            replaced_nodes[node] = child
+            leafset_bitmasks[node] = leafset_bitmasks[child]
+            if edge_lengths[node] is not None:
+                if edge_lengths[child] is None:
+                    edge_lengths[child] = edge_lengths[node]
+                else:
+                    edge_lengths[child] += edge_lengths[node]
+        else:
+            if children:
+                leafset_bitmask = 0
+                for child in children:
+                    leafset_bitmask |= leafset_bitmasks[child]
+                leafset_bitmasks[node] = leafset_bitmask
+            split_nodes.append(node)
+    tree_leafset_bitmask = leafset_bitmasks[0]
+    if not tree_leafset_bitmask:
+        return None
+    if is_rooted:
+        split_bitmasks = [leafset_bitmasks[nd] for nd in split_nodes]
+    else:
+        lowest_relevant_bit = tree_leafset_bitmask & -tree_leafset_bitmask
+        split_bitmasks = []
+        for nd in split_nodes:
+            leafset_bitmask = leafset_bitmasks[nd]
+            if leafset_bitmask & lowest_relevant_bit:
+                split_bitmasks.append((~leafset_bitmask) & tree_leafset_bitmask)
+            else:
+                split_bitmasks.append(leafset_bitmask)
+    return split_bitmasks, [edge_lengths[nd] for nd in split_nodes], tree_leafset_bitmask
+
 ##############################################################################
 ## NewickReader
 
@@ -155,6 +242,26 @@ class NewickReader(ioservice.DataReader):
             value'). If |False|, then the comments will not be parsed,
             but will be instead stored directly as elements of the ``comments``
             list attribute of the associated object.
+        defer_comment_metadata : boolean, default: |False|
+            If |True|, and ``extract_comment_metadata`` is |True|, then the
+            metadata comments of trees and nodes are stored unparsed, and
+            only parsed into annotations when the ``annotations`` (or
+            ``has_annotations``) attribute of the corresponding object is
+            first accessed. This saves the time and memory needed to build
+            |Annotation| objects for large metadata comments (e.g., as
+            written by BEAST or MrBayes) that are not used.
+        comment_metadata_attributes : list or dict, default: |None|
+            If given, then the values of the listed fields of the metadata
+            comments of nodes are set as attributes of the nodes (e.g.,
+            with ``comment_metadata_attributes=["height", "rate"]``, the
+            value of "height" in the comment "[&height=1.2,rate=0.5]" will be
+            available as ``node.height``). If a dictionary is given, then the
+            keys should be the field names and the values the types of the
+            field values (e.g., ``{"height": float, "rate": float}``); values
+            are otherwise stored as strings. This is independent of
+            ``extract_comment_metadata``: with
+            ``extract_comment_metadata=False``, the listed fields are
+            extracted without any |Annotation| objects being built.
         store_tree_weights : boolean, default: |False|
             If |True|, process the tree weight (e.g. "[&W 1/2]") comment
             associated with each tree, if any. Defaults to |False|.
@@ -184,6 +291,12 @@ class NewickReader(ioservice.DataReader):
         terminating_semicolon_required : boolean, default: |True|
             If |True| [default], then a tree statement that does not end in a
             semi-colon is an error. If |False|, then no error will be raised.
+        fast_tree_parsing : boolean, default: |True|
+            If |True| [default], tree statements that do not have any comments
+            or blank nodes are built directly from the statement text in a
+            single scan, falling back to the full token-by-token parser for
+            any other statements. If |False|, all tree statements are
+            processed by the full parser.
         ignore_unrecognized_keyword_arguments : boolean, default: |False|
             If |True|, then unsupported or unrecognized keyword arguments will
             not result in an error. Default is |False|: unsupported keyword
@@ -248,6 +361,11 @@ class NewickReader(ioservice.DataReader):
         self.edge_length_type = kwargs.pop("edge_length_type", float)
         self.suppress_edge_lengths = kwargs.pop("suppress_edge_lengths", False)
         self.extract_comment_metadata = kwargs.pop('extract_comment_metadata', True)
+        self.defer_comment_metadata = kwargs.pop('defer_comment_metadata', False)
+        self.comment_metadata_attributes = kwargs.pop('comment_metadata_attributes', None)
+        if (self.comment_metadata_attributes is not None
+                and not isinstance(self.comment_metadata_attributes, dict)):
+            self.comment_metadata_attributes = dict.fromkeys(self.comment_metadata_attributes)
         self.store_tree_weights = kwargs.pop("store_tree_weights", False)
         self.default_tree_weight = kwargs.pop("default_tree_weight", self.__class__._default_tree_weight)
         self.finish_node_fn = kwargs.pop("finish_node_fn", None)
@@ -257,6 +375,7 @@ class NewickReader(ioservice.DataReader):
         self.suppress_leaf_node_taxa = kwargs.pop("suppress_external_node_taxa", False) # legacy (will be deprecated)
         self.suppress_leaf_node_taxa = kwargs.pop("suppress_leaf_node_taxa", self.suppress_leaf_node_taxa)
         self.terminating_semicolon_required = kwargs.pop("terminating_semicolon_required", True)
+        self.fast_tree_parsing = kwargs.pop("fast_tree_parsing", True)
         self.check_for_unused_keyword_arguments(kwargs)
 
         # per-tree book-keeping
@@ -339,7 +458,8 @@ class NewickReader(ioservice.DataReader):
     def _parse_tree_statement(self,
             nexus_tokenizer,
             tree_factory,
-            taxon_symbol_map_fn):
+            taxon_symbol_map_fn,
+            taxon_bitmask_fn=None):
         """
         Parses a single tree statement from a token stream and constructs a
         corresponding Tree object. Expects that the first non-comment and
@@ -347,6 +467,11 @@ class NewickReader(ioservice.DataReader):
         the parenthesis that opens the tree statement. When complete, the
         current token will be the token immediately following the semi-colon,
         if any.
+
+        If ``taxon_bitmask_fn``, a function that returns the leafset bitmask
+        of a |Taxon| object, is given, then tree statements that can be
+        handled by :meth:`_encode_plain_tree_statement()` are not built into
+        trees: instead, a |SplitBitmaskEncoding| of the tree is returned.
         """
         current_token = nexus_tokenizer.current_token
         tree_comments = nexus_tokenizer.pull_captured_comments()
@@ -365,47 +490,430 @@ class NewickReader(ioservice.DataReader):
             #         stream=nexus_tokenizer.src)
         else:
             self._parenthesis_nesting_level = 1
+        if (taxon_bitmask_fn is not None
+                and self.fast_tree_parsing
+                and self.finish_node_fn is None
+                and current_token == "("
+                and not nexus_tokenizer.is_token_quoted):
+            statement = nexus_tokenizer.peek_raw_statement(";")
+            if statement is not None:
+                is_rooted, weight, other_comments = self._parse_tree_rooting_and_weight_comments(tree_comments, nexus_tokenizer)
+                encoding = self._encode_plain_tree_statement(
+                        statement=statement,
+                        is_rooted=is_rooted,
+                        taxon_symbol_map_fn=taxon_symbol_map_fn,
+                        taxon_bitmask_fn=taxon_bitmask_fn)
+                if encoding is not None:
+                    nexus_tokenizer.skip_raw_statement(statement)
+                    nexus_tokenizer.next_token()
+                    self._parenthesis_nesting_level = None
+                    self._skip_to_next_tree_statement(nexus_tokenizer)
+                    split_bitmasks, edge_lengths, leafset_bitmask = encoding
+                    return SplitBitmaskEncoding(
+                            split_bitmasks=split_bitmasks,
+                            edge_lengths=edge_lengths,
+                            leafset_bitmask=leafset_bitmask,
+                            is_rooted=is_rooted,
+                            weight=weight)
         tree = tree_factory()
         self._process_tree_comments(tree, tree_comments, nexus_tokenizer)
-        self._tree_statement_complete = False
-        self._seen_taxa = set()
-        self._parse_tree_node_description(
-                nexus_tokenizer=nexus_tokenizer,
+        if (self.fast_tree_parsing
+                and current_token == "("
+                and not nexus_tokenizer.is_token_quoted):
+            statement = nexus_tokenizer.peek_raw_statement(";")
+        else:
+            statement = None
+        if statement is not None and self._parse_plain_tree_statement(
                 tree=tree,
-                current_node=tree.seed_node,
-                taxon_symbol_map_fn=taxon_symbol_map_fn,
-                is_internal_node=None)
-        current_token = nexus_tokenizer.current_token
-        if not self._tree_statement_complete:
-            raise NewickReader.NewickReaderIncompleteTreeStatementError(
-                    message="Incomplete or improperly-terminated tree statement (last character read was '{}' instead of a semi-colon ';')".format(nexus_tokenizer.current_token),
-                    line_num=nexus_tokenizer.token_line_num,
-                    col_num=nexus_tokenizer.token_column_num,
-                    stream=nexus_tokenizer.src)
+                statement=statement,
+                taxon_symbol_map_fn=taxon_symbol_map_fn):
+            nexus_tokenizer.skip_raw_statement(statement)
+            nexus_tokenizer.next_token()
+        else:
+            self._tree_statement_complete = False
+            self._seen_taxa = set()
+            self._parse_tree_node_description(
+                    nexus_tokenizer=nexus_tokenizer,
+                    tree=tree,
+                    current_node=tree.seed_node,
+                    taxon_symbol_map_fn=taxon_symbol_map_fn,
+                    is_internal_node=None)
+            if not self._tree_statement_complete:
+                raise NewickReader.NewickReaderIncompleteTreeStatementError(
+                        message="Incomplete or improperly-terminated tree statement (last character read was '{}' instead of a semi-colon ';')".format(nexus_tokenizer.current_token),
+                        line_num=nexus_tokenizer.token_line_num,
+                        col_num=nexus_tokenizer.token_column_num,
+                        stream=nexus_tokenizer.src)
         self._seen_taxa = None
         self._parenthesis_nesting_level = None
         self._tree_statement_complete = None
+        self._skip_to_next_tree_statement(nexus_tokenizer)
+        return tree
+
+    def _skip_tree_statement(self, nexus_tokenizer, taxon_symbol_map_fn=None):
+        """
+        Skips over a single tree statement in a token stream without
+        constructing a tree, scanning the statement only for its terminating
+        semi-colon (quoted tokens and comments are respected). Expectations
+        are as for :meth:`_parse_tree_statement()`. Returns |False| if there
+        was no tree statement to skip.
+
+        If ``taxon_symbol_map_fn`` is given, then the labels of the statement
+        are scanned as well, and the operational taxonomic units that they
+        refer to are resolved (and so added to the taxon namespace, if
+        needed) in the same order as they would be if the tree were built.
+        """
+        current_token = nexus_tokenizer.current_token
+        nexus_tokenizer.clear_captured_comments()
+        while (current_token == ";" or current_token is None) and not nexus_tokenizer.is_eof():
+            current_token = nexus_tokenizer.require_next_token()
+            nexus_tokenizer.clear_captured_comments()
+        if nexus_tokenizer.is_eof():
+            return False
+        if taxon_symbol_map_fn is not None:
+            self._skip_tree_statement_resolving_taxa(nexus_tokenizer, taxon_symbol_map_fn)
+            return True
+        if not nexus_tokenizer.skip_statement(";"):
+            raise NewickReader.NewickReaderIncompleteTreeStatementError(
+                    message="Incomplete or improperly-terminated tree statement (end of stream reached instead of a semi-colon ';')",
+                    line_num=nexus_tokenizer.current_line_num,
+                    col_num=nexus_tokenizer.current_column_num,
+                    stream=nexus_tokenizer.src)
+        nexus_tokenizer.next_token()
+        self._skip_to_next_tree_statement(nexus_tokenizer)
+        return True
+
+    def _skip_tree_statement_resolving_taxa(self, nexus_tokenizer, taxon_symbol_map_fn):
+        """
+        Skips over the tree statement starting at the current token, as for
+        :meth:`_skip_tree_statement()`, passing the labels of nodes that are
+        to be interpreted as operational taxonomic units to
+        ``taxon_symbol_map_fn``.
+        """
+        if (self.fast_tree_parsing
+                and nexus_tokenizer.current_token == "("
+                and not nexus_tokenizer.is_token_quoted):
+            statement = nexus_tokenizer.peek_raw_statement(";")
+            if statement is not None and self._resolve_plain_tree_statement_taxa(
+                    statement=statement,
+                    taxon_symbol_map_fn=taxon_symbol_map_fn):
+                nexus_tokenizer.skip_raw_statement(statement)
+                nexus_tokenizer.next_token()
+                self._skip_to_next_tree_statement(nexus_tokenizer)
+                return
+        # As with the full parser, a label is that of an internal node if it
+        # follows a closing parenthesis, and a token following a colon is an
+        # edge length.
+        previous_token = None
+        current_token = nexus_tokenizer.current_token
+        while True:
+            if nexus_tokenizer.is_token_quoted or current_token not in ("(", ")", ",", ":", ";"):
+                if previous_token != ":":
+                    is_internal_node = previous_token == ")"
+                    if not ( (is_internal_node and self.suppress_internal_node_taxa)
+                            or ((not is_internal_node) and self.suppress_leaf_node_taxa) ):
+                        taxon_symbol_map_fn(current_token)
+                previous_token = None
+            elif current_token == ";":
+                break
+            else:
+                previous_token = current_token
+            nexus_tokenizer.clear_captured_comments()
+            current_token = nexus_tokenizer.next_token()
+            if current_token is None:
+                raise NewickReader.NewickReaderIncompleteTreeStatementError(
+                        message="Incomplete or improperly-terminated tree statement (end of stream reached instead of a semi-colon ';')",
+                        line_num=nexus_tokenizer.current_line_num,
+                        col_num=nexus_tokenizer.current_column_num,
+                        stream=nexus_tokenizer.src)
+        nexus_tokenizer.next_token()
+        self._skip_to_next_tree_statement(nexus_tokenizer)
+
+    def _resolve_plain_tree_statement_taxa(self,
+            statement,
+            taxon_symbol_map_fn):
+        """
+        Passes the labels of nodes of the tree described by ``statement`` (as
+        for :meth:`_parse_plain_tree_statement()`) that are to be interpreted
+        as operational taxonomic units to ``taxon_symbol_map_fn``. Returns
+        |False| if the statement cannot be handled without tokenizing it.
+        """
+        if _NON_PLAIN_TREE_STATEMENT_PATTERN.search(statement):
+            return False
+        seen_taxa = set()
+        previous_token = "("
+        for token in _PLAIN_TREE_STATEMENT_TOKEN_PATTERN.findall(statement):
+            if token not in ("(", ")", ",", ":") and previous_token != ":":
+                if self._resolve_plain_node_label(
+                        token,
+                        previous_token == ")",
+                        taxon_symbol_map_fn,
+                        seen_taxa) is None:
+                    return False
+            previous_token = token
+        return True
+
+    def _skip_to_next_tree_statement(self, nexus_tokenizer):
+        """
+        Skips over any (empty) statements following the end of a tree
+        statement, such that the current token is the first token of the next
+        tree statement, if any.
+        """
+        current_token = nexus_tokenizer.current_token
         while current_token == ";" and not nexus_tokenizer.is_eof():
             nexus_tokenizer.clear_captured_comments()
             current_token = nexus_tokenizer.next_token()
-        return tree
+
+    def _parse_plain_tree_statement(self,
+            tree,
+            statement,
+            taxon_symbol_map_fn):
+        """
+        Builds the nodes of ``tree`` directly from ``statement``, the text of
+        a tree statement following the parenthesis that opens it and
+        preceding its terminating semi-colon. Only statements without
+        comments, blank nodes, or quoted labels requiring escapes are handled. Returns |True| if
+        the tree was successfully built. Otherwise, returns |False|, and the
+        seed node of ``tree`` is replaced by a new node so that the statement
+        can be processed by the full parser, which is also responsible for
+        reporting any errors.
+        """
+        if _NON_PLAIN_TREE_STATEMENT_PATTERN.search(statement):
+            return False
+        tokens = _PLAIN_TREE_STATEMENT_TOKEN_PATTERN.findall(statement)
+        num_tokens = len(tokens)
+        node_factory = tree.node_factory
+        seen_taxa = set()
+        finished_nodes = []
+        parent_node = tree.seed_node
+        ancestor_nodes = []
+        node = None
+        is_expecting_child = True
+        idx = 0
+        while idx < num_tokens:
+            token = tokens[idx]
+            idx += 1
+            if is_expecting_child:
+                if token == "(":
+                    node = node_factory()
+                    parent_node.add_child(node)
+                    ancestor_nodes.append(parent_node)
+                    parent_node = node
+                elif token == "," or token == ")" or token == ":":
+                    # blank node
+                    break
+                else:
+                    node = node_factory()
+                    parent_node.add_child(node)
+                    if not self._set_plain_node_label(node, token, False, taxon_symbol_map_fn, seen_taxa):
+                        break
+                    is_expecting_child = False
+            elif token == ":":
+                if idx >= num_tokens:
+                    break
+                if not self.suppress_edge_lengths:
+                    try:
+                        node.edge.length = self.edge_length_type(tokens[idx])
+                    except ValueError:
+                        break
+                idx += 1
+            elif token == "," and parent_node is not None:
+                finished_nodes.append(node)
+                is_expecting_child = True
+            elif token == ")" and parent_node is not None:
+                finished_nodes.append(node)
+                node = parent_node
+                if ancestor_nodes:
+                    parent_node = ancestor_nodes.pop()
+                else:
+                    parent_node = None
+                if idx < num_tokens and tokens[idx] not in ("(", ")", ",", ":"):
+                    if not self._set_plain_node_label(node, tokens[idx], True, taxon_symbol_map_fn, seen_taxa):
+                        break
+                    idx += 1
+            else:
+                break
+        else:
+            if parent_node is None and not is_expecting_child:
+                finished_nodes.append(node)
+                if self.finish_node_fn is not None:
+                    for nd in finished_nodes:
+                        self.finish_node_fn(nd)
+                return True
+        tree.seed_node = node_factory()
+        return False
+
+    def _set_plain_node_label(self,
+            node,
+            label,
+            is_internal_node,
+            taxon_symbol_map_fn,
+            seen_taxa):
+        resolved_label = self._resolve_plain_node_label(
+                label,
+                is_internal_node,
+                taxon_symbol_map_fn,
+                seen_taxa)
+        if resolved_label is None:
+            return False
+        node_label, node_taxon = resolved_label
+        if node_label is not None:
+            node.label = node_label
+        else:
+            node.taxon = node_taxon
+        return True
+
+    def _resolve_plain_node_label(self,
+            label,
+            is_internal_node,
+            taxon_symbol_map_fn,
+            seen_taxa):
+        """
+        Returns a tuple of the node label and (if the label is to be
+        interpreted as an operational taxonomic unit concept instead) the
+        |Taxon| object given by the label token ``label`` of a plain tree
+        statement, or |None| if the label cannot be handled without
+        tokenizing the statement.
+        """
+        if label[0] == "'":
+            if len(label) < 3 or label[-1] != "'":
+                return None
+            label = label[1:-1]
+            if ("'" in label
+                    or label in ("(", ")", ",", ":", ";")):
+                return None
+        elif "'" in label:
+            return None
+        elif not self.preserve_unquoted_underscores:
+            label = label.replace("_", " ")
+        if ( (is_internal_node and self.suppress_internal_node_taxa)
+                or ((not is_internal_node) and self.suppress_leaf_node_taxa) ):
+            return label, None
+        node_taxon = taxon_symbol_map_fn(label)
+        if node_taxon in seen_taxa:
+            return None
+        seen_taxa.add(node_taxon)
+        return None, node_taxon
+
+    def _encode_plain_tree_statement(self,
+            statement,
+            is_rooted,
+            taxon_symbol_map_fn,
+            taxon_bitmask_fn):
+        """
+        Calculates the split bitmasks, edge lengths and leafset bitmask of the
+        tree described by ``statement`` (as for
+        :meth:`_parse_plain_tree_statement()`) directly from the statement,
+        without constructing any nodes, edges or bipartitions. The results are
+        as given by :meth:`Tree.encode_bipartitions()` (i.e., with
+        unifurcations suppressed and the basal bifurcation of an unrooted
+        tree collapsed), with the bipartitions in post-order. Returns |None|
+        if the statement cannot be handled, in which case it should be
+        processed by the full parser.
+        """
+        if _NON_PLAIN_TREE_STATEMENT_PATTERN.search(statement):
+            return None
+        tokens = _PLAIN_TREE_STATEMENT_TOKEN_PATTERN.findall(statement)
+        num_tokens = len(tokens)
+        # Nodes are represented by their indexes in the following lists,
+        # with the seed node at index 0.
+        child_nodes = [[]]
+        edge_lengths = [None]
+        leafset_bitmasks = [0]
+        seen_taxa = set()
+        parent_node = 0
+        ancestor_nodes = []
+        node = None
+        is_expecting_child = True
+        idx = 0
+        while idx < num_tokens:
+            token = tokens[idx]
+            idx += 1
+            if is_expecting_child:
+                if token == "," or token == ")" or token == ":":
+                    # blank node
+                    return None
+                node = len(child_nodes)
+                child_nodes.append([])
+                edge_lengths.append(None)
+                leafset_bitmasks.append(0)
+                child_nodes[parent_node].append(node)
+                if token == "(":
+                    ancestor_nodes.append(parent_node)
+                    parent_node = node
+                else:
+                    resolved_label = self._resolve_plain_node_label(token, False, taxon_symbol_map_fn, seen_taxa)
+                    if resolved_label is None:
+                        return None
+                    if resolved_label[1] is not None:
+                        leafset_bitmasks[node] = taxon_bitmask_fn(resolved_label[1])
+                    is_expecting_child = False
+            elif token == ":":
+                if idx >= num_tokens:
+                    return None
+                if not self.suppress_edge_lengths:
+                    try:
+                        edge_lengths[node] = self.edge_length_type(tokens[idx])
+                    except ValueError:
+                        return None
+                idx += 1
+            elif token == "," and parent_node is not None:
+                is_expecting_child = True
+            elif token == ")" and parent_node is not None:
+                node = parent_node
+                if ancestor_nodes:
+                    parent_node = ancestor_nodes.pop()
+                else:
+                    parent_node = None
+                if idx < num_tokens and tokens[idx] not in ("(", ")", ",", ":"):
+                    if self._resolve_plain_node_label(tokens[idx], True, taxon_symbol_map_fn, seen_taxa) is None:
+                        return None
+                    idx += 1
+            else:
+                return None
+        if parent_node is not None or is_expecting_child:
+            return None
+        return calc_split_bitmask_encoding(
+                child_nodes=child_nodes,
+                edge_lengths=edge_lengths,
+                leafset_bitmasks=leafset_bitmasks,
+                is_rooted=is_rooted)
 
     def _process_tree_comments(self, tree, tree_comments, nexus_tokenizer):
         # NOTE: this also unconditionally sets the tree rootedness and
         # weighting if no comment indicating these are found; for this to work
         # in the current implementation, this method must be called once and
         # exactly once per tree.
+        is_rooted, weight, other_comments = self._parse_tree_rooting_and_weight_comments(
+                tree_comments,
+                nexus_tokenizer)
+        tree.is_rooted = is_rooted
+        if self.store_tree_weights:
+            tree.weight = weight
+        nexusprocessing.process_comments_for_item(item=tree,
+                item_comments=other_comments,
+                extract_comment_metadata=self.extract_comment_metadata,
+                defer_comment_metadata=self.defer_comment_metadata)
+
+    def _parse_tree_rooting_and_weight_comments(self, tree_comments, nexus_tokenizer):
+        """
+        Returns the rooting state and weight (|None| unless tree weights are
+        to be stored) of a tree given its comments, and a list of the
+        comments not specifying these.
+        """
+        is_rooted = None
+        if self.store_tree_weights:
+            weight = self.default_tree_weight
+        else:
+            weight = None
+        other_comments = []
         if not tree_comments:
-            tree.is_rooted = self._parse_tree_rooting_state("")
-            if self.store_tree_weights:
-                tree.weight = self.default_tree_weight
-            return
+            return self._parse_tree_rooting_state(""), weight, other_comments
         rooting_token_found = False
-        weighting_token_found = False
         for comment in tree_comments:
             stripped_comment = comment.strip()
             if stripped_comment in ["&u", "&U", "&r", "&R"]:
-                tree.is_rooted = self._parse_tree_rooting_state(stripped_comment)
+                is_rooted = self._parse_tree_rooting_state(stripped_comment)
                 rooting_token_found = True
             elif (self.store_tree_weights
                     and (stripped_comment.startswith("&W ") or stripped_comment.startswith("&w "))
@@ -425,10 +933,9 @@ class NewickReader(ioservice.DataReader):
                     elif len(we_parts) == 2:
                         x = float(we_parts[0])
                         y = float(we_parts[1])
-                        tree.weight = x/y
+                        weight = x/y
                     else:
-                        tree.weight = float(we_parts[0])
-                    weighting_token_found = True
+                        weight = float(we_parts[0])
                 except ValueError:
                     exc = NewickReader.NewickReaderInvalidValueError(
                             message="Invalid tree weight expression: '{}'".format(stripped_comment),
@@ -438,19 +945,11 @@ class NewickReader(ioservice.DataReader):
                     exc.__context__ = None # Python 3.0, 3.1, 3.2
                     exc.__cause__ = None # Python 3.3, 3.4
                     raise exc
-            elif self.extract_comment_metadata and comment.startswith("&"):
-                annotations = nexusprocessing.parse_comment_metadata_to_annotations(
-                    comment=comment)
-                if annotations:
-                    tree.annotations.update(annotations)
-                else:
-                    tree.comments.append(comment)
             else:
-                tree.comments.append(comment)
+                other_comments.append(comment)
         if not rooting_token_found:
-            tree.is_rooted = self._parse_tree_rooting_state("")
-        if self.store_tree_weights and not weighting_token_found:
-            tree.weight = self.default_tree_weight
+            is_rooted = self._parse_tree_rooting_state("")
+        return is_rooted, weight, other_comments
 
     def _parse_tree_rooting_state(self, rooting_comment=None):
         """
@@ -485,18 +984,40 @@ class NewickReader(ioservice.DataReader):
         Assuming that the iterator is currently sitting on a parenthesis that
         opens a node with children or the label of a leaf node, this will
         populate the node ``node`` appropriately (label, edge length, comments,
-        metadata etc.) and recursively parse and add the node's
-        children. When complete, the token will be the token immediately
-        following the end of the node or tree statement if this is the root
-        node, i.e. the token *following* the closing parenthesis of the node or
-        the semi-colon terminating a tree statement.
-        """
-        current_node_comments = nexus_tokenizer.pull_captured_comments()
-        if nexus_tokenizer.current_token == "(":
-            # self._parenthesis_nesting_level += 1 # handled by calling code
-            nexus_tokenizer.require_next_token()
-            node_created = False
+        metadata etc.) and parse and add the node's children. When complete,
+        the token will be the token immediately following the end of the node
+        or tree statement if this is the root node, i.e. the token *following*
+        the closing parenthesis of the node or the semi-colon terminating a
+        tree statement.
+
+        Nodes are processed using an explicit stack rather than by recursion,
+        so the depth of trees that can be parsed is limited only by the
+        available memory.
+        """
+        # Nodes whose child nodes are currently being parsed, from the
+        # outermost to the innermost, together with their ``is_internal_node``
+        # status and any comments preceding their child nodes
+        open_nodes = []
+        while True:
+            current_node_comments = nexus_tokenizer.pull_captured_comments()
+            if nexus_tokenizer.current_token == "(":
+                # self._parenthesis_nesting_level += 1 # handled by calling code
+                nexus_tokenizer.require_next_token()
+                open_nodes.append((current_node, is_internal_node, current_node_comments))
+                node_created = False
+            else:
+                self._parse_node_description_tail(
+                        nexus_tokenizer=nexus_tokenizer,
+                        current_node=current_node,
+                        current_node_comments=current_node_comments,
+                        taxon_symbol_map_fn=taxon_symbol_map_fn,
+                        is_internal_node=is_internal_node)
+                if not open_nodes:
+                    return current_node
+                open_nodes[-1][0].add_child(current_node)
+                node_created = True
             while True:
+                parent_node = open_nodes[-1][0]
                 if nexus_tokenizer.current_token == ",":
                     if not node_created: #184
                         # no node has been created yet: ',' designates a
@@ -504,9 +1025,11 @@ class NewickReader(ioservice.DataReader):
                         new_node = tree.node_factory()
                         nexusprocessing.process_comments_for_item(item=new_node,
                                 item_comments=nexus_tokenizer.pull_captured_comments(),
-                                extract_comment_metadata=self.extract_comment_metadata)
+                                extract_comment_metadata=self.extract_comment_metadata,
+                                defer_comment_metadata=self.defer_comment_metadata,
+                                comment_metadata_attributes=self.comment_metadata_attributes)
                         self._finish_node(new_node)
-                        current_node.add_child(new_node)
+                        parent_node.add_child(new_node)
                         ## node_created = True # do not flag node as created to allow for an extra node to be created in the event of (..,)
                     nexus_tokenizer.require_next_token()
                     while nexus_tokenizer.current_token == ",": #192
@@ -514,9 +1037,11 @@ class NewickReader(ioservice.DataReader):
                         new_node = tree.node_factory()
                         nexusprocessing.process_comments_for_item(item=new_node,
                                 item_comments=nexus_tokenizer.pull_captured_comments(),
-                                extract_comment_metadata=self.extract_comment_metadata)
+                                extract_comment_metadata=self.extract_comment_metadata,
+                                defer_comment_metadata=self.defer_comment_metadata,
+                                comment_metadata_attributes=self.comment_metadata_attributes)
                         self._finish_node(new_node)
-                        current_node.add_child(new_node)
+                        parent_node.add_child(new_node)
                         # node_created = True; # do not flag node as created: extra node needed in the event of (..,)
                         nexus_tokenizer.require_next_token()
                     if not node_created and nexus_tokenizer.current_token == ")": #200
@@ -524,36 +1049,57 @@ class NewickReader(ioservice.DataReader):
                         new_node = tree.node_factory();
                         nexusprocessing.process_comments_for_item(item=new_node,
                                 item_comments=nexus_tokenizer.pull_captured_comments(),
-                                extract_comment_metadata=self.extract_comment_metadata)
+                                extract_comment_metadata=self.extract_comment_metadata,
+                                defer_comment_metadata=self.defer_comment_metadata,
+                                comment_metadata_attributes=self.comment_metadata_attributes)
                         self._finish_node(new_node)
-                        current_node.add_child(new_node)
+                        parent_node.add_child(new_node)
                         node_created = True;
                 elif nexus_tokenizer.current_token == ")": #206
                     # end of child nodes
                     self._parenthesis_nesting_level -= 1
                     nexus_tokenizer.require_next_token()
-                    break
+                    current_node, is_internal_node, current_node_comments = open_nodes.pop()
+                    self._parse_node_description_tail(
+                            nexus_tokenizer=nexus_tokenizer,
+                            current_node=current_node,
+                            current_node_comments=current_node_comments,
+                            taxon_symbol_map_fn=taxon_symbol_map_fn,
+                            is_internal_node=is_internal_node)
+                    if not open_nodes:
+                        return current_node
+                    open_nodes[-1][0].add_child(current_node)
+                    node_created = True
                 else: #210
                     # assume child nodes: a leaf node (if a label) or
                     # internal (if a parenthesis)
                     if nexus_tokenizer.current_token == "(":
                         self._parenthesis_nesting_level += 1
-                        is_new_internal_node = True
+                        is_internal_node = True
                     else:
-                        is_new_internal_node = False
-                    new_node = tree.node_factory();
-                    nexusprocessing.process_comments_for_item(item=new_node,
+                        is_internal_node = False
+                    current_node = tree.node_factory();
+                    nexusprocessing.process_comments_for_item(item=current_node,
                             item_comments=nexus_tokenizer.pull_captured_comments(),
-                            extract_comment_metadata=self.extract_comment_metadata)
-                    self._parse_tree_node_description(
-                            nexus_tokenizer=nexus_tokenizer,
-                            tree=tree,
-                            current_node=new_node,
-                            taxon_symbol_map_fn=taxon_symbol_map_fn,
-                            is_internal_node=is_new_internal_node,
-                            )
-                    current_node.add_child(new_node);
-                    node_created = True;
+                            extract_comment_metadata=self.extract_comment_metadata,
+                            defer_comment_metadata=self.defer_comment_metadata,
+                            comment_metadata_attributes=self.comment_metadata_attributes)
+                    break
+
+    def _parse_node_description_tail(
+            self,
+            nexus_tokenizer,
+            current_node,
+            current_node_comments,
+            taxon_symbol_map_fn,
+            is_internal_node):
+        """
+        Populates ``current_node`` with the label, edge length, comments etc.
+        following its child nodes (if any), and finishes it. When complete,
+        the token will be the ',' or ')' following the node or, if this is the
+        end of the tree statement, the token *following* the semi-colon
+        terminating it.
+        """
         label_parsed = False
         self._tree_statement_complete = False
         if is_internal_node is None:
@@ -601,9 +1147,11 @@ class NewickReader(ioservice.DataReader):
                 # self._parenthesis_nesting_level -= 1 # handled by calling code
                 nexusprocessing.process_comments_for_item(item=current_node,
                         item_comments=current_node_comments,
-                        extract_comment_metadata=self.extract_comment_metadata)
+                        extract_comment_metadata=self.extract_comment_metadata,
+                        defer_comment_metadata=self.defer_comment_metadata,
+                        comment_metadata_attributes=self.comment_metadata_attributes)
                 self._finish_node(current_node)
-                return current_node
+                return
             elif nexus_tokenizer.current_token == ";": #256
                 # end of tree statement
                 self._tree_statement_complete = True
@@ -613,9 +1161,11 @@ class NewickReader(ioservice.DataReader):
                 # end of this node
                 nexusprocessing.process_comments_for_item(item=current_node,
                             item_comments=current_node_comments,
-                            extract_comment_metadata=self.extract_comment_metadata)
+                            extract_comment_metadata=self.extract_comment_metadata,
+                            defer_comment_metadata=self.defer_comment_metadata,
+                            comment_metadata_attributes=self.comment_metadata_attributes)
                 self._finish_node(current_node)
-                return current_node
+                return
             elif nexus_tokenizer.current_token == "(": #263
                 # start of another node or tree without finishing this
                 # node
@@ -667,9 +1217,10 @@ class NewickReader(ioservice.DataReader):
                     stream=nexus_tokenizer.src)
         nexusprocessing.process_comments_for_item(item=current_node,
                 item_comments=current_node_comments,
-                extract_comment_metadata=self.extract_comment_metadata)
+                extract_comment_metadata=self.extract_comment_metadata,
+                defer_comment_metadata=self.defer_comment_metadata,
+                comment_metadata_attributes=self.comment_metadata_attributes)
         self._finish_node(current_node)
-        return current_node
 
     def _finish_node(self, node):
         if self.finish_node_fn is not None:
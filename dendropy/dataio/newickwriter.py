@@ -27,6 +27,7 @@ try:
 except ImportError:
     from io import StringIO # Python 3
 from dendropy.utility import error
+from dendropy.utility import bitprocessing
 from dendropy.utility import textprocessing
 from dendropy.dataio import tokenizer
 from dendropy.dataio import nexusprocessing
@@ -199,6 +200,10 @@ class NewickWriter(ioservice.DataWriter):
         if self.edge_label_compose_fn is None:
             self.edge_label_compose_fn = self._format_edge_length
         self.check_for_unused_keyword_arguments(kwargs)
+        # Escaped taxon tokens, keyed by the (unescaped) token, so that the
+        # labels of the taxa of a namespace are escaped only once for all the
+        # trees written.
+        self._taxon_tree_tag_cache = {}
 
     def _get_taxon_tree_token(self, taxon):
         if self.taxon_token_map is None:
@@ -210,6 +215,24 @@ class NewickWriter(ioservice.DataWriter):
             self.taxon_token_map[taxon] = t
             return t
 
+    def _get_taxon_tree_tag(self, taxon):
+        """
+        Returns the token representing ``taxon`` in tree statements, escaped
+        as needed.
+        """
+        token = self._get_taxon_tree_token(taxon)
+        try:
+            return self._taxon_tree_tag_cache[token]
+        except KeyError:
+            if token:
+                tag = nexusprocessing.escape_nexus_token(token,
+                        preserve_spaces=self.preserve_spaces,
+                        quote_underscores=not self.unquoted_underscores)
+            else:
+                tag = ""
+            self._taxon_tree_tag_cache[token] = tag
+            return tag
+
     def _get_real_value_format_specifier(self):
         return self._real_value_format_specifier
     def _set_real_value_format_specifier(self, f):
@@ -291,43 +314,151 @@ class NewickWriter(ioservice.DataWriter):
                 annotation_comments,
                 tree_comments,
                 ))
-        tree.apply(
-                before_fn=lambda x: self._write_node_open(x, stream),
-                after_fn=lambda x: self._write_node_close(x, stream),
-                leaf_fn=lambda x: self._write_leaf(x, stream),
-                )
+        stream.write(self._compose_tree_body(tree))
         stream.write(";")
 
-    def _write_node_open(self, node, out):
-        if node._parent_node is None or node._parent_node._child_nodes[0] is node:
-            out.write("(")
+    def _compose_tree_body(self, tree):
+        """
+        Returns the NEWICK representation of the nodes of ``tree`` (i.e.,
+        without the rooting token, tree comments and terminating semi-colon),
+        composed in a single pass over the nodes.
+        """
+        parts = []
+        append = parts.append
+        if self.node_label_compose_fn is None:
+            compose_node_tag = self._compose_node_tag
         else:
-            out.write(",(")
-
-    def _write_leaf(self, node, out):
-        if not (node._parent_node is None or node._parent_node._child_nodes[0] is node):
-            out.write(",")
-        self._write_node_body(node, out)
+            compose_node_tag = lambda node, is_leaf: self._render_node_tag(node)
+        format_edge = None if self.suppress_edge_lengths else self.edge_label_compose_fn
+        write_annotations = not self.suppress_annotations
+        write_comments = not self.suppress_item_comments
+        # Explicit stack of (node, text preceding node), with the text given
+        # as |None| when the child nodes of the node have been written.
+        stack = [(tree.seed_node, "")]
+        while stack:
+            node, prefix = stack.pop()
+            if prefix is None:
+                append(")")
+                is_leaf = False
+            else:
+                append(prefix)
+                child_nodes = node._child_nodes
+                if child_nodes:
+                    append("(")
+                    stack.append((node, None))
+                    for idx in range(len(child_nodes)-1, 0, -1):
+                        stack.append((child_nodes[idx], ","))
+                    stack.append((child_nodes[0], ""))
+                    continue
+                is_leaf = True
+            append(compose_node_tag(node, is_leaf))
+            edge = node.edge
+            if format_edge is not None and edge.length is not None:
+                append(":{}".format(format_edge(edge)))
+            if write_annotations:
+                for item in (node, edge):
+                    if item.has_annotations:
+                        append(nexusprocessing.format_item_annotations_as_comments(item,
+                                nhx=self.annotations_as_nhx,
+                                real_value_format_specifier=self.real_value_format_specifier))
+            if write_comments:
+                for item in (node, edge):
+                    if item.has_comments:
+                        append(self._compose_comment_string(item))
+        return "".join(parts)
 
-    def _write_node_close(self, node, out):
-        out.write(")")
-        self._write_node_body(node, out)
+    def _compose_node_tag(self, node, is_leaf):
+        """
+        Returns the (escaped) token of ``node``, as given by
+        ``_render_node_tag()`` when ``node_label_compose_fn`` is not specified,
+        using cached tokens for taxa.
+        """
+        if is_leaf:
+            suppress_taxon_labels = self.suppress_leaf_taxon_labels
+            suppress_node_labels = self.suppress_leaf_node_labels
+        else:
+            suppress_taxon_labels = self.suppress_internal_taxon_labels
+            suppress_node_labels = self.suppress_internal_node_labels
+        taxon = node.taxon
+        has_taxon_label = (not suppress_taxon_labels
+                and taxon is not None
+                and taxon.label is not None)
+        has_node_label = not suppress_node_labels and node.label
+        if has_taxon_label and not has_node_label:
+            return self._get_taxon_tree_tag(taxon)
+        if has_taxon_label:
+            tag = self.node_label_element_separator.join(
+                    [self._get_taxon_tree_token(taxon), str(node.label)])
+        elif has_node_label:
+            tag = str(node.label)
+        else:
+            return ""
+        if not tag:
+            return ""
+        return nexusprocessing.escape_nexus_token(tag,
+                preserve_spaces=self.preserve_spaces,
+                quote_underscores=not self.unquoted_underscores)
 
-    def _write_node_body(self, node, out):
-        out.write(self._render_node_tag(node))
-        if node.edge and node.edge.length != None and not self.suppress_edge_lengths:
-            out.write(":{}".format(self.edge_label_compose_fn(node.edge)))
-        if not self.suppress_annotations:
-            node_annotation_comments = nexusprocessing.format_item_annotations_as_comments(node,
-                    nhx=self.annotations_as_nhx,
-                    real_value_format_specifier=self.real_value_format_specifier)
-            out.write(node_annotation_comments)
-            edge_annotation_comments = nexusprocessing.format_item_annotations_as_comments(node.edge,
-                    nhx=self.annotations_as_nhx,
-                    real_value_format_specifier=self.real_value_format_specifier)
-            out.write(edge_annotation_comments)
-        out.write(self._compose_comment_string(node))
-        out.write(self._compose_comment_string(node.edge))
+    def _write_split_bitmasks(self,
+            stream,
+            split_bitmasks,
+            edge_lengths,
+            leafset_bitmask,
+            is_rooted,
+            weight,
+            taxon_for_bit):
+        """
+        Composes and writes the tree given by ``split_bitmasks`` (and,
+        optionally, the corresponding ``edge_lengths``) to ``stream``, without
+        building a |Tree|. ``taxon_for_bit`` should be a function that takes
+        the bitmask of a single leaf and returns its |Taxon|. The children of
+        each node are written in the order of the lowest-indexed taxon that
+        they subtend.
+        """
+        if is_rooted is None or self.suppress_rooting:
+            rooting = ""
+        elif is_rooted:
+            rooting = "[&R] "
+        else:
+            rooting = "[&U] "
+        if self.store_tree_weights and weight is not None:
+            stream.write("{}[&W {}] ".format(rooting, weight))
+        else:
+            stream.write(rooting)
+        children, split_edge_lengths = _compose_split_bitmask_children(
+                split_bitmasks=split_bitmasks,
+                edge_lengths=edge_lengths,
+                leafset_bitmask=leafset_bitmask,
+                is_rooted=is_rooted)
+        if self.suppress_edge_lengths:
+            split_edge_lengths = {}
+        formatter = self._real_value_formatter
+        suppress_labels = self.suppress_leaf_taxon_labels
+        parts = ["("]
+        stack = [(leafset_bitmask, iter(children[leafset_bitmask]))]
+        while stack:
+            child = next(stack[-1][1], None)
+            if child is None:
+                parts.append(")")
+                node = stack.pop()[0]
+            else:
+                if parts[-1] != "(":
+                    parts.append(",")
+                if child in children:
+                    parts.append("(")
+                    stack.append((child, iter(children[child])))
+                    continue
+                node = child
+                if not suppress_labels:
+                    taxon = taxon_for_bit(child)
+                    if taxon.label is not None:
+                        parts.append(self._get_taxon_tree_tag(taxon))
+            length = split_edge_lengths.get(node, None)
+            if length is not None:
+                parts.append(":")
+                parts.append(formatter(length))
+        parts.append(";")
+        stream.write("".join(parts))
 
     def _compose_comment_string(self, item):
         if not self.suppress_item_comments and item.comments:
@@ -419,3 +550,118 @@ class NewickWriter(ioservice.DataWriter):
     #     node_comment_str = self._compose_comment_string(node)
     #     statement = statement + node_comment_str + edge_comment_str
     #     return statement
+
+def _compose_split_bitmask_children(split_bitmasks, edge_lengths, leafset_bitmask, is_rooted):
+    """
+    Returns a dictionary mapping the bitmask of each internal node of the
+    tree given by ``split_bitmasks`` (including the root, with the bitmask
+    ``leafset_bitmask``) to the bitmasks of its child nodes, in the order of
+    their lowest set bits, and a dictionary mapping node bitmasks to the
+    lengths of their subtending edges. The tree is written so that, unless it
+    is rooted, the leaf of the lowest set bit is a child of the root.
+    """
+    if edge_lengths is None:
+        edge_lengths = [None] * len(split_bitmasks)
+    lowest_leaf = leafset_bitmask & -leafset_bitmask
+    node_edge_lengths = {}
+    splits = []
+    for split_bitmask, edge_length in zip(split_bitmasks, edge_lengths):
+        m = split_bitmask & leafset_bitmask
+        if not is_rooted:
+            if (m & lowest_leaf) and m != lowest_leaf and m != leafset_bitmask:
+                m = (~m) & leafset_bitmask
+            elif m == leafset_bitmask ^ lowest_leaf:
+                # normalized split of the edge subtending the lowest leaf
+                m = lowest_leaf
+        if not m:
+            continue
+        if m in node_edge_lengths:
+            # the edges of a basal bifurcation of an unrooted tree are merged
+            if not is_rooted and edge_length is not None and node_edge_lengths[m] is not None:
+                node_edge_lengths[m] += edge_length
+            continue
+        node_edge_lengths[m] = edge_length
+        if (m & (m-1)) and m != leafset_bitmask:
+            splits.append(m)
+    splits.sort(key=bitprocessing.num_set_bits, reverse=True)
+    children = {leafset_bitmask: []}
+    remaining_leaves = leafset_bitmask
+    leaves = []
+    while remaining_leaves:
+        leaf = remaining_leaves & -remaining_leaves
+        leaves.append(leaf)
+        remaining_leaves ^= leaf
+    for node in splits + leaves:
+        parent = leafset_bitmask
+        descending = True
+        while descending:
+            descending = False
+            for child in children[parent]:
+                shared = child & node
+                if shared == node:
+                    parent = child
+                    descending = True
+                    break
+                elif shared:
+                    raise ValueError("Incompatible split bitmasks: {} and {}".format(child, node))
+        children[parent].append(node)
+        if node & (node-1):
+            children[node] = []
+    for child_nodes in children.values():
+        child_nodes.sort(key=lambda x: x & -x)
+    return children, node_edge_lengths
+
+##############################################################################
+## NewickTreeStreamWriter
+
+class NewickTreeStreamWriter(ioservice.TreeStreamWriter):
+    """
+    Writes trees in Newick format one at a time, one tree statement per line.
+    """
+
+    def __init__(self, stream, **kwargs):
+        """
+
+        Parameters
+        ----------
+        stream : file or file-like object
+            Destination for data.
+
+        Keyword Arguments
+        -----------------
+
+        taxon_namespace : |TaxonNamespace| instance
+            The operational taxonomic unit concept namespace of the trees to be
+            written. If not specified, then the taxon namespace of the first
+            tree written will be used.
+        flush_interval : int
+            If specified, then the stream is flushed after every
+            ``flush_interval`` trees.
+
+        All other keyword arguments are as for |NewickWriter|.
+        """
+        ioservice.TreeStreamWriter.__init__(self,
+                stream,
+                taxon_namespace=kwargs.pop("taxon_namespace", None),
+                flush_interval=kwargs.pop("flush_interval", None))
+        self._newick_writer = NewickWriter(**kwargs)
+
+    def _write_tree(self, tree):
+        self._newick_writer._write_tree(self.stream, tree)
+        self.stream.write("\n")
+
+    def _write_split_bitmasks(self,
+            split_bitmasks,
+            edge_lengths,
+            leafset_bitmask,
+            is_rooted,
+            weight):
+        self._newick_writer._write_split_bitmasks(
+                stream=self.stream,
+                split_bitmasks=split_bitmasks,
+                edge_lengths=edge_lengths,
+                leafset_bitmask=leafset_bitmask,
+                is_rooted=is_rooted,
+                weight=weight,
+                taxon_for_bit=self.taxon_for_bit)
+        self.stream.write("\n")
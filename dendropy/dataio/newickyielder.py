@@ -44,6 +44,24 @@ class NewickTreeDataYielder(ioservice.TreeDataYielder):
         taxon_namespace : |TaxonNamespace| instance
             The operational taxonomic unit concept namespace to use to manage
             taxon definitions.
+        tree_offset : int
+            Number of trees at the start of each source (e.g., a burn-in) to
+            be skipped over without being built. The taxa that they reference
+            are still added to the taxon namespace.
+        encode_split_bitmasks : bool
+            If |True|, then, instead of building a tree, the
+            |SplitBitmaskEncoding| of a tree is yielded where this can be
+            calculated directly from its statement (which is typically the
+            case for tree statements without comments).
+        read_ahead : bool or int
+            If |True| or a positive integer, then each source is read (and,
+            if it is a compressed file, decompressed) and decoded by a
+            background thread, up to this many blocks (or a default number
+            of blocks, if |True|) ahead of the parsing of the source.
+        prefetch_files : bool
+            If |True|, then the background reading of each source is started
+            while the preceding source is being parsed (implies
+            ``read_ahead``).
         \*\*kwargs : keyword arguments
             These will be passed directly to the base `newickreader.NexusReader`
             class. See `newickreader.NexusReader` for details.
@@ -51,7 +69,11 @@ class NewickTreeDataYielder(ioservice.TreeDataYielder):
         ioservice.TreeDataYielder.__init__(self,
                 files=files,
                 taxon_namespace=taxon_namespace,
-                tree_type=tree_type)
+                tree_type=tree_type,
+                tree_offset=kwargs.pop("tree_offset", None),
+                encode_split_bitmasks=kwargs.pop("encode_split_bitmasks", False),
+                read_ahead=kwargs.pop("read_ahead", None),
+                prefetch_files=kwargs.pop("prefetch_files", False))
         self.newick_reader = newickreader.NewickReader(**kwargs)
 
     ###########################################################################
@@ -64,11 +86,18 @@ class NewickTreeDataYielder(ioservice.TreeDataYielder):
                 taxon_namespace=self.attached_taxon_namespace,
                 enable_lookup_by_taxon_number=True,
                 case_sensitive=self.newick_reader.case_sensitive_taxon_labels)
+        taxon_bitmask_fn = self.taxon_bitmask_fn(self.attached_taxon_namespace)
+        for tree_idx in range(self.tree_offset):
+            if not self.newick_reader._skip_tree_statement(
+                    nexus_tokenizer,
+                    taxon_symbol_map_fn=taxon_symbol_mapper.require_taxon_for_symbol):
+                return
         while True:
             tree = self.newick_reader._parse_tree_statement(
                     nexus_tokenizer=nexus_tokenizer,
                     tree_factory=self.tree_factory,
-                    taxon_symbol_map_fn=taxon_symbol_mapper.require_taxon_for_symbol)
+                    taxon_symbol_map_fn=taxon_symbol_mapper.require_taxon_for_symbol,
+                    taxon_bitmask_fn=taxon_bitmask_fn)
             if tree is None:
                 break
             yield tree
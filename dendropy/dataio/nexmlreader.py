@@ -279,15 +279,20 @@ class NexmlReader(ioservice.DataReader, _AnnotationParser):
             char_matrix_factory=None,
             state_alphabet_factory=None,
             global_annotations_target=None):
-        xml_doc = xmlprocessing.XmlDocument(file_obj=stream,
-                subelement_factory=self._subelement_factory)
-        self._namespace_registry = xml_doc.namespace_registry
         self._taxon_namespace_factory = taxon_namespace_factory
         self._tree_list_factory = tree_list_factory
         self._char_matrix_factory = char_matrix_factory
         self._state_alphabet_factory = state_alphabet_factory
         self._global_annotations_target = global_annotations_target
-        self._parse_document(xml_doc)
+        tree_parser = _NexmlTreeParser(
+                id_taxon_map=self._id_taxon_map,
+                annotations_processor_fn=self._parse_annotations,
+                )
+        for nxtree, otus_id, tree_list in self._parse_document_stream(
+                stream,
+                parse_trees=self._tree_list_factory is not None):
+            tree_obj = tree_list.new_tree()
+            tree_parser.build_tree(tree_obj, nxtree, otus_id)
         self._product = self.Product(
                 taxon_namespaces=self._taxon_namespaces,
                 tree_lists=self._tree_lists,
@@ -334,67 +339,141 @@ class NexmlReader(ioservice.DataReader, _AnnotationParser):
 
     ## Following methods are class-specific ###
 
-    def _parse_document(self, xml_doc):
-        xml_root = xml_doc.root
-        self._parse_taxon_namespaces(xml_root)
-        if self._char_matrix_factory is not None:
-            self._parse_char_matrices(xml_root)
-        if self._tree_list_factory is not None:
-            self._parse_tree_lists(xml_root)
-        if self._global_annotations_target is not None:
-            top_annotations = [i for i in xml_root.findall_annotations()]
-            for annotation in top_annotations:
-                self._parse_annotations(self._global_annotations_target, annotation)
-
-    def _parse_taxon_namespaces(self, xml_root):
-        for nxtaxa in xml_root.iter_otus():
-            taxon_namespace_label = nxtaxa.get('label', None)
-            taxon_namespace = self._new_taxon_namespace(label=taxon_namespace_label)
-            taxon_namespace_id = nxtaxa.get('id', id(taxon_namespace))
-            self._id_taxon_namespace_map[taxon_namespace_id] = taxon_namespace
-            annotations = [i for i in nxtaxa.findall_annotations()]
+    def _parse_document_stream(self, stream, parse_trees=True):
+        """
+        Incrementally parses the NeXML document in ``stream``.
+
+        Each element is processed as soon as it is closed and is then
+        discarded, so that memory use does not grow with the size of the
+        document: taxon namespaces are built when their "otus" elements
+        close, the rows of character matrices when their "row" elements
+        close, and so on. Character matrices are only parsed if there is a
+        character matrix factory.
+
+        If ``parse_trees`` is |True|, then this yields a tuple, ``(nxtree,
+        otus_id, tree_list)``, for each "tree" element as soon as it closes,
+        where ``nxtree`` is the element, ``otus_id`` is the id of the taxon
+        namespace of its trees block, and ``tree_list`` is the |TreeList| for
+        the trees block (or |None| if there is no tree list factory). The
+        element is discarded once the caller resumes iteration.
+        """
+        self._namespace_registry = xmlprocessing.XmlNamespaces()
+        ns = "{%s}" % self.default_namespace
+        meta_tag = ns + "meta"
+        otus_tag = ns + "otus"
+        characters_tag = ns + "characters"
+        format_tag = ns + "format"
+        matrix_tag = ns + "matrix"
+        row_tag = ns + "row"
+        trees_tag = ns + "trees"
+        tree_tag = ns + "tree"
+        root = None
+        is_skipping_block = False
+        char_matrix_parser = None
+        char_matrix = None
+        tree_list = None
+        otus_id = None
+        trees_idx = 0
+        for event, element, parent in xmlprocessing.iterparse_elements(stream, self._namespace_registry):
+            if parent is None:
+                if event == "start":
+                    root = element
+                continue
+            tag = element.tag
+            if event == "start":
+                if parent is root:
+                    # subelements of blocks that are not parsed are
+                    # discarded as they close
+                    is_skipping_block = ((tag == characters_tag and self._char_matrix_factory is None)
+                            or (tag == trees_tag and not parse_trees))
+                    if tag == characters_tag and self._char_matrix_factory is not None:
+                        char_matrix_parser = _NexmlCharBlockParser(self._namespace_registry,
+                                self._id_taxon_namespace_map,
+                                self._id_taxon_map,
+                                self._new_char_matrix,
+                                self._state_alphabet_factory)
+                        char_matrix = char_matrix_parser.begin_char_matrix(self._subelement_factory(element))
+                    elif tag == trees_tag and parse_trees:
+                        tree_list, otus_id = self._begin_tree_list(self._subelement_factory(element), trees_idx)
+                        trees_idx += 1
+                elif tag == matrix_tag and parent.tag == characters_tag and char_matrix_parser is not None:
+                    char_matrix_parser.begin_char_matrix_rows()
+                continue
+            if parent is root:
+                if tag == otus_tag:
+                    self._parse_taxon_namespace(self._subelement_factory(element))
+                elif tag == characters_tag:
+                    char_matrix_parser = None
+                    char_matrix = None
+                elif tag == trees_tag:
+                    tree_list = None
+                    otus_id = None
+                elif tag == meta_tag and self._global_annotations_target is not None:
+                    self._parse_annotations(self._global_annotations_target, self._subelement_factory(element))
+                root.remove(element)
+            elif is_skipping_block:
+                parent.remove(element)
+            elif char_matrix_parser is not None and parent.tag in (characters_tag, matrix_tag):
+                if tag == row_tag:
+                    char_matrix_parser.parse_char_row(self._subelement_factory(element))
+                    parent.remove(element)
+                elif tag == meta_tag:
+                    if parent.tag == characters_tag:
+                        self._parse_annotations(char_matrix, self._subelement_factory(element))
+                    else:
+                        self._parse_annotations(char_matrix.taxon_seq_map, self._subelement_factory(element))
+                elif tag == format_tag and parent.tag == characters_tag:
+                    char_matrix_parser.parse_characters_format(
+                            self._subelement_factory(element),
+                            char_matrix_parser.data_type,
+                            char_matrix)
+            elif otus_id is not None and parent.tag == trees_tag:
+                if tag == tree_tag:
+                    yield self._subelement_factory(element), otus_id, tree_list
+                    parent.remove(element)
+                elif tag == meta_tag and tree_list is not None:
+                    self._parse_annotations(tree_list, self._subelement_factory(element))
+
+    def _parse_taxon_namespace(self, nxtaxa):
+        taxon_namespace_label = nxtaxa.get('label', None)
+        taxon_namespace = self._new_taxon_namespace(label=taxon_namespace_label)
+        taxon_namespace_id = nxtaxa.get('id', id(taxon_namespace))
+        self._id_taxon_namespace_map[taxon_namespace_id] = taxon_namespace
+        annotations = [i for i in nxtaxa.findall_annotations()]
+        for annotation in annotations:
+            self._parse_annotations(taxon_namespace, annotation)
+        if self.case_sensitive_taxon_labels:
+            label_taxon_map = {}
+        else:
+            label_taxon_map = container.OrderedCaselessDict()
+        if self.attached_taxon_namespace is not None:
+            for t in taxon_namespace:
+                label_taxon_map[t.label] = t
+        for idx, nxtaxon in enumerate(nxtaxa.findall_otu()):
+            taxon = None
+            taxon_label = nxtaxon.get('label', None)
+            taxon_oid = nxtaxon.get('id', id(nxtaxon))
+            if taxon_label is not None and self.attached_taxon_namespace is not None:
+                # taxon = label_taxon_map.get_taxon(
+                #         label=taxon_label,
+                #         case_sensitive=self.case_sensitive_taxon_labels)
+                try:
+                    taxon = label_taxon_map[taxon_label]
+                except KeyError:
+                    taxon = None
+            if taxon is None:
+                taxon = taxon_namespace.new_taxon(label=taxon_label)
+            annotations = [i for i in nxtaxon.findall_annotations()]
             for annotation in annotations:
-                self._parse_annotations(taxon_namespace, annotation)
-            if self.case_sensitive_taxon_labels:
-                label_taxon_map = {}
-            else:
-                label_taxon_map = container.OrderedCaselessDict()
-            if self.attached_taxon_namespace is not None:
-                for t in taxon_namespace:
-                    label_taxon_map[t.label] = t
-            for idx, nxtaxon in enumerate(nxtaxa.findall_otu()):
-                taxon = None
-                taxon_label = nxtaxon.get('label', None)
-                taxon_oid = nxtaxon.get('id', id(nxtaxon))
-                if taxon_label is not None and self.attached_taxon_namespace is not None:
-                    # taxon = label_taxon_map.get_taxon(
-                    #         label=taxon_label,
-                    #         case_sensitive=self.case_sensitive_taxon_labels)
-                    try:
-                        taxon = label_taxon_map[taxon_label]
-                    except KeyError:
-                        taxon = None
-                if taxon is None:
-                    taxon = taxon_namespace.new_taxon(label=taxon_label)
-                annotations = [i for i in nxtaxon.findall_annotations()]
-                for annotation in annotations:
-                    self._parse_annotations(taxon, annotation)
-                self._id_taxon_map[(taxon_namespace_id, taxon_oid)] = taxon
-
-    def _parse_char_matrices(self, xml_root):
-        nxc = _NexmlCharBlockParser(self._namespace_registry,
-                self._id_taxon_namespace_map,
-                self._id_taxon_map,
-                self._new_char_matrix,
-                self._state_alphabet_factory)
-        for char_matrix_element in xml_root.iter_characters():
-            nxc.parse_char_matrix(char_matrix_element)
-
-    def _parse_tree_lists(self, xml_root):
-        for trees_idx, trees_element in enumerate(xml_root.iter_trees()):
-            self._parse_tree_list(trees_element, trees_idx, True)
-
-    def _parse_tree_list(self, nxtrees, trees_idx=None, add_to_tree_list=True):
+                self._parse_annotations(taxon, annotation)
+            self._id_taxon_map[(taxon_namespace_id, taxon_oid)] = taxon
+
+    def _begin_tree_list(self, nxtrees, trees_idx=None):
+        """
+        Returns the tree list (or |None| if there is no tree list factory) and
+        the id of the taxon namespace for the trees block ``nxtrees``, given
+        only its attributes.
+        """
         trees_id = nxtrees.get('id', "Trees" + str(trees_idx))
         trees_label = nxtrees.get('label', None)
         otus_id = nxtrees.get('otus', None)
@@ -403,19 +482,12 @@ class NexmlReader(ioservice.DataReader, _AnnotationParser):
         taxon_namespace = self._id_taxon_namespace_map.get(otus_id, None)
         if not taxon_namespace:
             raise Exception("Tree block '{}': Taxa block '{}' not found".format(trees_id, otus_id))
+        if self._tree_list_factory is None:
+            return None, otus_id
         tree_list = self._new_tree_list(
                 label=trees_label,
                 taxon_namespace=taxon_namespace)
-        annotations = [i for i in nxtrees.findall_annotations()]
-        for annotation in annotations:
-            self._parse_annotations(tree_list, annotation)
-        tree_parser = _NexmlTreeParser(
-                id_taxon_map=self._id_taxon_map,
-                annotations_processor_fn=self._parse_annotations,
-                )
-        for tree_element in nxtrees.findall_tree():
-            tree_obj = tree_list.new_tree()
-            tree_parser.build_tree(tree_obj, tree_element, otus_id)
+        return tree_list, otus_id
 
 class _NexmlTreeParser(object):
 
@@ -598,6 +670,36 @@ class _NexmlCharBlockParser(_AnnotationParser):
         Given an XmlElement representing a nexml characters block, this
         instantiates and returns a corresponding DendroPy CharacterMatrix object.
         """
+        char_matrix = self.begin_char_matrix(nxchars)
+
+        # annotation processing
+        annotations = [i for i in nxchars.findall_annotations()]
+        for annotation in annotations:
+            self._parse_annotations(char_matrix, annotation)
+
+        # get state mappings
+        nxformat = nxchars.find_char_format()
+        if nxformat is not None:
+            self.parse_characters_format(nxformat, self.data_type, char_matrix)
+        self.begin_char_matrix_rows()
+
+        nxmatrix = nxchars.find_char_matrix()
+        annotations = [i for i in nxmatrix.findall_annotations()]
+        for annotation in annotations:
+            self._parse_annotations(char_matrix.taxon_seq_map, annotation)
+        for nxrow in nxmatrix.findall_char_row():
+            self.parse_char_row(nxrow)
+        return char_matrix
+
+    def begin_char_matrix(self, nxchars):
+        """
+        Given an XmlElement representing a nexml characters block, this
+        instantiates and returns a corresponding DendroPy CharacterMatrix
+        object based only on the attributes of the element. The format (see
+        :meth:`parse_characters_format()`) and then the rows (see
+        :meth:`parse_char_row()`) of the block are parsed in turn, so that
+        the subelements of the block can be processed as they are read.
+        """
 
         # clear
         self._id_state_alphabet_map = {}
@@ -605,6 +707,7 @@ class _NexmlCharBlockParser(_AnnotationParser):
         self._id_chartype_map = {}
         self._char_types = []
         self._chartype_id_to_pos_map = {}
+        self._is_format_parsed = False
 
         # initiaiize
         label = nxchars.get('label', None)
@@ -641,110 +744,118 @@ class _NexmlCharBlockParser(_AnnotationParser):
                 taxon_namespace=taxon_namespace,
                 label=label,
                 **extra_kwargs)
+        self.char_matrix = char_matrix
+        self.data_type = data_type
+        self._nxchartype = nxchartype
+        self._otus_id = otus_id
+        self._char_matrix_oid = char_matrix_oid
+        return char_matrix
 
-        # annotation processing
-        annotations = [i for i in nxchars.findall_annotations()]
-        for annotation in annotations:
-            self._parse_annotations(char_matrix, annotation)
+    def begin_char_matrix_rows(self):
+        """
+        Completes the set up of the current character matrix once its format
+        (if any) has been parsed, before its rows are parsed.
+        """
+        if not self._is_format_parsed and self.data_type == "standard":
+            self.create_standard_character_alphabet(self.char_matrix)
 
-        # get state mappings
-        nxformat = nxchars.find_char_format()
-        if nxformat is not None:
-            self.parse_characters_format(nxformat, data_type, char_matrix)
-        elif data_type == "standard":
-            self.create_standard_character_alphabet(char_matrix)
+    def parse_char_row(self, nxrow):
+        """
+        Given an XmlElement representing a row of the current nexml characters
+        block, this adds the corresponding sequence to the CharacterMatrix
+        object.
+        """
+        char_matrix = self.char_matrix
+        data_type = self.data_type
+        nxchartype = self._nxchartype
+        otus_id = self._otus_id
+        char_matrix_oid = self._char_matrix_oid
+        row_id = nxrow.get('id', None)
+        label = nxrow.get('label', None)
+        taxon_id = nxrow.get('otu', None)
+        try:
+            taxon = self._id_taxon_map[(otus_id, taxon_id)]
+        except KeyError:
+            raise error.DataParseError(message='Character Block %s (\"%s\"): Taxon with id "%s" not defined in taxa block "%s"' % (char_matrix.oid, char_matrix.label, taxon_id, otus_id))
 
-        nxmatrix = nxchars.find_char_matrix()
-        annotations = [i for i in nxmatrix.findall_annotations()]
+        character_vector = char_matrix.new_sequence(taxon=taxon)
+        annotations = [i for i in nxrow.findall_annotations()]
         for annotation in annotations:
-            self._parse_annotations(char_matrix.taxon_seq_map, annotation)
-        for nxrow in nxmatrix.findall_char_row():
-            row_id = nxrow.get('id', None)
-            label = nxrow.get('label', None)
-            taxon_id = nxrow.get('otu', None)
-            try:
-                taxon = self._id_taxon_map[(otus_id, taxon_id)]
-            except KeyError:
-                raise error.DataParseError(message='Character Block %s (\"%s\"): Taxon with id "%s" not defined in taxa block "%s"' % (char_matrix.oid, char_matrix.label, taxon_id, otus_id))
-
-            character_vector = char_matrix.new_sequence(taxon=taxon)
-            annotations = [i for i in nxrow.findall_annotations()]
-            for annotation in annotations:
-                self._parse_annotations(character_vector, annotation)
-
-            if data_type == "continuous":
-                if nxchartype.endswith('Seqs'):
-                    seq = nxrow.find_char_seq()
-                    if seq is not None:
-                        seq = seq.replace('\n\r', ' ').replace('\r\n', ' ').replace('\n', ' ').replace('\r',' ')
-                        col_idx = -1
-                        for char in seq.split(' '):
-                            char = char.strip()
-                            if char:
-                                col_idx += 1
-                                if len(self._char_types) <= col_idx:
-                                    raise error.DataParseError(message="Character column/type ('<char>') not defined for character in position"\
-                                        + " %d (matrix = '%s' row='%s', taxon='%s')" % (col_idx+1, char_matrix.oid, row_id, taxon.label))
-                                character_vector.append(character_value=float(char), character_type=self._char_types[col_idx])
-                else:
-                    for nxcell in nxrow.findall_char_cell():
-                        chartype_id = nxcell.get('char', None)
-                        if chartype_id is None:
-                            raise error.DataParseError(message="'char' attribute missing for cell: cell markup must indicate character column type for character"\
-                                        + " (matrix = '%s' row='%s', taxon='%s')" % (char_matrix.oid, row_id, taxon.label))
-                        if chartype_id not in self._id_chartype_map:
-                            raise error.DataParseError(message="Character type ('<char>') with id '%s' referenced but not found for character" % chartype_id \
-                                        + " (matrix = '%s' row='%s', taxon='%s')" % (char_matrix.oid, row_id, taxon.label))
-                        chartype = self._id_chartype_map[chartype_id]
-                        pos_idx = self._char_types.index(chartype)
-#                         column = id_chartype_map[chartype_id]
-#                         state = column.state_id_map[cell.get('state', None)]
-                        # annotations = [i for i in nxcell.findall_annotations]
-                        # for annotation in annotations:
-                        #     self._parse_annotations(cell, annotation)
-                        character_vector.append(character_value=float(nxcell.get('state')),
-                                character_type=chartype)
-            else:
-                if nxchartype.endswith('Seqs'):
-                    seq = nxrow.find_char_seq()
-                    if seq is not None:
-                        seq = seq.replace(' ', '').replace('\n', '').replace('\r', '')
-                        col_idx = -1
-                        for char in seq:
+            self._parse_annotations(character_vector, annotation)
+
+        if data_type == "continuous":
+            if nxchartype.endswith('Seqs'):
+                seq = nxrow.find_char_seq()
+                if seq is not None:
+                    seq = seq.replace('\n\r', ' ').replace('\r\n', ' ').replace('\n', ' ').replace('\r',' ')
+                    col_idx = -1
+                    for char in seq.split(' '):
+                        char = char.strip()
+                        if char:
                             col_idx += 1
-                            state_alphabet = char_matrix.character_types[col_idx].state_alphabet
-                            try:
-                                state = state_alphabet[char]
-                            except KeyError:
-                                raise error.DataParseError(message="Character Block row '%s', character position %s: State with symbol '%s' in sequence '%s' not defined" \
-                                        % (row_id, col_idx, char, seq))
                             if len(self._char_types) <= col_idx:
                                 raise error.DataParseError(message="Character column/type ('<char>') not defined for character in position"\
-                                    + " %d (row='%s', taxon='%s')" % (col_idx+1, row_id, taxon.label))
-                            character_type = self._char_types[col_idx]
-                            character_vector.append(character_value=state,
-                                    character_type=character_type)
-                else:
-                    for nxcell in nxrow.findall_char_cell():
-                        chartype_id = nxcell.get('char', None)
-                        if chartype_id is None:
-                            raise error.DataParseError(message="'char' attribute missing for cell: cell markup must indicate character column type for character"\
-                                        + " (matrix = '%s' row='%s', taxon='%s')" % (char_matrix_oid, row_id, taxon.label))
-                        if chartype_id not in self._id_chartype_map:
-                            raise error.DataParseError(message="Character type ('<char>') with id '%s' referenced but not found for character" % chartype_id \
-                                        + " (matrix = '%s' row='%s', taxon='%s')" % (char_matrix_oid, row_id, taxon.label))
-                        chartype = self._id_chartype_map[chartype_id]
-                        state_alphabet = self._id_chartype_map[chartype_id].state_alphabet
-                        pos_idx = self._chartype_id_to_pos_map[chartype_id]
-                        state = self._id_state_map[ (state_alphabet, nxcell.get('state', None)) ]
-                        character_vector.set_at(pos_idx,
-                                character_value=state,
-                                character_type=chartype)
-                        # self._id_state_alphabet_map = {}
-                        # self._id_state_map = {}
-                        # self._id_chartype_map = {}
-
-            char_matrix[taxon] = character_vector
+                                    + " %d (matrix = '%s' row='%s', taxon='%s')" % (col_idx+1, char_matrix.oid, row_id, taxon.label))
+                            character_vector.append(character_value=float(char), character_type=self._char_types[col_idx])
+            else:
+                for nxcell in nxrow.findall_char_cell():
+                    chartype_id = nxcell.get('char', None)
+                    if chartype_id is None:
+                        raise error.DataParseError(message="'char' attribute missing for cell: cell markup must indicate character column type for character"\
+                                    + " (matrix = '%s' row='%s', taxon='%s')" % (char_matrix.oid, row_id, taxon.label))
+                    if chartype_id not in self._id_chartype_map:
+                        raise error.DataParseError(message="Character type ('<char>') with id '%s' referenced but not found for character" % chartype_id \
+                                    + " (matrix = '%s' row='%s', taxon='%s')" % (char_matrix.oid, row_id, taxon.label))
+                    chartype = self._id_chartype_map[chartype_id]
+                    pos_idx = self._char_types.index(chartype)
+#                         column = id_chartype_map[chartype_id]
+#                         state = column.state_id_map[cell.get('state', None)]
+                    # annotations = [i for i in nxcell.findall_annotations]
+                    # for annotation in annotations:
+                    #     self._parse_annotations(cell, annotation)
+                    character_vector.append(character_value=float(nxcell.get('state')),
+                            character_type=chartype)
+        else:
+            if nxchartype.endswith('Seqs'):
+                seq = nxrow.find_char_seq()
+                if seq is not None:
+                    seq = seq.replace(' ', '').replace('\n', '').replace('\r', '')
+                    col_idx = -1
+                    for char in seq:
+                        col_idx += 1
+                        state_alphabet = char_matrix.character_types[col_idx].state_alphabet
+                        try:
+                            state = state_alphabet[char]
+                        except KeyError:
+                            raise error.DataParseError(message="Character Block row '%s', character position %s: State with symbol '%s' in sequence '%s' not defined" \
+                                    % (row_id, col_idx, char, seq))
+                        if len(self._char_types) <= col_idx:
+                            raise error.DataParseError(message="Character column/type ('<char>') not defined for character in position"\
+                                + " %d (row='%s', taxon='%s')" % (col_idx+1, row_id, taxon.label))
+                        character_type = self._char_types[col_idx]
+                        character_vector.append(character_value=state,
+                                character_type=character_type)
+            else:
+                for nxcell in nxrow.findall_char_cell():
+                    chartype_id = nxcell.get('char', None)
+                    if chartype_id is None:
+                        raise error.DataParseError(message="'char' attribute missing for cell: cell markup must indicate character column type for character"\
+                                    + " (matrix = '%s' row='%s', taxon='%s')" % (char_matrix_oid, row_id, taxon.label))
+                    if chartype_id not in self._id_chartype_map:
+                        raise error.DataParseError(message="Character type ('<char>') with id '%s' referenced but not found for character" % chartype_id \
+                                    + " (matrix = '%s' row='%s', taxon='%s')" % (char_matrix_oid, row_id, taxon.label))
+                    chartype = self._id_chartype_map[chartype_id]
+                    state_alphabet = self._id_chartype_map[chartype_id].state_alphabet
+                    pos_idx = self._chartype_id_to_pos_map[chartype_id]
+                    state = self._id_state_map[ (state_alphabet, nxcell.get('state', None)) ]
+                    character_vector.set_at(pos_idx,
+                            character_value=state,
+                            character_type=chartype)
+                    # self._id_state_alphabet_map = {}
+                    # self._id_state_map = {}
+                    # self._id_chartype_map = {}
+
+        char_matrix[taxon] = character_vector
 
         # if fixed_state_alphabet:
         #     char_matrix.remap_to_default_state_alphabet_by_symbol(purge_other_state_alphabets=True)
@@ -829,6 +940,7 @@ class _NexmlCharBlockParser(_AnnotationParser):
         state definitions (if any) and characters (column definitions, if any),
         and populates the given char_matrix accordingly.
         """
+        self._is_format_parsed = True
         # if data_type == "standard":
         #     for nxstates in nxformat.findall_char_states():
         #         char_matrix.state_alphabets.append(self.parse_state_alphabet(nxstates))
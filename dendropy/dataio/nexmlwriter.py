@@ -25,11 +25,6 @@ import textwrap
 import collections
 from dendropy.dataio import ioservice
 
-try:
-    from StringIO import StringIO # Python 2 legacy support: StringIO in this module is the one needed (not io)
-except ImportError:
-    from io import StringIO # Python 3
-
 ############################################################################
 ## Local Module Methods
 
@@ -127,6 +122,7 @@ class NexmlWriter(ioservice.DataWriter):
         self._taxon_namespaces_to_write = []
         self._taxon_namespace_id_map = {}
         self._object_xml_id = {}
+        self._num_xml_ids = 0
         self._taxon_id_map = {}
         self._node_id_map = {}
         self._state_alphabet_id_map = {}
@@ -147,15 +143,6 @@ class NexmlWriter(ioservice.DataWriter):
         self._state_alphabet_id_map = {}
         self._state_id_map = {}
 
-        # Destination:
-        # Writing to buffer instead of directly to output
-        # stream so that all namespaces referenced in metadata
-        # can be written
-        body = StringIO()
-
-        # comments and metadata
-        self._write_annotations_and_comments(global_annotations_target, body, 1)
-
         # Taxon namespace discovery
         candidate_taxon_namespaces = collections.OrderedDict()
         if self.attached_taxon_namespace is not None:
@@ -175,21 +162,76 @@ class NexmlWriter(ioservice.DataWriter):
                         candidate_taxon_namespaces[i.taxon_namespace] = True
         self._taxon_namespaces_to_write = [tns for tns in candidate_taxon_namespaces if candidate_taxon_namespaces[tns]]
 
+        # All namespaces referenced in metadata have to be declared in the
+        # opening tag: these are collected beforehand, so that the elements
+        # can then be written directly to the output stream as they are
+        # composed, instead of to a buffer
+        self._collect_prefix_uri_tuples(
+                global_annotations_target=global_annotations_target,
+                tree_lists=tree_lists,
+                char_matrices=char_matrices)
+        self._write_to_nexml_open(stream, indent_level=0)
+
+        # comments and metadata
+        self._write_annotations_and_comments(global_annotations_target, stream, 1)
+
         for tns in self._taxon_namespaces_to_write:
-            self._write_taxon_namespace(tns, body)
+            self._write_taxon_namespace(tns, stream)
 
         if char_matrices:
             for char_matrix in char_matrices:
-                self._write_char_matrix(char_matrix=char_matrix, dest=body)
+                self._write_char_matrix(char_matrix=char_matrix, dest=stream)
 
         if tree_lists:
             for tree_list in tree_lists:
-                self._write_tree_list(tree_list=tree_list, dest=body)
+                self._write_tree_list(tree_list=tree_list, dest=stream)
 
-        self._write_to_nexml_open(stream, indent_level=0)
-        stream.write(body.getvalue())
         self._write_to_nexml_close(stream, indent_level=0)
 
+    def _collect_prefix_uri_tuples(self,
+            global_annotations_target,
+            tree_lists,
+            char_matrices):
+        """
+        Adds the prefixes and namespaces of all the annotations that will be
+        written to ``self._prefix_uri_tuples``.
+        """
+        self._collect_item_prefix_uri_tuples(global_annotations_target)
+        for tns in self._taxon_namespaces_to_write:
+            self._collect_item_prefix_uri_tuples(tns)
+            for taxon in tns:
+                self._collect_item_prefix_uri_tuples(taxon)
+        if char_matrices:
+            for char_matrix in char_matrices:
+                self._collect_item_prefix_uri_tuples(char_matrix)
+                for taxon in char_matrix:
+                    char_vector = char_matrix[taxon]
+                    self._collect_item_prefix_uri_tuples(char_vector)
+                    if not self.markup_as_sequences:
+                        for char_value, cell_char_type, cell_annotations in char_vector.iter_cells():
+                            if cell_annotations is not None:
+                                self._collect_annotation_set_prefix_uri_tuples(cell_annotations)
+        if tree_lists:
+            for tree_list in tree_lists:
+                self._collect_item_prefix_uri_tuples(tree_list)
+                for tree in tree_list:
+                    self._collect_item_prefix_uri_tuples(tree)
+                    for node in tree.preorder_node_iter():
+                        self._collect_item_prefix_uri_tuples(node)
+                        self._collect_item_prefix_uri_tuples(node.edge)
+
+    def _collect_item_prefix_uri_tuples(self, item):
+        if getattr(item, "has_annotations", False):
+            self._collect_annotation_set_prefix_uri_tuples(item.annotations)
+
+    def _collect_annotation_set_prefix_uri_tuples(self, annotation_set, is_nested=False):
+        for annote in annotation_set:
+            if annote.is_hidden and not is_nested:
+                continue
+            self._prefix_uri_tuples.add((annote.name_prefix, annote.namespace))
+            if annote.has_annotations:
+                self._collect_annotation_set_prefix_uri_tuples(annote.annotations, is_nested=True)
+
     def _write_taxon_namespace(self, taxon_namespace, dest, indent_level=1):
         self._taxon_namespace_id_map[taxon_namespace] = self._get_nexml_id(taxon_namespace)
         dest.write(self.indent * indent_level)
@@ -293,7 +335,7 @@ class NexmlWriter(ioservice.DataWriter):
         if char_matrix.has_annotations or (hasattr(char_matrix, "comments") and char_matrix.comments):
             self._write_annotations_and_comments(char_matrix, dest, indent_level=indent_level+1)
 
-        cell_char_type_id_map = self._write_format_section(char_matrix, dest, indent_level=indent_level+1)
+        column_char_type_ids = self._write_format_section(char_matrix, dest, indent_level=indent_level+1)
 
         dest.write("%s<matrix>\n" % (self.indent * (indent_level+1)))
 
@@ -301,64 +343,69 @@ class NexmlWriter(ioservice.DataWriter):
         # if char_matrix.taxon_seq_map.has_annotations:
         #     self._write_annotations_and_comments(char_matrix.taxon_seq_map, dest, indent_level=indent_level+1)
 
+        # each row (and, within rows, each line of a sequence or each cell)
+        # is written as soon as it is composed
         for taxon in char_matrix:
             char_vector = char_matrix[taxon]
             # for col_idx, (char_value, cell_char_type, cell_annotations) in enumerate(char_vector):
             dest.write(self.indent*(indent_level+2))
             parts = []
             parts.append('row')
-            parts.append('id="%s"' % self._get_nexml_id(char_vector))
+            parts.append('id="%s"' % self._get_transient_nexml_id())
             if taxon is not None:
                 parts.append('otu="%s"' % self._taxon_id_map[taxon])
             dest.write("<%s>\n" % ' '.join(parts))
             if char_vector.has_annotations or (hasattr(char_vector, "comments") and char_vector.comments):
                 self._write_annotations_and_comments(char_vector, dest, indent_level=indent_level+3)
             if self.markup_as_sequences:
-                if char_matrix.data_type in ("dna", "rna", "protein", "restriction", "aa", "amino-acid"):
-                    separator = ''
-                else:
-                    # standard or continuous
-                    separator = ' '
-                print_count = 1
-                dest.write("{}<seq>".format(self.indent * (indent_level+3)))
-                for cidx, c in enumerate(char_vector):
-                    s = str(c)
-                    if not s:
-                        raise TypeError("Character %d in char_vector '%s' does not have a symbol defined for its character state:" % (cidx, char_vector.default_oid) \
-                                    + " this matrix cannot be written in sequence format (set 'markup_as_sequences' to False)'")
-                    if print_count == 1:
-                        dest.write("\n{}".format(self.indent * (indent_level+4)))
-                    else:
-                        dest.write(separator)
-                    dest.write(s)
-                    if print_count == 58:
-                        print_count = 1
-                    else:
-                        print_count += 1
-                dest.write("\n{}</seq>\n".format(self.indent * (indent_level+3)))
+                self._write_char_vector_sequence(char_matrix, char_vector, dest, indent_level=indent_level+3)
             else:
+                cell_prefix = '%s<cell char="' % (self.indent*(indent_level+3))
                 for col_idx, (char_value, cell_char_type, cell_annotations) in enumerate(char_vector.iter_cells()):
-                    parts = []
-                    parts.append('%s<cell' % (self.indent*(indent_level+3)))
-                    parts.append('char="%s"' % cell_char_type_id_map[ (taxon, col_idx) ])
+                    if cell_char_type is None:
+                        char_type_id = column_char_type_ids[col_idx]
+                    else:
+                        char_type_id = self._get_nexml_id(cell_char_type)
                     if char_matrix.data_type == "continuous":
                         v = str(char_value)
                     else:
                         v = self._state_id_map[char_value]
-                    parts.append('state="%s"' % v)
-                    dest.write(' '.join(parts))
                     if cell_annotations is not None:
-                        dest.write('>\n')
+                        dest.write('%s%s" state="%s">\n' % (cell_prefix, char_type_id, v))
                         self._write_annotation_set(cell_annotations, dest, indent_level=indent_level+4)
                         dest.write('%s</cell>' % (self.indent*(indent_level+3)))
                     else:
-                        dest.write('/>\n')
+                        dest.write('%s%s" state="%s"/>\n' % (cell_prefix, char_type_id, v))
             dest.write(self.indent * (indent_level+2))
             dest.write('</row>\n')
         dest.write("%s</matrix>\n" % (self.indent * (indent_level+1)))
         dest.write(self.indent * indent_level)
         dest.write('</characters>\n')
 
+    def _write_char_vector_sequence(self, char_matrix, char_vector, dest, indent_level):
+        if char_matrix.data_type in ("dna", "rna", "protein", "restriction", "aa", "amino-acid"):
+            separator = ''
+        else:
+            # standard or continuous
+            separator = ' '
+        line_prefix = "\n{}".format(self.indent * (indent_level+1))
+        dest.write("{}<seq>".format(self.indent * indent_level))
+        line = []
+        for cidx, c in enumerate(char_vector):
+            s = str(c)
+            if not s:
+                raise TypeError("Character %d in char_vector '%s' does not have a symbol defined for its character state:" % (cidx, char_vector.default_oid) \
+                            + " this matrix cannot be written in sequence format (set 'markup_as_sequences' to False)'")
+            line.append(s)
+            if len(line) == 58:
+                dest.write(line_prefix)
+                dest.write(separator.join(line))
+                line = []
+        if line:
+            dest.write(line_prefix)
+            dest.write(separator.join(line))
+        dest.write("\n{}</seq>\n".format(self.indent * indent_level))
+
     def _write_tree(self, tree, dest, indent_level=0):
         """
         Writes a single DendroPy Tree object as a NEXML nex:tree
@@ -366,7 +413,7 @@ class NexmlWriter(ioservice.DataWriter):
         """
         parts = []
         parts.append('tree')
-        parts.append('id="%s"' % self._get_nexml_id(tree))
+        parts.append('id="%s"' % self._get_transient_nexml_id())
         if hasattr(tree, 'label') and tree.label:
             parts.append('label=%s' % _protect_attr(tree.label))
         if hasattr(tree, 'length_type') and tree.length_type:
@@ -392,6 +439,8 @@ class NexmlWriter(ioservice.DataWriter):
                     is_root=tree.is_rooted and node is tree.seed_node,
                     indent_level=indent_level+1)
         dest.write('%s</tree>\n' % (self.indent * indent_level))
+        # nodes are only referenced by the edges of their tree
+        self._node_id_map = {}
 
     def _write_to_nexml_open(self, dest, indent_level=0):
         "Writes the opening tag for a nexml element."
@@ -448,7 +497,7 @@ class NexmlWriter(ioservice.DataWriter):
         "Writes out a NEXML node element."
         parts = []
         parts.append('<node')
-        self._node_id_map[node] = self._get_nexml_id(node)
+        self._node_id_map[node] = self._get_transient_nexml_id()
         parts.append('id="%s"' % self._node_id_map[node])
         if hasattr(node, 'label') and node.label:
             parts.append('label=%s' % _protect_attr(node.label))
@@ -458,7 +507,7 @@ class NexmlWriter(ioservice.DataWriter):
             parts.append('root="true"')
         parts = ' '.join(parts)
         dest.write('%s%s' % ((self.indent * indent_level), parts))
-        if node.has_annotations or (hasattr(node, "comments") and node.comments):
+        if node.has_annotations or node.has_comments:
             dest.write('>\n')
             self._write_annotations_and_comments(node, dest, indent_level=indent_level+1)
             dest.write('%s</node>\n' % (self.indent * indent_level))
@@ -476,7 +525,7 @@ class NexmlWriter(ioservice.DataWriter):
                 # EDGE-ON-ROOT:
                 tag = "rootedge"
                 parts.append('<%s' % tag)
-            parts.append('id="%s"' % self._get_nexml_id(edge))
+            parts.append('id="%s"' % self._get_transient_nexml_id())
             # programmatically more efficent to do this in above
             # block, but want to maintain this tag order ...
             if edge.tail_node is not None:
@@ -492,7 +541,7 @@ class NexmlWriter(ioservice.DataWriter):
             if len(parts) > 2:
                 parts = ' '.join(parts)
                 dest.write('%s%s' % ((self.indent * indent_level), parts))
-                if edge.has_annotations or (hasattr(edge, "comments") and edge.comments):
+                if edge.has_annotations or edge.has_comments:
                     dest.write('>\n')
                     self._write_annotations_and_comments(edge, dest, indent_level=indent_level+1)
                     dest.write('%s</%s>\n' % ((self.indent * indent_level), tag))
@@ -517,7 +566,9 @@ class NexmlWriter(ioservice.DataWriter):
     def _write_annotations(self, annotated, dest, indent_level=0):
         "Writes out annotations for an Annotable object."
         # import sys
-        if hasattr(annotated, "annotations"):
+        # (``has_annotations`` is checked first so that an empty annotation
+        # set is not created for each object written)
+        if getattr(annotated, "has_annotations", False):
             self._write_annotation_set(annotated.annotations, dest, indent_level)
 
     def _write_annotation_set(self, annotation_set, dest, indent_level=0):
@@ -572,54 +623,81 @@ class NexmlWriter(ioservice.DataWriter):
         return sa
 
     def _write_format_section(self, char_matrix, dest, indent_level):
-        format_section_parts = []
+        """
+        Writes the state alphabets and the character types of
+        ``char_matrix``, returning the list of the ids of the character types
+        of its columns, for the cells that do not have a character type.
+        """
+        is_format_written = [False]
+        def _write_format_part(part):
+            if not is_format_written[0]:
+                dest.write("%s<format>\n" % (self.indent*(indent_level)))
+                is_format_written[0] = True
+            dest.write(part)
+            dest.write("\n")
         if hasattr(char_matrix, "state_alphabets"): #isinstance(char_matrix, dendropy.StandardCharacterMatrix):
             for state_alphabet in char_matrix.state_alphabets:
                 self._state_alphabet_id_map[state_alphabet] = self._get_nexml_id(state_alphabet)
-                format_section_parts.append('%s<states id="%s">'
+                _write_format_part('%s<states id="%s">'
                     % (self.indent * (indent_level+1), self._state_alphabet_id_map[state_alphabet]))
-                for state in state_alphabet:
-                    if state.state_denomination == state_alphabet.FUNDAMENTAL_STATE:
-                        format_section_parts.extend(self._compose_state_definition(state, state_alphabet, indent_level+3))
-                for state in state_alphabet:
-                    if state.state_denomination == state_alphabet.POLYMORPHIC_STATE:
-                        format_section_parts.extend(self._compose_state_definition(state, state_alphabet, indent_level+3))
-                for state in state_alphabet:
-                    if state.state_denomination == state_alphabet.AMBIGUOUS_STATE:
-                        format_section_parts.extend(self._compose_state_definition(state, state_alphabet, indent_level+3))
-                format_section_parts.append('%s</states>' % (self.indent * (indent_level+1)))
-        cell_char_type_id_map = {}
+                for state_denomination in (
+                        state_alphabet.FUNDAMENTAL_STATE,
+                        state_alphabet.POLYMORPHIC_STATE,
+                        state_alphabet.AMBIGUOUS_STATE):
+                    for state in state_alphabet:
+                        if state.state_denomination == state_denomination:
+                            for part in self._compose_state_definition(state, state_alphabet, indent_level+3):
+                                _write_format_part(part)
+                _write_format_part('%s</states>' % (self.indent * (indent_level+1)))
+        # cells without a character type share the character type of their
+        # column
+        column_char_type_ids = []
         char_type_ids_written = set()
         for taxon in char_matrix:
             char_vector = char_matrix[taxon]
             for col_idx, (char_value, cell_char_type, cell_annotations) in enumerate(char_vector.iter_cells()):
                 if cell_char_type is None:
+                    while len(column_char_type_ids) <= col_idx:
+                        column_char_type_ids.append(None)
+                    if column_char_type_ids[col_idx] is not None:
+                        continue
+                    char_type_id = self._get_transient_nexml_id()
                     if char_matrix.data_type == "continuous":
-                        char_type_id, char_type_xml = self._compose_char_type_xml_for_continuous_type(indent_level=indent_level+1)
+                        char_type_id, char_type_xml = self._compose_char_type_xml_for_continuous_type(indent_level=indent_level+1, char_type_id=char_type_id)
                     else:
                         sa = self._get_state_alphabet_for_char_matrix(char_matrix)
                         assert sa is not None
-                        char_type_id, char_type_xml = self._compose_char_type_xml_for_state_alphabet(sa, indent_level=indent_level+1)
+                        char_type_id, char_type_xml = self._compose_char_type_xml_for_state_alphabet(sa, indent_level=indent_level+1, char_type_id=char_type_id)
+                    column_char_type_ids[col_idx] = char_type_id
                 else:
+                    char_type_id = self._get_nexml_id(cell_char_type)
+                    if char_type_id in char_type_ids_written:
+                        continue
                     char_type_id, char_type_xml = self._compose_char_type_xml_for_character_type(cell_char_type, indent_level=indent_level+1)
-                if char_type_id not in char_type_ids_written:
-                    format_section_parts.append(char_type_xml)
                     char_type_ids_written.add(char_type_id)
-                cell_char_type_id_map[ (taxon, col_idx) ] = char_type_id
-        if format_section_parts:
-            dest.write("%s<format>\n" % (self.indent*(indent_level)))
-            dest.write(('\n'.join(format_section_parts)) + '\n')
+                _write_format_part(char_type_xml)
+        if is_format_written[0]:
             dest.write("%s</format>\n" % (self.indent*(indent_level)))
-        return cell_char_type_id_map
+        return column_char_type_ids
 
     def _get_nexml_id(self, o):
         try:
             return self._object_xml_id[o]
         except KeyError:
-            oid = "d{}".format(len(self._object_xml_id))
+            oid = self._get_transient_nexml_id()
             self._object_xml_id[o] = oid
             return oid
 
+    def _get_transient_nexml_id(self):
+        """
+        Returns a new id for an element that is not referenced by other
+        elements (e.g., a tree, an edge or a row), so that its object does
+        not have to be kept mapped to its id.
+        """
+        oid = "d{}".format(self._num_xml_ids)
+        self._num_xml_ids += 1
+        return oid
+
     def _compose_annotation_xml(self,
             annote,
             indent="",
@@ -651,10 +729,10 @@ class NexmlWriter(ioservice.DataWriter):
                 parts.append('content=""')
         if annote.datatype_hint:
             parts.append('datatype="%s"'% annote.datatype_hint)
-        parts.append('id="%s"' % self._get_nexml_id(annote))
+        parts.append('id="%s"' % self._get_transient_nexml_id())
         if prefix_uri_tuples is not None:
             prefix_uri_tuples.add((annote.name_prefix, annote.namespace))
-        if len(annote.annotations) > 0:
+        if annote.has_annotations:
             parts.append(">")
             for a in annote.annotations:
                 parts.append("\n" + self._compose_annotation_xml(a, indent=indent, indent_level=indent_level+1, prefix_uri_tuples=prefix_uri_tuples))
@@ -25,7 +25,6 @@ if not (sys.version_info.major >= 3 and sys.version_info.minor >= 4):
     from dendropy.utility.filesys import pre_py34_open as open
 from dendropy.dataio import ioservice
 from dendropy.dataio import nexmlreader
-from dendropy.dataio import xmlprocessing
 
 class NexmlTreeDataYielder(
         ioservice.TreeDataYielder,
@@ -48,6 +47,20 @@ class NexmlTreeDataYielder(
         taxon_namespace : |TaxonNamespace| instance
             The operational taxonomic unit concept namespace to use to manage
             taxon definitions.
+        tree_offset : int
+            Number of trees at the start of each source (e.g., a burn-in) to
+            be skipped over without being built.
+        encode_split_bitmasks : bool
+            Ignored: trees are always built.
+        read_ahead : bool or int
+            If |True| or a positive integer, then each source is read (and,
+            if it is a compressed file, decompressed) and decoded by a
+            background thread, up to this many blocks (or a default number
+            of blocks, if |True|) ahead of the parsing of the source.
+        prefetch_files : bool
+            If |True|, then the background reading of each source is started
+            while the preceding source is being parsed (implies
+            ``read_ahead``).
         \*\*kwargs : keyword arguments
             These will be passed directly to the base `nexmlreader.NexusReader`
             class. See `nexmlreader.NexusReader` for details.
@@ -55,7 +68,11 @@ class NexmlTreeDataYielder(
         ioservice.TreeDataYielder.__init__(self,
                 files=files,
                 taxon_namespace=taxon_namespace,
-                tree_type=tree_type)
+                tree_type=tree_type,
+                tree_offset=kwargs.pop("tree_offset", None),
+                encode_split_bitmasks=kwargs.pop("encode_split_bitmasks", False),
+                read_ahead=kwargs.pop("read_ahead", None),
+                prefetch_files=kwargs.pop("prefetch_files", False))
         nexmlreader.NexmlReader.__init__(self,
                 **kwargs)
         self.attached_taxon_namespace = self.taxon_namespace
@@ -64,25 +81,17 @@ class NexmlTreeDataYielder(
     ## Implementation of DataYielder interface
 
     def _yield_items_from_stream(self, stream):
-        xml_doc = xmlprocessing.XmlDocument(file_obj=stream,
-                subelement_factory=self._subelement_factory)
-        self._namespace_registry = xml_doc.namespace_registry
-        xml_root = xml_doc.root
-        self._parse_taxon_namespaces(xml_root)
+        # trees are built (and their elements discarded) as they are read,
+        # so memory use does not grow with the size of the source
         tree_parser = nexmlreader._NexmlTreeParser(
                 id_taxon_map=self._id_taxon_map,
                 annotations_processor_fn=self._parse_annotations,
                 )
-        for trees_idx, trees_element in enumerate(xml_root.iter_trees()):
-            trees_id = trees_element.get('id', "Trees" + str(trees_idx))
-            trees_label = trees_element.get('label', None)
-            otus_id = trees_element.get('otus', None)
-            if otus_id is None:
-                raise Exception("Taxa block not specified for trees block '{}'".format(otus_id))
-            taxon_namespace = self._id_taxon_namespace_map.get(otus_id, None)
-            if not taxon_namespace:
-                raise Exception("Tree block '{}': Taxa block '{}' not found".format(trees_id, otus_id))
-            for tree_element in trees_element.findall_tree():
-                tree_obj = self.tree_factory()
-                tree_parser.build_tree(tree_obj, tree_element, otus_id)
-                yield tree_obj
+        num_trees_to_skip = self.tree_offset
+        for nxtree, otus_id, tree_list in self._parse_document_stream(stream, parse_trees=True):
+            if num_trees_to_skip > 0:
+                num_trees_to_skip -= 1
+                continue
+            tree_obj = self.tree_factory()
+            tree_parser.build_tree(tree_obj, nxtree, otus_id)
+            yield tree_obj
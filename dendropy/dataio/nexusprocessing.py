@@ -36,7 +36,8 @@ from dendropy.datamodel import basemodel
 class NexusTokenizer(Tokenizer):
 
     def __init__(self, src,
-            preserve_unquoted_underscores=False):
+            preserve_unquoted_underscores=False,
+            buffer_size=None):
         Tokenizer.__init__(self,
             src=src,
             uncaptured_delimiters=list(" \t\n\r"),
@@ -47,7 +48,8 @@ class NexusTokenizer(Tokenizer):
             comment_begin="[",
             comment_end="]",
             capture_comments=True,
-            preserve_unquoted_underscores=preserve_unquoted_underscores)
+            preserve_unquoted_underscores=preserve_unquoted_underscores,
+            buffer_size=buffer_size)
         # self.preserve_unquoted_underscores = preserve_unquoted_underscores
 
     # def __next__(self):
@@ -84,6 +86,7 @@ class NexusTokenizer(Tokenizer):
                 self.uncaptured_delimiters.append("\n")
             if "\r" not in self.uncaptured_delimiters:
                 self.uncaptured_delimiters.append("\r")
+        self._compile_scanner()
 
     def set_hyphens_as_captured_delimiters(self, hyphens_as_captured_delimiters):
         if hyphens_as_captured_delimiters:
@@ -94,6 +97,7 @@ class NexusTokenizer(Tokenizer):
                 self.captured_delimiters.remove("-")
             except ValueError:
                 pass
+        self._compile_scanner()
 
     def require_next_token_ucase(self):
         t = self.require_next_token()
@@ -186,6 +190,7 @@ class NexusTaxonSymbolMapper(object):
             self.label_taxon_map = {}
         self.number_taxon_map = {}
         self.number_taxon_label_map = {}
+        self._resolved_symbol_taxon_map = {}
         self.enable_lookup_by_taxon_number = enable_lookup_by_taxon_number
         self._set_taxon_namespace(taxon_namespace)
 
@@ -210,6 +215,7 @@ class NexusTaxonSymbolMapper(object):
     taxon_namespace = property(_get_taxon_namespace, _set_taxon_namespace)
 
     def reset_supplemental_mappings(self):
+        self._resolved_symbol_taxon_map.clear()
         self.token_taxon_map.clear()
         if not self.case_sensitive:
             self.label_taxon_map = container.CaseInsensitiveDict(self._taxon_namespace.label_taxon_map())
@@ -224,6 +230,7 @@ class NexusTaxonSymbolMapper(object):
     def add_translate_token(self, token, taxon):
         if not textprocessing.is_str_type(token):
             token = str(token)
+        self._resolved_symbol_taxon_map.clear()
         self.token_taxon_map[token] = taxon
 
     def lookup_taxon_symbol(self, symbol, create_taxon_if_not_found=True):
@@ -253,9 +260,19 @@ class NexusTaxonSymbolMapper(object):
         return None
 
     def require_taxon_for_symbol(self, symbol):
-        return self.lookup_taxon_symbol(symbol=symbol, create_taxon_if_not_found=True)
+        # Symbols are typically repeated across many trees, so the
+        # resolution of each distinct symbol is cached (until any of the
+        # mappings are modified).
+        try:
+            return self._resolved_symbol_taxon_map[symbol]
+        except KeyError:
+            pass
+        taxon = self.lookup_taxon_symbol(symbol=symbol, create_taxon_if_not_found=True)
+        self._resolved_symbol_taxon_map[symbol] = taxon
+        return taxon
 
     def new_taxon(self, label):
+        self._resolved_symbol_taxon_map.clear()
         self._taxon_namespace.is_mutable = self.taxon_namespace_original_mutability_state
         t = self._taxon_namespace.new_taxon(label)
         self._taxon_namespace.is_mutable = False
@@ -265,6 +282,7 @@ class NexusTaxonSymbolMapper(object):
         return t
 
     def add_taxon(self, taxon):
+        self._resolved_symbol_taxon_map.clear()
         self._taxon_namespace.is_mutable = self.taxon_namespace_original_mutability_state
         self._taxon_namespace.add_taxon(taxon)
         self._taxon_namespace.is_mutable = False
@@ -318,6 +336,63 @@ def parse_comment_metadata_to_annotations(
         field_name_map = {}
     if field_value_types is None:
         field_value_types = {}
+    for key, val in _iter_comment_metadata_fields(
+            comment,
+            strip_leading_trailing_spaces=strip_leading_trailing_spaces):
+        val = _parse_comment_metadata_value(val, field_value_types.get(key, None))
+        if key in field_name_map:
+            key = field_name_map[key]
+        annote = basemodel.Annotation(
+                name=key,
+                value=val,
+                # datatype_hint=datatype_hint,
+                # name_prefix=name_prefix,
+                # namespace=namespace,
+                # name_is_prefixed=name_is_prefixed,
+                # is_attribute=False,
+                # annotate_as_reference=annotate_as_reference,
+                # is_hidden=is_hidden,
+                )
+        annotations.add(annote)
+    return annotations
+
+def parse_comment_metadata_to_attributes(
+        item,
+        comment,
+        field_value_types):
+    """
+    Sets the values of the metadata fields given in ``comment`` that are
+    listed in ``field_value_types`` as attributes of ``item``, without
+    creating |Annotation| objects. Other fields are ignored.
+
+    Parameters
+    ----------
+    ``item`` : object
+        Object on which to set the attributes.
+    ``comment`` : string
+        A comment token.
+    ``field_value_types`` : dict
+        A dictionary mapping the names of the fields to be extracted (as
+        given in the comment string, and used as the names of the attributes)
+        to the value type (e.g. {"height" : float}), or to |None| to store
+        the values as given in the comment string.
+    """
+    for key in field_value_types:
+        if key in comment:
+            break
+    else:
+        return
+    for key, val in _iter_comment_metadata_fields(comment):
+        if key in field_value_types:
+            setattr(item, key, _parse_comment_metadata_value(val, field_value_types[key]))
+
+def _iter_comment_metadata_fields(
+        comment,
+        strip_leading_trailing_spaces=True):
+    """
+    Iterates over the (name, value string) pairs of the metadata fields given
+    in ``comment``.
+    """
     if comment.startswith("&&NHX:"):
         pattern = NHX_COMMENT_FIELD_PATTERN
         comment = comment[6:]
@@ -329,60 +404,76 @@ def parse_comment_metadata_to_annotations(
         comment = comment[1:]
     else:
         # unrecognized metadata pattern
-        return annotations
+        return
     for match_group in pattern.findall(comment):
         key, val = match_group[:2]
         if strip_leading_trailing_spaces:
             key = key.strip()
             val = val.strip()
-        if key in field_value_types:
-            value_type = field_value_types[key]
-        else:
-            value_type = None
-        if val.startswith('{'):
-            if value_type is not None:
-                val = [value_type(v) for v in val[1:-1].split(',')]
-            else:
-                val = val[1:-1].split(',')
-        elif val.startswith('"') and val.endswith('"'):
-            val = val[1:-1]
-        elif val.lower() == "false":
-            val = False
-        elif val.lower() == "true":
-            val = True
+        yield key, val
+
+def _parse_comment_metadata_value(val, value_type=None):
+    if val.startswith('{'):
+        if value_type is not None:
+            val = [value_type(v) for v in val[1:-1].split(',')]
         else:
-            if value_type is not None:
-                val = value_type(val)
-        if key in field_name_map:
-            key = field_name_map[key]
-        annote = basemodel.Annotation(
-                name=key,
-                value=val,
-                # datatype_hint=datatype_hint,
-                # name_prefix=name_prefix,
-                # namespace=namespace,
-                # name_is_prefixed=name_is_prefixed,
-                # is_attribute=False,
-                # annotate_as_reference=annotate_as_reference,
-                # is_hidden=is_hidden,
-                )
-        annotations.add(annote)
-    return annotations
+            val = val[1:-1].split(',')
+    elif val.startswith('"') and val.endswith('"'):
+        val = val[1:-1]
+    elif val.lower() == "false":
+        val = False
+    elif val.lower() == "true":
+        val = True
+    else:
+        if value_type is not None:
+            val = value_type(val)
+    return val
 
 def process_comments_for_item(item,
         item_comments,
-        extract_comment_metadata):
+        extract_comment_metadata,
+        defer_comment_metadata=False,
+        comment_metadata_attributes=None):
+    """
+    Stores ``item_comments`` as annotations or comments of ``item``.
+
+    If ``extract_comment_metadata`` is |True|, metadata comments (i.e.,
+    comments beginning with '&') are parsed into annotations of ``item``
+    (or stored as comments if no metadata can be parsed from them). If
+    ``defer_comment_metadata`` is also |True|, then the comments are kept
+    unparsed until the annotations of ``item`` are first accessed. If
+    ``comment_metadata_attributes`` is given, then the values of the
+    metadata fields that it lists are also set as attributes of ``item``
+    (see :func:`parse_comment_metadata_to_attributes`).
+    """
     if not item_comments or item is None:
         return
     for comment in item_comments:
-        if extract_comment_metadata and comment.startswith("&"):
-            annotations = parse_comment_metadata_to_annotations(comment)
-            if annotations:
-                item.annotations.update(annotations)
-            else:
-                item.comments.append(comment)
-        else:
-            item.comments.append(comment)
+        if comment.startswith("&"):
+            if comment_metadata_attributes:
+                parse_comment_metadata_to_attributes(item,
+                        comment,
+                        comment_metadata_attributes)
+            if extract_comment_metadata:
+                if defer_comment_metadata:
+                    item._add_deferred_annotation_source(comment,
+                            process_comment_metadata_for_item)
+                else:
+                    process_comment_metadata_for_item(item, comment)
+                continue
+        item.comments.append(comment)
+
+def process_comment_metadata_for_item(item, comment):
+    """
+    Adds the metadata given in ``comment`` to the annotations of ``item`` or,
+    if no metadata can be parsed from it, adds ``comment`` to the comments of
+    ``item``.
+    """
+    annotations = parse_comment_metadata_to_annotations(comment)
+    if annotations:
+        item.annotations.update(annotations)
+    else:
+        item.comments.append(comment)
 
 ###############################################################################
 ## NEWICK/NEXUS formatting support.
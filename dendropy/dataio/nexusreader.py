@@ -227,6 +227,18 @@ class NexusReader(ioservice.DataReader):
             value'). If |False|, then the comments will not be parsed,
             but will be instead stored directly as elements of the ``comments``
             list attribute of the associated object.
+        defer_comment_metadata : boolean, default: |False|
+            If |True|, and ``extract_comment_metadata`` is |True|, then the
+            metadata comments of trees and nodes are stored unparsed, and
+            only parsed into annotations when the ``annotations`` (or
+            ``has_annotations``) attribute of the corresponding object is
+            first accessed.
+        comment_metadata_attributes : list or dict, default: |None|
+            If given, then the values of the listed fields of the metadata
+            comments of nodes are set as attributes of the nodes. If a
+            dictionary is given, then the keys should be the field names and
+            the values the types of the field values (e.g., ``{"height":
+            float}``). See |NewickReader| for details.
         store_tree_weights : boolean, default: |False|
             If |True|, process the tree weight (e.g. "[&W 1/2]") comment
             associated with each tree, if any. Defaults to |False|.
@@ -256,6 +268,11 @@ class NexusReader(ioservice.DataReader):
         terminating_semicolon_required : boolean, default: |True|
             If |True| [default], then a tree statement that does not end in a
             semi-colon is an error. If |False|, then no error will be raised.
+        fast_tree_parsing : boolean, default: |True|
+            If |True| [default], tree statements that do not have any comments
+            or blank nodes are built directly from the statement text in a
+            single scan. If |False|, all tree statements are processed by the
+            full token-by-token parser.
         unconstrained_taxa_accumulation_mode : bool
             If |True|, then no error is raised even if the number of taxon
             names defined exceeds the number of declared taxa (as specified by
@@ -275,11 +292,13 @@ class NexusReader(ioservice.DataReader):
             namespaces linked to by title but not given in the data file will
             result in error.
         exclude_chars : bool
-            If |False|, then character data will not be read. Defaults to
-            |True|: character data will be read.
+            If |True|, then character data will not be read: CHARACTERS,
+            DATA, SETS, ASSUMPTIONS and CODONS blocks are skipped over without
+            being tokenized. Defaults to |False|: character data will be read.
         exclude_trees : bool
-            If |False|, then tree data will not be read. Defaults to
-            |True|: tree data will be read.
+            If |True|, then tree data will not be read: TREES blocks are
+            skipped over without being tokenized. Defaults to |False|: tree
+            data will be read.
         attached_taxon_namespace : |TaxonNamespace|
             Unify all operational taxonomic unit definitions in this namespace.
         ignore_unrecognized_keyword_arguments : boolean, default: |False|
@@ -309,6 +328,7 @@ class NexusReader(ioservice.DataReader):
         self.preserve_underscores = kwargs.get('preserve_underscores', False)
         self.case_sensitive_taxon_labels = kwargs.get('case_sensitive_taxon_labels', False)
         self.extract_comment_metadata = kwargs.get('extract_comment_metadata', True)
+        self.defer_comment_metadata = kwargs.get('defer_comment_metadata', False)
 
         # As above, but the NEXUS format default is different from the NEWICK
         # default, so this rather convoluted approach
@@ -584,6 +604,8 @@ class NexusReader(ioservice.DataReader):
                             raise self._nexus_error("'BEGIN' found without completion of previous block",
                                     NexusReader.IncompleteBlockError)
                     self._nexus_tokenizer.skip_to_semicolon() # move past END command
+                else:
+                    token = self._consume_to_end_of_block(token)
             elif token == 'BEGIN':
                 raise self._nexus_error("'BEGIN' found without completion of previous block",
                         NexusReader.IncompleteBlockError)
@@ -928,9 +950,16 @@ class NexusReader(ioservice.DataReader):
         state_alphabet = char_block.default_state_alphabet
         first_sequence_defined = None
         if self._interleave:
+            # taxa of the row labels, so that rows of later blocks are not
+            # looked up in the taxon namespace again
+            label_taxa = {}
             try:
                 while token != ";" and not self._nexus_tokenizer.is_eof():
-                    taxon = self._get_taxon(taxon_namespace=taxon_namespace, label=token)
+                    try:
+                        taxon = label_taxa[token]
+                    except KeyError:
+                        taxon = self._get_taxon(taxon_namespace=taxon_namespace, label=token)
+                        label_taxa[token] = taxon
                     self._read_character_states(char_block[taxon], state_alphabet, first_sequence_defined)
                     if first_sequence_defined is None:
                         first_sequence_defined = char_block[taxon]
@@ -975,11 +1004,14 @@ class NexusReader(ioservice.DataReader):
     ###########################################################################
     ## TREE / TREE BLOCK PARSERS
 
-    def _parse_tree_statement(self, tree_factory, taxon_symbol_mapper):
+    def _parse_tree_statement(self, tree_factory, taxon_symbol_mapper, taxon_bitmask_fn=None):
         """
         Processes a TREE command. Assumes that the file reader is
         positioned right after the "TREE" token in a TREE command.
-        Calls on the NewickStatementParser of the trees module.
+        Calls on the NewickStatementParser of the trees module. If
+        ``taxon_bitmask_fn`` is given, then a |SplitBitmaskEncoding| of the
+        tree may be returned instead of a tree (see
+        :meth:`NewickReader._parse_tree_statement()`).
         """
         token = self._nexus_tokenizer.next_token()
         if token == '*':
@@ -992,10 +1024,13 @@ class NexusReader(ioservice.DataReader):
         tree_comments = self._nexus_tokenizer.pull_captured_comments()
         # advance to '('; comments will be processed by newick reader
         self._nexus_tokenizer.next_token()
-        tree = self._build_tree_from_newick_tree_string(tree_factory, taxon_symbol_mapper)
+        tree = self._build_tree_from_newick_tree_string(tree_factory, taxon_symbol_mapper, taxon_bitmask_fn)
+        if isinstance(tree, newickreader.SplitBitmaskEncoding):
+            # tree name and comments are not part of the encoding
+            return tree
         tree.label = tree_name
-        nexusprocessing.process_comments_for_item(tree, pre_tree_comments, self.extract_comment_metadata)
-        nexusprocessing.process_comments_for_item(tree, tree_comments, self.extract_comment_metadata)
+        nexusprocessing.process_comments_for_item(tree, pre_tree_comments, self.extract_comment_metadata, self.defer_comment_metadata)
+        nexusprocessing.process_comments_for_item(tree, tree_comments, self.extract_comment_metadata, self.defer_comment_metadata)
         # if self.extract_comment_metadata:
         #     annotations = nexustokenizer.parse_comment_metadata(tree_comments)
         #     for annote in annotations:
@@ -1010,11 +1045,29 @@ class NexusReader(ioservice.DataReader):
         #     self._nexus_tokenizer.skip_to_semicolon()
         return tree
 
-    def _build_tree_from_newick_tree_string(self, tree_factory, taxon_symbol_mapper):
+    def _skip_tree_statement(self):
+        """
+        Skips over a TREE command without constructing a tree. Assumes that
+        the file reader is positioned right after the "TREE" token in a TREE
+        command. When complete, the current token will be the token
+        immediately following the terminating semi-colon, as with
+        :meth:`_parse_tree_statement()`.
+        """
+        self._nexus_tokenizer.clear_captured_comments()
+        if not self._nexus_tokenizer.skip_statement(";"):
+            raise self._nexus_error("Unexpected end of stream in TREE command",
+                    NexusReader.IncompleteBlockError)
+        token = self._nexus_tokenizer.next_token()
+        while token == ";" and not self._nexus_tokenizer.is_eof():
+            self._nexus_tokenizer.clear_captured_comments()
+            token = self._nexus_tokenizer.next_token()
+
+    def _build_tree_from_newick_tree_string(self, tree_factory, taxon_symbol_mapper, taxon_bitmask_fn=None):
         tree = self.newick_reader._parse_tree_statement(
                 nexus_tokenizer=self._nexus_tokenizer,
                 tree_factory=tree_factory,
-                taxon_symbol_map_fn=taxon_symbol_mapper.require_taxon_for_symbol)
+                taxon_symbol_map_fn=taxon_symbol_mapper.require_taxon_for_symbol,
+                taxon_bitmask_fn=taxon_bitmask_fn)
         return tree
 
     def _parse_translate_statement(self, taxon_namespace, taxon_symbol_mapper=None):
@@ -1222,6 +1275,15 @@ class NexusReader(ioservice.DataReader):
         return positions # make unique and return
 
     def _consume_to_end_of_block(self, token=None):
+        """
+        Skips over the statements of the current block up to its 'END' (or
+        'ENDBLOCK') command, returning the command. Only the first token of
+        each statement is read: the rest of the statement is skipped over by
+        scanning the raw text for its terminating semi-colon (outside of
+        quotes and comments), without tokenizing it, so that large blocks
+        (e.g., character matrices that are not to be read) are skipped
+        quickly.
+        """
         if token:
             token = token.upper()
         else:
@@ -1229,7 +1291,8 @@ class NexusReader(ioservice.DataReader):
         while not (token == 'END' or token == 'ENDBLOCK') \
             and not self._nexus_tokenizer.is_eof() \
             and not token==None:
-            self._nexus_tokenizer.skip_to_semicolon()
+            if not self._nexus_tokenizer.skip_statement(";"):
+                break
             token = self._nexus_tokenizer.next_token_ucase()
         return token
 
@@ -1263,7 +1326,9 @@ class NexusReader(ioservice.DataReader):
         if self._interleave:
             self._nexus_tokenizer.set_capture_eol(True)
         states_to_add = []
-        while len(character_data_vector) + len(states_to_add) < self._file_specified_nchar:
+        num_existing_states = len(character_data_vector)
+        symbol_state_map = state_alphabet.full_symbol_state_map
+        while num_existing_states + len(states_to_add) < self._file_specified_nchar:
             token = self._nexus_tokenizer.require_next_token()
             if token == "{" or token == "(":
                 if token == "{":
@@ -1282,7 +1347,7 @@ class NexusReader(ioservice.DataReader):
                     multistate_tokens.append(token)
                 c = "".join(multistate_tokens)
                 state = self._get_state_for_multistate_tokens(c, multistate_type, state_alphabet)
-                if len(character_data_vector) + len(states_to_add) == self._file_specified_nchar:
+                if num_existing_states + len(states_to_add) == self._file_specified_nchar:
                     raise self._too_many_characters_error(c)
                 states_to_add.append(state)
             elif token == "\r" or token == "\n":
@@ -1291,10 +1356,18 @@ class NexusReader(ioservice.DataReader):
             elif token == ";":
                 raise NexusReader.BlockTerminatedException
             else:
+                states = self._decode_state_symbols(
+                        token,
+                        num_existing_states + len(states_to_add),
+                        symbol_state_map,
+                        first_sequence_defined)
+                if states is not None:
+                    states_to_add.extend(states)
+                    continue
                 for c in token:
                     if c in self._match_char:
                         try:
-                            state = first_sequence_defined[len(character_data_vector) + len(states_to_add)]
+                            state = first_sequence_defined[num_existing_states + len(states_to_add)]
                         except TypeError:
                             exc = self._nexus_error("Cannot dereference MATCHCHAR '{}' on first sequence".format(c), NexusReader.NexusReaderError)
                             exc.__context__ = None # Python 3.0, 3.1, 3.2
@@ -1302,7 +1375,7 @@ class NexusReader(ioservice.DataReader):
                             raise exc
                         except IndexError:
                             exc = self._nexus_error("Cannot dereference MATCHCHAR '{}': current position ({}) exceeds length of first sequence ({})".format(c,
-                                    len(character_data_vector) + len(states_to_add) + 1,
+                                    num_existing_states + len(states_to_add) + 1,
                                     len(first_sequence_defined),
                                     NexusReader.NexusReaderError))
                             exc.__context__ = None # Python 3.0, 3.1, 3.2
@@ -1310,7 +1383,7 @@ class NexusReader(ioservice.DataReader):
                             raise exc
                     else:
                         try:
-                            state = state_alphabet.full_symbol_state_map[c]
+                            state = symbol_state_map[c]
                         except KeyError:
                             exc = self._nexus_error("Unrecognized character state symbol for state alphabet '{}' ({}) : '{}'".format(
                                         state_alphabet.label,
@@ -1320,7 +1393,7 @@ class NexusReader(ioservice.DataReader):
                             exc.__context__ = None # Python 3.0, 3.1, 3.2
                             exc.__cause__ = None # Python 3.3, 3.4
                             raise exc
-                    if len(character_data_vector) + len(states_to_add) == self._file_specified_nchar:
+                    if num_existing_states + len(states_to_add) == self._file_specified_nchar:
                         raise self._too_many_characters_error(c)
                     states_to_add.append(state)
         if self._interleave:
@@ -1328,6 +1401,34 @@ class NexusReader(ioservice.DataReader):
         character_data_vector.extend(states_to_add)
         return character_data_vector
 
+    def _decode_state_symbols(self,
+            symbols,
+            position,
+            symbol_state_map,
+            first_sequence_defined):
+        """
+        Decodes the run of state symbols ``symbols``, starting at character
+        ``position`` of the sequence, in bulk, using the lookup table
+        ``symbol_state_map``, with MATCHCHAR symbols resolved against
+        ``first_sequence_defined``. Returns the list of states, or |None| if
+        the run cannot be decoded in this way (e.g., if it has unrecognized
+        symbols or too many characters), in which case it should be decoded
+        symbol by symbol, so that the error can be reported.
+        """
+        end = position + len(symbols)
+        if end > self._file_specified_nchar:
+            return None
+        match_char = self._match_char
+        try:
+            if match_char.isdisjoint(symbols):
+                return [symbol_state_map[c] for c in symbols]
+            if first_sequence_defined is None or end > len(first_sequence_defined):
+                return None
+            return [first_sequence_defined[position + idx] if c in match_char else symbol_state_map[c]
+                    for idx, c in enumerate(symbols)]
+        except KeyError:
+            return None
+
     def _read_continuous_character_values(self,
             character_data_vector,
             datatype=float,
@@ -41,6 +41,10 @@ class NexusWriter(ioservice.DataWriter):
     Formatter for NEXUS data.
     """
 
+    # Number of values of a character matrix row formatted before being
+    # written to the stream.
+    MATRIX_ROW_CHUNK_SIZE = 1 << 14
+
     def __init__(self, **kwargs):
         """
 
@@ -229,22 +233,8 @@ class NexusWriter(ioservice.DataWriter):
             char_matrices=None,
             global_annotations_target=None):
 
-        # Header
-        stream.write('#NEXUS\n\n')
-
-        # File/Document-level annotations and comments
-        if self.file_comments:
-            self._write_comments(stream, self.file_comments)
-        if global_annotations_target is not None:
-            self._write_item_annotations(stream, global_annotations_target)
-            self._write_item_comments(stream, global_annotations_target)
-
-        # Other blocks
-        if self.preamble_blocks:
-            for block in self.preamble_blocks:
-                stream.write(block)
-                stream.write("\n")
-            stream.write("\n")
+        # Header, file/document-level annotations and comments, other blocks
+        self._write_preamble(stream, global_annotations_target)
 
         # Taxon namespace discovery
         candidate_taxon_namespaces = collections.OrderedDict()
@@ -289,6 +279,27 @@ class NexusWriter(ioservice.DataWriter):
                             tree_list=tree_list)
 
         # Write out remaining
+        self._write_supplemental_blocks(stream)
+
+    def _write_preamble(self, stream, global_annotations_target=None):
+        # Header
+        stream.write('#NEXUS\n\n')
+
+        # File/Document-level annotations and comments
+        if self.file_comments:
+            self._write_comments(stream, self.file_comments)
+        if global_annotations_target is not None:
+            self._write_item_annotations(stream, global_annotations_target)
+            self._write_item_comments(stream, global_annotations_target)
+
+        # Other blocks
+        if self.preamble_blocks:
+            for block in self.preamble_blocks:
+                stream.write(block)
+                stream.write("\n")
+            stream.write("\n")
+
+    def _write_supplemental_blocks(self, stream):
         if self.supplemental_blocks:
             for block in self.supplemental_blocks:
                 stream.write(block)
@@ -323,14 +334,14 @@ class NexusWriter(ioservice.DataWriter):
         else:
             self._newick_writer.taxon_token_map = dict(self.translate_tree_taxa)
         stream.write("        Translate\n")
-        statement = []
+        separator = ""
         for taxon in taxon_namespace:
             label = nexusprocessing.escape_nexus_token(str(taxon.label),
                     preserve_spaces=self.preserve_spaces,
                     quote_underscores=not self.unquoted_underscores)
-            statement.append("             {} {}".format(self._newick_writer.taxon_token_map[taxon], label))
-        statement = ",\n".join(statement)
-        stream.write("{}\n             ;\n".format(statement))
+            stream.write("{}             {} {}".format(separator, self._newick_writer.taxon_token_map[taxon], label))
+            separator = ",\n"
+        stream.write("\n             ;\n")
 
     def _write_trees_block(self, stream, tree_list):
         stream.write("BEGIN TREES;\n")
@@ -340,19 +351,25 @@ class NexusWriter(ioservice.DataWriter):
         self._write_link_to_taxa_block(stream, tree_list.taxon_namespace)
         self._set_and_write_translate_block(stream, tree_list.taxon_namespace)
         for tree_idx, tree in enumerate(tree_list):
-            if tree.label:
-                tree_name = tree.label
-            else:
-                tree_name = str(tree_idx+1)
-            tree_name = nexusprocessing.escape_nexus_token(
-                    tree_name,
-                    preserve_spaces=self.preserve_spaces,
-                    quote_underscores=not self.unquoted_underscores)
-            stream.write("    TREE {} = ".format(tree_name))
-            self._newick_writer._write_tree(stream, tree)
-            stream.write("\n")
+            self._write_tree_statement(stream, tree, tree_idx)
         stream.write("END;\n\n")
 
+    def _write_tree_statement(self, stream, tree, tree_idx):
+        if tree.label:
+            tree_name = tree.label
+        else:
+            tree_name = str(tree_idx+1)
+        self._write_tree_statement_name(stream, tree_name)
+        self._newick_writer._write_tree(stream, tree)
+        stream.write("\n")
+
+    def _write_tree_statement_name(self, stream, tree_name):
+        tree_name = nexusprocessing.escape_nexus_token(
+                tree_name,
+                preserve_spaces=self.preserve_spaces,
+                quote_underscores=not self.unquoted_underscores)
+        stream.write("    TREE {} = ".format(tree_name))
+
     def _write_char_block(self, stream, char_matrix):
         taxon_label_map = collections.OrderedDict()
         for taxon in char_matrix:
@@ -374,20 +391,47 @@ class NexusWriter(ioservice.DataWriter):
         stream.write("    FORMAT {};\n".format(self._compose_format_terms(char_matrix)))
         stream.write("    MATRIX\n")
         if char_matrix.data_type == "continuous":
-            state_value_writer = lambda x : stream.write("{} ".format(self.continuous_character_state_value_format_fn(x)))
+            value_format_fn = lambda x : "{} ".format(self.continuous_character_state_value_format_fn(x))
+            value_cache = None
         else:
-            state_value_writer = lambda x : stream.write("{}".format(self.discrete_character_state_value_format_fn(x)))
+            value_format_fn = lambda x : "{}".format(self.discrete_character_state_value_format_fn(x))
+            # states are formatted only once for the whole matrix
+            value_cache = {}
         max_label_len = max(len(v) for v in taxon_label_map.values())
         for taxon in char_matrix:
             stream.write("        {taxon_label:{field_len}}    ".format(taxon_label=taxon_label_map[taxon],
                 field_len=max_label_len))
-            for state in char_matrix[taxon]:
-                state_value_writer(state)
+            self._write_char_values(stream, char_matrix[taxon].values(), value_format_fn, value_cache)
             stream.write("\n")
         stream.write("    ;\n")
         stream.write("END;\n\n\n")
         self._write_character_subsets(stream, char_matrix)
 
+    def _write_char_values(self, stream, values, value_format_fn, value_cache):
+        """
+        Writes ``values`` (a list) as formatted by ``value_format_fn``, in
+        chunks of ``MATRIX_ROW_CHUNK_SIZE`` values. If ``value_cache`` is not
+        |None|, it is used to map the identity of each value to its formatted
+        string, so that each distinct value (e.g., state) is only formatted
+        once.
+        """
+        chunk_size = NexusWriter.MATRIX_ROW_CHUNK_SIZE
+        for start in range(0, len(values), chunk_size):
+            chunk = values[start:start+chunk_size]
+            if value_cache is None:
+                stream.write("".join([value_format_fn(v) for v in chunk]))
+                continue
+            # keyed by ``id()`` rather than by the values themselves, as
+            # states are hashed by a Python method; the values are referenced
+            # by the matrix for as long as the cache is used
+            try:
+                stream.write("".join(map(value_cache.__getitem__, map(id, chunk))))
+            except KeyError:
+                for v in chunk:
+                    if id(v) not in value_cache:
+                        value_cache[id(v)] = value_format_fn(v)
+                stream.write("".join(map(value_cache.__getitem__, map(id, chunk))))
+
     def _compose_format_terms(self, char_matrix):
         format = []
         if char_matrix.data_type == "dna":
@@ -452,7 +496,7 @@ class NexusWriter(ioservice.DataWriter):
             self._write_comments(stream, item.comments)
 
     def _write_item_annotations(self, stream, item):
-        if not self.suppress_annotations and item.annotations:
+        if not self.suppress_annotations and item.has_annotations:
             a = nexusprocessing.format_item_annotations_as_comments(item,
                     nhx=self.annotations_as_nhx,
                     real_value_format_specifier=self.real_value_format_specifier)
@@ -535,3 +579,91 @@ class NexusWriter(ioservice.DataWriter):
             pos = " ".join("-".join(str(c+1) for c in r) for r in ranges)
             stream.write("    charset {} = {};\n".format(label, pos))
         stream.write("END;\n\n\n")
+
+###############################################################################
+## NexusTreeStreamWriter
+
+class NexusTreeStreamWriter(ioservice.TreeStreamWriter):
+    """
+    Writes trees in NEXUS format one at a time, as the statements of a single
+    "TREES" block.
+
+    The "TAXA" block and the "TRANSLATE" statement (if requested) are written
+    from the taxon namespace before the first tree, and so this must include
+    all the taxa of the trees to be written by the time the first tree is
+    written. The "TREES" block is completed when the writer is closed.
+    """
+
+    def __init__(self, stream, **kwargs):
+        """
+
+        Parameters
+        ----------
+        stream : file or file-like object
+            Destination for data.
+
+        Keyword Arguments
+        -----------------
+
+        taxon_namespace : |TaxonNamespace| instance
+            The operational taxonomic unit concept namespace of the trees to be
+            written. If not specified, then the taxon namespace of the first
+            tree written will be used.
+        flush_interval : int
+            If specified, then the stream is flushed after every
+            ``flush_interval`` trees.
+
+        All other keyword arguments are as for |NexusWriter|.
+        """
+        ioservice.TreeStreamWriter.__init__(self,
+                stream,
+                taxon_namespace=kwargs.pop("taxon_namespace", None),
+                flush_interval=kwargs.pop("flush_interval", None))
+        self._nexus_writer = NexusWriter(**kwargs)
+        self._is_header_written = False
+        self._is_closed = False
+
+    def close(self):
+        if self._is_closed:
+            return
+        self._write_header()
+        self.stream.write("END;\n\n")
+        self._nexus_writer._write_supplemental_blocks(self.stream)
+        self._is_closed = True
+
+    def _write_header(self):
+        if self._is_header_written:
+            return
+        nexus_writer = self._nexus_writer
+        nexus_writer._write_preamble(self.stream)
+        if self.taxon_namespace is not None:
+            nexus_writer.taxon_namespaces_to_write = [self.taxon_namespace]
+            if not nexus_writer.simple and not nexus_writer.suppress_taxa_blocks:
+                nexus_writer._write_taxa_block(self.stream, self.taxon_namespace)
+        self.stream.write("BEGIN TREES;\n")
+        if self.taxon_namespace is not None:
+            nexus_writer._write_link_to_taxa_block(self.stream, self.taxon_namespace)
+            nexus_writer._set_and_write_translate_block(self.stream, self.taxon_namespace)
+        self._is_header_written = True
+
+    def _write_tree(self, tree):
+        self._write_header()
+        self._nexus_writer._write_tree_statement(self.stream, tree, self.num_trees_written)
+
+    def _write_split_bitmasks(self,
+            split_bitmasks,
+            edge_lengths,
+            leafset_bitmask,
+            is_rooted,
+            weight):
+        self._write_header()
+        self._nexus_writer._write_tree_statement_name(self.stream, str(self.num_trees_written+1))
+        self._nexus_writer._newick_writer._write_split_bitmasks(
+                stream=self.stream,
+                split_bitmasks=split_bitmasks,
+                edge_lengths=edge_lengths,
+                leafset_bitmask=leafset_bitmask,
+                is_rooted=is_rooted,
+                weight=weight,
+                taxon_for_bit=self.taxon_for_bit)
+        self.stream.write("\n")
@@ -50,6 +50,24 @@ class NexusTreeDataYielder(
         taxon_namespace : |TaxonNamespace| instance
             The operational taxonomic unit concept namespace to use to manage
             taxon definitions.
+        tree_offset : int
+            Number of trees at the start of each source (e.g., a burn-in) to
+            be skipped over without being built. Trees in all TREES blocks of
+            a source are counted.
+        encode_split_bitmasks : bool
+            If |True|, then, instead of building a tree, the
+            |SplitBitmaskEncoding| of a tree is yielded where this can be
+            calculated directly from its statement (which is typically the
+            case for tree statements without comments).
+        read_ahead : bool or int
+            If |True| or a positive integer, then each source is read (and,
+            if it is a compressed file, decompressed) and decoded by a
+            background thread, up to this many blocks (or a default number
+            of blocks, if |True|) ahead of the parsing of the source.
+        prefetch_files : bool
+            If |True|, then the background reading of each source is started
+            while the preceding source is being parsed (implies
+            ``read_ahead``).
         \*\*kwargs : keyword arguments
             These will be passed directly to the base `nexusreader.NexusReader`
             class. See `nexusreader.NexusReader` for details.
@@ -57,7 +75,11 @@ class NexusTreeDataYielder(
         ioservice.TreeDataYielder.__init__(self,
                 files=files,
                 taxon_namespace=taxon_namespace,
-                tree_type=tree_type)
+                tree_type=tree_type,
+                tree_offset=kwargs.pop("tree_offset", None),
+                encode_split_bitmasks=kwargs.pop("encode_split_bitmasks", False),
+                read_ahead=kwargs.pop("read_ahead", None),
+                prefetch_files=kwargs.pop("prefetch_files", False))
         self.assume_newick_if_not_nexus = kwargs.pop("assume_newick_if_not_nexus", False)
         kwargs["attached_taxon_namespace"] = self.attached_taxon_namespace
         nexusreader.NexusReader.__init__(self, **kwargs)
@@ -73,14 +95,22 @@ class NexusTreeDataYielder(
                 preserve_unquoted_underscores=self.preserve_underscores)
         else:
             self._nexus_tokenizer.set_stream(stream)
+        self._num_trees_to_skip = self.tree_offset
         token = self._nexus_tokenizer.next_token()
         if token.upper() != "#NEXUS":
             if self.assume_newick_if_not_nexus:
                 taxon_symbol_mapper = self._get_taxon_symbol_mapper(taxon_namespace=self.attached_taxon_namespace)
+                while self._num_trees_to_skip > 0:
+                    if not self.newick_reader._skip_tree_statement(
+                            self._nexus_tokenizer,
+                            taxon_symbol_map_fn=taxon_symbol_mapper.require_taxon_for_symbol):
+                        break
+                    self._num_trees_to_skip -= 1
                 while True:
                     tree = self._build_tree_from_newick_tree_string(
                             tree_factory=self.tree_factory,
-                            taxon_symbol_mapper=taxon_symbol_mapper)
+                            taxon_symbol_mapper=taxon_symbol_mapper,
+                            taxon_bitmask_fn=self.taxon_bitmask_fn(self.attached_taxon_namespace))
                     if tree is None:
                         break
                     yield tree
@@ -149,6 +179,7 @@ class NexusTreeDataYielder(
                     taxon_symbol_mapper = self._get_taxon_symbol_mapper(taxon_namespace=taxon_namespace)
                 pre_tree_comments = self._nexus_tokenizer.pull_captured_comments()
                 tree_factory = self.tree_factory
+                taxon_bitmask_fn = self.taxon_bitmask_fn(taxon_namespace)
                 while True:
                     ## After the following, the current token
                     ## will be the token immediately following
@@ -156,10 +187,15 @@ class NexusTreeDataYielder(
                     ## statement. Typically, this will be
                     ## 'TREE' if there is another tree, or
                     ## 'END'/'ENDBLOCK'.
-                    tree = self._parse_tree_statement(
-                            tree_factory=tree_factory,
-                            taxon_symbol_mapper=taxon_symbol_mapper)
-                    yield tree
+                    if self._num_trees_to_skip > 0:
+                        self._skip_tree_statement()
+                        self._num_trees_to_skip -= 1
+                    else:
+                        tree = self._parse_tree_statement(
+                                tree_factory=tree_factory,
+                                taxon_symbol_mapper=taxon_symbol_mapper,
+                                taxon_bitmask_fn=taxon_bitmask_fn)
+                        yield tree
                     if self._nexus_tokenizer.is_eof() or not self._nexus_tokenizer.current_token:
                         break
                     if self._nexus_tokenizer.cast_current_token_to_ucase() != "TREE":
@@ -0,0 +1,411 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+On-disk cache of the data objects parsed from files, stored in the DendroPy
+binary format so that, as long as a file is unchanged, reading it again
+rebuilds the objects from their compact stored form without the file being
+tokenized.
+"""
+
+import os
+import sys
+import hashlib
+import tempfile
+from dendropy.utility import textprocessing
+
+DEFAULT_MAX_SIZE = 1 << 30
+CACHE_DIR_ENVAR = "DENDROPY_PARSE_CACHE_DIR"
+
+# Keyword arguments that do not affect the parsing of a source, but are
+# passed on when the objects are rebuilt from the cache.
+_PASS_THROUGH_KEYWORDS = frozenset(["taxon_namespace", "taxon_set"])
+_KEY_VALUE_TYPES = (type(None), bool, int, float)
+
+def get_default_cache_dir():
+    """
+    Returns the directory given by the environmental variable
+    'DENDROPY_PARSE_CACHE_DIR' or, if this is not set, the 'dendropy'
+    subdirectory of the user cache directory.
+    """
+    cache_dir = os.environ.get(CACHE_DIR_ENVAR, None)
+    if cache_dir:
+        return cache_dir
+    user_cache_dir = os.environ.get("XDG_CACHE_HOME", None)
+    if not user_cache_dir:
+        user_cache_dir = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(user_cache_dir, "dendropy", "parse-cache")
+
+def _has_populated_taxon_namespace(kwargs):
+    taxon_namespace = kwargs.get("taxon_namespace", None)
+    if taxon_namespace is None:
+        taxon_namespace = kwargs.get("taxon_set", None)
+    return taxon_namespace is not None and len(taxon_namespace) > 0
+
+def _is_key_value(value):
+    if isinstance(value, _KEY_VALUE_TYPES) or textprocessing.is_str_type(value):
+        return True
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return all(_is_key_value(v) for v in value)
+    if isinstance(value, dict):
+        return all(_is_key_value(k) and _is_key_value(v) for k, v in value.items())
+    return False
+
+def _key_value_repr(value):
+    if isinstance(value, dict):
+        return "{" + ", ".join(sorted("{}: {}".format(_key_value_repr(k), _key_value_repr(v)) for k, v in value.items())) + "}"
+    if isinstance(value, (set, frozenset)):
+        return "{" + ", ".join(sorted(_key_value_repr(v) for v in value)) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(_key_value_repr(v) for v in value) + "]"
+    return repr(value)
+
+def _has_unstorable_content(data_object):
+    """
+    Returns |True| if ``data_object`` (a |Tree|, |TreeList|, |CharacterMatrix|
+    or |DataSet|) has comments, character subsets or types of characters,
+    which are not stored in the binary format.
+    """
+    from dendropy.datamodel import treemodel
+    from dendropy.datamodel import treecollectionmodel
+    from dendropy.datamodel import charmatrixmodel
+    from dendropy.datamodel import datasetmodel
+    if data_object.comments:
+        return True
+    if isinstance(data_object, datasetmodel.DataSet):
+        for taxon_namespace in data_object.taxon_namespaces:
+            if taxon_namespace.comments or any(taxon.comments for taxon in taxon_namespace):
+                return True
+        return any(_has_unstorable_content(x)
+                for x in list(data_object.tree_lists) + list(data_object.char_matrices))
+    taxon_namespace = data_object.taxon_namespace
+    if taxon_namespace.comments or any(taxon.comments for taxon in taxon_namespace):
+        return True
+    if isinstance(data_object, charmatrixmodel.CharacterMatrix):
+        if data_object.character_subsets or data_object.character_types:
+            return True
+        for taxon in data_object:
+            if any(t is not None for t in data_object[taxon]._character_types):
+                return True
+        return False
+    if isinstance(data_object, treemodel.Tree):
+        trees = [data_object]
+    elif isinstance(data_object, treecollectionmodel.TreeList):
+        trees = data_object
+    else:
+        return False
+    for tree in trees:
+        if tree.comments:
+            return True
+        for nd in tree.preorder_node_iter():
+            if nd.has_comments or nd.edge.has_comments:
+                return True
+    return False
+
+class ParseCache(object):
+    """
+    A directory of the data objects parsed from files, each stored in the
+    DendroPy binary format under a key derived from the path, size and
+    modification time of the file, the schema, the type of the object
+    and the keyword arguments given to the reader, so that an entry is not
+    used once the file is modified or if the file is read differently.
+
+    Entries are evicted in least-recently-used order once the total size
+    of the entries exceeds ``max_size``. As the binary format does not
+    store comments, character subsets or types of characters, objects that
+    have any of these are not cached, but parsed whenever they are read
+    (trees read into a |TreeArray|, which does not keep these, are cached
+    regardless). Objects read into a taxon namespace that already has taxa
+    are neither cached nor rebuilt from the cache, as the taxa of the source
+    would be mapped onto these by each reader in its own way. The trees
+    read into a |TreeArray| from the cache are mapped onto the taxa of its
+    taxon namespace by label, ignoring case unless
+    ``case_sensitive_taxon_labels`` is given as |True| (as with the NEXUS,
+    NEWICK and NeXML readers).
+    """
+
+    ENTRY_FILE_EXTENSION = ".dpy"
+    FORMAT_VERSION = 1
+
+    def __init__(self, cache_dir=None, max_size=DEFAULT_MAX_SIZE):
+        """
+        Parameters
+        ----------
+        cache_dir : str
+            Directory of the entries of the cache (created if it does not
+            exist). Defaults to the directory given by
+            :func:`get_default_cache_dir()`.
+        max_size : int
+            Maximum total size, in bytes, of the entries of the cache.
+        """
+        if cache_dir is None:
+            cache_dir = get_default_cache_dir()
+        self.cache_dir = os.path.abspath(os.path.expandvars(os.path.expanduser(cache_dir)))
+        self.max_size = max_size
+
+    def entry_key(self, path, schema, data_type, kwargs):
+        """
+        Returns the key of the entry of the objects of type ``data_type``
+        parsed from the file at ``path`` in ``schema`` with (parsing) keyword
+        arguments ``kwargs``, or |None| if the parse cannot be cached because
+        some of the keyword arguments are not simple values (e.g., are
+        functions).
+        """
+        key_kwargs = {}
+        for kw, value in kwargs.items():
+            if kw in _PASS_THROUGH_KEYWORDS:
+                continue
+            if not _is_key_value(value):
+                return None
+            key_kwargs[kw] = value
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        key = "\n".join([
+            str(ParseCache.FORMAT_VERSION),
+            path,
+            str(st.st_size),
+            repr(getattr(st, "st_mtime_ns", st.st_mtime)),
+            schema.lower(),
+            "{}.{}".format(data_type.__module__, data_type.__name__),
+            _key_value_repr(key_kwargs),
+            ])
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.cache_dir, key + ParseCache.ENTRY_FILE_EXTENSION)
+
+    def lookup(self, key):
+        """
+        Returns the path of the entry of ``key``, marking it as used, or
+        |None| if there is no such entry.
+        """
+        path = self.entry_path(key)
+        try:
+            os.utime(path, None)
+        except OSError:
+            return None
+        return path
+
+    def store(self, key, data_object):
+        """
+        Stores ``data_object`` (a |Tree|, |TreeList|, |TreeArray| or
+        |CharacterMatrix|) as the entry of ``key``, evicting the least
+        recently used entries as needed. Returns the path of the entry, or
+        |None| if the object cannot be stored in the binary format (or not
+        without losing its comments, character subsets or types of
+        characters) or is too large to be stored.
+        """
+        if _has_unstorable_content(data_object):
+            return None
+        self._ensure_cache_dir()
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            data_object.write(path=temp_path, schema="dendropy-binary")
+            return self._commit_entry(key, temp_path)
+        except ValueError:
+            # e.g., character matrices with multiple state alphabets, or
+            # annotations that cannot be stored exactly
+            os.remove(temp_path)
+            return None
+        except:
+            os.remove(temp_path)
+            raise
+
+    def _ensure_cache_dir(self):
+        if not os.path.isdir(self.cache_dir):
+            try:
+                os.makedirs(self.cache_dir)
+            except OSError:
+                if not os.path.isdir(self.cache_dir):
+                    raise
+
+    def _commit_entry(self, key, temp_path):
+        """
+        Makes the file at ``temp_path`` the entry of ``key`` (or removes it if
+        it is larger than the maximum size of the cache), evicting the least
+        recently used entries as needed. Returns the path of the entry, or
+        |None| if it is too large.
+        """
+        if os.path.getsize(temp_path) > self.max_size:
+            os.remove(temp_path)
+            return None
+        path = self.entry_path(key)
+        if sys.version_info.major >= 3:
+            os.replace(temp_path, path)
+        else:
+            os.rename(temp_path, path)
+        self.evict()
+        return path
+
+    def _entries(self):
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(ParseCache.ENTRY_FILE_EXTENSION):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def size(self):
+        """
+        Returns the total size, in bytes, of the entries of the cache.
+        """
+        return sum(size for mtime, size, path in self._entries())
+
+    def evict(self, max_size=None):
+        """
+        Removes the least recently used entries until the total size of the
+        entries is not greater than ``max_size`` (defaults to
+        ``self.max_size``).
+        """
+        if max_size is None:
+            max_size = self.max_size
+        entries = sorted(self._entries())
+        total_size = sum(size for mtime, size, path in entries)
+        for mtime, size, path in entries:
+            if total_size <= max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
+
+    def clear(self):
+        """
+        Removes all the entries of the cache.
+        """
+        self.evict(max_size=0)
+
+    def get_from_path(self, data_type, src, schema, kwargs):
+        """
+        Returns the object of type ``data_type`` (a class derived from
+        |Deserializable|) parsed from the file at ``src``, as rebuilt from
+        its entry if there is one, or as parsed (and stored in a new entry)
+        otherwise.
+        """
+        if _has_populated_taxon_namespace(kwargs):
+            return data_type.get_from_path(src, schema, **kwargs)
+        key = self.entry_key(src, schema, data_type, kwargs)
+        if key is None:
+            return data_type.get_from_path(src, schema, **kwargs)
+        path = self.lookup(key)
+        if path is None:
+            data_object = data_type.get_from_path(src, schema, **kwargs)
+            if data_object is not None:
+                self.store(key, data_object)
+            return data_object
+        return data_type.get_from_path(path, "dendropy-binary", **self._pass_through_kwargs(kwargs))
+
+    def read_tree_array_from_path(self, tree_array, src, schema, kwargs):
+        """
+        Adds the trees of the file at ``src`` to ``tree_array``, as read from
+        their entry if there is one, or as parsed (and stored in a new entry)
+        otherwise. Sources larger than the maximum size of the cache are not
+        cached, so as not to be parsed twice.
+        """
+        encode_split_bitmasks = kwargs.pop("encode_split_bitmasks", None)
+        key = self.entry_key(src, schema, type(tree_array), kwargs)
+        if key is not None:
+            path = self.lookup(key)
+            if path is None and os.path.getsize(src) <= self.max_size:
+                from dendropy.datamodel import taxonmodel
+                taxon_namespace = taxonmodel.TaxonNamespace()
+                path = self.store_trees(key,
+                        tree_array.tree_type.yield_from_files(
+                            files=[src],
+                            schema=schema,
+                            taxon_namespace=taxon_namespace,
+                            **kwargs),
+                        taxon_namespace)
+            if path is not None:
+                tree_array.read_from_files([path], "dendropy-binary",
+                        encode_split_bitmasks=encode_split_bitmasks,
+                        case_sensitive_taxon_labels=kwargs.get("case_sensitive_taxon_labels", False))
+                return
+        # not cached: the trees are read directly (again, if they could not
+        # be stored)
+        tree_array.read_from_files([src], schema,
+                encode_split_bitmasks=encode_split_bitmasks,
+                **kwargs)
+
+    def store_trees(self, key, tree_yielder, taxon_namespace):
+        """
+        Stores the trees yielded by ``tree_yielder`` (a |TreeDataYielder| of
+        trees that reference ``taxon_namespace``) as the entry of ``key``,
+        one tree at a time, evicting the least recently used entries as
+        needed. The trees are stored as parsed (rather than as a tree array,
+        from which trees are rebuilt without the lengths of their leaf
+        edges), and so are subject to the settings of the tree array that
+        reads them from the entry. Returns the path of the entry, or |None|
+        if the trees cannot be stored in the binary format or are too large
+        to be stored (in which case storing stops as soon as this is known).
+        """
+        from dendropy.dataio import binarywriter
+        self._ensure_cache_dir()
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as dest:
+                writer = binarywriter.BinaryTreeStreamWriter(dest,
+                        taxon_namespace=taxon_namespace)
+                try:
+                    for tree in tree_yielder:
+                        writer.write_tree(tree)
+                        if writer.spooled_size > self.max_size:
+                            break
+                    else:
+                        writer.close()
+                finally:
+                    writer.discard()
+            if writer.spooled_size > self.max_size:
+                os.remove(temp_path)
+                return None
+            return self._commit_entry(key, temp_path)
+        except ValueError:
+            # e.g., annotations that cannot be stored exactly
+            os.remove(temp_path)
+            return None
+        except:
+            os.remove(temp_path)
+            raise
+
+    def _pass_through_kwargs(self, kwargs):
+        return dict((kw, value) for kw, value in kwargs.items() if kw in _PASS_THROUGH_KEYWORDS)
+
+def get_parse_cache(parse_cache):
+    """
+    Returns ``parse_cache`` if it is a |ParseCache|; otherwise, the cache in
+    the directory ``parse_cache`` if it is a string, or in the default
+    directory (see :func:`get_default_cache_dir()`) if it is |True|.
+    """
+    if isinstance(parse_cache, ParseCache):
+        return parse_cache
+    if parse_cache is True:
+        return ParseCache()
+    if textprocessing.is_str_type(parse_cache):
+        return ParseCache(cache_dir=parse_cache)
+    raise TypeError("'parse_cache' must be a ParseCache, a directory path or True, but found: {}".format(parse_cache))
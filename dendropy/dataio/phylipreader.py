@@ -22,8 +22,8 @@ Implementation of PHYLIP-format data reader.
 
 
 import re
+import itertools
 from dendropy.dataio import ioservice
-from dendropy.utility import filesys
 from dendropy.utility import error
 
 class PhylipReader(ioservice.DataReader):
@@ -53,6 +53,10 @@ class PhylipReader(ioservice.DataReader):
         def __init__(self, *args, **kwargs):
             error.DataParseError.__init__(self, *args, **kwargs)
 
+    # Number of symbols (of all rows) of interleaved data read before they
+    # are decoded.
+    MAX_PENDING_SYMBOLS = 1 << 22
+
     def __init__(self, **kwargs):
         """
         Keyword Arguments
@@ -123,6 +127,7 @@ class PhylipReader(ioservice.DataReader):
         self.nchar = None
         self.char_matrix = None
         self.taxon_namespace = None
+        self._symbol_state_map = None
 
     def describe_mode(self):
         parts = []
@@ -142,6 +147,7 @@ class PhylipReader(ioservice.DataReader):
         self.char_matrix = None
         self.taxon_namespace = None
         self.stream = None
+        self._symbol_state_map = None
 
     def _read(self,
             stream,
@@ -174,20 +180,23 @@ class PhylipReader(ioservice.DataReader):
                     gap_symbol="-",
                     case_sensitive=False)
                 self.char_matrix.state_alphabets.append(state_alphabet)
-        lines = filesys.get_lines(stream)
-        if len(lines) == 0:
-            raise error.DataSourceError("No data in source", stream=self.stream)
-        elif len(lines) <= 2:
+        lines = self._iter_lines(stream)
+        desc_line = next(lines, None)
+        first_line = next(lines, None)
+        if desc_line is None or first_line is None:
             raise error.DataParseError("Expecting at least 2 lines in PHYLIP format data source", stream=self.stream)
-        desc_line = lines[0]
-        lines = lines[1:]
-        m = re.match('\s*(\d+)\s+(\d+)\s*$', desc_line)
+        lines = itertools.chain([first_line], lines)
+        m = re.match(r'\s*(\d+)\s+(\d+)\s*$', desc_line)
         if m is None:
-            raise self._data_parse_error("Invalid data description line: '%s'" % desc_line)
+            raise self._data_parse_error("Invalid data description line: '%s'" % desc_line.rstrip())
         self.ntax = int(m.groups()[0])
         self.nchar = int(m.groups()[1])
         if self.ntax == 0 or self.nchar == 0:
-            raise error.DataSourceError("No data in source", stream=self.stream)
+            raise error.DataParseError("No data in source", stream=self.stream)
+        if self.data_type == "continuous":
+            self._symbol_state_map = None
+        else:
+            self._symbol_state_map = self.char_matrix.default_state_alphabet.full_symbol_state_map
         if self.interleaved:
             self._parse_interleaved(lines)
         else:
@@ -198,6 +207,22 @@ class PhylipReader(ioservice.DataReader):
                 char_matrices=[self.char_matrix])
         return product
 
+    def _iter_lines(self, stream):
+        """
+        Yields the lines of ``stream`` one at a time (so that the source is
+        not read into memory as a whole), dealing with all line break
+        conventions.
+        """
+        for line in stream:
+            if "\r" in line:
+                parts = re.split(r'\r\n|\n|\r', line)
+                if not parts[-1]:
+                    parts.pop()
+                for part in parts:
+                    yield part
+            else:
+                yield line
+
     def _parse_taxon_from_line(self, line, line_index):
         if self.strict:
             seq_label = line[:10].strip()
@@ -223,14 +248,46 @@ class PhylipReader(ioservice.DataReader):
         else:
             if len(self.char_matrix[current_taxon]) >= self.nchar:
                 raise self._data_parse_error("Cannot add characters to sequence for taxon '%s': already has declared number of characters (%d)" \
-                        % (current_taxon.label, self.char_matrix[current_taxon]), line_index=line_index)
+                        % (current_taxon.label, self.nchar), line_index=line_index)
         return current_taxon, line
 
-    def _parse_sequence_from_line(self, current_taxon, line, line_index):
-        if self.data_type == "continuous":
-            for c in line.split():
-                if not c:
-                    continue
+    def _split_symbols(self, line):
+        """
+        Returns the symbols of ``line`` with whitespace removed: as a string
+        of state symbols or, for continuous data, as a list of value tokens.
+        """
+        if self._symbol_state_map is None:
+            return line.split()
+        return "".join(line.split())
+
+    def _add_states(self, current_taxon, sequence, pending):
+        """
+        Decodes the runs of symbols in ``pending`` (a list of tuples of the
+        index of a line and the symbols read from it for ``current_taxon``)
+        and adds the states to ``sequence``. The runs are joined and decoded
+        in bulk; if this fails, they are decoded symbol by symbol so that
+        invalid symbols can be reported (with their line) or ignored.
+        """
+        if len(pending) == 1:
+            symbols = pending[0][1]
+        elif self._symbol_state_map is None:
+            symbols = [value for line_index, values in pending for value in values]
+        else:
+            symbols = "".join([s for line_index, s in pending])
+        try:
+            if self._symbol_state_map is None:
+                states = [float(value) for value in symbols]
+            else:
+                states = list(map(self._symbol_state_map.__getitem__, symbols))
+        except (KeyError, ValueError):
+            for line_index, symbols in pending:
+                self._parse_sequence_from_symbols(current_taxon, sequence, symbols, line_index)
+        else:
+            sequence.extend(states)
+
+    def _parse_sequence_from_symbols(self, current_taxon, sequence, symbols, line_index):
+        if self._symbol_state_map is None:
+            for c in symbols:
                 try:
                     state = float(c)
                 except ValueError:
@@ -238,58 +295,87 @@ class PhylipReader(ioservice.DataReader):
                         raise self._data_parse_error("Invalid state for taxon '%s': '%s'" % (current_taxon.label, c),
                                 line_index=line_index)
                 else:
-                    self.char_matrix[current_taxon].append(state)
+                    sequence.append(state)
         else:
-            for c in line:
-                if c in [' ', '\t']:
-                    continue
+            for c in symbols:
                 try:
-                    state = self.char_matrix.default_state_alphabet[c]
+                    state = self._symbol_state_map[c]
                 except KeyError:
                     if not self.ignore_invalid_chars:
                         raise self._data_parse_error("Invalid state symbol for taxon '%s': '%s'" % (current_taxon.label, c),
                                 line_index=line_index)
                 else:
-                    self.char_matrix[current_taxon].append(state)
+                    sequence.append(state)
 
-    def _parse_sequential(self, lines, line_num_start=1):
-        seq_labels = []
+    def _parse_sequential(self, lines):
         current_taxon = None
+        sequence = None
+        pending = []
+        num_pending = 0
         for line_index, line in enumerate(lines):
             line = line.rstrip()
             if line == '':
                 continue
             if current_taxon is None:
-                seq_label = None
                 current_taxon, line = self._parse_taxon_from_line(line, line_index)
-                # if current_taxon not in self.char_matrix and len(self.char_matrix.taxon_namespace) >= self.ntax:
-                #     raise self._data_parse_error("Cannot add new sequence %s: declared number of sequences (%d) already defined" \
-                #                 % (current_taxon, len(self.char_matrix.taxon_namespace)), line_index=line_index)
-            self._parse_sequence_from_line(current_taxon, line, line_index)
-            if len(self.char_matrix[current_taxon]) >= self.nchar:
-                current_taxon = None
+                sequence = self.char_matrix[current_taxon]
+            symbols = self._split_symbols(line)
+            pending.append((line_index, symbols))
+            num_pending += len(symbols)
+            if len(sequence) + num_pending >= self.nchar:
+                # the lines of the sequence are joined and decoded at once;
+                # if invalid symbols were ignored, the sequence is continued
+                # on the following lines
+                self._add_states(current_taxon, sequence, pending)
+                pending = []
+                num_pending = 0
+                if len(sequence) >= self.nchar:
+                    current_taxon = None
+        if pending:
+            self._add_states(current_taxon, sequence, pending)
 
-    def _parse_interleaved(self, lines, line_num_start=1):
-        seq_labels = []
-        current_taxon = None
+    def _parse_interleaved(self, lines):
+        # taxa, sequences and pending runs of symbols of the rows of each
+        # block; the runs are decoded in bulk once there are more than
+        # ``MAX_PENDING_SYMBOLS`` of them across all the rows (and at the
+        # end), so that memory usage does not depend on the size of the data
+        row_taxa = []
+        row_sequences = []
+        row_pending = []
+        num_pending = 0
         paged = False
         paged_row = -1
         for line_index, line in enumerate(lines):
-            current_taxon = None
             line = line.rstrip()
             if line == '':
                 continue
             paged_row += 1
             if paged_row >= self.ntax:
                 paged_row = 0
-            if paged:
-                current_taxon = self.char_matrix.taxon_namespace[paged_row]
-            else:
+            if not paged:
                 current_taxon, line = self._parse_taxon_from_line(line, line_index)
-                if len(self.char_matrix.taxon_namespace) == self.ntax:
+                row_taxa.append(current_taxon)
+                row_sequences.append(self.char_matrix[current_taxon])
+                row_pending.append([])
+                if len(row_taxa) == self.ntax:
                     paged = True
                     paged_row = -1
-            self._parse_sequence_from_line(current_taxon, line, line_index)
+                row = len(row_taxa) - 1
+            else:
+                row = paged_row
+            symbols = self._split_symbols(line)
+            row_pending[row].append((line_index, symbols))
+            num_pending += len(symbols)
+            if num_pending >= PhylipReader.MAX_PENDING_SYMBOLS:
+                self._add_pending_rows(row_taxa, row_sequences, row_pending)
+                num_pending = 0
+        self._add_pending_rows(row_taxa, row_sequences, row_pending)
+
+    def _add_pending_rows(self, row_taxa, row_sequences, row_pending):
+        for row, pending in enumerate(row_pending):
+            if pending:
+                self._add_states(row_taxa[row], row_sequences[row], pending)
+                row_pending[row] = []
 
     def _data_parse_error(self, message, line_index=None):
         if line_index is None:
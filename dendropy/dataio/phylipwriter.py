@@ -127,3 +127,96 @@ class PhylipWriter(ioservice.DataWriter):
                     taxon_label_map[t] = label.ljust(STRICT_MODE_MAX_LABEL_LENGTH)
         return taxon_label_map
 
+
+class PhylipSequenceStreamWriter(ioservice.SequenceStreamWriter):
+    """
+    Writes sequences in PHYLIP (sequential) format one at a time.
+
+    If the number of sequences or the number of characters are not given,
+    then space for the data description line is reserved at the start of the
+    data, and the line is written in when the writer is closed. This requires
+    a stream that supports random access (e.g., a file, but not standard
+    output).
+    """
+
+    HEADER_WIDTH = 40
+
+    def __init__(self, stream, **kwargs):
+        """
+
+        Parameters
+        ----------
+        stream : file or file-like object
+            Destination for data.
+
+        Keyword Arguments
+        -----------------
+
+        ntax : int
+            Number of sequences to be written.
+        nchar : int
+            Number of characters of each sequence. If not given, then this
+            is taken to be the length of the first sequence written.
+        state_alphabet : |StateAlphabet| instance
+            If specified, then sequences that are not given as strings of
+            symbols are taken to be iterables of the indexes of their states
+            in this alphabet.
+        strict : bool
+            If |True|, use 'strict' format, i.e., taxon labels given in
+            first 10 characters, followed by sequence starting at character 11.
+            Default is |False|: use 'relaxed' format, with arbitrary-length
+            taxon labels separated from sequences by two spaces.
+        spaces_to_underscores : bool
+            If |True|, all spaces will be converted to underscores. Default is
+            |False|: spaces will be preserved.
+        ignore_unrecognized_keyword_arguments : boolean, default: |False|
+            If |True|, then unsupported or unrecognized keyword arguments will
+            not result in an error. Default is |False|: unsupported keyword
+            arguments will result in an error.
+        """
+        ioservice.SequenceStreamWriter.__init__(self,
+                stream,
+                state_alphabet=kwargs.pop("state_alphabet", None))
+        self.ntax = kwargs.pop("ntax", None)
+        self.nchar = kwargs.pop("nchar", None)
+        self.strict = kwargs.pop("strict", False)
+        self.spaces_to_underscores = kwargs.pop("spaces_to_underscores", False)
+        self.check_for_unused_keyword_arguments(kwargs)
+        if self.ntax is not None and self.nchar is not None:
+            self._header_position = None
+            self.stream.write("%d %d\n" % (self.ntax, self.nchar))
+        else:
+            try:
+                self._header_position = self.stream.tell()
+            except (AttributeError, IOError, ValueError):
+                raise ValueError("Number of sequences ('ntax') and characters ('nchar') must be given if the stream does not support random access")
+            self.stream.write(" " * self.HEADER_WIDTH + "\n")
+
+    def _write_sequence(self, label, symbols):
+        if self.nchar is None:
+            self.nchar = len(symbols)
+        elif len(symbols) != self.nchar:
+            raise ValueError("Sequence '{}' has {} characters, but expecting {}".format(label, len(symbols), self.nchar))
+        if self.ntax is not None and self.num_sequences_written >= self.ntax:
+            raise ValueError("Cannot write sequence '{}': declared number of sequences ({}) already written".format(label, self.ntax))
+        label = str(label)
+        if self.spaces_to_underscores:
+            label = label.replace(' ', '_')
+        if self.strict:
+            label = label[:STRICT_MODE_MAX_LABEL_LENGTH].ljust(STRICT_MODE_MAX_LABEL_LENGTH)
+            spacer = ""
+        else:
+            spacer = "  "
+        self.stream.write("%s%s%s\n" % (label, spacer, symbols))
+
+    def close(self):
+        if self.ntax is not None and self.num_sequences_written != self.ntax:
+            raise ValueError("Expecting {} sequences, but {} were written".format(self.ntax, self.num_sequences_written))
+        if self._header_position is None:
+            return
+        end_position = self.stream.tell()
+        self.stream.seek(self._header_position)
+        self.stream.write(("%d %d" % (self.num_sequences_written, self.nchar or 0)).ljust(self.HEADER_WIDTH))
+        self.stream.seek(end_position)
+        self._header_position = None
+
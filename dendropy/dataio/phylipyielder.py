@@ -0,0 +1,245 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+Implementation of PHYLIP-format sequence iterator.
+"""
+
+import re
+from dendropy.dataio import ioservice
+from dendropy.dataio import phylipreader
+from dendropy.utility import error
+
+class PhylipSequenceDataYielder(ioservice.SequenceDataYielder):
+
+    def __init__(self,
+            files=None,
+            **kwargs):
+        """
+
+        Parameters
+        ----------
+        files : iterable of sources
+            Iterable of sources, which can either be strings specifying file
+            paths or file-like objects open for reading. If a source element is
+            a string, then it is assumed to be a path to a file. Otherwise, the
+            source is assumed to be a file-like object.
+
+        Keyword Arguments
+        -----------------
+        state_alphabet : |StateAlphabet| instance
+            If specified, then sequences are yielded as arrays of the indexes
+            of their states in this alphabet. Default is |None|: sequences
+            are yielded as strings of their symbols.
+        data_type : str
+            If specified (and ``state_alphabet`` is not), then sequences are
+            yielded as strings of their symbols after checking that the
+            symbols are recognized by the (fixed) state alphabet of this
+            character data type: "dna", "rna", "protein", "restriction", or
+            "infinite". If "continuous", then the values of each sequence
+            are given as whitespace-separated tokens, and sequences are
+            yielded as lists of (float) values.
+        strict : bool
+            If |True|, then data is given in 'strict' format, where first 10
+            characters are the taxon label and remaining characters are the sequence.
+            Default is |False|: relaxed format, where taxon labels are of
+            arbitrary length and separation of sequences are is by one or more (if
+            ``multispace_delimiter`` is |False|) or two or more (if
+            ``multispace_delimiter`` is |True|) spaces.
+        interleaved : bool
+            If |True|, then data is in interleaved format. As the last part
+            of a sequence is only given at the end of the source, sequences are
+            only yielded once the entire source has been read (but the
+            symbols are still not resolved into a matrix). Default is
+            |False|: data is non-interleaved, and each sequence is yielded as
+            soon as it has been read.
+        multispace_delimiter: bool
+            If |True| (and ``strict`` is |False|), then at least two spaces are
+            required to delimit taxon label and associated sequence. Default is
+            |False|: one or more spaces delimit taxon label and associated
+            sequence.
+        underscores_to_spaces: bool
+            If |True|, then underscores in taxon labels are converted to
+            spaces. Default is |False|: underscores are not converted.
+        ignore_invalid_chars : bool
+            If |True| then symbols that are not recognized by
+            ``state_alphabet`` will be ignored. Default is |False|: invalid
+            symbols result in errors.
+        read_ahead : bool or int
+            If |True| or a positive integer, then each source is read (and,
+            if it is a compressed file, decompressed) and decoded by a
+            background thread, up to this many blocks (or a default number
+            of blocks, if |True|) ahead of the parsing of the source.
+        prefetch_files : bool
+            If |True|, then the background reading of each source is started
+            while the preceding source is being parsed (implies
+            ``read_ahead``).
+        ignore_unrecognized_keyword_arguments : boolean, default: |False|
+            If |True|, then unsupported or unrecognized keyword arguments will
+            not result in an error. Default is |False|: unsupported keyword
+            arguments will result in an error.
+        """
+        state_alphabet = kwargs.pop("state_alphabet", None)
+        data_type = kwargs.pop("data_type", None)
+        self.is_continuous = data_type == "continuous"
+        if self.is_continuous and state_alphabet is not None:
+            raise ValueError("Cannot specify 'state_alphabet' for continuous data")
+        ioservice.SequenceDataYielder.__init__(self,
+                files=files,
+                state_alphabet=state_alphabet,
+                ignore_invalid_chars=kwargs.pop("ignore_invalid_chars", False),
+                read_ahead=kwargs.pop("read_ahead", None),
+                prefetch_files=kwargs.pop("prefetch_files", False),
+                data_type=None if self.is_continuous else data_type)
+        self.data_type = data_type
+        self.strict = kwargs.pop("strict", False)
+        self.interleaved = kwargs.pop("interleaved", False)
+        self.multispace_delimiter = kwargs.pop("multispace_delimiter", False)
+        self.underscores_to_spaces = kwargs.pop("underscores_to_spaces", False)
+        self.check_for_unused_keyword_arguments(kwargs)
+
+    ###########################################################################
+    ## Implementation of DataYielder interface
+
+    def _yield_items_from_stream(self, stream):
+        ntax = None
+        nchar = None
+        for line_index, line in enumerate(stream):
+            line = line.rstrip()
+            if not line:
+                continue
+            m = re.match(r'\s*(\d+)\s+(\d+)\s*$', line)
+            if m is None:
+                raise self._data_parse_error("Invalid data description line: '%s'" % line, line_index, stream)
+            ntax = int(m.groups()[0])
+            nchar = int(m.groups()[1])
+            break
+        if ntax is None or ntax == 0 or nchar == 0:
+            raise error.DataParseError(message="No data in source", stream=stream)
+        if self.interleaved:
+            records = self._parse_interleaved(stream, ntax, line_index + 1)
+        else:
+            records = self._parse_sequential(stream, nchar, line_index + 1)
+        for record in records:
+            yield record
+
+    def _parse_sequential(self, stream, nchar, line_index_start):
+        labels = set()
+        label = None
+        parts = None
+        num_symbols = 0
+        for line_index, line in enumerate(stream, line_index_start):
+            line = line.rstrip()
+            if line == '':
+                continue
+            if label is None:
+                label, line = self._parse_label_from_line(line, line_index, stream)
+                if label in labels:
+                    raise self._data_parse_error("Repeated sequence name ('%s') found" % label, line_index, stream)
+                labels.add(label)
+                label_line_index = line_index
+                parts = []
+                num_symbols = 0
+            symbols = self._split_symbols(line)
+            parts.append(symbols)
+            num_symbols += len(symbols)
+            if num_symbols >= nchar:
+                yield self._sequence_record_from_parts(label, parts, label_line_index + 1)
+                label = None
+                parts = None
+        if label is not None:
+            yield self._sequence_record_from_parts(label, parts, label_line_index + 1)
+
+    def _parse_interleaved(self, stream, ntax, line_index_start):
+        labels = []
+        rows = []
+        paged_row = -1
+        for line_index, line in enumerate(stream, line_index_start):
+            line = line.rstrip()
+            if line == '':
+                continue
+            paged_row += 1
+            if paged_row >= ntax:
+                paged_row = 0
+            if len(labels) < ntax:
+                label, line = self._parse_label_from_line(line, line_index, stream)
+                if label in labels:
+                    raise self._data_parse_error("Repeated sequence name ('%s') found" % label, line_index, stream)
+                labels.append(label)
+                rows.append([])
+            rows[paged_row].append(self._split_symbols(line))
+        for label, parts in zip(labels, rows):
+            yield self._sequence_record_from_parts(label, parts)
+
+    def _split_symbols(self, line):
+        """
+        Returns the symbols of ``line`` with whitespace removed: as a string
+        of state symbols or, for continuous data, as a list of value tokens.
+        """
+        if self.is_continuous:
+            return line.split()
+        return "".join(line.split())
+
+    def _sequence_record_from_parts(self, label, parts, line_num=None):
+        if not self.is_continuous:
+            return self.sequence_record(label, "".join(parts), line_num)
+        values = []
+        for tokens in parts:
+            for token in tokens:
+                try:
+                    values.append(float(token))
+                except ValueError:
+                    if not self.ignore_invalid_chars:
+                        raise error.DataParseError(
+                                message="Invalid value for sequence '{}': '{}'".format(label, token),
+                                line_num=line_num,
+                                stream=self.current_file)
+        return ioservice.SequenceRecord(label, values)
+
+    def _parse_label_from_line(self, line, line_index, stream):
+        if self.strict:
+            label = line[:10].strip()
+            line = line[10:]
+        else:
+            if self.multispace_delimiter:
+                parts = re.split('[ \t]{2,}', line, maxsplit=1)
+            else:
+                parts = re.split('[ \t]{1,}', line, maxsplit=1)
+            label = parts[0]
+            if len(parts) < 2:
+                line = ''
+            else:
+                line = parts[1]
+        label = label.strip()
+        if not label:
+            raise self._data_parse_error("Expecting taxon label", line_index, stream)
+        if self.underscores_to_spaces:
+            label = label.replace('_', ' ')
+        return label, line
+
+    def _data_parse_error(self, message, line_index, stream):
+        if self.strict and self.interleaved:
+            error_type = phylipreader.PhylipReader.PhylipStrictInterleavedError
+        elif self.strict:
+            error_type = phylipreader.PhylipReader.PhylipStrictSequentialError
+        elif self.interleaved:
+            error_type = phylipreader.PhylipReader.PhylipRelaxedInterleavedError
+        else:
+            error_type = phylipreader.PhylipReader.PhylipRelaxedSequentialError
+        return error_type(message, line_num=line_index + 1, stream=stream)
+
@@ -16,7 +16,8 @@
 ##
 ##############################################################################
 
-import sys
+import re
+import itertools
 from dendropy.utility import error
 
 ##############################################################################
@@ -25,8 +26,15 @@ from dendropy.utility import error
 class Tokenizer(object):
     """
     Stream tokenizer.
+
+    The source stream is read in blocks of ``buffer_size`` characters at a
+    time, and token boundaries are located by scanning the buffered block
+    with compiled regular expressions and string searches instead of
+    examining the stream one character at a time.
     """
 
+    DEFAULT_BUFFER_SIZE = 65536
+
     class TokenizerError(error.DataParseError):
 
         def __init__(self,
@@ -77,6 +85,7 @@ class Tokenizer(object):
             comment_end,                # string indicating end of comment
             capture_comments,           # are comments to be stored?
             preserve_unquoted_underscores,       # are unquoted underscores to be preserved
+            buffer_size=None,           # number of characters to read from the source stream at a time
             ):
         # Tokenizer behavior customization
         self.uncaptured_delimiters = uncaptured_delimiters
@@ -88,36 +97,63 @@ class Tokenizer(object):
         self.comment_end = comment_end
         self.capture_comments = capture_comments
         self.preserve_unquoted_underscores = preserve_unquoted_underscores
+        if buffer_size is None:
+            buffer_size = Tokenizer.DEFAULT_BUFFER_SIZE
+        self.buffer_size = buffer_size
+        self._compile_scanner()
 
         # State (internals)
         self.src = src
-        self._cur_char = None
         self.current_token = None
         self.is_token_quoted = False
+        self._reset_buffer()
 
         # Meta-information
         self.captured_comments = []
-        self.current_line_num = 1
-        self.current_column_num = 0
-        self.token_line_num = 0
-        self.token_column_num = 0
+
+    def _compile_scanner(self):
+        """
+        (Re-)builds the lookup sets and regular expressions used to locate
+        token boundaries in the buffer. Must be called whenever the
+        delimiter, quote or comment characters are modified.
+        """
+        scanner_key = (
+                tuple(self.uncaptured_delimiters),
+                tuple(self.captured_delimiters),
+                tuple(self.quote_chars),
+                tuple(self.comment_begin),
+                tuple(self.comment_end))
+        try:
+            scanner = _SCANNERS[scanner_key]
+        except KeyError:
+            scanner = _build_scanner(*scanner_key)
+            _SCANNERS[scanner_key] = scanner
+        for name, value in scanner.items():
+            setattr(self, name, value)
+
+    def _reset_buffer(self):
+        self._buffer = ""
+        self._pos = 0
+        self._buffer_offset = 0
+        self._is_started = False
+        self._is_src_exhausted = False
+        self._lines_before_buffer = 0
+        self._last_newline_before_buffer = -1
+        self._token_offset = None
+        self._token_location = None
 
     def reset(self):
         self.set_stream(src=None)
 
     def set_stream(self, src=None):
         self.src = src
-        self._cur_char = None
         self.current_token = None
         self.is_token_quoted = False
         self.captured_comments = []
-        self.current_line_num = 1
-        self.current_column_num = 0
-        self.token_line_num = 0
-        self.token_column_num = 0
+        self._reset_buffer()
 
     def is_eof(self):
-        return self._cur_char == ""
+        return self._is_started and self._peek_char() == ""
 
     def has_captured_comments(self):
         return len(self.captured_comments) > 0
@@ -168,126 +204,378 @@ class Tokenizer(object):
         del self.captured_comments[:]
         return c
 
+    def peek_raw_statement(self, terminator):
+        """
+        Returns the raw (untokenized) text from the current reading position
+        up to, but not including, the next occurrence of the character
+        ``terminator``, without consuming it. Quoted text is returned as-is.
+        Returns |None| if the end of the stream is reached before
+        ``terminator`` is found, or if a comment or an unpaired quote character
+        is found before ``terminator`` (in which case the text cannot be
+        interpreted without tokenizing it).
+        """
+        self._is_started = True
+        scan_start = self._pos
+        while True:
+            buffer = self._buffer
+            idx = buffer.find(terminator, scan_start)
+            if idx >= 0:
+                break
+            num_scanned = len(buffer) - self._pos
+            if not self._fill_buffer():
+                return None
+            scan_start = self._pos + num_scanned
+        statement = buffer[self._pos:idx]
+        if self._raw_statement_pattern.match(statement).end() != len(statement):
+            return None
+        return statement
+
+    def skip_raw_statement(self, statement):
+        """
+        Consumes ``statement``, as returned by :meth:`peek_raw_statement()`,
+        and the terminator character following it.
+        """
+        self._pos += len(statement) + 1
+
+    def skip_statement(self, terminator):
+        """
+        Consumes the text from the current reading position up to and
+        including the next occurrence of the character ``terminator`` that is
+        not part of a quoted token or a comment, without tokenizing it or
+        capturing any comments. Returns |False| if the end of the stream is
+        reached before ``terminator`` is found.
+        """
+        self._is_started = True
+        self.is_token_quoted = False
+        try:
+            pattern = self._statement_end_patterns[terminator]
+        except KeyError:
+            pattern = re.compile(_char_class_pattern(
+                itertools.chain(
+                    terminator,
+                    self.quote_chars,
+                    self.comment_begin)))
+            self._statement_end_patterns[terminator] = pattern
+        # as with the tokenizer, a quote character only opens a quoted token
+        # at the start of a token
+        is_token_start = True
+        while True:
+            buffer = self._buffer
+            m = pattern.search(buffer, self._pos)
+            if m is None:
+                if self._pos < len(buffer):
+                    is_token_start = buffer[-1] in self._delimiter_set
+                self._pos = len(buffer)
+                if not self._fill_buffer():
+                    return False
+                continue
+            idx = m.start()
+            if idx > self._pos:
+                is_token_start = buffer[idx-1] in self._delimiter_set
+            cur_char = buffer[idx]
+            if cur_char == terminator:
+                self._pos = idx + 1
+                return True
+            self._pos = idx
+            if cur_char in self._quote_char_set:
+                if is_token_start:
+                    self._read_quoted_token(cur_char)
+                else:
+                    self._pos += 1
+            else:
+                self._handle_comment(capture_comments=False)
+            is_token_start = False
+
     def __iter__(self):
         return self
 
     def __next__(self):
         self.is_token_quoted = False
-        if self._cur_char is None:
-            self._get_next_char()
-        self._skip_to_significant_char()
-        if self._cur_char == "":
-            raise StopIteration
-        if self._cur_char in self.captured_delimiters:
-            self.current_token = self._cur_char
-            self.token_line_num = self.current_line_num
-            self.token_column_num = self.current_column_num
-            self._get_next_char()
-            return self.current_token
-        elif self._cur_char in self.quote_chars:
-            self.token_line_num = self.current_line_num
-            self.token_column_num = self.current_column_num
-            dest = []
-            self.is_token_quoted = True
-            cur_quote_char = self._cur_char
-            self._get_next_char()
-            while True:
-                if self._cur_char == "":
+        self._is_started = True
+        while True:
+            buffer = self._buffer
+            self._pos = self._skip_pattern.match(buffer, self._pos).end()
+            if self._pos < len(buffer):
+                cur_char = buffer[self._pos]
+            else:
+                cur_char = self._skip_to_significant_char()
+                if cur_char == "":
+                    raise StopIteration
+            self._token_offset = self._buffer_offset + self._pos
+            self._token_location = None
+            if cur_char in self._captured_delimiter_set:
+                self._pos += 1
+                self.current_token = cur_char
+                return self.current_token
+            elif cur_char in self._quote_char_set:
+                self.is_token_quoted = True
+                self.current_token = self._read_quoted_token(cur_char)
+                return self.current_token
+            else:
+                self.current_token = self._read_unquoted_token()
+                if not self.preserve_unquoted_underscores:
+                    self.current_token = self.current_token.replace("_", " ")
+                if self.current_token != "":
+                    return self.current_token
+                # only comments were found: continue on to the next token
+    next = __next__ # Python 2 legacy support
+
+    def _read_quoted_token(self, quote_char):
+        self._pos += 1
+        dest = []
+        while True:
+            buffer = self._buffer
+            idx = buffer.find(quote_char, self._pos)
+            if idx < 0:
+                dest.append(buffer[self._pos:])
+                self._pos = len(buffer)
+                if not self._fill_buffer():
                     raise Tokenizer.UnterminatedQuoteError(
-                            quote_char=cur_quote_char,
+                            quote_char=quote_char,
                             line_num=self.current_line_num,
                             col_num=self.current_column_num,
-                            stream=src)
-                if self._cur_char == cur_quote_char:
-                    self._get_next_char()
-                    if self.escape_quote_by_doubling:
-                        if self._cur_char == cur_quote_char:
-                            # dest.write(cur_quote_char)
-                            dest.append(cur_quote_char)
-                            self._get_next_char()
-                        else:
-                            break
-                    else:
-                        self._get_next_char()
-                        break
-                else:
-                    # dest.write(self._cur_char)
-                    dest.append(self._cur_char)
-                    self._get_next_char()
-            # self.current_token = dest.getvalue()
-            self.current_token = "".join(dest)
-            return self.current_token
-        else:
-            # unquoted
-            self.token_line_num = self.current_line_num
-            self.token_column_num = self.current_column_num
-            dest = []
-            self.is_token_quoted = False
-            while self._cur_char != "":
-                if self._cur_char in self.uncaptured_delimiters:
-                    self._get_next_char()
+                            stream=self.src)
+                continue
+            dest.append(buffer[self._pos:idx])
+            self._pos = idx + 1
+            if self.escape_quote_by_doubling and self._peek_char() == quote_char:
+                dest.append(quote_char)
+                self._pos += 1
+            else:
+                break
+        return "".join(dest)
+
+    def _read_unquoted_token(self):
+        buffer = self._buffer
+        start = self._pos
+        end = self._unquoted_token_pattern.match(buffer, start).end()
+        if end < len(buffer):
+            # fast path: token does not span a buffer boundary or a comment
+            cur_char = buffer[end]
+            if cur_char in self._uncaptured_delimiter_set:
+                self._pos = end + 1
+                return buffer[start:end]
+            elif cur_char in self._captured_delimiter_set:
+                self._pos = end
+                return buffer[start:end]
+        dest = []
+        while True:
+            if end > start:
+                dest.append(buffer[start:end])
+            self._pos = end
+            if end >= len(buffer):
+                if not self._fill_buffer():
                     break
-                elif self._cur_char in self.captured_delimiters:
+            else:
+                cur_char = buffer[end]
+                if cur_char in self._uncaptured_delimiter_set:
+                    self._pos += 1
+                    break
+                elif cur_char in self._captured_delimiter_set:
                     break
-                elif self._cur_char in self.comment_begin:
-                    self._handle_comment()
-                    if self._cur_char == "":
-                        break
-                else:
-                    if self._cur_char == "_" and not self.preserve_unquoted_underscores:
-                        self._cur_char = " "
-                    dest.append(self._cur_char)
-                    self._get_next_char()
-            # self.current_token = dest.getvalue()
-            self.current_token = "".join(dest)
-            if self.current_token == "":
-                if self._cur_char != "":
-                    self.__next__()
                 else:
-                    raise StopIteration
-            return self.current_token
-    next = __next__ # Python 2 legacy support
+                    self._handle_comment()
+            buffer = self._buffer
+            start = self._pos
+            end = self._unquoted_token_pattern.match(buffer, start).end()
+        return "".join(dest)
 
     def _skip_to_significant_char(self):
-        if self._cur_char == "":
-            return
-        if self._cur_char is None:
-            self._get_next_char()
-        if self._cur_char not in self.uncaptured_delimiters:
-            return
-        while self._cur_char != "" and self._cur_char in self.uncaptured_delimiters:
-            self._get_next_char()
-        return
-
-    def _get_next_char(self):
-        self._cur_char = self.src.read(1)
-        if self._cur_char != "":
-            if self._cur_char == "\n":
-                self.current_line_num += 1
-                self.current_column_num = 1
-            else:
-                # print("@@@ {}: {}".format(self.current_column_num, self._cur_char))
-                self.current_column_num += 1
-        return self._cur_char
+        while True:
+            self._pos = self._skip_pattern.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill_buffer():
+                return ""
 
-    def _handle_comment(self):
+    def _handle_comment(self, capture_comments=True):
+        capture_comments = capture_comments and self.capture_comments
         dest = []
         nesting = 0
-        comment_complete = False
-        while self._cur_char != "":
-            if self._cur_char in self.comment_end:
+        while True:
+            buffer = self._buffer
+            m = self._comment_delimiter_pattern.search(buffer, self._pos)
+            if m is None:
+                if capture_comments:
+                    dest.append(buffer[self._pos:])
+                self._pos = len(buffer)
+                if not self._fill_buffer():
+                    break
+                continue
+            idx = m.start()
+            if capture_comments and idx > self._pos:
+                dest.append(buffer[self._pos:idx])
+            self._pos = idx + 1
+            if buffer[idx] in self._comment_end_set:
                 nesting -= 1
                 if nesting <= 0:
-                    comment_complete = True
-                    self._get_next_char()
                     break
-            elif self._cur_char in self.comment_begin:
+            else:
                 nesting += 1
-            elif self.capture_comments:
-                # dest.write(self._cur_char)
-                dest.append(self._cur_char)
-            self._get_next_char()
-        if self.capture_comments:
-            # self.captured_comments.append(dest.getvalue())
+        if capture_comments:
             self.captured_comments.append("".join(dest))
 
+    def _peek_char(self):
+        if self._pos >= len(self._buffer) and not self._fill_buffer():
+            return ""
+        return self._buffer[self._pos]
+
+    def _get_cur_char(self):
+        if not self._is_started:
+            return None
+        return self._peek_char()
+    _cur_char = property(_get_cur_char)
+
+    def _fill_buffer(self):
+        """
+        Discards the consumed portion of the buffer and appends the next
+        block of characters from the source stream. Returns |False| if the
+        source stream is exhausted.
+        """
+        if self._is_src_exhausted or self.src is None:
+            return False
+        block = self.src.read(self.buffer_size)
+        if not block:
+            self._is_src_exhausted = True
+            return False
+        if self._pos > 0:
+            if (self._token_location is None
+                    and self._token_offset is not None
+                    and self._token_offset < self._buffer_offset + self._pos):
+                self._token_location = self._location(self._token_offset)
+            num_newlines = self._buffer.count("\n", 0, self._pos)
+            if num_newlines:
+                self._lines_before_buffer += num_newlines
+                self._last_newline_before_buffer = self._buffer_offset + self._buffer.rindex("\n", 0, self._pos)
+            self._buffer_offset += self._pos
+            self._buffer = self._buffer[self._pos:] + block
+            self._pos = 0
+        else:
+            self._buffer += block
+        return True
+
+    def _location(self, offset):
+        """
+        Returns the line and column numbers of the character at ``offset``
+        (counted from the beginning of the stream), which must be in the
+        current buffer.
+        """
+        idx = offset - self._buffer_offset + 1
+        num_newlines = self._buffer.count("\n", 0, idx)
+        if num_newlines:
+            last_newline = self._buffer_offset + self._buffer.rindex("\n", 0, idx)
+        else:
+            last_newline = self._last_newline_before_buffer
+        line_num = self._lines_before_buffer + num_newlines + 1
+        if last_newline < 0:
+            return line_num, offset + 1
+        else:
+            return line_num, offset - last_newline + 1
+
+    def _get_current_location(self):
+        if not self._is_started:
+            return 1, 0
+        offset = self._buffer_offset + self._pos
+        if self._peek_char() == "":
+            # as with the reading position, the location is that of the
+            # last character of the stream
+            offset -= 1
+            if offset < 0:
+                return 1, 0
+        return self._location(offset)
+
+    def _get_current_line_num(self):
+        return self._get_current_location()[0]
+    current_line_num = property(_get_current_line_num)
+
+    def _get_current_column_num(self):
+        return self._get_current_location()[1]
+    current_column_num = property(_get_current_column_num)
+
+    def _get_token_location(self):
+        if self._token_offset is None:
+            return 0, 0
+        if self._token_location is None:
+            self._token_location = self._location(self._token_offset)
+        return self._token_location
+
+    def _get_token_line_num(self):
+        return self._get_token_location()[0]
+    token_line_num = property(_get_token_line_num)
+
+    def _get_token_column_num(self):
+        return self._get_token_location()[1]
+    token_column_num = property(_get_token_column_num)
+
+# Lookup sets and regular expressions of tokenizers, by their delimiter,
+# quote and comment characters; these are switched frequently (e.g., to
+# capture line ends in each row of an interleaved NEXUS matrix), so are
+# built only once for each combination
+_SCANNERS = {}
+
+def _build_scanner(uncaptured_delimiters,
+        captured_delimiters,
+        quote_chars,
+        comment_begin,
+        comment_end):
+    """
+    Returns the attributes used by |Tokenizer| to locate token boundaries
+    with the given delimiter, quote and comment characters.
+    """
+    scanner = {}
+    scanner["_uncaptured_delimiter_set"] = frozenset(uncaptured_delimiters)
+    scanner["_captured_delimiter_set"] = frozenset(captured_delimiters)
+    scanner["_quote_char_set"] = frozenset(quote_chars)
+    scanner["_comment_end_set"] = frozenset(comment_end)
+    if uncaptured_delimiters:
+        scanner["_skip_pattern"] = re.compile(
+                _char_class_pattern(uncaptured_delimiters) + "*")
+    else:
+        scanner["_skip_pattern"] = re.compile("")
+    scanner["_unquoted_token_pattern"] = re.compile(
+            _char_class_pattern(
+                itertools.chain(
+                    uncaptured_delimiters,
+                    captured_delimiters,
+                    comment_begin),
+                negate=True) + "*")
+    scanner["_comment_delimiter_pattern"] = re.compile(
+            _char_class_pattern(
+                itertools.chain(
+                    comment_begin,
+                    comment_end)))
+    # Text consisting of anything but comments, with any quote
+    # characters paired up into quoted runs
+    raw_statement_subpatterns = [
+            _char_class_pattern(
+                itertools.chain(
+                    quote_chars,
+                    comment_begin),
+                negate=True) + "+"]
+    for quote_char in quote_chars:
+        raw_statement_subpatterns.append(
+                re.escape(quote_char)
+                + _char_class_pattern(quote_char, negate=True) + "*"
+                + re.escape(quote_char))
+    scanner["_raw_statement_pattern"] = re.compile(
+            "(?:" + "|".join(raw_statement_subpatterns) + ")*")
+    scanner["_delimiter_set"] = scanner["_uncaptured_delimiter_set"] | scanner["_captured_delimiter_set"]
+    # built as needed
+    scanner["_statement_end_patterns"] = {}
+    return scanner
+
+def _char_class_pattern(chars, negate=False):
+    """
+    Returns a regular expression character class matching any (or, if
+    ``negate`` is |True|, none) of the characters in ``chars``.
+    """
+    chars = "".join(re.escape(c) for c in chars)
+    if not chars:
+        if negate:
+            return "[\\s\\S]"
+        else:
+            return "(?!)"
+    if negate:
+        return "[^" + chars + "]"
+    else:
+        return "[" + chars + "]"
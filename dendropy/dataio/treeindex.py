@@ -0,0 +1,938 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+Indexing of the tree statements of NEXUS and NEWICK files by byte offset,
+allowing for particular trees to be read without parsing the trees that
+precede them.
+"""
+
+import os
+import re
+import sys
+import json
+import mmap
+import codecs
+import collections
+from dendropy.utility import textprocessing
+from dendropy.utility import filesys
+
+_WHITESPACE_PATTERN = re.compile(br"\s*")
+_WORD_PATTERN = re.compile(br"[^\s{}(),;:=\\\"'\[\]]+")
+_STATEMENT_BODY_PATTERN = re.compile(br"[^;'\[]*")
+_COMMENT_DELIMITER_PATTERN = re.compile(br"[\[\]]")
+# A quote character only begins a quoted token if it follows one of these
+# (or the beginning of the data); elsewhere it is part of an unquoted token
+_TOKEN_DELIMITERS = b" \t\n\r{}(),;:=\\\""
+# Statement terminators followed by the beginning of a tree statement, used to
+# locate tree statements from arbitrary offsets without scanning the file
+_NEXUS_TREE_BOUNDARY_PATTERN = re.compile(br";\s*(?=TREE\s)", re.IGNORECASE)
+_NEWICK_TREE_BOUNDARY_PATTERN = re.compile(br";\s*(?=[^\s;])")
+
+def _skip_comment(data, pos):
+    """
+    Returns the offset following the (possibly nested) comment that begins at
+    ``pos``.
+    """
+    nesting = 0
+    while True:
+        m = _COMMENT_DELIMITER_PATTERN.search(data, pos)
+        if m is None:
+            return len(data)
+        pos = m.end()
+        if data[m.start():pos] == b"]":
+            nesting -= 1
+            if nesting <= 0:
+                return pos
+        else:
+            nesting += 1
+
+def _skip_quoted(data, pos):
+    """
+    Returns the offset following the quoted token that begins at ``pos``.
+    """
+    while True:
+        idx = data.find(b"'", pos + 1)
+        if idx < 0:
+            return len(data)
+        if data[idx+1:idx+2] == b"'":
+            pos = idx + 1
+        else:
+            return idx + 1
+
+def _skip_whitespace_and_comments(data, pos):
+    pos = _WHITESPACE_PATTERN.match(data, pos).end()
+    while data[pos:pos+1] == b"[":
+        pos = _skip_comment(data, pos)
+        pos = _WHITESPACE_PATTERN.match(data, pos).end()
+    return pos
+
+def _read_word(data, pos):
+    """
+    Returns the (upper-cased) word at ``pos``, and the offset following it.
+    """
+    m = _WORD_PATTERN.match(data, pos)
+    if m is None:
+        return b"", pos
+    return m.group(0).upper(), m.end()
+
+def _iter_statements(data, pos=0):
+    """
+    Iterates over the semi-colon terminated statements in ``data``, beginning
+    with the statement at offset ``pos``, yielding for each statement a
+    tuple, ``(start, keyword_start, keyword, end)``, where ``start`` is the
+    offset of the first non-whitespace character of the statement, ``keyword_start`` is the offset of the first character
+    that is not part of a comment, ``keyword`` is the first word
+    (upper-cased), and ``end`` is the offset following the terminating
+    semi-colon. The NEXUS file signature, '#NEXUS', is yielded as a separate
+    statement even though it is not terminated by a semi-colon.
+    """
+    size = len(data)
+    pos = _WHITESPACE_PATTERN.match(data, pos).end()
+    while pos < size:
+        start = pos
+        pos = _skip_whitespace_and_comments(data, pos)
+        keyword_start = pos
+        keyword, pos = _read_word(data, pos)
+        if keyword == b"#NEXUS":
+            yield start, keyword_start, keyword, pos
+            pos = _WHITESPACE_PATTERN.match(data, pos).end()
+            continue
+        while True:
+            pos = _STATEMENT_BODY_PATTERN.match(data, pos).end()
+            if pos >= size:
+                break
+            c = data[pos:pos+1]
+            if c == b";":
+                pos += 1
+                break
+            elif c == b"[":
+                pos = _skip_comment(data, pos)
+            elif data[pos-1:pos] in _TOKEN_DELIMITERS:
+                pos = _skip_quoted(data, pos)
+            else:
+                pos += 1
+        yield start, keyword_start, keyword, pos
+        pos = _WHITESPACE_PATTERN.match(data, pos).end()
+
+def _index_nexus_data(data):
+    """
+    Returns a list of (context ranges, tree ranges) for each "TREES" block in
+    ``data`` that has at least one tree statement.
+    """
+    collections = []
+    nexus_context = []
+    block_name = None
+    block_start = None
+    context = None
+    tree_ranges = None
+    for start, keyword_start, keyword, end in _iter_statements(data):
+        if keyword == b"#NEXUS":
+            nexus_context.append((keyword_start, end))
+        elif keyword == b"BEGIN":
+            block_name = _read_word(data,
+                    _skip_whitespace_and_comments(data, keyword_start + len(keyword)))[0]
+            block_start = keyword_start
+            if block_name == b"TREES":
+                context = list(nexus_context)
+                tree_ranges = []
+        elif keyword == b"END" or keyword == b"ENDBLOCK":
+            if block_name == b"TREES":
+                if tree_ranges:
+                    collections.append((context, tree_ranges))
+            elif block_name is not None:
+                nexus_context.append((block_start, end))
+            block_name = None
+        elif block_name == b"TREES":
+            if keyword == b"TREE":
+                if not tree_ranges:
+                    # header of block, including any 'TRANSLATE' statement
+                    context.append((block_start, keyword_start))
+                tree_ranges.append((keyword_start, end))
+            elif tree_ranges:
+                context.append((keyword_start, end))
+    if block_name == b"TREES" and tree_ranges:
+        collections.append((context, tree_ranges))
+    return collections
+
+def _index_newick_data(data):
+    """
+    Returns a list with a single (context ranges, tree ranges) tuple for the
+    tree statements in ``data``.
+    """
+    tree_ranges = []
+    for start, keyword_start, keyword, end in _iter_statements(data):
+        if keyword_start < end and data[keyword_start:keyword_start+1] != b";":
+            tree_ranges.append((start, end))
+    if not tree_ranges:
+        return []
+    return [([], tree_ranges)]
+
+def _locate_nexus_trees(data):
+    """
+    Returns the context ranges of the first "TREES" block in ``data`` that has
+    at least one tree statement, along with the offset of its first tree
+    statement, or |None| if there are no tree statements. Only the statements
+    preceding the first tree statement are scanned.
+    """
+    nexus_context = []
+    block_name = None
+    block_start = None
+    for start, keyword_start, keyword, end in _iter_statements(data):
+        if keyword == b"#NEXUS":
+            nexus_context.append((keyword_start, end))
+        elif keyword == b"BEGIN":
+            block_name = _read_word(data,
+                    _skip_whitespace_and_comments(data, keyword_start + len(keyword)))[0]
+            block_start = keyword_start
+        elif keyword == b"END" or keyword == b"ENDBLOCK":
+            if block_name is not None and block_name != b"TREES":
+                nexus_context.append((block_start, end))
+            block_name = None
+        elif block_name == b"TREES" and keyword == b"TREE":
+            return nexus_context + [(block_start, keyword_start)], keyword_start
+    return None
+
+def _locate_newick_trees(data):
+    """
+    Returns the (empty) context ranges of the tree statements in ``data``
+    along with the offset of the first tree statement, or |None| if there are
+    no tree statements.
+    """
+    for start, keyword_start, keyword, end in _iter_statements(data):
+        if keyword_start < end and data[keyword_start:keyword_start+1] != b";":
+            return [], start
+    return None
+
+def _resolve_schema(data, schema, path):
+    start = _WHITESPACE_PATTERN.match(data, 0).end()
+    is_nexus = data[start:start+6].upper() == b"#NEXUS"
+    if schema == "nexus/newick":
+        return "nexus" if is_nexus else "newick"
+    elif schema == "nexus" and not is_nexus:
+        raise ValueError("Expecting '#NEXUS' at beginning of file: '{}'".format(path))
+    return schema
+
+def _check_schema(schema, path):
+    schema = schema.lower()
+    if schema not in ("nexus", "newick", "nexus/newick"):
+        raise NotImplementedError("'{}' is not a supported tree indexing schema".format(schema))
+    compression = filesys.get_path_compression(path)
+    if compression is not None:
+        raise ValueError("Cannot index '{}'-compressed file: '{}'".format(compression, path))
+    return schema
+
+##############################################################################
+## TreeFileIndex
+
+class TreeFileIndex(object):
+    """
+    Index of the byte offsets of the tree statements in a NEXUS or NEWICK
+    file.
+
+    For each collection of trees in the file (i.e., each NEXUS "TREES" block
+    with at least one tree, or all trees of a NEWICK file), the index records
+    the location of each tree statement as well as the location of all the
+    statements required to interpret them (the NEXUS file signature, all
+    non-"TREES" blocks preceding the collection, and the header of the
+    "TREES" block itself, including the translate table). Particular trees
+    can then be read by reading only these portions of the file, without
+    processing any of the other tree statements.
+
+    Indexes are built by scanning the file (which is much faster than
+    parsing it) using :meth:`TreeFileIndex.build()`, and can be stored in
+    and loaded from "sidecar" files alongside the indexed file; see
+    :meth:`TreeFileIndex.get_for_path()`.
+
+    Note that, as the other tree statements are not processed, taxa that
+    are only referenced in trees that are not read will not be added to the
+    |TaxonNamespace| of the trees that are read.
+
+    Examples
+    --------
+
+    ::
+
+        tree_index = dendropy.dataio.treeindex.TreeFileIndex.get_for_path(
+                "mcmc.trees", schema="nexus")
+        # skip burn-in and take every 10th tree
+        trees = tree_index.read_trees(
+                tree_offsets=range(1000, tree_index.num_trees(), 10))
+        # or, through the usual interfaces
+        tree = dendropy.Tree.get(
+                path="mcmc.trees",
+                schema="nexus",
+                tree_offset=-1,
+                tree_index=tree_index)
+        trees = dendropy.TreeList.get(
+                path="mcmc.trees",
+                schema="nexus",
+                tree_offset=1000,
+                tree_index=True)
+    """
+
+    FORMAT_VERSION = 1
+    SIDECAR_FILE_EXTENSION = ".treeindex"
+
+    @staticmethod
+    def sidecar_path(path):
+        """
+        Returns the path of the sidecar file used to store the index of the
+        file at ``path``.
+        """
+        return path + TreeFileIndex.SIDECAR_FILE_EXTENSION
+
+    @classmethod
+    def build(cls, path, schema="nexus/newick"):
+        """
+        Scans the file at ``path`` and returns a new index of its tree
+        statements.
+
+        Parameters
+        ----------
+        path : str
+            Path of the file to be indexed.
+        schema : str
+            "nexus", "newick", or "nexus/newick" [default], in which case the
+            file is indexed as a NEXUS file if it begins with the NEXUS file
+            signature, '#NEXUS', or as a NEWICK file otherwise. If "nexus",
+            then ValueError is raised if the file does not begin with the
+            NEXUS file signature. ValueError is also raised if the file is
+            compressed, as its byte offsets cannot be read from directly.
+
+        Returns
+        -------
+        i : |TreeFileIndex|
+            The new index.
+        """
+        schema = _check_schema(schema, path)
+        st = os.stat(path)
+        with open(path, "rb") as src:
+            if st.st_size == 0:
+                data = b""
+            else:
+                data = mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                schema = _resolve_schema(data, schema, path)
+                if schema == "nexus":
+                    collections = _index_nexus_data(data)
+                else:
+                    collections = _index_newick_data(data)
+            finally:
+                if st.st_size != 0:
+                    data.close()
+        return cls(path=path,
+                schema=schema,
+                file_size=st.st_size,
+                file_mtime=st.st_mtime,
+                collections=collections)
+
+    @classmethod
+    def load(cls, index_path):
+        """
+        Returns an index loaded from the file at ``index_path``, as stored by
+        :meth:`TreeFileIndex.save()`.
+        """
+        with open(index_path, "r") as src:
+            d = json.load(src)
+        if d.get("format_version") != TreeFileIndex.FORMAT_VERSION:
+            raise ValueError("Unsupported tree index format version: {}".format(d.get("format_version")))
+        collections = []
+        for c in d["collections"]:
+            collections.append((
+                [tuple(r) for r in c["context"]],
+                [tuple(r) for r in c["trees"]]))
+        return cls(path=d["path"],
+                schema=d["schema"],
+                file_size=d["file_size"],
+                file_mtime=d["file_mtime"],
+                collections=collections)
+
+    @classmethod
+    def get_for_path(cls, path, schema="nexus/newick", use_sidecar_file=True):
+        """
+        Returns an index of the file at ``path``.
+
+        If ``use_sidecar_file`` is |True| [default], then the index is loaded
+        from the sidecar file of ``path`` (see
+        :meth:`TreeFileIndex.sidecar_path()`) if it exists and is current
+        (i.e., the size and modification time of the file recorded in it
+        match those of the file). Otherwise, the file is scanned to build a
+        new index, which is then stored in the sidecar file (if the sidecar
+        file cannot be written, the index is still returned).
+        """
+        index_path = cls.sidecar_path(path)
+        if use_sidecar_file and os.path.exists(index_path):
+            try:
+                tree_index = cls.load(index_path)
+            except (ValueError, KeyError, TypeError):
+                tree_index = None
+            if (tree_index is not None
+                    and tree_index.is_current()
+                    and (schema == "nexus/newick" or schema == tree_index.schema)):
+                tree_index.path = path
+                return tree_index
+        tree_index = cls.build(path, schema=schema)
+        if use_sidecar_file:
+            try:
+                tree_index.save(index_path)
+            except (IOError, OSError):
+                pass
+        return tree_index
+
+    def __init__(self, path, schema, file_size, file_mtime, collections):
+        """
+        Indexes are typically obtained from :meth:`TreeFileIndex.build()`,
+        :meth:`TreeFileIndex.load()`, or
+        :meth:`TreeFileIndex.get_for_path()` instead of being directly
+        instantiated.
+
+        Parameters
+        ----------
+        path : str
+            Path of the indexed file.
+        schema : str
+            Schema of the indexed file: "nexus" or "newick".
+        file_size : int
+            Size of the indexed file (in bytes) when indexed.
+        file_mtime : float
+            Modification time of the indexed file when indexed.
+        collections : list
+            A list of tuples, ``(context_ranges, tree_ranges)``, for each tree
+            collection in the file, where ``context_ranges`` is a list of the
+            ``(start, end)`` byte offsets of all the statements required to
+            interpret the statements of the collection, and ``tree_ranges`` is
+            a list of the ``(start, end)`` byte offsets of each tree statement
+            of the collection.
+        """
+        self.path = path
+        self.schema = schema
+        self.file_size = file_size
+        self.file_mtime = file_mtime
+        self._collections = collections
+
+    def save(self, index_path=None):
+        """
+        Stores the index in the file at ``index_path`` or, if not specified,
+        the sidecar file of the indexed file.
+        """
+        if index_path is None:
+            index_path = TreeFileIndex.sidecar_path(self.path)
+        d = {
+            "format_version": TreeFileIndex.FORMAT_VERSION,
+            "path": self.path,
+            "schema": self.schema,
+            "file_size": self.file_size,
+            "file_mtime": self.file_mtime,
+            "collections": [{"context": context, "trees": tree_ranges}
+                for context, tree_ranges in self._collections],
+        }
+        with open(index_path, "w") as dest:
+            json.dump(d, dest)
+
+    def is_current(self):
+        """
+        Returns |True| if the indexed file has the same size and modification
+        time as when indexed.
+        """
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return False
+        return st.st_size == self.file_size and st.st_mtime == self.file_mtime
+
+    def _get_num_collections(self):
+        return len(self._collections)
+    num_collections = property(_get_num_collections)
+
+    def num_trees(self, collection_offset=0):
+        """
+        Returns the number of trees in the collection of trees given by
+        ``collection_offset``.
+        """
+        return len(self._get_collection(collection_offset)[1])
+
+    def __len__(self):
+        return sum(len(c[1]) for c in self._collections)
+
+    def _get_collection(self, collection_offset):
+        if collection_offset >= len(self._collections) or collection_offset < -len(self._collections):
+            raise IndexError("Collection offset out of range: {} (number of collections = {}, maximum valid collection offset = {})".format(collection_offset, len(self._collections), len(self._collections)-1))
+        return self._collections[collection_offset]
+
+    def tree_offsets_from(self, tree_offset=None, collection_offset=0):
+        """
+        Returns the offsets of all trees in the collection given by
+        ``collection_offset`` starting with ``tree_offset``, which can be
+        negative to count from the end of the collection (as with the
+        ``tree_offset`` argument of :meth:`TreeList.get()`). The range is
+        empty if the collection has no more than ``tree_offset`` trees.
+        """
+        num_trees = self.num_trees(collection_offset)
+        if tree_offset is None:
+            tree_offset = 0
+        return range(*slice(tree_offset, None).indices(num_trees))
+
+    def check_tree_offset(self, tree_offset, collection_offset=0):
+        """
+        Raises IndexError if ``tree_offset`` is not the offset of a tree of
+        the collection given by ``collection_offset``.
+        """
+        num_trees = self.num_trees(collection_offset)
+        if tree_offset >= num_trees or tree_offset < -num_trees:
+            raise _tree_offset_error(tree_offset, num_trees)
+
+    def open_trees(self, tree_offsets, collection_offset=0):
+        """
+        Returns a file-like object with data in the schema of the indexed file
+        describing (only) the trees given by ``tree_offsets``, in that order,
+        of the collection of trees given by ``collection_offset``. This is
+        streamed from the corresponding tree statements and their context
+        in the indexed file as it is read.
+        """
+        if not self.is_current():
+            raise ValueError("Indexed file has been modified since indexing: '{}'".format(self.path))
+        context_ranges, tree_ranges = self._get_collection(collection_offset)
+        num_trees = len(tree_ranges)
+        parts = []
+        for byte_range in context_ranges:
+            parts.append(byte_range)
+            parts.append(b"\n")
+        for tree_offset in tree_offsets:
+            if tree_offset >= num_trees or tree_offset < -num_trees:
+                raise _tree_offset_error(tree_offset, num_trees)
+            parts.append(tree_ranges[tree_offset])
+            parts.append(b"\n")
+        if self.schema == "nexus":
+            parts.append(b"END;\n")
+        return _TreeFileSegmentReader(self.path, parts)
+
+    def split(self, num_segments, tree_offset=None):
+        """
+        Partitions the trees of the indexed file into consecutive segments
+        that can be read independently of each other (e.g., in parallel, by
+        different processes).
+
+        Each segment consists of a contiguous run of the tree statements of a
+        single collection along with the context of the collection (e.g., the
+        NEXUS "TAXA" block and "TRANSLATE" statement), so that
+        ``num_segments`` segments are returned if the file has a single
+        collection of at least ``num_segments`` trees. Trees are assigned to
+        segments so that the segments have (approximately) the same number of
+        bytes of tree statements. Reading the segments in the order returned
+        yields the trees in the order in which they appear in the file.
+
+        Parameters
+        ----------
+        num_segments : int
+            Number of segments into which to split the trees.
+        tree_offset : int
+            If specified, then the first ``tree_offset`` trees of the file
+            (counting across all collections, as with the ``tree_offset``
+            argument of :meth:`Tree.yield_from_files()`) are excluded, e.g.,
+            as a burn-in.
+
+        Returns
+        -------
+        s : list[|TreeFileSegment|]
+            The segments of the trees of the file.
+        """
+        if num_segments < 1:
+            raise ValueError("Number of segments must be at least 1: {}".format(num_segments))
+        if tree_offset is None:
+            tree_offset = 0
+        elif tree_offset < 0:
+            raise ValueError("'tree_offset' must be a non-negative integer: {}".format(tree_offset))
+        selected = []
+        source_tree_offset = 0
+        for collection_offset, (context_ranges, tree_ranges) in enumerate(self._collections):
+            start = min(max(tree_offset - source_tree_offset, 0), len(tree_ranges))
+            if start < len(tree_ranges):
+                selected.append((collection_offset, source_tree_offset, start))
+            source_tree_offset += len(tree_ranges)
+        total_size = 0
+        for collection_offset, source_tree_offset, start in selected:
+            tree_ranges = self._collections[collection_offset][1]
+            total_size += sum(end - begin for begin, end in tree_ranges[start:])
+        segments = []
+        segment_size = float(total_size) / num_segments
+        cumulative_size = 0
+        for collection_offset, source_tree_offset, start in selected:
+            context_ranges, tree_ranges = self._collections[collection_offset]
+            first = start
+            for idx in range(start, len(tree_ranges)):
+                begin, end = tree_ranges[idx]
+                cumulative_size += end - begin
+                if (idx == len(tree_ranges) - 1
+                        or cumulative_size >= segment_size * (len(segments) + 1)):
+                    segments.append(TreeFileSegment(
+                            path=self.path,
+                            schema=self.schema,
+                            file_size=self.file_size,
+                            file_mtime=self.file_mtime,
+                            context_ranges=context_ranges,
+                            tree_range=(tree_ranges[first][0], end),
+                            tree_offset=source_tree_offset + first,
+                            num_trees=idx - first + 1))
+                    first = idx + 1
+        return segments
+
+    def read_trees(self, tree_offsets=None, collection_offset=0, **kwargs):
+        """
+        Returns a new |TreeList| with the trees given by ``tree_offsets`` (or
+        all the trees, if not specified) of the collection of trees given by
+        ``collection_offset``. Keyword arguments ``kwargs`` are passed to
+        :meth:`TreeList.get()`.
+        """
+        from dendropy.datamodel.treecollectionmodel import TreeList
+        if tree_offsets is None:
+            tree_offsets = range(self.num_trees(collection_offset))
+        return TreeList.get(
+                file=self.open_trees(tree_offsets, collection_offset),
+                schema=self.schema,
+                collection_offset=0,
+                **kwargs)
+
+    def read_tree(self, tree_offset, collection_offset=0, **kwargs):
+        """
+        Returns a new |Tree| corresponding to the tree given by
+        ``tree_offset`` of the collection of trees given by
+        ``collection_offset``. Keyword arguments ``kwargs`` are passed to
+        :meth:`Tree.get()`.
+        """
+        from dendropy.datamodel.treemodel import Tree
+        return Tree.get(
+                file=self.open_trees([tree_offset], collection_offset),
+                schema=self.schema,
+                **kwargs)
+
+def _tree_offset_error(tree_offset, num_trees):
+    return IndexError("Tree offset out of range: {} (number of trees in source = {}, maximum valid tree offset = {})".format(tree_offset, num_trees, num_trees-1))
+
+class TreeFileSegment(object):
+    """
+    A contiguous run of the tree statements of a collection of trees in an
+    indexed file, along with the context required to interpret them, as
+    given by :meth:`TreeFileIndex.split()`.
+
+    Segments are small and can be pickled (e.g., to be passed to other
+    processes). The trees of a segment are read by passing the file-like
+    object returned by :meth:`TreeFileSegment.open()`, which streams the
+    text of the segment from the indexed file, to any of the usual reading
+    interfaces, with the schema of the segment::
+
+        tree_index = dendropy.dataio.treeindex.TreeFileIndex.build(
+                "mcmc.trees", schema="nexus")
+        for segment in tree_index.split(num_segments=4, tree_offset=1000):
+            trees = dendropy.TreeList.get(
+                    file=segment.open(),
+                    schema=segment.schema)
+
+    Alternatively, segments can be located without indexing the file using
+    :meth:`TreeFileSegment.locate()`, and then scanned independently of each
+    other (e.g., in parallel) using :meth:`TreeFileSegment.scan()`.
+    """
+
+    @classmethod
+    def locate(cls, path, num_segments, schema="nexus/newick"):
+        """
+        Splits the tree statements of the file at ``path`` into (up to)
+        ``num_segments`` consecutive segments of approximately the same number
+        of bytes, without scanning the whole file.
+
+        Only the statements preceding the first tree statement are scanned
+        (to establish the context of the trees). The other boundaries are
+        found by seeking to evenly-spaced byte offsets and searching forward
+        from each for the next statement terminator followed by the
+        beginning of a tree statement (so a semi-colon followed by a 'TREE'
+        keyword within a comment or quoted label is taken as a boundary).
+
+        The numbers of trees of the segments, and so their offsets in the
+        file, are not known: each segment must be scanned using
+        :meth:`TreeFileSegment.scan()` before being read, and its
+        ``tree_offset`` set by the caller from the numbers of trees of the
+        preceding segments.
+
+        Parameters
+        ----------
+        path : str
+            Path of the file to be split.
+        num_segments : int
+            Number of segments into which to split the trees.
+        schema : str
+            "nexus", "newick", or "nexus/newick" [default], as with
+            :meth:`TreeFileIndex.build()`.
+
+        Returns
+        -------
+        s : list[|TreeFileSegment|]
+            The (unscanned) segments of the trees of the file.
+        """
+        if num_segments < 1:
+            raise ValueError("Number of segments must be at least 1: {}".format(num_segments))
+        schema = _check_schema(schema, path)
+        st = os.stat(path)
+        if st.st_size == 0:
+            return []
+        with open(path, "rb") as src:
+            data = mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                schema = _resolve_schema(data, schema, path)
+                if schema == "nexus":
+                    located = _locate_nexus_trees(data)
+                    boundary_pattern = _NEXUS_TREE_BOUNDARY_PATTERN
+                else:
+                    located = _locate_newick_trees(data)
+                    boundary_pattern = _NEWICK_TREE_BOUNDARY_PATTERN
+                if located is None:
+                    return []
+                context_ranges, first = located
+                starts = [first]
+                for idx in range(1, num_segments):
+                    target = first + ((st.st_size - first) * idx) // num_segments
+                    m = boundary_pattern.search(data, max(target, starts[-1]))
+                    if m is None:
+                        break
+                    if m.end() > starts[-1]:
+                        starts.append(m.end())
+            finally:
+                data.close()
+        ends = starts[1:] + [st.st_size]
+        return [cls(path=path,
+                    schema=schema,
+                    file_size=st.st_size,
+                    file_mtime=st.st_mtime,
+                    context_ranges=context_ranges,
+                    tree_range=(start, end),
+                    tree_offset=None,
+                    num_trees=None)
+                for start, end in zip(starts, ends)]
+
+    def __init__(self,
+            path,
+            schema,
+            file_size,
+            file_mtime,
+            context_ranges,
+            tree_range,
+            tree_offset,
+            num_trees):
+        """
+        Parameters
+        ----------
+        path : str
+            Path of the indexed file.
+        schema : str
+            Schema of the indexed file: "nexus" or "newick".
+        file_size : int
+            Size of the indexed file (in bytes) when indexed.
+        file_mtime : float
+            Modification time of the indexed file when indexed.
+        context_ranges : list
+            List of the ``(start, end)`` byte offsets of all the statements
+            required to interpret the tree statements.
+        tree_range : tuple
+            The ``(start, end)`` byte offsets of the run of tree statements.
+        tree_offset : int
+            Offset of the first tree of the segment in the indexed file
+            (counting across all collections), or |None| if not yet known.
+        num_trees : int
+            Number of trees in the segment, or |None| if not yet scanned.
+        """
+        self.path = path
+        self.schema = schema
+        self.file_size = file_size
+        self.file_mtime = file_mtime
+        self.context_ranges = context_ranges
+        self.tree_range = tree_range
+        self.tree_offset = tree_offset
+        self.num_trees = num_trees
+
+    def __len__(self):
+        return self.num_trees
+
+    def _check_is_current(self):
+        st = os.stat(self.path)
+        if st.st_size != self.file_size or st.st_mtime != self.file_mtime:
+            raise ValueError("Indexed file has been modified since indexing: '{}'".format(self.path))
+
+    def scan(self):
+        """
+        Scans the tree statements of a segment given by
+        :meth:`TreeFileSegment.locate()`, setting its number of trees and
+        trimming its ``tree_range`` to end with its last tree statement.
+        ValueError is raised if the tree statements of the segment do not all
+        belong to the collection of trees in which the segment begins (e.g.,
+        if it spans two NEXUS "TREES" blocks), in which case the file must be
+        split using its index instead (see :meth:`TreeFileIndex.split()`).
+
+        Returns
+        -------
+        s : |TreeFileSegment|
+            This segment.
+        """
+        self._check_is_current()
+        start, stop = self.tree_range
+        num_trees = 0
+        trees_end = start
+        is_collection_ended = False
+        with open(self.path, "rb") as src:
+            data = mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                for statement_start, keyword_start, keyword, end in _iter_statements(data, start):
+                    if statement_start >= stop:
+                        break
+                    if self.schema == "newick":
+                        is_tree = keyword_start < end and data[keyword_start:keyword_start+1] != b";"
+                    elif keyword == b"END" or keyword == b"ENDBLOCK":
+                        is_collection_ended = True
+                        continue
+                    elif keyword == b"BEGIN" and is_collection_ended:
+                        block_name = _read_word(data,
+                                _skip_whitespace_and_comments(data, keyword_start + len(keyword)))[0]
+                        is_tree = block_name == b"TREES"
+                    else:
+                        is_tree = keyword == b"TREE"
+                    if not is_tree:
+                        continue
+                    if is_collection_ended:
+                        raise ValueError("Segment spans more than one collection of trees: '{}'".format(self.path))
+                    num_trees += 1
+                    trees_end = end
+            finally:
+                data.close()
+        self.tree_range = (start, trees_end)
+        self.num_trees = num_trees
+        return self
+
+    def open(self):
+        """
+        Returns a file-like object with data in the schema of the indexed file
+        describing (only) the trees of the segment.
+        """
+        self._check_is_current()
+        parts = []
+        for byte_range in self.context_ranges:
+            parts.append(byte_range)
+            parts.append(b"\n")
+        parts.append(self.tree_range)
+        if self.schema == "nexus":
+            parts.append(b"\nEND;")
+        parts.append(b"\n")
+        return _TreeFileSegmentReader(self.path, parts)
+
+class _TreeFileSegmentReader(object):
+    """
+    Read-only file-like object that streams the text of a sequence of byte
+    ranges of a file (and of literal byte strings).
+    """
+
+    def __init__(self, path, parts, read_size=1048576):
+        self.name = path
+        self.read_size = read_size
+        self._src = open(path, "rb")
+        self._parts = collections.deque(parts)
+        self._decoder = codecs.getincrementaldecoder(textprocessing.ENCODING or "utf-8")()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._parts.clear()
+        self._src.close()
+
+    def _read_bytes(self, size):
+        blocks = []
+        while size > 0 and self._parts:
+            part = self._parts[0]
+            if isinstance(part, bytes):
+                block = part[:size]
+                if len(block) < len(part):
+                    self._parts[0] = part[size:]
+                else:
+                    self._parts.popleft()
+            else:
+                start, end = part
+                self._src.seek(start)
+                block = self._src.read(min(size, end - start))
+                if block and start + len(block) < end:
+                    self._parts[0] = (start + len(block), end)
+                else:
+                    self._parts.popleft()
+            blocks.append(block)
+            size -= len(block)
+        return b"".join(blocks)
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            blocks = []
+            while self._parts:
+                blocks.append(self.read(self.read_size))
+            return "".join(blocks)
+        text = ""
+        while not text and self._parts:
+            data = self._read_bytes(size)
+            text = self._decoder.decode(data, final=not self._parts)
+        if not self._parts:
+            # the file is closed as soon as all its text has been read, as
+            # readers do not close the streams they are given
+            self._src.close()
+        if sys.hexversion < 0x03000000:
+            text = codecs.encode(text, "utf-8")
+        return text
+
+def get_tree_file_index(tree_index, src, schema):
+    """
+    Returns ``tree_index`` if it is a |TreeFileIndex|. Otherwise, if
+    ``tree_index`` is |True|, returns the index (as given by
+    :meth:`TreeFileIndex.get_for_path()`) of ``src``, which must be a file
+    path or a file object opened from a path.
+    """
+    if isinstance(tree_index, TreeFileIndex):
+        return tree_index
+    if tree_index is not True:
+        raise TypeError("'tree_index' must be a TreeFileIndex or True, but found: {}".format(tree_index))
+    if textprocessing.is_str_type(src):
+        path = src
+    else:
+        path = getattr(src, "name", None)
+    if not textprocessing.is_str_type(path) or not os.path.isfile(path):
+        raise TypeError("Indexed reading of trees requires the source to be given as a path")
+    if schema.lower() not in ("nexus", "newick"):
+        schema = "nexus/newick"
+    return TreeFileIndex.get_for_path(path, schema=schema)
+
+def iter_indexed_tree_sources(files, schema, tree_offset=None):
+    """
+    Iterates over the sources in ``files`` (file paths or file objects opened
+    from paths), yielding for each collection of trees in each source a
+    file-like object describing the trees of the collection starting with
+    ``tree_offset``, as streamed using the index of the source (see
+    :meth:`TreeFileIndex.get_for_path()`). Collections with no more than
+    ``tree_offset`` trees are skipped.
+    """
+    for src in files:
+        tree_index = get_tree_file_index(True, src, schema)
+        for collection_offset in range(tree_index.num_collections):
+            tree_offsets = tree_index.tree_offsets_from(tree_offset, collection_offset)
+            if len(tree_offsets) == 0:
+                continue
+            yield tree_index.open_trees(tree_offsets, collection_offset)
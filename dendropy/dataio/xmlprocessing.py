@@ -175,3 +175,33 @@ class XmlDocument(XmlObject):
         for prefix, namespace in ns_map:
             self.namespace_registry.add_namespace(prefix=prefix, namespace=namespace)
 
+
+def iterparse_elements(source, namespace_registry=None):
+    """
+    Incrementally parses the XML document in ``source`` (a filepath string
+    or a file object), yielding a tuple, ``(event, element, parent)``, on the
+    "start" and on the "end" of each element, where ``element`` is the
+    (ElementTree) element and ``parent`` is its parent element (|None| for
+    the root element). The attributes of an element are available on its
+    "start", and its subelements on its "end".
+
+    Elements are not discarded by the parser: to keep memory use from
+    growing with the size of the document, the caller should remove each
+    element from its parent (i.e., ``parent.remove(element)``) once it has
+    been processed.
+
+    If given, then the namespace prefixes declared in the document are added
+    to ``namespace_registry`` (an ``XmlNamespaces`` instance) as they are
+    encountered.
+    """
+    ancestors = []
+    for event, elem in ElementTree.iterparse(source, ("start", "end", "start-ns")):
+        if event == "start-ns":
+            if namespace_registry is not None:
+                namespace_registry.add_namespace(prefix=elem[0], namespace=elem[1])
+        elif event == "start":
+            yield event, elem, (ancestors[-1] if ancestors else None)
+            ancestors.append(elem)
+        else:
+            ancestors.pop()
+            yield event, elem, (ancestors[-1] if ancestors else None)
@@ -33,6 +33,7 @@ if not (sys.version_info.major >= 3 and sys.version_info.minor >= 4):
 from dendropy.utility import container
 from dendropy.utility import bibtex
 from dendropy.utility import textprocessing
+from dendropy.utility import filesys
 from dendropy.utility import urlio
 from dendropy.utility import error
 from dendropy.utility import deprecate
@@ -56,6 +57,63 @@ def _extract_serialization_target_keyword(kwargs, target_type):
     schema = kwargs.pop("schema")
     return found_kw[0], target, schema
 
+##############################################################################
+## Instance State
+
+_SLOT_NAMES = {}
+
+def _get_slot_names(cls):
+    """
+    Returns the names of the slots (other than "__dict__" and "__weakref__")
+    defined by ``cls`` and its base classes.
+    """
+    try:
+        return _SLOT_NAMES[cls]
+    except KeyError:
+        pass
+    slot_names = []
+    for base in cls.__mro__:
+        slots = base.__dict__.get("__slots__", ())
+        if textprocessing.is_str_type(slots):
+            slots = (slots,)
+        for name in slots:
+            if name not in ("__dict__", "__weakref__") and name not in slot_names:
+                slot_names.append(name)
+    slot_names = tuple(slot_names)
+    _SLOT_NAMES[cls] = slot_names
+    return slot_names
+
+def _get_instance_state(obj):
+    """
+    Returns a tuple of the instance dictionary of ``obj`` (or |None| if it is
+    empty) and a list of the (name, value) pairs of the slots of ``obj`` that
+    are set. Unlike accessing ``obj.__dict__``, this does not create an empty
+    instance dictionary for objects of slotted classes that do not have one.
+    """
+    slot_items = []
+    for name in _get_slot_names(type(obj)):
+        try:
+            slot_items.append((name, getattr(obj, name)))
+        except AttributeError:
+            pass
+    if sys.version_info >= (3, 11):
+        state = object.__getstate__(obj)
+        if isinstance(state, tuple):
+            state = state[0]
+        return state or None, slot_items
+    return getattr(obj, "__dict__", None) or None, slot_items
+
+def _set_instance_state(obj, state):
+    """
+    Restores the state of ``obj`` from ``state``, as returned by
+    :func:`_get_instance_state()`.
+    """
+    instance_dict, slot_items = state
+    if instance_dict:
+        obj.__dict__.update(instance_dict)
+    for name, value in slot_items:
+        setattr(obj, name, value)
+
 ##############################################################################
 ## DataObject
 
@@ -65,6 +123,10 @@ class DataObject(object):
     Base class for all phylogenetic data objects.
     """
 
+    # Empty, so that derived classes can define slots (classes that do not
+    # will have instance dictionaries as usual).
+    __slots__ = ()
+
     def __init__(self, label=None):
         self._label = None
         if label is not None:
@@ -200,9 +262,19 @@ class Deserializable(object):
         Parameters
         ----------
         src : string
-            Full file path to source of data.
+            Full file path to source of data. Files compressed with gzip,
+            bzip2 or xz are detected by their leading bytes and decompressed
+            as they are read.
         schema : string
             Specification of data format (e.g., "nexus").
+        parse_cache : ParseCache, str, or bool
+            If given, then the object is rebuilt from the entry of the file
+            in this on-disk parse cache (see
+            :class:`dendropy.dataio.parsecache.ParseCache`), or in the cache
+            in this directory or, if |True|, in the default cache directory,
+            if the file has been read before with the same arguments and has
+            not been modified since; otherwise the parsed object is stored
+            in the cache.
         \*\*kwargs : keyword arguments, optional
             Arguments to customize parsing, instantiation, processing, and
             accession of objects read from the data source, including schema-
@@ -215,7 +287,11 @@ class Deserializable(object):
             New instance of object, constructed and populated from data given
             in source.
         """
-        with open(src, "r", newline=None) as fsrc:
+        parse_cache = kwargs.pop("parse_cache", None)
+        if parse_cache:
+            from dendropy.dataio import parsecache
+            return parsecache.get_parse_cache(parse_cache).get_from_path(cls, src, schema, kwargs)
+        with filesys.open_source_path(src) as fsrc:
             return cls._parse_and_create_from_stream(stream=fsrc,
                     schema=schema,
                     **kwargs)
@@ -392,7 +468,9 @@ class MultiReadable(object):
         Parameters
         ----------
         filepath : file or file-like
-            Full file path to source of data.
+            Full file path to source of data. Files compressed with gzip,
+            bzip2 or xz are detected by their leading bytes and decompressed
+            as they are read.
         schema : string
             Specification of data format (e.g., "nexus").
         \*\*kwargs : keyword arguments, optional
@@ -412,7 +490,7 @@ class MultiReadable(object):
                 - |CharacterMatrix|: number of sequences
                 - |DataSet|: ``tuple`` (number of taxon namespaces, number of tree lists, number of matrices)
         """
-        with open(src, "r", newline=None) as fsrc:
+        with filesys.open_source_path(src) as fsrc:
             return self._parse_and_add_from_stream(stream=fsrc, schema=schema, **kwargs)
 
     def read_from_string(self, src, schema, **kwargs):
@@ -568,6 +646,12 @@ class Serializable(object):
             - **schema** (*str*) -- Identifier of format of data. See
               "|Schemas|" for more details.
 
+        **Optional Destination-Specification Keyword Argument:**
+
+            - **compression** (*str*) -- If writing to a path, then the
+              file is compressed in this format ("gzip", "bz2", or "xz") as
+              it is written.
+
         **Optional Schema-Specific Keyword Arguments:**
 
             These provide control over how the data is formatted, and supported
@@ -597,11 +681,14 @@ class Serializable(object):
         """
         return self._format_and_write_to_stream(stream=dest, schema=schema, **kwargs)
 
-    def write_to_path(self, dest, schema, **kwargs):
+    def write_to_path(self, dest, schema, compression=None, **kwargs):
         """
-        Writes to file specified by ``dest``.
+        Writes to file specified by ``dest``, compressed in the format given
+        by ``compression`` ("gzip", "bz2", or "xz"), if this is not |None|.
         """
-        with open(os.path.expandvars(os.path.expanduser(dest)), "w") as f:
+        with filesys.open_destination_path(
+                os.path.expandvars(os.path.expanduser(dest)),
+                compression=compression) as f:
             return self._format_and_write_to_stream(stream=f, schema=schema, **kwargs)
 
     def as_string(self, schema, **kwargs):
@@ -632,13 +719,23 @@ class Annotable(object):
     """
     Mixin class which all classes that need to persist object attributes
     or other information as metadata should subclass.
+
+    Derived classes that define slots need to provide the slots
+    "_annotations" and "_deferred_annotation_sources", which are left unset
+    until used.
     """
 
+    __slots__ = ()
+
     def _get_annotations(self):
+        if hasattr(self, "_deferred_annotation_sources"):
+            self._process_deferred_annotation_sources()
         if not hasattr(self, "_annotations"):
             self._annotations = AnnotationSet(self)
         return self._annotations
     def _set_annotations(self, annotations):
+        if hasattr(self, "_deferred_annotation_sources"):
+            del self._deferred_annotation_sources
         if hasattr(self, "_annotations") \
                 and annotations is self._annotations \
                 and self._annotations.target is self:
@@ -654,9 +751,29 @@ class Annotable(object):
     annotations = property(_get_annotations, _set_annotations)
 
     def _has_annotations(self):
+        if hasattr(self, "_deferred_annotation_sources"):
+            self._process_deferred_annotation_sources()
         return hasattr(self, "_annotations") and len(self._annotations) > 0
     has_annotations = property(_has_annotations)
 
+    def _add_deferred_annotation_source(self, source, process_fn):
+        """
+        Registers ``source`` (e.g., a metadata comment string) to be
+        processed into annotations only when the annotations of this object
+        are first accessed (or copied), by calling ``process_fn(self,
+        source)``.
+        """
+        try:
+            self._deferred_annotation_sources.append((source, process_fn))
+        except AttributeError:
+            self._deferred_annotation_sources = [(source, process_fn)]
+
+    def _process_deferred_annotation_sources(self):
+        sources = self._deferred_annotation_sources
+        del self._deferred_annotation_sources
+        for source, process_fn in sources:
+            process_fn(self, source)
+
     def copy_annotations_from(self,
             other,
             attribute_object_mapper=None):
@@ -705,6 +822,8 @@ class Annotable(object):
             instead.
 
         """
+        if hasattr(other, "_deferred_annotation_sources"):
+            other._process_deferred_annotation_sources()
         if hasattr(other, "_annotations"):
             if attribute_object_mapper is None:
                 attribute_object_mapper = {id(object):self}
@@ -722,6 +841,8 @@ class Annotable(object):
         (i.e., a reference to a particular entity may be absolute regardless of
         context).
         """
+        if hasattr(other, "_deferred_annotation_sources"):
+            other._process_deferred_annotation_sources()
         if hasattr(other, "_annotations"):
             # if not isinstance(self, other.__class__) or not isinstance(other, self.__class__):
             if type(self) is not type(other):
@@ -755,6 +876,8 @@ class Annotable(object):
         """
         if memo is None:
             memo = {}
+        if hasattr(self, "_deferred_annotation_sources"):
+            self._process_deferred_annotation_sources()
         other = self.__class__()
         memo[id(self)] = other
         for k in self.__dict__:
@@ -768,6 +891,8 @@ class Annotable(object):
         # ensure clone map
         if memo is None:
             memo = {}
+        if hasattr(self, "_deferred_annotation_sources"):
+            self._process_deferred_annotation_sources()
         # get or create clone of self
         try:
             other = memo[id(self)]
@@ -778,14 +903,25 @@ class Annotable(object):
             # store
             memo[id(self)] = other
         # copy other attributes first, skipping annotations
-        for k in self.__dict__:
-            if k == "_annotations":
-                continue
-            if k in other.__dict__:
-                continue
-            other.__dict__[k] = copy.deepcopy(self.__dict__[k], memo)
-            memo[id(self.__dict__[k])] = other.__dict__[k]
-            # assert id(self.__dict__[k]) in memo
+        self_dict, self_slot_items = _get_instance_state(self)
+        if self_slot_items:
+            other_dict, other_slot_items = _get_instance_state(other)
+            other_slot_names = set(k for k, v in other_slot_items)
+            for k, v in self_slot_items:
+                if k == "_annotations" or k in other_slot_names:
+                    continue
+                v2 = copy.deepcopy(v, memo)
+                setattr(other, k, v2)
+                memo[id(v)] = v2
+        if self_dict:
+            for k in self_dict:
+                if k == "_annotations":
+                    continue
+                if k in other.__dict__:
+                    continue
+                other.__dict__[k] = copy.deepcopy(self_dict[k], memo)
+                memo[id(self_dict[k])] = other.__dict__[k]
+                # assert id(self.__dict__[k]) in memo
         # create annotations
         other.deep_copy_annotations_from(self, memo)
         # return
@@ -571,6 +571,14 @@ class CharacterMatrix(
             - **matrix_offset** (*int*) -- 0-based index of character block or
               matrix in source to be parsed. If not specified then the
               first matrix (offset = 0) is assumed.
+            - **parse_cache** (*ParseCache*, *str* or *bool*) -- On-disk
+              parse cache (see :class:`dendropy.dataio.parsecache.ParseCache`),
+              or the directory of the cache, or |True| for the cache in the
+              default directory. If given (with ``path``), then the
+              matrix is rebuilt from the compact stored form of the result of a
+              previous parse of the unmodified file with the same arguments,
+              if any, without the file being parsed; otherwise the result of
+              the parse is stored in the cache.
             - **ignore_unrecognized_keyword_arguments** (*bool*) -- If |True|,
               then unsupported or unrecognized keyword arguments will not
               result in an error. Default is |False|: unsupported keyword
@@ -606,6 +614,116 @@ class CharacterMatrix(
         """
         return cls._get_from(**kwargs)
 
+    def yield_sequences_from_files(cls,
+            files,
+            schema,
+            as_state_indexes=False,
+            **kwargs):
+        """
+        Iterates over the sequences of the character data in files, returning
+        them one-by-one, as soon as they are read, instead of instantiating a
+        character matrix.
+
+        For operations that run over the sequences once (e.g., filtering
+        sequences, calculating statistics or converting the data to another
+        format with :meth:`CharacterMatrix.get_sequence_stream_writer()`),
+        this requires memory for only a single sequence at a time instead of
+        the full matrix of state identities.
+
+        Parameters
+        ----------
+        files : iterable of file paths or file-like objects.
+            Iterable of sources, which can either be strings specifying file
+            paths or file-like objects open for reading. If a source element is
+            a string (``isinstance(i,str) == True``), then it is assumed to be
+            a path to a file. Otherwise, the source is assumed to be a file-like
+            object.
+        schema : string
+            The name of the data format ("fasta" or "phylip").
+        as_state_indexes : bool
+            If |True|, then each sequence is yielded as an array of the
+            indexes of its states in the state alphabet given by the
+            ``state_alphabet`` keyword argument or, if this is not given, in
+            the (fixed) state alphabet of this class (e.g., the DNA state
+            alphabet for |DnaCharacterMatrix|). Default is |False|:
+            sequences are yielded as strings of their symbols.
+        read_ahead : bool or int
+            If |True| or a positive integer, then each source is read (and,
+            if it is a path to a compressed file, decompressed) and
+            decoded in blocks by a background thread, at most this many blocks
+            (or a default number of blocks, if |True|) ahead of the parsing.
+        prefetch_files : bool
+            If |True|, then the background reading of each source in
+            ``files`` is started while the preceding source is being parsed
+            (this implies ``read_ahead``).
+        \*\*kwargs : keyword arguments
+            These will be passed directly to the schema-parser implementation.
+
+        Yields
+        ------
+        r : |SequenceRecord|
+            Named tuple of the label of the sequence (``r.label``) and the
+            sequence (``r.sequence``).
+
+        Examples
+        --------
+
+        ::
+
+            writer = dendropy.DnaCharacterMatrix.get_sequence_stream_writer(
+                    stream=open("filtered.fasta", "w"),
+                    schema="fasta")
+            with writer:
+                for label, seq in dendropy.DnaCharacterMatrix.yield_sequences_from_files(
+                        files=["genome.fasta"],
+                        schema="fasta"):
+                    if seq.count("-") < len(seq) / 2:
+                        writer.write_sequence(label, seq)
+
+        """
+        if as_state_indexes:
+            kwargs["state_alphabet"] = cls._get_stream_state_alphabet(kwargs.get("state_alphabet", None))
+        return dataio.get_sequence_yielder(files, schema, **kwargs)
+    yield_sequences_from_files = classmethod(yield_sequences_from_files)
+
+    def get_sequence_stream_writer(cls,
+            stream,
+            schema,
+            **kwargs):
+        """
+        Returns a writer that writes sequences to ``stream`` one at a time,
+        as they are given to its ``write_sequence(label, sequence)`` method,
+        without a character matrix being built. The writer should be closed
+        (or used as a context manager) once all the sequences have been
+        written.
+
+        Parameters
+        ----------
+        stream : file or file-like object
+            Destination for data.
+        schema : string
+            The name of the data format ("fasta" or "phylip").
+        \*\*kwargs : keyword arguments
+            These will be passed directly to the schema-writer implementation.
+            Sequences can be given as strings of symbols, iterables of state
+            identities or, if the ``state_alphabet`` keyword argument is given
+            or this class has a fixed state alphabet, iterables of state
+            indexes (as yielded by
+            :meth:`CharacterMatrix.yield_sequences_from_files()`).
+        """
+        if getattr(cls, "datatype_alphabet", None) is not None:
+            kwargs["state_alphabet"] = cls._get_stream_state_alphabet(kwargs.get("state_alphabet", None))
+        return dataio.get_sequence_writer(stream, schema, **kwargs)
+    get_sequence_stream_writer = classmethod(get_sequence_stream_writer)
+
+    def _get_stream_state_alphabet(cls, state_alphabet):
+        if state_alphabet is None:
+            state_alphabet = getattr(cls, "datatype_alphabet", None)
+            if state_alphabet is None:
+                raise TypeError("State alphabet must be specified for this data type")
+        return state_alphabet
+    _get_stream_state_alphabet = classmethod(_get_stream_state_alphabet)
+
     def concatenate(cls, char_matrices):
         """
         Creates and returns a single character matrix from multiple
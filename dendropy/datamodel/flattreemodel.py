@@ -0,0 +1,492 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+This module handles the definition of an immutable, array-based
+representation of a tree, for computations that do not need to modify
+trees.
+"""
+
+import array
+from dendropy.utility import bitprocessing
+from dendropy.utility import constants
+from dendropy.utility import error
+from dendropy.datamodel import treemodel
+
+class FlatTree(object):
+    """
+    Immutable representation of the structure, edge lengths and taxa of a
+    tree as flat arrays, indexed by node.
+
+    Nodes are indexed in level order (i.e., breadth-first, with the
+    children of each node in order), starting from 0 for the seed node, so
+    that the children of each node have consecutive indexes, and the index
+    of each node is greater than that of its parent. The following
+    attributes (which must not be modified) describe the tree:
+
+        ``parent_indices``
+            Array of the index of the parent of each node (-1 for the seed
+            node).
+        ``child_offsets``
+            Array of the index of the first child of each node, followed by
+            the number of nodes, so that the children of the node with index
+            ``i`` are the nodes with indexes from ``child_offsets[i]`` to
+            ``child_offsets[i+1] - 1``.
+        ``edge_lengths``
+            Array of the lengths of the edges subtending each node, with
+            edges without a length (i.e., of length |None|) given a length
+            of 0.0.
+        ``taxon_indices``
+            Array of the accession index, in ``taxon_namespace``, of the
+            taxon of each node (-1 for nodes without a taxon).
+        ``postorder``
+            Array of the indexes of the nodes in the order in which the nodes
+            of the tree are visited in postorder.
+        ``node_labels``
+            List of the labels of the nodes, or |None| if no node has a label.
+
+    As nodes are not objects, results computed for nodes are returned as
+    arrays indexed by node rather than set as node attributes. Other
+    information (such as edge labels, annotations or comments) of the tree
+    is not represented.
+    """
+
+    def from_tree(cls, tree):
+        """
+        Returns a |FlatTree| representing ``tree``.
+
+        Parameters
+        ----------
+        tree : |Tree|
+            The tree to represent. All the taxa of the nodes of ``tree`` must
+            be in its taxon namespace.
+
+        Returns
+        -------
+        t : |FlatTree|
+            A new |FlatTree| object.
+        """
+        flat_tree = cls()
+        flat_tree._taxon_namespace = tree.taxon_namespace
+        flat_tree.label = tree.label
+        flat_tree.is_rooted = tree.is_rooted
+        nodes = [tree.seed_node]
+        parent_indices = [-1]
+        child_offsets = []
+        idx = 0
+        while idx < len(nodes):
+            child_offsets.append(len(nodes))
+            child_nodes = nodes[idx]._child_nodes
+            nodes.extend(child_nodes)
+            parent_indices.extend([idx] * len(child_nodes))
+            idx += 1
+        child_offsets.append(len(nodes))
+        flat_tree.parent_indices = array.array("l", parent_indices)
+        flat_tree.child_offsets = array.array("l", child_offsets)
+        edge_lengths = [nd._edge.length for nd in nodes]
+        flat_tree._missing_edge_length_indices = frozenset(idx for idx, length in enumerate(edge_lengths) if length is None)
+        if flat_tree._missing_edge_length_indices:
+            edge_lengths = [0.0 if length is None else length for length in edge_lengths]
+        flat_tree.edge_lengths = array.array("d", edge_lengths)
+        taxon_namespace = tree.taxon_namespace
+        taxon_indices = array.array("l", [-1]) * len(nodes)
+        for idx, nd in enumerate(nodes):
+            if nd.taxon is not None:
+                try:
+                    taxon_indices[idx] = taxon_namespace.accession_index(nd.taxon)
+                except KeyError:
+                    raise ValueError("Taxon of node is not in the taxon namespace of the tree: {}".format(nd.taxon))
+        flat_tree.taxon_indices = taxon_indices
+        node_labels = [nd._label for nd in nodes]
+        if any(label is not None for label in node_labels):
+            flat_tree.node_labels = node_labels
+        else:
+            flat_tree.node_labels = None
+        flat_tree.postorder = flat_tree._calc_postorder()
+        return flat_tree
+    from_tree = classmethod(from_tree)
+
+    def __init__(self):
+        """
+        Creates an empty |FlatTree|: use :meth:`FlatTree.from_tree()` or
+        :meth:`Tree.to_flat()` to create a |FlatTree| representing a tree.
+        """
+        self._taxon_namespace = None
+        self.label = None
+        self.is_rooted = None
+        self.parent_indices = array.array("l")
+        self.child_offsets = array.array("l", [0])
+        self.edge_lengths = array.array("d")
+        self.taxon_indices = array.array("l")
+        self.postorder = array.array("l")
+        self.node_labels = None
+        self._missing_edge_length_indices = frozenset()
+        self._taxa = None
+
+    def _calc_postorder(self):
+        child_offsets = self.child_offsets
+        postorder = array.array("l")
+        if not self.parent_indices:
+            return postorder
+        # stack of (node, index of next child to visit)
+        stack = [(0, child_offsets[0])]
+        while stack:
+            idx, next_child_idx = stack[-1]
+            if next_child_idx < child_offsets[idx+1]:
+                stack[-1] = (idx, next_child_idx + 1)
+                stack.append((next_child_idx, child_offsets[next_child_idx]))
+            else:
+                postorder.append(idx)
+                stack.pop()
+        return postorder
+
+    def _get_taxon_namespace(self):
+        return self._taxon_namespace
+    taxon_namespace = property(_get_taxon_namespace)
+
+    def __len__(self):
+        """
+        Returns the number of nodes of the tree.
+        """
+        return len(self.parent_indices)
+
+    ###########################################################################
+    ### Conversion
+
+    def to_tree(self, tree_factory=None):
+        """
+        Returns a |Tree| of the structure, edge lengths, taxa and node
+        labels represented by this |FlatTree|, referencing the same taxon
+        namespace.
+
+        Parameters
+        ----------
+        tree_factory : function object, optional
+            Function object that returns a new |Tree| object (or an object
+            of a class derived from |Tree|) given a ``taxon_namespace``
+            keyword argument. Defaults to |Tree|.
+
+        Returns
+        -------
+        t : |Tree|
+            A new |Tree| object.
+        """
+        if tree_factory is None:
+            tree_factory = treemodel.Tree
+        tree = tree_factory(taxon_namespace=self._taxon_namespace)
+        tree.label = self.label
+        tree.is_rooted = self.is_rooted
+        taxa = self._accession_index_taxon_map()
+        parent_indices = self.parent_indices
+        edge_lengths = self.edge_lengths
+        missing_edge_length_indices = self._missing_edge_length_indices
+        node_labels = self.node_labels
+        nodes = []
+        for idx, taxon_idx in enumerate(self.taxon_indices):
+            if idx == 0:
+                nd = tree.seed_node
+            else:
+                nd = tree.node_factory()
+                nodes[parent_indices[idx]].add_child(nd)
+            if taxon_idx >= 0:
+                nd.taxon = taxa[taxon_idx]
+            if node_labels is not None:
+                nd.label = node_labels[idx]
+            if idx not in missing_edge_length_indices:
+                nd.edge.length = edge_lengths[idx]
+            nodes.append(nd)
+        return tree
+
+    def _accession_index_taxon_map(self):
+        taxon_namespace = self._taxon_namespace
+        return dict((taxon_namespace.accession_index(taxon), taxon) for taxon in taxon_namespace)
+
+    ###########################################################################
+    ### Structure
+
+    def child_indices(self, node_index):
+        """
+        Returns the (range of) indexes of the children of the node with index
+        ``node_index``.
+        """
+        return range(self.child_offsets[node_index], self.child_offsets[node_index+1])
+
+    def is_leaf(self, node_index):
+        """
+        Returns |True| if the node with index ``node_index`` has no children.
+        """
+        return self.child_offsets[node_index] == self.child_offsets[node_index+1]
+
+    def taxon(self, node_index):
+        """
+        Returns the |Taxon| of the node with index ``node_index``, or |None|
+        if it does not have a taxon.
+        """
+        taxon_idx = self.taxon_indices[node_index]
+        if taxon_idx < 0:
+            return None
+        try:
+            return self._taxa[taxon_idx]
+        except (KeyError, TypeError):
+            self._taxa = self._accession_index_taxon_map()
+            return self._taxa.get(taxon_idx, None)
+
+    def leaf_index_iter(self):
+        """
+        Iterates over the indexes of the leaf nodes of the tree, in the same
+        order as :meth:`Tree.leaf_node_iter()`.
+        """
+        child_offsets = self.child_offsets
+        for idx in self.postorder:
+            if child_offsets[idx] == child_offsets[idx+1]:
+                yield idx
+
+    def leaf_taxa(self):
+        """
+        Returns the list of the taxa of the leaf nodes of the tree (with
+        |None| for leaf nodes without a taxon), in the same order as
+        :meth:`Tree.leaf_node_iter()`.
+        """
+        taxa = self._accession_index_taxon_map()
+        taxon_indices = self.taxon_indices
+        return [taxa.get(taxon_indices[idx], None) for idx in self.leaf_index_iter()]
+
+    ###########################################################################
+    ### Ages, Distances and Lengths
+
+    def calc_node_ages(self,
+            ultrametricity_precision=constants.DEFAULT_ULTRAMETRICITY_PRECISION,
+            force_max_age=False,
+            force_min_age=False):
+        """
+        Returns the ages of the nodes, i.e., the sums of edge lengths from
+        each node to the tips, as an array indexed by node. As with
+        :meth:`Tree.calc_node_ages()`, the age of an internal node is
+        calculated through its first child unless ``force_max_age`` or
+        ``force_min_age`` is |True|.
+
+        Parameters
+        ----------
+        ultrametricity_precision : numeric or bool or None
+            If the lengths of different paths to the node differ by more than
+            ``ultrametricity_precision``, then a ValueError exception will be
+            raised indicating deviation from ultrametricity. If
+            ``ultrametricity_precision`` is negative or False, then this check
+            will be skipped.
+        force_max_age: bool
+            If ``force_max_age`` is |True|, then each node will be set to the
+            maximum possible age, given its child set and the subtending edge
+            lengths.
+        force_min_age: bool
+            If ``force_min_age`` is |True| then each node will be set to the
+            minimum possible age, given its child set and the subtending edge
+            lengths.
+
+        Returns
+        -------
+        a : :py:class:`array.array` [float]
+            Array of the ages of the nodes, indexed by node.
+        """
+        if force_max_age and force_min_age:
+            raise ValueError("Cannot specify both 'force_max_age' and 'force_min_age'")
+        num_nodes = len(self.parent_indices)
+        parent_indices = self.parent_indices
+        child_offsets = self.child_offsets
+        edge_lengths = self.edge_lengths
+        ages = array.array("d", [0.0]) * num_nodes
+        # children are visited before their parents, last child first
+        if force_max_age or force_min_age:
+            for idx in range(num_nodes - 1, 0, -1):
+                parent_idx = parent_indices[idx]
+                age = ages[idx] + edge_lengths[idx]
+                if idx == child_offsets[parent_idx+1] - 1:
+                    ages[parent_idx] = age
+                elif force_max_age:
+                    if age > ages[parent_idx]:
+                        ages[parent_idx] = age
+                elif age < ages[parent_idx]:
+                    ages[parent_idx] = age
+        else:
+            for idx in range(num_nodes - 1, 0, -1):
+                ages[parent_indices[idx]] = ages[idx] + edge_lengths[idx]
+            if not (ultrametricity_precision is None or ultrametricity_precision is False or ultrametricity_precision < 0):
+                for idx in range(1, num_nodes):
+                    d = abs(ages[parent_indices[idx]] - (ages[idx] + edge_lengths[idx]))
+                    if d > ultrametricity_precision:
+                        raise error.UltrametricityError("Tree is not ultrametric within threshold of {threshold}: {deviance}".format(
+                            threshold=ultrametricity_precision,
+                            deviance=d,
+                            ))
+        return ages
+
+    def node_ages(self,
+            ultrametricity_precision=constants.DEFAULT_ULTRAMETRICITY_PRECISION,
+            force_max_age=False,
+            force_min_age=False,
+            internal_only=False):
+        """
+        Returns the sorted list of the ages of all the nodes (or only of the
+        internal nodes, if ``internal_only`` is |True|), as
+        :meth:`Tree.node_ages()`.
+        """
+        ages = self.calc_node_ages(
+                ultrametricity_precision=ultrametricity_precision,
+                force_max_age=force_max_age,
+                force_min_age=force_min_age)
+        if internal_only:
+            child_offsets = self.child_offsets
+            ages = [age for idx, age in enumerate(ages) if child_offsets[idx] != child_offsets[idx+1]]
+        else:
+            ages = list(ages)
+        ages.sort()
+        return ages
+
+    def internal_node_ages(self,
+            ultrametricity_precision=constants.DEFAULT_ULTRAMETRICITY_PRECISION,
+            force_max_age=False,
+            force_min_age=False):
+        """
+        Returns the sorted list of the ages of the internal nodes, as
+        :meth:`Tree.internal_node_ages()`.
+        """
+        return self.node_ages(
+                ultrametricity_precision=ultrametricity_precision,
+                force_max_age=force_max_age,
+                force_min_age=force_min_age,
+                internal_only=True)
+
+    def coalescence_intervals(self):
+        """
+        Returns list of coalescence intervals, i.e., the waiting times between
+        successive coalescence events, as
+        :meth:`Tree.coalescence_intervals()`.
+        """
+        ages = self.node_ages()
+        intervals = [ages[0]]
+        intervals.extend([d - ages[i] for i, d in enumerate(ages[1:])])
+        return intervals
+
+    def calc_node_root_distances(self):
+        """
+        Returns the sums of edge lengths from each node to the root, as an
+        array indexed by node.
+        """
+        num_nodes = len(self.parent_indices)
+        parent_indices = self.parent_indices
+        edge_lengths = self.edge_lengths
+        distances = array.array("d", [0.0]) * num_nodes
+        # parents are visited before their children
+        for idx in range(1, num_nodes):
+            distances[idx] = distances[parent_indices[idx]] + edge_lengths[idx]
+        return distances
+
+    def length(self):
+        """
+        Returns sum of edge lengths, as :meth:`Tree.length()`.
+        """
+        return sum(self.edge_lengths)
+
+    ###########################################################################
+    ### Bipartitions
+
+    def calc_leafset_bitmasks(self):
+        """
+        Returns the list of the leafset bitmasks of the nodes (i.e., the
+        bitmasks of the taxa of the leaf nodes descending from each node),
+        indexed by node.
+        """
+        num_nodes = len(self.parent_indices)
+        parent_indices = self.parent_indices
+        child_offsets = self.child_offsets
+        taxon_indices = self.taxon_indices
+        bitmasks = [0] * num_nodes
+        for idx in range(num_nodes):
+            taxon_idx = taxon_indices[idx]
+            if taxon_idx >= 0 and child_offsets[idx] == child_offsets[idx+1]:
+                bitmasks[idx] = 1 << taxon_idx
+        for idx in range(num_nodes - 1, 0, -1):
+            bitmasks[parent_indices[idx]] |= bitmasks[idx]
+        return bitmasks
+
+    def encode_bipartitions(self,
+            suppress_unifurcations=True,
+            collapse_unrooted_basal_bifurcation=True,
+            is_bipartitions_mutable=False):
+        """
+        Returns the list of the bipartitions of the tree, as the list
+        returned by :meth:`Tree.encode_bipartitions()` for the tree (without,
+        of course, the tree being modified): edges subtending nodes of
+        outdegree 1 are skipped if ``suppress_unifurcations`` is |True|, and,
+        if ``collapse_unrooted_basal_bifurcation`` is |True|, so is the edge
+        collapsed by :meth:`Tree.collapse_basal_bifurcation()` if the tree is
+        not rooted.
+        """
+        if not self.parent_indices:
+            return []
+        child_offsets = self.child_offsets
+        is_rooted = self.is_rooted
+        skipped_idx = None
+        if (collapse_unrooted_basal_bifurcation
+                and not is_rooted
+                and child_offsets[1] - child_offsets[0] == 2):
+            ch1 = child_offsets[0]
+            ch2 = ch1 + 1
+            if child_offsets[ch2+1] - child_offsets[ch2] >= 2:
+                skipped_idx = ch2
+            elif child_offsets[ch1+1] - child_offsets[ch1] >= 2:
+                skipped_idx = ch1
+            if skipped_idx is not None:
+                is_rooted = False
+        leafset_bitmasks = self.calc_leafset_bitmasks()
+        tree_leafset_bitmask = leafset_bitmasks[0]
+        if tree_leafset_bitmask:
+            lowest_relevant_bit = bitprocessing.least_significant_set_bit(tree_leafset_bitmask)
+        else:
+            lowest_relevant_bit = None
+        Bipartition = treemodel.Bipartition
+        bipartitions = []
+        for idx in self.postorder:
+            if idx == skipped_idx:
+                continue
+            if suppress_unifurcations and child_offsets[idx+1] - child_offsets[idx] == 1:
+                continue
+            bipartition = Bipartition(compile_bipartition=False, is_mutable=True)
+            leafset_bitmask = leafset_bitmasks[idx]
+            if lowest_relevant_bit is None:
+                bipartition._leafset_bitmask = leafset_bitmask
+                bipartition._is_rooted = is_rooted
+                bipartition.compile_split_bitmask(
+                        tree_leafset_bitmask=tree_leafset_bitmask,
+                        is_mutable=is_bipartitions_mutable)
+            else:
+                # as compiled by ``Bipartition.compile_split_bitmask()``
+                # (the leafset bitmasks of the nodes are within the leafset
+                # bitmask of the tree)
+                bipartition._leafset_bitmask = leafset_bitmask
+                bipartition._tree_leafset_bitmask = tree_leafset_bitmask
+                bipartition._lowest_relevant_bit = lowest_relevant_bit
+                bipartition._is_rooted = is_rooted
+                if is_rooted:
+                    bipartition._split_bitmask = leafset_bitmask
+                elif leafset_bitmask & lowest_relevant_bit:
+                    bipartition._split_bitmask = (~leafset_bitmask) & tree_leafset_bitmask
+                else:
+                    bipartition._split_bitmask = leafset_bitmask
+                bipartition.is_mutable = is_bipartitions_mutable
+            bipartitions.append(bipartition)
+        return bipartitions
@@ -33,6 +33,7 @@ from dendropy.utility import container
 from dendropy.utility import error
 from dendropy.utility import bitprocessing
 from dendropy.utility import deprecate
+from dendropy.utility import textprocessing
 from dendropy.utility import constants
 from dendropy.calculate import statistics
 from dendropy.datamodel import basemodel
@@ -130,6 +131,13 @@ class TreeList(
                 * ``tree_list`` : **SPECIAL** If passed a |TreeList| using
                   this keyword, then this instance is populated and returned
                   (instead of a new instance being created).
+                * ``tree_index`` : A |TreeFileIndex| of the data source, or
+                  |True| to use the index given by
+                  :meth:`TreeFileIndex.get_for_path()`. If given with
+                  ``collection_offset`` or ``tree_offset``, then only the
+                  requested tree statements and their context are read from
+                  the data source (and operational taxonomic unit concepts
+                  only referenced in other trees are not accessioned).
 
             All other keyword arguments are passed directly to |TreeList|.read()`.
             Other keyword arguments may be available, depending on the implementation
@@ -145,6 +153,8 @@ class TreeList(
         source, there is no gain in efficiency. If you need multiple trees or
         subsets of trees from the same data source, it would be much more
         efficient to read the entire data source, and extract trees as needed.
+        The exception is if a ``tree_index`` is given, in which case only the
+        requested trees are parsed.
 
         Returns
         -------
@@ -156,10 +166,23 @@ class TreeList(
         tree_list = kwargs.pop("tree_list", None)
         taxon_namespace = taxonmodel.process_kwargs_dict_for_taxon_namespace(kwargs, None)
         label = kwargs.pop("label", None)
+        tree_index = kwargs.pop("tree_index", None)
 
         # get the reader
         reader = dataio.get_reader(schema, **kwargs)
 
+        # read only the requested trees using the index
+        if tree_index is not None and (collection_offset is not None or tree_offset is not None):
+            tree_index = dataio.treeindex.get_tree_file_index(tree_index, stream, schema)
+            if collection_offset is None:
+                collection_offset = 0
+            tree_offsets = tree_index.tree_offsets_from(tree_offset, collection_offset)
+            if len(tree_offsets) == 0 and tree_offset is not None:
+                tree_index.check_tree_offset(tree_offset, collection_offset)
+            stream = tree_index.open_trees(tree_offsets, collection_offset)
+            collection_offset = 0
+            tree_offset = None
+
         # Accommodate an existing TreeList object being passed
         if tree_list is None:
             tree_list = cls(label=label, taxon_namespace=taxon_namespace)
@@ -248,6 +271,22 @@ class TreeList(
               specified, then the first tree (offset = 0) is assumed (i.e., no
               trees within the specified collection will be skipped). Use this
               to specify, e.g. a burn-in.
+            - **tree_index** (|TreeFileIndex| or *bool*) -- Byte-offset index
+              of the tree statements of the data source (see
+              :class:`dendropy.dataio.treeindex.TreeFileIndex`), or |True| to
+              load the index from (or build and store it in) the sidecar file
+              of the data source, which must be given by ``path``. If given
+              with ``collection_offset`` or ``tree_offset``, then the requested
+              trees are read directly from their locations in the data source,
+              without processing any of the skipped trees.
+            - **parse_cache** (*ParseCache*, *str* or *bool*) -- On-disk
+              parse cache (see :class:`dendropy.dataio.parsecache.ParseCache`),
+              or the directory of the cache, or |True| for the cache in the
+              default directory. If given (with ``path``), then the
+              trees are rebuilt from the compact stored form of the result of a
+              previous parse of the unmodified file with the same arguments,
+              if any, without the file being parsed; otherwise the result of
+              the parse is stored in the cache.
             - **ignore_unrecognized_keyword_arguments** (*bool*) -- If |True|,
               then unsupported or unrecognized keyword arguments will not
               result in an error. Default is |False|: unsupported keyword
@@ -646,6 +685,14 @@ class TreeList(
               specified, then the first tree (offset = 0) is assumed (i.e., no
               trees within the specified collection will be skipped). Use this
               to specify, e.g. a burn-in.
+            - **tree_index** (|TreeFileIndex| or *bool*) -- Byte-offset index
+              of the tree statements of the data source (see
+              :class:`dendropy.dataio.treeindex.TreeFileIndex`), or |True| to
+              load the index from (or build and store it in) the sidecar file
+              of the data source, which must be given by ``path``. If given
+              with ``collection_offset`` or ``tree_offset``, then the requested
+              trees are read directly from their locations in the data source,
+              without processing any of the skipped trees.
             - **ignore_unrecognized_keyword_arguments** (*bool*) -- If |True|,
               then unsupported or unrecognized keyword arguments will not
               result in an error. Default is |False|: unsupported keyword
@@ -1395,6 +1442,52 @@ class SplitDistribution(taxonmodel.TaxonNamespaceAssociated):
                 sna = None
         return splits, edge_lengths, node_ages
 
+    def count_split_bitmask_encoding(self,
+            split_bitmask_encoding,
+            default_edge_length_value=None):
+        """
+        Counts splits of a tree given by its split bitmask encoding and add to
+        totals, as :meth:`count_splits_on_tree()` does for a |Tree|. As
+        the encoding does not provide node ages, node ages cannot be counted.
+
+        Parameters
+        ----------
+        split_bitmask_encoding : |SplitBitmaskEncoding|
+            The split bitmask encoding of the tree, as yielded by tree
+            yielders with ``encode_split_bitmasks=True``.
+
+        Returns
+        --------
+        s : iterable of splits
+            A list of split bitmasks from the tree.
+        e :
+            A list of edge length values from the tree.
+        """
+        if not self.ignore_node_ages:
+            raise ValueError("Node ages cannot be counted from split bitmask encodings")
+        self.total_trees_counted += 1
+        if split_bitmask_encoding.weight is not None and self.use_tree_weights:
+            weight_to_use = float(split_bitmask_encoding.weight)
+        else:
+            weight_to_use = 1.0
+        self.sum_of_tree_weights += weight_to_use
+        if split_bitmask_encoding.is_rooted:
+            self.tree_rooting_types_counted.add(True)
+        else:
+            self.tree_rooting_types_counted.add(False)
+        splits = split_bitmask_encoding.split_bitmasks
+        edge_lengths = []
+        for split, length in zip(splits, split_bitmask_encoding.edge_lengths):
+            self.split_counts[split] += weight_to_use
+            if not self.ignore_edge_lengths:
+                if length is None:
+                    elen = default_edge_length_value
+                else:
+                    elen = length
+                self.split_edge_lengths[split].append(elen)
+                edge_lengths.append(elen)
+        return splits, edge_lengths
+
     def splits_considered(self):
         """
         Returns 4 values:
@@ -2059,6 +2152,7 @@ class SplitDistributionSummarizer(object):
 class TreeArray(
         taxonmodel.TaxonNamespaceAssociated,
         basemodel.MultiReadable,
+        basemodel.Serializable,
         ):
     """
     High-performance collection of tree structures.
@@ -2254,6 +2348,57 @@ class TreeArray(
                 tree=tree,
                 is_bipartitions_updated=is_bipartitions_updated,
                 default_edge_length_value=self.default_edge_length_value)
+        return self._add_tree_split_bitmasks(
+                splits=splits,
+                edge_lengths=edge_lengths,
+                leafset_bitmask=tree.seed_node.edge.bipartition.leafset_bitmask,
+                weight=tree.weight,
+                index=index)
+
+    def add_split_bitmask_encoding(self,
+            split_bitmask_encoding,
+            index=None):
+        """
+        Adds the structure of a tree represented by its split bitmask
+        encoding to the collection, without a |Tree| instance.
+
+        Parameters
+        ----------
+        split_bitmask_encoding : |SplitBitmaskEncoding|
+            The split bitmask encoding of the tree, as yielded by tree
+            yielders with ``encode_split_bitmasks=True``. The tree must have
+            the same rooting state as all the other trees accessioned into
+            this collection as well as that of ``self.is_rooted_trees``, and
+            its bitmasks must be based on ``self.taxon_namespace``.
+        index : integer
+            Insert before index.
+
+        Returns
+        -------
+        index : int
+            The index of the accession.
+        s : iterable of splits
+            A list of split bitmasks from the tree.
+        e :
+            A list of edge length values from the tree.
+        """
+        self.validate_rooting(split_bitmask_encoding.is_rooted)
+        splits, edge_lengths = self._split_distribution.count_split_bitmask_encoding(
+                split_bitmask_encoding=split_bitmask_encoding,
+                default_edge_length_value=self.default_edge_length_value)
+        return self._add_tree_split_bitmasks(
+                splits=splits,
+                edge_lengths=edge_lengths,
+                leafset_bitmask=split_bitmask_encoding.leafset_bitmask,
+                weight=split_bitmask_encoding.weight,
+                index=index)
+
+    def _add_tree_split_bitmasks(self,
+            splits,
+            edge_lengths,
+            leafset_bitmask,
+            weight,
+            index):
 
         # pre-process splits
         splits = tuple(splits)
@@ -2267,8 +2412,8 @@ class TreeArray(
             edge_lengths = tuple(edge_lengths)
 
         # pre-process weights
-        if tree.weight is not None and self.use_tree_weights:
-            weight_to_use = float(tree.weight)
+        if weight is not None and self.use_tree_weights:
+            weight_to_use = float(weight)
         else:
             weight_to_use = 1.0
 
@@ -2276,13 +2421,12 @@ class TreeArray(
         if index is None:
             index = len(self._tree_split_bitmasks)
             self._tree_split_bitmasks.append(splits)
-            self._tree_leafset_bitmasks.append(tree.seed_node.edge.bipartition.leafset_bitmask)
+            self._tree_leafset_bitmasks.append(leafset_bitmask)
             self._tree_edge_lengths.append(edge_lengths)
             self._tree_weights.append(weight_to_use)
         else:
             self._tree_split_bitmasks.insert(index, splits)
-            self._tree_leafset_bitmasks.insert(index,
-                    tree.seed_node.edge.bipartition.leafset_bitmask)
+            self._tree_leafset_bitmasks.insert(index, leafset_bitmask)
             self._tree_edge_lengths.insert(index, edge_lengths)
             self._tree_weights.insert(index, weight_to_use)
         return index, splits, edge_lengths, weight_to_use
@@ -2329,6 +2473,19 @@ class TreeArray(
             objects opened for reading).
         schema : string
             The data format of the source. E.g., "nexus", "newick", "nexml".
+        encode_split_bitmasks : bool
+            If |True|, then the splits of tree statements (without comments)
+            are calculated directly from the statements, without building
+            |Tree| instances. Defaults to ``self.ignore_node_ages``, as node
+            ages require trees to be built.
+        parse_cache : ParseCache, str, or bool
+            If given, then the trees of each file path in ``files`` are read
+            from the entry of the file in this on-disk parse cache (see
+            :class:`dendropy.dataio.parsecache.ParseCache`), or in the cache
+            in this directory or, if |True|, in the default cache directory,
+            if the file has been read before with the same arguments and has
+            not been modified since; otherwise the trees parsed from the file
+            are stored in the cache.
         \*\*kwargs : keyword arguments
             These will be passed directly to the underlying schema-specific
             reader implementation.
@@ -2337,22 +2494,31 @@ class TreeArray(
             if kwargs["taxon_namespace"] is not self.taxon_namespace:
                 raise ValueError("TaxonNamespace object passed as keyword argument is not the same as self's TaxonNamespace reference")
             kwargs.pop("taxon_namespace")
-        target_tree_offset = kwargs.pop("tree_offset", 0)
+        if not kwargs.get("tree_index", None) and (kwargs.get("tree_offset", None) or 0) < 0:
+            # as before trees were skipped by the yielder, a negative offset
+            # does not exclude any trees
+            kwargs.pop("tree_offset")
+        parse_cache = kwargs.pop("parse_cache", None)
+        if parse_cache:
+            parse_cache = dataio.parsecache.get_parse_cache(parse_cache)
+            for src in files:
+                if textprocessing.is_str_type(src):
+                    parse_cache.read_tree_array_from_path(self, src, schema, dict(kwargs))
+                else:
+                    self.read_from_files([src], schema, **kwargs)
+            return
+        if kwargs.get("encode_split_bitmasks", None) is None:
+            kwargs["encode_split_bitmasks"] = self.ignore_node_ages
         tree_yielder = self.tree_type.yield_from_files(
                 files=files,
                 schema=schema,
                 taxon_namespace=self.taxon_namespace,
                 **kwargs)
-        current_source_index = None
-        current_tree_offset = None
-        for tree_idx, tree in enumerate(tree_yielder):
-            current_yielder_index = tree_yielder.current_file_index
-            if current_source_index != current_yielder_index:
-                current_source_index = current_yielder_index
-                current_tree_offset = 0
-            if current_tree_offset >= target_tree_offset:
+        for tree in tree_yielder:
+            if isinstance(tree, dataio.newickreader.SplitBitmaskEncoding):
+                self.add_split_bitmask_encoding(tree)
+            else:
                 self.add_tree(tree=tree, is_bipartitions_updated=False)
-            current_tree_offset += 1
 
     def _parse_and_add_from_stream(self,
             stream,
@@ -2430,6 +2596,28 @@ class TreeArray(
         """
         return basemodel.MultiReadable._read_from(self, **kwargs)
 
+    def _format_and_write_to_stream(self, stream, schema, **kwargs):
+        """
+        Writes out the tree structures stored by ``self`` in ``schema``
+        format to a destination given by file-like object ``stream``, as
+        they are stored (i.e., without restoring any trees).
+
+        Parameters
+        ----------
+        stream : file or file-like object
+            Destination for data.
+        schema : string
+            Must be a recognized schema with a writer that can store tree
+            structures as they are stored by |TreeArray|, such as
+            "dendropy-binary". If this is not implemented for the schema
+            specified, then a NotImplementedError is raised.
+
+        \*\*kwargs : keyword arguments, optional
+            Keyword arguments will be passed directly to the writer for the
+            specified schema.
+        """
+        writer = dataio.get_writer(schema, **kwargs)
+        writer.write_tree_array(self, stream)
 
     # def read_from_stream(self, fileobj, schema, **kwargs):
     #     """
@@ -23,6 +23,7 @@ as well as all the structural classes that make up a tree.
 
 import collections
 import math
+import array
 try:
     from StringIO import StringIO # Python 2 legacy support: StringIO in this module is the one needed (not io)
 except ImportError:
@@ -41,6 +42,18 @@ from dendropy.datamodel import basemodel
 from dendropy.datamodel import taxonmodel
 from dendropy import dataio
 
+def _invalidate_traversal_cache(node):
+    """
+    Discards the cached traversals (see :meth:`Tree.preorder_node_iter()`,
+    etc.) of the tree to which ``node`` belongs, on a change to the parent or
+    child nodes of ``node``. As nodes do not know the tree to which they
+    belong, the cache is registered with each of the nodes of the tree when
+    built, so that changes to other trees leave it valid.
+    """
+    cache = node._traversal_cache
+    if cache is not None:
+        cache.is_current = False
+
 ##############################################################################
 ### Bipartition
 
@@ -142,8 +155,27 @@ class Bipartition(object):
     calculating the bitmask for a parent node, whereas, with the latter, we
     would need to use AND operations. The former strikes us as more intuitive.
 
+    Note
+    ----
+
+    The state of |Bipartition| objects is stored in slots, so as to keep
+    the memory footprint of large numbers of bipartitions small. Other
+    attributes can still be set on |Bipartition| objects: these are stored
+    in an instance dictionary, which is only created when the first such
+    attribute is set.
+
     """
 
+    __slots__ = (
+            "_split_bitmask",
+            "_leafset_bitmask",
+            "_tree_leafset_bitmask",
+            "_lowest_relevant_bit",
+            "_is_rooted",
+            "is_mutable",
+            "__dict__",
+            )
+
     def normalize_bitmask(bitmask, fill_bitmask, lowest_relevant_bit):
         if bitmask & lowest_relevant_bit:
             return (~bitmask) & fill_bitmask             # force least-significant bit to 0
@@ -267,6 +299,14 @@ class Bipartition(object):
         # return self._split_bitmask == other._split_bitmask
         return (self._split_bitmask is not None and self._split_bitmask == other._split_bitmask) or (self._split_bitmask is other._split_bitmask)
 
+    def __getstate__(self):
+        # slotted classes are only picklable with protocols 0 and 1 if they
+        # provide their state explicitly
+        return basemodel._get_instance_state(self)
+
+    def __setstate__(self, state):
+        basemodel._set_instance_state(self, state)
+
     ##############################################################################
     ## All properties are publically read-only if not mutable
 
@@ -726,8 +766,26 @@ class Edge(
         basemodel.Annotable):
     """
     An :term:``edge`` on a :term:``tree``.
+
+    The state of |Edge| objects is stored in slots, and the list of comments
+    and the set of annotations are only created when first accessed.
+    Other attributes can still be set on |Edge| objects: these are stored
+    in an instance dictionary, which is only created when the first such
+    attribute is set.
     """
 
+    __slots__ = (
+            "_label",
+            "_head_node",
+            "rootedge",
+            "length",
+            "_bipartition",
+            "_comments",
+            "_annotations",
+            "_deferred_annotation_sources",
+            "__dict__",
+            )
+
     ###########################################################################
     ### Life-cycle and Identity
 
@@ -756,7 +814,7 @@ class Edge(
             raise TypeError("Unsupported keyword arguments: {}".format(kwargs))
 
         self._bipartition = None
-        self.comments = []
+        self._comments = None
 
     def __copy__(self, memo=None):
         raise TypeError("Cannot directly copy Edge")
@@ -769,12 +827,33 @@ class Edge(
         return basemodel.Annotable.__deepcopy__(self, memo=memo)
         # return super(Edge, self).__deepcopy__(memo=memo)
 
+    def __getstate__(self):
+        return basemodel._get_instance_state(self)
+
+    def __setstate__(self, state):
+        basemodel._set_instance_state(self, state)
+
     def __hash__(self):
         return id(self)
 
     def __eq__(self, other):
         return self is other
 
+    ###########################################################################
+    ### Comments
+
+    def _get_comments(self):
+        if self._comments is None:
+            self._comments = []
+        return self._comments
+    def _set_comments(self, comments):
+        self._comments = comments
+    comments = property(_get_comments, _set_comments)
+
+    def _has_comments(self):
+        return bool(self._comments)
+    has_comments = property(_has_comments)
+
     ###########################################################################
     ### Basic Structure
 
@@ -865,6 +944,7 @@ class Edge(
         new_head_node = old_tail_node
         grandparent = old_tail_node._parent_node
         if grandparent is not None:
+            _invalidate_traversal_cache(grandparent)
             for idx, ch in enumerate(grandparent._child_nodes):
                 if ch is old_tail_node:
                     grandparent._child_nodes[idx] = old_head_node
@@ -976,8 +1056,28 @@ class Node(
         basemodel.Annotable):
     """
     A :term:|Node| on a :term:|Tree|.
+
+    The state of |Node| objects is stored in slots, and the list of comments
+    and the set of annotations are only created when first accessed.
+    Other attributes (e.g., values computed by client code) can still be set
+    on |Node| objects: these are stored in an instance dictionary, which is
+    only created when the first such attribute is set.
     """
 
+    __slots__ = (
+            "_label",
+            "taxon",
+            "age",
+            "_edge",
+            "_child_nodes",
+            "_parent_node",
+            "_traversal_cache",
+            "_comments",
+            "_annotations",
+            "_deferred_annotation_sources",
+            "__dict__",
+            )
+
     ###########################################################################
     ### Life-cycle
 
@@ -1000,11 +1100,12 @@ class Node(
         self._edge = None
         self._child_nodes = []
         self._parent_node = None
+        self._traversal_cache = None
         self.edge = Edge(head_node=self,
                 length=kwargs.pop("edge_length", None))
         if kwargs:
             raise TypeError("Unsupported keyword arguments: {}".format(kwargs))
-        self.comments = []
+        self._comments = None
 
     def __copy__(self, memo=None):
         raise TypeError("Cannot directly copy Edge")
@@ -1031,6 +1132,15 @@ class Node(
         # return other
         # return super(Node, self).__deepcopy__(memo=memo)
 
+    def __getstate__(self):
+        # cached traversals are only valid within this process
+        instance_dict, slot_items = basemodel._get_instance_state(self)
+        return instance_dict, [(name, value) for name, value in slot_items if name != "_traversal_cache"]
+
+    def __setstate__(self, state):
+        self._traversal_cache = None
+        basemodel._set_instance_state(self, state)
+
     ###########################################################################
     ### Identity
 
@@ -1044,6 +1154,21 @@ class Node(
     def __repr__(self):
         return "<{} object at {}: '{}' ({})>".format(self.__class__.__name__, hex(id(self)), self._label, repr(self.taxon))
 
+    ###########################################################################
+    ### Comments
+
+    def _get_comments(self):
+        if self._comments is None:
+            self._comments = []
+        return self._comments
+    def _set_comments(self, comments):
+        self._comments = comments
+    comments = property(_get_comments, _set_comments)
+
+    def _has_comments(self):
+        return bool(self._comments)
+    has_comments = property(_has_comments)
+
     ###########################################################################
     ### Iterators
 
@@ -1614,6 +1739,8 @@ class Node(
         """
         assert node is not self, "Cannot add node as child of itself"
         assert self._parent_node is not node, "Cannot add a node's parent as its child: remove the node from its parent's child set first"
+        _invalidate_traversal_cache(self)
+        _invalidate_traversal_cache(node)
         node._parent_node = self
         if node not in self._child_nodes:
             self._child_nodes.append(node)
@@ -1640,6 +1767,8 @@ class Node(
         |Node|
             The node that was added.
         """
+        _invalidate_traversal_cache(self)
+        _invalidate_traversal_cache(node)
         node._parent_node = self
         try:
             cur_index = self._child_nodes.index(node)
@@ -1724,6 +1853,7 @@ class Node(
             raise ValueError("Tried to remove an non-existing or null node")
         children = self._child_nodes
         if node in children:
+            _invalidate_traversal_cache(self)
             node._parent_node = None
             node.edge.tail_node = None
             index = children.index(node)
@@ -1769,6 +1899,7 @@ class Node(
         """
         Removes all child nodes.
         """
+        _invalidate_traversal_cache(self)
         del self._child_nodes[:] # list.clear() is not in Python 2.7
 
     def reversible_remove_child(self, node, suppress_unifurcations=False):
@@ -1792,6 +1923,7 @@ class Node(
         except:
             raise ValueError("Tried to remove a node that is not listed as a child")
         removed = [(node, self, pos, [], None)]
+        _invalidate_traversal_cache(self)
         node._parent_node = None
         node.edge.tail_node = None
         children.remove(node)
@@ -1920,6 +2052,7 @@ class Node(
         if new_edge is self._edge:
             return
         if self._parent_node is not None:
+            _invalidate_traversal_cache(self)
             try:
                 self._parent_node._child_nodes.remove(self)
             except ValueError:
@@ -1989,6 +2122,9 @@ class Node(
         return self._parent_node
     def _set_parent_node(self, parent):
         """Sets the parent node of this node."""
+        _invalidate_traversal_cache(self)
+        if parent is not None:
+            _invalidate_traversal_cache(parent)
         if self._parent_node is not None:
             try:
                 self._parent_node._child_nodes.remove(self)
@@ -2311,16 +2447,24 @@ class Node(
         """
         edge_lengths = not kwargs.get('suppress_edge_lengths', False)
         edge_lengths = kwargs.get('edge_lengths', edge_lengths)
-        child_nodes = self.child_nodes()
-        if child_nodes:
-            out.write('(')
-            f_child = child_nodes[0]
-            for child in child_nodes:
-                if child is not f_child:
-                    out.write(',')
-                child._write_newick(out, **kwargs)
-            out.write(')')
+        # Explicit stack of (node, text preceding node, whether child nodes
+        # of node have been written) instead of recursion, so that very deep
+        # trees can be written.
+        stack = [(self, "", False)]
+        while stack:
+            node, prefix, children_written = stack.pop()
+            out.write(prefix)
+            if not children_written:
+                child_nodes = node.child_nodes()
+                if child_nodes:
+                    out.write('(')
+                    stack.append((node, ")", True))
+                    for idx in range(len(child_nodes)-1, -1, -1):
+                        stack.append((child_nodes[idx], "," if idx else "", False))
+                    continue
+            node._write_newick_node_tail(out, edge_lengths, **kwargs)
 
+    def _write_newick_node_tail(self, out, edge_lengths, **kwargs):
         out.write(self._get_node_token(**kwargs))
         if edge_lengths:
             e = self.edge
@@ -2487,6 +2631,14 @@ class Tree(
                    instance. This includes the operation taxonomic unit
                    definitions associated with all tree collections and
                    character matrices in the data source.
+                ``tree_index``
+                   A |TreeFileIndex| of the data source, or |True| to use
+                   the index given by
+                   :meth:`TreeFileIndex.get_for_path()`. If given, then only
+                   the requested tree statement and its context are read
+                   from the data source (and operational taxonomic unit
+                   concepts only referenced in other trees are not
+                   accessioned).
 
             Other keyword arguments may be available, depending on the
             implementation of the reader specialized to handle ``schema``
@@ -2513,6 +2665,7 @@ class Tree(
 
         tree_list_factory = lambda label, taxon_namespace: TreeList(label=label, taxon_namespace=taxon_namespace, tree_type=cls)
         label = kwargs.pop("label", None)
+        tree_index = kwargs.pop("tree_index", None)
         reader = dataio.get_reader(schema, **kwargs)
         # if collection_offset is None and tree_offset is not None:
         #     raise TypeError("Cannot specify ``tree_offset`` without specifying ``collection_offset``")
@@ -2520,6 +2673,11 @@ class Tree(
             collection_offset = 0
         if tree_offset is None:
             tree_offset = 0
+        if tree_index is not None:
+            tree_index = dataio.treeindex.get_tree_file_index(tree_index, stream, schema)
+            stream = tree_index.open_trees([tree_offset], collection_offset)
+            collection_offset = 0
+            tree_offset = 0
         tree_lists = reader.read_tree_lists(
                     stream=stream,
                     taxon_namespace_factory=tns_factory,
@@ -2569,6 +2727,21 @@ class Tree(
             - **tree_offset** (*int*) -- 0-based index of tree within the
               collection specified by ``collection_offset`` to be parsed. If
               not specified, then the first tree (offset = 0) is assumed.
+            - **tree_index** (|TreeFileIndex| or *bool*) -- Byte-offset index
+              of the tree statements of the data source (see
+              :class:`dendropy.dataio.treeindex.TreeFileIndex`), or |True| to
+              load the index from (or build and store it in) the sidecar file
+              of the data source, which must be given by ``path``. If given,
+              the requested tree is read directly from its location in the
+              data source, without processing any of the other trees.
+            - **parse_cache** (*ParseCache*, *str* or *bool*) -- On-disk
+              parse cache (see :class:`dendropy.dataio.parsecache.ParseCache`),
+              or the directory of the cache, or |True| for the cache in the
+              default directory. If given (with ``path``), then the
+              tree is rebuilt from the compact stored form of the result of a
+              previous parse of the unmodified file with the same arguments,
+              if any, without the file being parsed; otherwise the result of
+              the parse is stored in the cache.
             - **ignore_unrecognized_keyword_arguments** (*bool*) -- If |True|,
               then unsupported or unrecognized keyword arguments will not
               result in an error. Default is |False|: unsupported keyword
@@ -2645,13 +2818,41 @@ class Tree(
             Iterable of sources, which can either be strings specifying file
             paths or file-like objects open for reading. If a source element is
             a string (``isinstance(i,str) == True``), then it is assumed to be
-            a path to a file. Otherwise, the source is assumed to be a file-like
-            object.
+            a path to a file, which is decompressed as it is read if it is
+            compressed with gzip, bzip2 or xz (as detected from its leading
+            bytes). Otherwise, the source is assumed to be a file-like object.
         schema : string
             The name of the data format (e.g., "newick" or "nexus").
         taxon_namespace : |TaxonNamespace| instance
             The operational taxonomic unit concept namespace to use to manage
             taxon definitions.
+        tree_index : bool
+            If |True|, then each source, which must be a file path or a file
+            object opened from a path, is read using its byte-offset index
+            (see :meth:`dendropy.dataio.treeindex.TreeFileIndex.get_for_path()`),
+            so that trees preceding ``tree_offset`` are not read at all.
+            Compressed files cannot be indexed.
+        tree_offset : int
+            0-based index of first tree of each source to be yielded.
+            Preceding trees (e.g., a burn-in) are skipped over by scanning for
+            the end of their statements, without being built (so operational
+            taxonomic unit concepts referenced only in these trees are not
+            accessioned). If ``tree_index`` is |True|, then the offset is that
+            of the first tree within each collection of trees of each source,
+            and negative offsets work like negative list indexes.
+        read_ahead : bool or int
+            If |True| or a positive integer, then each source is read (and,
+            if it is a path to a compressed file, decompressed) and
+            decoded in blocks by a background thread while the trees already
+            read are being parsed and built, so that waiting on the I/O of
+            slow (e.g., network) file systems is overlapped with the
+            processing of the trees. The background thread stays at most
+            this many blocks (or a default number of blocks, if |True|) ahead
+            of the parsing. Not supported by the "dendropy-binary" schema.
+        prefetch_files : bool
+            If |True|, then the background reading of each source in
+            ``files`` is started while the preceding source is being parsed
+            (this implies ``read_ahead``).
         \*\*kwargs : keyword arguments
             These will be passed directly to the schema-parser implementation.
 
@@ -2694,8 +2895,12 @@ class Tree(
                 taxon_namespace = taxonmodel.TaxonNamespace()
         else:
             assert "taxon_set" not in kwargs
-        if "tree_offset" in kwargs:
-            raise TypeError("'tree_offset' is not supported: trees should be skipped/discarded on the client code side")
+        tree_index = kwargs.pop("tree_index", None)
+        if tree_index:
+            files = dataio.treeindex.iter_indexed_tree_sources(
+                    files,
+                    schema,
+                    tree_offset=kwargs.pop("tree_offset", None))
         tree_yielder = dataio.get_tree_yielder(
                 files,
                 schema,
@@ -2705,6 +2910,62 @@ class Tree(
         return tree_yielder
     yield_from_files = classmethod(yield_from_files)
 
+    def get_tree_stream_writer(cls,
+            stream,
+            schema,
+            taxon_namespace=None,
+            **kwargs):
+        """
+        Returns a writer that writes trees to ``stream`` one at a time, as
+        they are given to its ``write_tree(tree)`` method, without a
+        |TreeList| being built. The writer should be closed (or used as a
+        context manager) once all the trees have been written.
+
+        The trees stored in a |TreeArray| can also be written, directly from
+        their split bitmasks and edge lengths (i.e., without restoring them
+        as |Tree| objects), using the ``write_tree_array(tree_array)`` method
+        of the writer, and trees yielded as |SplitBitmaskEncoding| tuples
+        using its ``write_split_bitmasks(*split_bitmask_encoding)`` method.
+
+        Parameters
+        ----------
+        stream : file or file-like object
+            Destination for data.
+        schema : string
+            The name of the data format ("newick", "nexus" or "dendropy-binary").
+        taxon_namespace : |TaxonNamespace| instance
+            The operational taxonomic unit concept namespace of the trees to be
+            written. With the "nexus" schema, the "TAXA" block and the
+            "TRANSLATE" statement are written from this before the first tree,
+            and so it must include all the taxa of the trees by then. If not
+            specified, then the taxon namespace of the first tree written will
+            be used.
+        \*\*kwargs : keyword arguments
+            These will be passed directly to the schema-writer implementation
+            (e.g., ``flush_interval``, to flush the stream after every
+            ``flush_interval`` trees).
+
+        Examples
+        --------
+
+        ::
+
+            with dendropy.Tree.get_tree_stream_writer(
+                    stream=open("trees.nex", "w"),
+                    schema="nexus",
+                    taxon_namespace=taxon_namespace,
+                    translate_tree_taxa=True) as writer:
+                for i in range(1000000):
+                    writer.write_tree(simulate_tree(taxon_namespace))
+
+        """
+        return dataio.get_tree_writer(
+                stream,
+                schema,
+                taxon_namespace=taxon_namespace,
+                **kwargs)
+    get_tree_stream_writer = classmethod(get_tree_stream_writer)
+
     def from_bipartition_encoding(
             cls,
             bipartition_encoding,
@@ -3048,9 +3309,12 @@ class Tree(
             self.length_type = None
             self._seed_node = None
             self.seed_node = None
-            self.bipartition_encoding = None
+            self._bipartition_encoding = None
+            self._bipartition_encoding_state = None
             self._split_bitmask_edge_map = None
             self._bipartition_edge_map = None
+            self._bipartition_edge_counts = None
+            self._traversal_cache = None
             seed_node = kwargs.pop("seed_node", None)
             if seed_node is None:
                 self.seed_node = self.node_factory()
@@ -3063,6 +3327,18 @@ class Tree(
     ##############################################################################
     ## Bipartitions
 
+    def _get_bipartition_encoding(self):
+        if self._bipartition_encoding is None and self._bipartition_encoding_state is not None:
+            # bipartitions have been updated edge by edge (see
+            # ``_update_bipartitions()``): collect them from the edges
+            self._bipartition_encoding = [edge.bipartition for edge in self.postorder_edge_iter()]
+        return self._bipartition_encoding
+    def _set_bipartition_encoding(self, bipartitions):
+        self._bipartition_encoding = bipartitions
+        if bipartitions is None:
+            self._bipartition_encoding_state = None
+    bipartition_encoding = property(_get_bipartition_encoding, _set_bipartition_encoding)
+
     def _get_split_edges(self):
         deprecate.dendropy_deprecation_warning(
                 message="Deprecated since DendroPy 4: 'Tree.split_edges' will no longer be supported in future releases; use 'Tree.bipartition_encoding' for a list of bipartitions on the tree, or dereference the edge through the 'Tree.bipartition_edge_map' attribute.",
@@ -3114,6 +3390,15 @@ class Tree(
     def __copy__(self):
         return self.taxon_namespace_scoped_copy()
 
+    def __getstate__(self):
+        # cached traversals are only valid within this process, and with them
+        # the state of the bipartitions (the list of which is stored instead)
+        state = dict(self.__dict__)
+        state["_traversal_cache"] = None
+        state["_bipartition_encoding"] = self.bipartition_encoding
+        state["_bipartition_encoding_state"] = None
+        return state
+
     def taxon_namespace_scoped_copy(self, memo=None):
         if memo is None:
             memo = {}
@@ -3124,7 +3409,21 @@ class Tree(
 
     def __deepcopy__(self, memo=None):
         # ensure clone map
-        return basemodel.Annotable.__deepcopy__(self, memo=memo)
+        if memo is None:
+            memo = {}
+        if id(self) not in memo:
+            # cached traversals are not copied, but rebuilt when needed
+            other = self.__class__.__new__(self.__class__)
+            other._traversal_cache = None
+            other._bipartition_encoding_state = None
+            memo[id(self)] = other
+        bipartition_state = self._get_bipartition_encoding_state()
+        other = basemodel.Annotable.__deepcopy__(self, memo=memo)
+        if bipartition_state is not None:
+            # copying leaves the bipartitions of both trees current
+            self._set_bipartition_encoding_state(*bipartition_state[3:])
+            other._set_bipartition_encoding_state(*bipartition_state[3:])
+        return other
         # if memo is None:
         #     memo = {}
         # # get or create clone of self
@@ -3532,12 +3831,14 @@ class Tree(
             * have the labels specified by the list of strings given by the
               keyword argument ``taxon_labels``
 
-        Returns |None| if no appropriate node is found. Assumes that
-        bipartitions have been encoded on the tree. It is possible that the
-        leafset bitmask is not compatible with the subtree that is returned!
-        (compatibility tests are not fully performed).  This function is used
-        to find the "insertion point" for a new bipartition via a root to tip
-        search.
+        or that has all of the nodes given by the keyword argument ``nodes``
+        as descendants.
+
+        Returns |None| if no appropriate node is found. Queries are answered
+        using an index of the tree that is built on the first query and
+        rebuilt on the first query after the structure of the tree is
+        modified, taking time proportional to the number of taxa or nodes
+        specified. Bipartitions need not be encoded on the tree.
 
         Parameters
         ----------
@@ -3545,8 +3846,9 @@ class Tree(
             Exactly one of the following must be specified:
 
                 ``leafset_bitmask`` : integer
-                    Node object subtended by the first edge compatible with this
-                    leafset bitmask will be returned.
+                    Shallowest node object with descendent leaf nodes
+                    associated with all the |Taxon| objects given by the
+                    bits set in this leafset bitmask will be returned.
                 ``taxa`` : collections.Iterable [|Taxon|]
                     Shallowest node object with descendent nodes associated with
                     all the |Taxon| objects specified will be returned.
@@ -3555,12 +3857,17 @@ class Tree(
                     with the minimal set of Taxon objects that
                     collectively have all the labels specified in
                     ``taxon_labels`` will be returned.
+                ``nodes`` : collections.Iterable [|Node|]
+                    Shallowest node object that is, or is an ancestor of, each
+                    of the |Node| objects specified will be returned.
 
             In addition, the following optional keywords are supported:
 
                 ``start_node`` : |Node|, optional
-                    If given, specifies the node at which to start searching.
-                    If not, defaults to the root or ``seed_node``.
+                    If given, specifies the node at which to start searching:
+                    |None| is returned if the most-recent common ancestor is
+                    not this node or one of its descendants. If not, defaults
+                    to the root or ``seed_node``.
 
         Returns
         -------
@@ -3569,61 +3876,78 @@ class Tree(
             if no such node exists.
         """
         start_node = kwargs.get("start_node", self.seed_node)
-        leafset_bitmask = None
-        if "leafset_bitmask" in kwargs:
-            leafset_bitmask = kwargs["leafset_bitmask"]
+        lca_index = self._get_lca_index()
+        if "nodes" in kwargs:
+            nodes = list(kwargs["nodes"])
+            if not nodes:
+                raise ValueError("No nodes specified")
+            try:
+                mrca_node = lca_index.mrca_of_nodes(nodes)
+            except KeyError:
+                return None
         else:
-            taxa = kwargs.get("taxa", None)
-            if taxa is None:
-                if "taxon_labels" in kwargs:
-                    taxa = self.taxon_namespace.get_taxa(labels=kwargs["taxon_labels"])
-                    if len(taxa) != len(kwargs["taxon_labels"]):
-                        raise KeyError("Not all labels matched to taxa")
-                else:
-                    raise TypeError("Must specify one of: 'leafset_bitmask', 'taxa' or 'taxon_labels'")
-            if taxa is None:
-                raise ValueError("No taxa matching criteria found")
-            leafset_bitmask = self.taxon_namespace.taxa_bitmask(taxa=taxa)
-
-        if leafset_bitmask is None or leafset_bitmask == 0:
-            raise ValueError("Null leafset bitmask (0)")
-
-        if start_node.edge.bipartition.leafset_bitmask == 0 or not kwargs.get("is_bipartitions_updated", True):
-            self.encode_bipartitions(suppress_unifurcations=False)
-
-        if (start_node.edge.bipartition.leafset_bitmask & leafset_bitmask) != leafset_bitmask:
+            if "leafset_bitmask" in kwargs:
+                leafset_bitmask = kwargs["leafset_bitmask"]
+                if leafset_bitmask is None or leafset_bitmask == 0:
+                    raise ValueError("Null leafset bitmask (0)")
+                try:
+                    taxa = self.taxon_namespace.bitmask_taxa_list(leafset_bitmask)
+                except KeyError:
+                    return None
+            else:
+                taxa = kwargs.get("taxa", None)
+                if taxa is None:
+                    if "taxon_labels" in kwargs:
+                        taxa = self.taxon_namespace.get_taxa(labels=kwargs["taxon_labels"])
+                        if len(taxa) != len(kwargs["taxon_labels"]):
+                            raise KeyError("Not all labels matched to taxa")
+                    else:
+                        raise TypeError("Must specify one of: 'leafset_bitmask', 'taxa', 'taxon_labels' or 'nodes'")
+                if taxa is None:
+                    raise ValueError("No taxa matching criteria found")
+                taxa = list(taxa)
+                if not taxa:
+                    raise ValueError("Null leafset bitmask (0)")
+            leaf_nodes = lca_index.leaf_nodes_for_taxa(taxa)
+            if leaf_nodes is None:
+                return None
+            mrca_node = lca_index.mrca_of_nodes(leaf_nodes)
+            # if the leafset of the MRCA is exactly that of the taxa, then the
+            # shallowest node with this leafset is the deepest ancestor of a
+            # chain of unifurcations, if any, above it
+            if lca_index.num_leaf_nodes(mrca_node) == len(set(leaf_nodes)):
+                while (mrca_node is not start_node
+                        and mrca_node._parent_node is not None
+                        and len(mrca_node._parent_node._child_nodes) == 1):
+                    mrca_node = mrca_node._parent_node
+        if start_node is not self.seed_node and not lca_index.is_ancestor(start_node, mrca_node):
             return None
+        return mrca_node
 
-        curr_node = start_node
-        last_match = start_node
-        nd_source = iter(start_node.child_nodes())
-        try:
-            while True:
-                cm = curr_node.edge.bipartition.leafset_bitmask
-                cms = (cm & leafset_bitmask)
-                if cms:
-                    # for at least one taxon cm has 1 and bipartition has 1
-                    if cms == leafset_bitmask:
-                        # curr_node has all of the 1's that bipartition has
-                        if cm == leafset_bitmask:
-                            return curr_node
-                        last_match = curr_node
-                        nd_source = iter(curr_node.child_nodes())
-                    else:
-                        # we have reached a child that has some, but not all of the
-                        #   required taxa as descendants, so we return the last_match
-                        return last_match
-                curr_node = next(nd_source)
-        except StopIteration:
-            # we shouldn't reach this if all of the descendants are properly
-            #   decorated with leafset_bitmask attributes, but there may be some hacky
-            #   context in which we want to allow the function to be called with
-            #   leaves that have not been encoded with leafset_bitmasks.
-            return last_match
+    def _get_lca_index(self):
+        """
+        Returns the index answering most-recent common ancestor and node depth
+        queries, rebuilding it first if the structure of the tree has changed
+        since it was built.
+        """
+        return self._get_traversal_cache().lca_index()
 
     ###########################################################################
     ### Node iterators
 
+    def _get_traversal_cache(self):
+        """
+        Returns the cached traversals of the tree, discarding them first if
+        the structure of the tree has changed since they were cached.
+        """
+        cache = self._traversal_cache
+        if (cache is None
+                or not cache.is_current
+                or cache.seed_node is not self.seed_node):
+            cache = _TraversalCache(self.seed_node)
+            self._traversal_cache = cache
+        return cache
+
     def __iter__(self):
         """
         Iterate over nodes on tree in pre-order.
@@ -3664,8 +3988,18 @@ class Tree(
         -------
         :py:class:`collections.Iterator` [|Node|]
             An iterator yielding nodes in ``self`` in pre-order sequence.
+
+        Notes
+        -----
+        The sequence of nodes is cached, so that iterating again over a tree
+        whose structure has not changed in the meantime does not require the
+        tree to be traversed again. Changing the structure of the tree while
+        iterating is safe: the iteration proceeds as it would over the nodes
+        themselves.
         """
-        return self.seed_node.preorder_iter(filter_fn=filter_fn)
+        cache = self._get_traversal_cache()
+        nodes, parent_positions = cache.preorder()
+        return _iter_cached_preorder(nodes, parent_positions, cache, filter_fn)
 
     def preorder_internal_node_iter(self, filter_fn=None, exclude_seed_node=False):
         """
@@ -3694,8 +4028,15 @@ class Tree(
         :py:class:`collections.Iterator` [|Node|]
             An iterator yielding the internal nodes of ``self``.
         """
-        return self.seed_node.preorder_internal_node_iter(filter_fn=filter_fn,
-                exclude_seed_node=exclude_seed_node)
+        if exclude_seed_node:
+            froot = lambda x: x._parent_node is not None
+        else:
+            froot = lambda x: True
+        if filter_fn:
+            f = lambda x: (froot(x) and x._child_nodes and filter_fn(x)) or None
+        else:
+            f = lambda x: (x and froot(x) and x._child_nodes) or None
+        return self.preorder_node_iter(filter_fn=f)
 
     def postorder_node_iter(self, filter_fn=None):
         """
@@ -3718,8 +4059,19 @@ class Tree(
         -------
         :py:class:`collections.Iterator` [|Node|]
             An iterator yielding the nodes in ``self`` in post-order sequence.
+
+        Notes
+        -----
+        The sequence of nodes is cached, so that iterating again over a tree
+        whose structure has not changed in the meantime does not require the
+        tree to be traversed again. Changing the structure of the tree while
+        iterating is safe: the iteration proceeds as it would over the nodes
+        themselves.
         """
-        return self.seed_node.postorder_iter(filter_fn=filter_fn)
+        cache = self._get_traversal_cache()
+        nodes, parent_positions, leaf_positions = cache.postorder()
+        return _iter_cached_postorder(nodes, parent_positions,
+                range(len(nodes)), cache, filter_fn, filter_fn)
 
     def postorder_internal_node_iter(self, filter_fn=None, exclude_seed_node=False):
         """
@@ -3749,8 +4101,15 @@ class Tree(
             An iterator yielding the internal nodes of ``self`` in post-order
             sequence.
         """
-        return self.seed_node.postorder_internal_node_iter(filter_fn=filter_fn,
-                exclude_seed_node=exclude_seed_node)
+        if exclude_seed_node:
+            froot = lambda x: x._parent_node is not None
+        else:
+            froot = lambda x: True
+        if filter_fn:
+            f = lambda x: (froot(x) and x._child_nodes and filter_fn(x)) or None
+        else:
+            f = lambda x: (x and froot(x) and x._child_nodes) or None
+        return self.postorder_node_iter(filter_fn=f)
 
     def levelorder_node_iter(self, filter_fn=None):
         """
@@ -3830,7 +4189,15 @@ class Tree(
         :py:class:`collections.Iterator` [|Node|]
             An iterator yielding leaf nodes in ``self``.
         """
-        return self.seed_node.leaf_iter(filter_fn=filter_fn)
+        # as :meth:`Node.leaf_iter()`, which filters a post-order traversal
+        if filter_fn:
+            ff = lambda x: x.is_leaf() and filter_fn(x) or None
+        else:
+            ff = lambda x: x.is_leaf() and x or None
+        cache = self._get_traversal_cache()
+        nodes, parent_positions, leaf_positions = cache.postorder()
+        return _iter_cached_postorder(nodes, parent_positions,
+                leaf_positions, cache, filter_fn, ff)
 
     def leaf_iter(self, filter_fn=None):
         """
@@ -3986,14 +4353,14 @@ class Tree(
         :py:class:`collections.Iterator` [|Node|]
             An iterator yielding nodes in ``self`` in pre-order sequence.
         """
-        # NOTE: from-scratch implementation here instead of wrapping
-        # `preorder_node_iter()`for efficiency
-        stack = [self.seed_node._edge]
-        while stack:
-            edge = stack.pop()
-            if filter_fn is None or filter_fn(edge):
-                yield edge
-            stack.extend(n._edge for n in reversed(edge._head_node._child_nodes))
+        # NOTE: wraps `preorder_node_iter()` (rather than traversing the
+        # edges directly) to make use of the cached traversal
+        if filter_fn is None:
+            f = None
+        else:
+            f = lambda x: filter_fn(x._edge)
+        for nd in self.preorder_node_iter(filter_fn=f):
+            yield nd._edge
 
     def preorder_internal_edge_iter(self, filter_fn=None, exclude_seed_edge=False):
         """
@@ -4058,33 +4425,14 @@ class Tree(
             An iterator yielding the edges in ``self`` in post-order sequence.
 
         """
-        # NOTE: custom implementation here instead of wrapping
-        # `postorder_node_iter()`for efficiency
-
-        # stack = [(self.seed_node._edge, False)]
-        # while stack:
-        #     edge, state = stack.pop(0)
-        #     if state:
-        #         if filter_fn is None or filter_fn(edge):
-        #             yield edge
-        #     else:
-        #         stack.insert(0, (edge, True))
-        #         child_edges = [(n._edge, False) for n in edge._head_node._child_nodes]
-        #         child_edges.extend(stack)
-        #         stack = child_edges
-
-        ## Prefer `pop()` to `pop(0)`.
-        ## Thanks to Mark T. Holder
-        ## From peyotl commits: d1ffef2 + 19fdea1
-        stack = [(self.seed_node._edge, False)]
-        while stack:
-            edge, state = stack.pop()
-            if state:
-                if filter_fn is None or filter_fn(edge):
-                    yield edge
-            else:
-                stack.append((edge, True))
-                stack.extend([(n._edge, False) for n in reversed(edge._head_node._child_nodes)])
+        # NOTE: wraps `postorder_node_iter()` (rather than traversing the
+        # edges directly) to make use of the cached traversal
+        if filter_fn is None:
+            f = None
+        else:
+            f = lambda x: filter_fn(x._edge)
+        for nd in self.postorder_node_iter(filter_fn=f):
+            yield nd._edge
 
     def postorder_internal_edge_iter(self, filter_fn=None, exclude_seed_edge=False):
         """
@@ -4218,7 +4566,7 @@ class Tree(
             f = lambda x : filter_fn(x.edge)
         else:
             f = None
-        for nd in self.seed_node.leaf_iter(filter_fn=f):
+        for nd in self.leaf_node_iter(filter_fn=f):
             yield nd.edge
 
     ###########################################################################
@@ -4431,6 +4779,47 @@ class Tree(
         then after this operation, it will have an outdegree of one. In this
         case, unless ``suppress_unifurcations`` is False, then it will be removed
         from the tree.
+
+        The bipartitions are updated by recalculating those of the edges on
+        the path between the old and new seed nodes only, provided that the
+        bipartitions of the tree are current (i.e., that the tree has not been
+        changed since they were last encoded or updated); otherwise, all the
+        bipartitions of the tree are encoded afresh.
+        """
+
+        if update_bipartitions:
+            bipartition_state = self._get_bipartition_encoding_state()
+        if self.seed_node is new_seed_node:
+            # do not just return: allow for updating of bipartitions,
+            # collapsing of unifurcations, collapsing of unrooted basal
+            # bifurcations
+            bipartition_state = updated_nodes = None
+        else:
+            if new_seed_node._parent_node is None:
+                return
+            updated_nodes = self._reseed_at(new_seed_node,
+                    suppress_unifurcations=suppress_unifurcations)
+
+        if update_bipartitions:
+            self._update_bipartitions(bipartition_state, updated_nodes,
+                    suppress_unifurcations=suppress_unifurcations,
+                    collapse_unrooted_basal_bifurcation=collapse_unrooted_basal_bifurcation)
+        else:
+            if (collapse_unrooted_basal_bifurcation
+                    and not self._is_rooted
+                    and len(self.seed_node._child_nodes) == 2):
+                self.collapse_basal_bifurcation()
+            if suppress_unifurcations:
+                self.suppress_unifurcations()
+
+        return self.seed_node
+
+    def _reseed_at(self, new_seed_node, suppress_unifurcations=True):
+        """
+        Makes ``new_seed_node``, which must be a (non-seed) node of the tree,
+        the seed node of the tree, returning the nodes of which the child
+        nodes have changed in the process: ``new_seed_node`` and all its
+        (old) ancestors.
         """
 
         # def _dump_node(nd, name):
@@ -4458,56 +4847,34 @@ class Tree(
         #     debug_children = ", ".join(debug_children)
         #     print("    Children (Node Parent, Edge Tail Node Parent): {}".format(debug_children))
 
-        if self.seed_node is new_seed_node:
-            # do not just return: allow for updating of bipartitions,
-            # collapsing of unifurcations, collapsing of unrooted basal
-            # bifurcations
-            pass
-        else:
-            old_seed_node = self.seed_node
-            old_parent_node = new_seed_node._parent_node
-            if old_parent_node is None:
-                return
-
-            if new_seed_node._child_nodes:
-                new_seed_node_is_leaf = False
-            else:
-                new_seed_node_is_leaf = True
-
-            edges_to_invert = []
-            current_node = new_seed_node
-            while current_node:
-                if current_node._parent_node is not None:
-                    edges_to_invert.append(current_node.edge)
-                current_node = current_node._parent_node
-            while edges_to_invert:
-                edge = edges_to_invert.pop()
-                edge.invert(update_bipartitions=update_bipartitions)
-
-            if new_seed_node_is_leaf and suppress_unifurcations:
-                ## Cannot just suppress_unifurcations, because wrong node will be deleted
-                ## need to remove child (i.e. new seed node's old parent, which is now its child, needs to be deleted)
-                # self.suppress_unifurcations(update_bipartitions=update_bipartitions)
-                if len(new_seed_node._child_nodes) == 1:
-                    nsn_ch = new_seed_node._child_nodes[0]
-                    new_seed_node.remove_child(nsn_ch)
-                    for ch in nsn_ch._child_nodes:
-                        new_seed_node.add_child(ch)
-            self.seed_node = new_seed_node
-
-        if update_bipartitions:
-            self.encode_bipartitions(
-                    suppress_unifurcations=suppress_unifurcations,
-                    collapse_unrooted_basal_bifurcation=collapse_unrooted_basal_bifurcation)
+        if new_seed_node._child_nodes:
+            new_seed_node_is_leaf = False
         else:
-            if (collapse_unrooted_basal_bifurcation
-                    and not self._is_rooted
-                    and len(self.seed_node._child_nodes) == 2):
-                self.collapse_basal_bifurcation()
-            if suppress_unifurcations:
-                self.suppress_unifurcations()
-
-        return self.seed_node
+            new_seed_node_is_leaf = True
+
+        updated_nodes = []
+        edges_to_invert = []
+        current_node = new_seed_node
+        while current_node:
+            updated_nodes.append(current_node)
+            if current_node._parent_node is not None:
+                edges_to_invert.append(current_node.edge)
+            current_node = current_node._parent_node
+        while edges_to_invert:
+            edge = edges_to_invert.pop()
+            edge.invert()
+
+        if new_seed_node_is_leaf and suppress_unifurcations:
+            ## Cannot just suppress_unifurcations, because wrong node will be deleted
+            ## need to remove child (i.e. new seed node's old parent, which is now its child, needs to be deleted)
+            # self.suppress_unifurcations(update_bipartitions=update_bipartitions)
+            if len(new_seed_node._child_nodes) == 1:
+                nsn_ch = new_seed_node._child_nodes[0]
+                new_seed_node.remove_child(nsn_ch)
+                for ch in nsn_ch._child_nodes:
+                    new_seed_node.add_child(ch)
+        self.seed_node = new_seed_node
+        return updated_nodes
 
     def to_outgroup_position(self, outgroup_node, update_bipartitions=False, suppress_unifurcations=True):
         """Reroots the tree at the parent of ``outgroup_node`` and makes ``outgroup_node`` the first child
@@ -4524,10 +4891,16 @@ class Tree(
         p = outgroup_node._parent_node
         assert p is not None
         self.reseed_at(p, update_bipartitions=update_bipartitions, suppress_unifurcations=suppress_unifurcations)
+        bipartition_state = self._get_bipartition_encoding_state()
         p.remove_child(outgroup_node)
         _ognlen = outgroup_node.edge.length
         p.insert_child(0, outgroup_node)
         assert outgroup_node.edge.length == _ognlen
+        if bipartition_state is not None:
+            # reordering child nodes leaves bipartitions current (the list of which is
+            # rebuilt in the new order)
+            self._bipartition_encoding = None
+            self._set_bipartition_encoding_state(*bipartition_state[3:])
         return self.seed_node
 
     def reroot_at_node(self, new_root_node, update_bipartitions=False, suppress_unifurcations=True):
@@ -4544,12 +4917,45 @@ class Tree(
         ``suppress_unifurcations`` is False, then it will be
         removed from the tree.
         """
-        self.reseed_at(new_seed_node=new_root_node,
-                update_bipartitions=False,
-                suppress_unifurcations=suppress_unifurcations)
-        self.is_rooted = True
         if update_bipartitions:
-            self.update_bipartitions(suppress_unifurcations=suppress_unifurcations)
+            bipartition_state = self._get_bipartition_encoding_state()
+        else:
+            bipartition_state = None
+        return self._reroot_at_node(new_root_node,
+                bipartition_state=bipartition_state,
+                update_bipartitions=update_bipartitions,
+                suppress_unifurcations=suppress_unifurcations)
+
+    def _reroot_at_node(self,
+            new_root_node,
+            bipartition_state,
+            update_bipartitions=False,
+            suppress_unifurcations=True):
+        """
+        Roots the tree at ``new_root_node`` as :meth:`Tree.reroot_at_node()`
+        does, with ``bipartition_state`` the state of the bipartitions (as
+        returned by ``_get_bipartition_encoding_state()``) before any change
+        to the tree.
+        """
+        if (bipartition_state is None
+                or self.seed_node is new_root_node
+                or new_root_node._parent_node is None):
+            self.reseed_at(new_seed_node=new_root_node,
+                    update_bipartitions=False,
+                    suppress_unifurcations=suppress_unifurcations)
+            self.is_rooted = True
+            if update_bipartitions:
+                self.update_bipartitions(suppress_unifurcations=suppress_unifurcations)
+            return self.seed_node
+        updated_nodes = self._reseed_at(new_root_node,
+                suppress_unifurcations=suppress_unifurcations)
+        self._update_bipartitions(bipartition_state, updated_nodes,
+                suppress_unifurcations=suppress_unifurcations)
+        if not self._is_rooted:
+            # all bipartitions change with the rooting state
+            self.is_rooted = True
+            self._update_bipartitions(self._get_bipartition_encoding_state(), [],
+                    suppress_unifurcations=suppress_unifurcations)
         return self.seed_node
 
     def reroot_at_edge(self,
@@ -4571,6 +4977,10 @@ class Tree(
         ``suppress_unifurcations`` is False, then it will be
         removed from the tree.
         """
+        if update_bipartitions:
+            bipartition_state = self._get_bipartition_encoding_state()
+        else:
+            bipartition_state = None
         old_tail = edge.tail_node
         old_head = edge.head_node
         new_seed_node = old_tail.new_child(edge_length=length1)
@@ -4578,7 +4988,10 @@ class Tree(
         # new_seed_node.add_child(old_head, edge_length=length2)
         new_seed_node.add_child(old_head)
         old_head.edge.length = length2
-        self.reroot_at_node(new_seed_node,
+        # ``old_tail`` and ``new_seed_node``, changed above, are on the path
+        # to the old seed node, along which bipartitions are updated
+        self._reroot_at_node(new_seed_node,
+                bipartition_state=bipartition_state,
                 update_bipartitions=update_bipartitions,
                 suppress_unifurcations=suppress_unifurcations)
         return self.seed_node
@@ -4618,9 +5031,7 @@ class Tree(
             n2 = spanning_nodes[1]
 
         plen = float(pdm.patristic_distance(maxtax1, maxtax2)) / 2
-        mrca_node = pdm.mrca(n1.taxon, n2.taxon)
-        #assert mrca_node is self.mrca(taxa=[n1.taxon, n2.taxon])
-        #mrca_node = self.mrca(taxa=[n1.taxon, n2.taxon])
+        mrca_node = self.mrca(nodes=[n1, n2])
         cur_node = n1
 
         break_on_node = None # populated *iff* midpoint is exactly at an existing node
@@ -4719,11 +5130,16 @@ class Tree(
         Collapse all *internal* edges with edge lengths less than or equal to
         ``threshold`` (or with |None| for edge length).
         """
+        if update_bipartitions:
+            bipartition_state = self._get_bipartition_encoding_state()
+            updated_nodes = []
         for e in self.postorder_edge_iter():
             if e.length is None or (e.length <= threshold) and e.is_internal():
+               if update_bipartitions and e.tail_node is not None:
+                   updated_nodes.extend((e.head_node, e.tail_node))
                e.collapse()
         if update_bipartitions:
-            self.update_bipartitions()
+            self._update_bipartitions(bipartition_state, updated_nodes)
 
     def resolve_polytomies(self,
             limit=2,
@@ -4747,10 +5163,13 @@ class Tree(
             If ``rng`` is |None|, then polytomy is broken deterministically by
             repeatedly joining pairs of children.
         """
+        if update_bipartitions:
+            bipartition_state = self._get_bipartition_encoding_state()
         polytomies = []
         for node in self.postorder_node_iter():
             if len(node._child_nodes) > limit:
                 polytomies.append(node)
+        updated_nodes = list(polytomies)
         for node in polytomies:
             if rng:
                 to_attach = rng.sample(node._child_nodes, len(node._child_nodes)-limit)
@@ -4766,6 +5185,7 @@ class Tree(
                     p.remove_child(next_sib)
                     next_attachment.add_child(next_sib)
                     next_attachment.add_child(next_child)
+                    updated_nodes.append(next_attachment)
                     attachment_points.append(next_attachment)
                     attachment_points.append(next_child)
             else:
@@ -4779,8 +5199,9 @@ class Tree(
                     nn1.add_child(c1)
                     nn1.add_child(c2)
                     node.add_child(nn1)
+                    updated_nodes.append(nn1)
         if update_bipartitions:
-            self.update_bipartitions()
+            self._update_bipartitions(bipartition_state, updated_nodes)
 
     def prune_subtree(self,
             node,
@@ -4861,6 +5282,31 @@ class Tree(
         Removes all terminal nodes that have their ``taxon`` attribute set to
         |None|.
         """
+        if update_bipartitions:
+            bipartition_state = self._get_bipartition_encoding_state()
+        else:
+            bipartition_state = None
+        return self._prune_leaves_without_taxa(
+                bipartition_state=bipartition_state,
+                updated_nodes=[],
+                recursive=recursive,
+                update_bipartitions=update_bipartitions,
+                suppress_unifurcations=suppress_unifurcations)
+
+    def _prune_leaves_without_taxa(self,
+            bipartition_state,
+            updated_nodes,
+            recursive=True,
+            update_bipartitions=False,
+            suppress_unifurcations=True):
+        """
+        Removes terminal nodes without taxa as
+        :meth:`Tree.prune_leaves_without_taxa()` does, with
+        ``bipartition_state`` the state of the bipartitions (as returned by
+        ``_get_bipartition_encoding_state()``) before any change to the tree,
+        and ``updated_nodes`` the nodes changed since (to which the nodes
+        removed, and their parents, are added).
+        """
         nodes_removed = []
         while True:
             nodes_to_remove = []
@@ -4868,26 +5314,45 @@ class Tree(
                 if nd.taxon is None:
                     nodes_to_remove.append(nd)
             for nd in nodes_to_remove:
-                nd.edge.tail_node.remove_child(nd)
+                parent_node = nd.edge.tail_node
+                parent_node.remove_child(nd)
+                updated_nodes.extend((nd, parent_node))
             nodes_removed += nodes_to_remove
             if not nodes_to_remove or not recursive:
                 break
-        if suppress_unifurcations:
-            self.suppress_unifurcations()
-        if update_bipartitions:
-            self.update_bipartitions()
+        if update_bipartitions and bipartition_state is not None:
+            # as with ``update_bipartitions()``, unifurcations are suppressed
+            # regardless of ``suppress_unifurcations``
+            self._update_bipartitions(bipartition_state, updated_nodes)
+        else:
+            if suppress_unifurcations:
+                self.suppress_unifurcations()
+            if update_bipartitions:
+                self.update_bipartitions()
         return nodes_removed
 
     def prune_taxa(self, taxa, update_bipartitions=False, suppress_unifurcations=True):
         """
         Removes terminal nodes associated with Taxon objects given by the container
         ``taxa`` (which can be any iterable, including a TaxonNamespace object) from ``self``.
+        If ``update_bipartitions`` is True, then the bipartitions are updated
+        along the paths from the nodes removed to the seed node only, provided
+        that they are current.
         """
-        nodes_to_remove = []
+        if update_bipartitions:
+            bipartition_state = self._get_bipartition_encoding_state()
+        else:
+            bipartition_state = None
+        updated_nodes = []
         for nd in self.postorder_node_iter():
             if nd.taxon and nd.taxon in taxa:
-                nd.edge.tail_node.remove_child(nd)
-        self.prune_leaves_without_taxa(update_bipartitions=update_bipartitions,
+                parent_node = nd.edge.tail_node
+                parent_node.remove_child(nd)
+                updated_nodes.extend((nd, parent_node))
+        self._prune_leaves_without_taxa(
+                bipartition_state=bipartition_state,
+                updated_nodes=updated_nodes,
+                update_bipartitions=update_bipartitions,
                 suppress_unifurcations=suppress_unifurcations)
 
     def prune_nodes(self, nodes, prune_leaves_without_taxa=False, update_bipartitions=False, suppress_unifurcations=True):
@@ -4952,7 +5417,13 @@ class Tree(
             self.to_outgroup_position(nd, update_bipartitions=update_bipartitions)
         else:
             self.reseed_at(nd, update_bipartitions=update_bipartitions)
+        bipartition_state = self._get_bipartition_encoding_state()
         self.randomly_rotate(rng=rng)
+        if bipartition_state is not None:
+            # rotating leaves bipartitions current (the list of which is
+            # rebuilt in the new order)
+            self._bipartition_encoding = None
+            self._set_bipartition_encoding_state(*bipartition_state[3:])
 
     def randomly_rotate(self, rng=None):
         "Randomly rotates the branches around all internal nodes in ``self``"
@@ -5012,6 +5483,7 @@ class Tree(
                     total += node_desc_counts[child]
                 total += len(nd._child_nodes)
                 node_desc_counts[nd] = total
+                _invalidate_traversal_cache(nd)
                 nd._child_nodes.sort(key=lambda n: node_desc_counts[n], reverse=not ascending)
 
     def truncate_from_root(self, distance_from_root):
@@ -5374,11 +5846,14 @@ class Tree(
             # two nodes).
             self.collapse_basal_bifurcation()
         tree_edges = []
+        has_unifurcations = False
         for edge in self.postorder_edge_iter():
             leafset_bitmask = 0
             head_node = edge._head_node
             child_nodes = head_node._child_nodes
             num_children = len(child_nodes)
+            if num_children == 1 and not suppress_unifurcations:
+                has_unifurcations = True
             if num_children == 1 and suppress_unifurcations:
                 # collapsing node: remove, and do not process/add edge
                 if head_node.edge.length is not None:
@@ -5423,6 +5898,7 @@ class Tree(
         else:
             # self.bipartition_encoding = dict(zip(map(self._compile_bipartition_for_edge, tree_edges), tree_edges))
             self.bipartition_encoding = list(map(_compile_bipartition, tree_edges))
+            self._set_bipartition_encoding_state(is_bipartitions_mutable, has_unifurcations)
         return self.bipartition_encoding
 
     def update_bipartitions(self, *args, **kwargs):
@@ -5431,6 +5907,242 @@ class Tree(
         """
         self.encode_bipartitions(*args, **kwargs)
 
+    def _get_bipartition_encoding_state(self):
+        """
+        Returns the state of the bipartitions of this tree as last encoded or
+        updated, as a tuple of the cached traversals of the tree at the time
+        (which are discarded on any change to the structure of the tree), the
+        leafset bitmask and rooting state of the tree, the mutability of the
+        bipartitions, and whether unifurcations were left in the tree (and may
+        remain). Returns |None| if the bipartitions are not encoded, or if the
+        structure of the tree has changed since, in which case they may not be
+        current.
+        """
+        state = self._bipartition_encoding_state
+        if (state is None
+                or state[0] is None
+                or state[0] is not self._traversal_cache
+                or not state[0].is_current
+                or state[0].seed_node is not self.seed_node):
+            return None
+        return state
+
+    def _set_bipartition_encoding_state(self, is_mutable, has_unifurcations):
+        self._bipartition_encoding_state = (
+                self._get_traversal_cache(),
+                self.seed_node._edge.bipartition._leafset_bitmask,
+                self._is_rooted,
+                is_mutable,
+                has_unifurcations)
+
+    def _update_bipartitions(self,
+            bipartition_state,
+            nodes,
+            suppress_unifurcations=True,
+            collapse_unrooted_basal_bifurcation=True):
+        """
+        Updates the bipartitions of this tree after changes to the child nodes
+        of ``nodes`` (and of no other node), recalculating the bipartitions of
+        the edges subtending these nodes and their ancestors instead of those
+        of all the edges of the tree. ``nodes`` may include nodes that have
+        been added to the tree, or removed from it (the bipartitions of which,
+        and of their descendants, are discarded). As with
+        :meth:`Tree.encode_bipartitions()`, the basal bifurcation of an
+        unrooted tree is collapsed and unifurcations (among ``nodes`` and
+        their ancestors) are suppressed, depending on
+        ``collapse_unrooted_basal_bifurcation`` and ``suppress_unifurcations``.
+        If unifurcations are to be suppressed but may have been left elsewhere
+        in the tree when its bipartitions were last encoded or updated, then
+        all the bipartitions are encoded afresh instead, so as to suppress
+        these too. All the bipartitions are also encoded afresh if they were
+        last encoded as mutable, as the updated bipartitions are compiled as
+        immutable (as by :meth:`Tree.encode_bipartitions()` by default).
+
+        The bipartitions of the tree, and the map of bipartitions to edges (if
+        built), are left as if encoded afresh, except for the
+        ``bipartition_encoding`` list, which is rebuilt when next accessed. If
+        the leafset or rooting state of the tree has changed, then all
+        bipartitions are compiled afresh (though leafsets are still only
+        recalculated along the paths from ``nodes``).
+
+        Parameters
+        ----------
+        bipartition_state : tuple or |None|
+            The state of the bipartitions before the changes, as returned by
+            ``_get_bipartition_encoding_state()``. If |None|, then all the
+            bipartitions of the tree are encoded afresh.
+        nodes : iterable[|Node|]
+            The nodes of which the child nodes have changed.
+        suppress_unifurcations : bool
+            If |True|, nodes of outdegree 1 will be deleted.
+        collapse_unrooted_basal_bifurcation: bool
+            If |True|, then a basal bifurcation on an unrooted tree will be
+            collapsed to a trifurcation.
+        """
+        if bipartition_state is None or nodes is None:
+            self.encode_bipartitions(
+                    suppress_unifurcations=suppress_unifurcations,
+                    collapse_unrooted_basal_bifurcation=collapse_unrooted_basal_bifurcation)
+            return
+        _, old_tree_leafset_bitmask, old_is_rooted, is_mutable, has_unifurcations = bipartition_state
+        if is_mutable or (suppress_unifurcations and has_unifurcations):
+            self.encode_bipartitions(
+                    suppress_unifurcations=suppress_unifurcations,
+                    collapse_unrooted_basal_bifurcation=collapse_unrooted_basal_bifurcation)
+            return
+        nodes = list(nodes)
+        seed_node = self.seed_node
+        if (collapse_unrooted_basal_bifurcation
+                and not self._is_rooted
+                and len(seed_node._child_nodes) == 2):
+            nodes.append(seed_node)
+            nodes.extend(seed_node._child_nodes)
+            self.collapse_basal_bifurcation()
+        if suppress_unifurcations:
+            node_depths, removed_nodes = self._get_node_depths_for_update(nodes)
+            for nd in sorted(node_depths, key=node_depths.get, reverse=True):
+                child_nodes = nd._child_nodes
+                if len(child_nodes) != 1:
+                    continue
+                # as in ``encode_bipartitions()``
+                if nd.edge.length is not None:
+                    if child_nodes[0].edge.length is None:
+                        child_nodes[0].edge.length = nd.edge.length
+                    else:
+                        child_nodes[0].edge.length += nd.edge.length
+                nodes.append(nd)
+                if nd._parent_node is not None:
+                    parent = nd._parent_node
+                    pos = parent._child_nodes.index(nd)
+                    parent.remove_child(nd)
+                    parent.insert_child(index=pos, node=child_nodes[0])
+                    nd._parent_node = None
+                    nodes.append(parent)
+                else:
+                    self.seed_node = child_nodes[0]
+                    self.seed_node._parent_node = None
+
+        node_depths, removed_nodes = self._get_node_depths_for_update(nodes)
+        if not suppress_unifurcations and not has_unifurcations:
+            has_unifurcations = any(len(nd._child_nodes) == 1 for nd in node_depths)
+        taxon_namespace = self._taxon_namespace
+        is_rooted = self._is_rooted
+        discarded_bipartitions = []
+        updated_edges = []
+        for nd in sorted(node_depths, key=node_depths.get, reverse=True):
+            edge = nd._edge
+            child_nodes = nd._child_nodes
+            if child_nodes:
+                leafset_bitmask = 0
+                for child in child_nodes:
+                    leafset_bitmask |= child._edge.bipartition._leafset_bitmask
+            else:
+                taxon = nd.taxon
+                if taxon:
+                    leafset_bitmask = taxon_namespace.taxon_bitmask(taxon)
+                else:
+                    leafset_bitmask = 0
+            bipartition = edge._bipartition
+            if bipartition is not None:
+                if (bipartition._leafset_bitmask == leafset_bitmask
+                        and bipartition._tree_leafset_bitmask == old_tree_leafset_bitmask
+                        and bipartition._is_rooted == old_is_rooted):
+                    continue
+                discarded_bipartitions.append((bipartition, edge))
+            edge.bipartition = Bipartition(compile_bipartition=False, is_mutable=True)
+            edge.bipartition._leafset_bitmask = leafset_bitmask
+            edge.bipartition._is_rooted = is_rooted
+            updated_edges.append(edge)
+        for nd in removed_nodes:
+            to_discard = [nd]
+            while to_discard:
+                nd = to_discard.pop()
+                if nd._edge._bipartition is not None:
+                    discarded_bipartitions.append((nd._edge._bipartition, nd._edge))
+                to_discard.extend(ch for ch in nd._child_nodes if ch._parent_node is nd)
+
+        _compile_bipartition = self._compile_immutable_bipartition_for_edge
+        tree_leafset_bitmask = self.seed_node._edge.bipartition._leafset_bitmask
+        if tree_leafset_bitmask != old_tree_leafset_bitmask or is_rooted != old_is_rooted:
+            # the split bitmasks of all bipartitions depend on these
+            for edge in self.postorder_edge_iter():
+                leafset_bitmask = edge.bipartition._leafset_bitmask
+                edge.bipartition = Bipartition(compile_bipartition=False, is_mutable=True)
+                edge.bipartition._leafset_bitmask = leafset_bitmask
+                edge.bipartition._is_rooted = is_rooted
+                _compile_bipartition(edge)
+            self._bipartition_edge_map = None
+        else:
+            for edge in updated_edges:
+                _compile_bipartition(edge)
+            if self._bipartition_edge_map:
+                self._update_bipartition_edge_map(discarded_bipartitions, updated_edges)
+        self._bipartition_encoding = None
+        self._set_bipartition_encoding_state(False, has_unifurcations)
+
+    def _update_bipartition_edge_map(self, discarded_bipartitions, updated_edges):
+        """
+        Updates the map of bipartitions to edges for the replacement of the
+        ``(bipartition, edge)`` pairs of ``discarded_bipartitions`` by the
+        bipartitions of ``updated_edges``. A bipartition shared by more than
+        one edge (e.g., the edges of a unifurcation) is mapped to the last of
+        these in postorder when the map is built, so if any such bipartition
+        is discarded or added, the map is instead discarded, to be rebuilt
+        when next accessed.
+        """
+        edge_counts = self._bipartition_edge_counts
+        if edge_counts is None:
+            self._bipartition_edge_map = None
+            return
+        previous_counts = {}
+        for bipartition, edge in discarded_bipartitions:
+            split_bitmask = bipartition._split_bitmask
+            previous_counts.setdefault(split_bitmask, edge_counts.get(split_bitmask, 0))
+            edge_counts[split_bitmask] = edge_counts.get(split_bitmask, 0) - 1
+        for edge in updated_edges:
+            split_bitmask = edge.bipartition._split_bitmask
+            previous_counts.setdefault(split_bitmask, edge_counts.get(split_bitmask, 0))
+            edge_counts[split_bitmask] = edge_counts.get(split_bitmask, 0) + 1
+        for split_bitmask, previous_count in previous_counts.items():
+            if previous_count > 1 or edge_counts[split_bitmask] not in (0, 1):
+                self._bipartition_edge_map = None
+                self._bipartition_edge_counts = None
+                return
+        edge_map = self._bipartition_edge_map
+        for bipartition, edge in discarded_bipartitions:
+            if edge_counts.get(bipartition._split_bitmask) == 0:
+                del edge_counts[bipartition._split_bitmask]
+                edge_map.pop(bipartition, None)
+        for edge in updated_edges:
+            edge_map[edge.bipartition] = edge
+
+    def _get_node_depths_for_update(self, nodes):
+        """
+        Returns a dictionary mapping each node of ``nodes`` that is on this
+        tree, and all its ancestors, to its depth (i.e., its number of
+        ancestors), and a list of the nodes of ``nodes`` (and of their
+        ancestors) that are not on this tree.
+        """
+        seed_node = self.seed_node
+        node_depths = {}
+        removed_nodes = set()
+        for nd in nodes:
+            path = []
+            while nd is not None and nd not in node_depths and nd not in removed_nodes:
+                path.append(nd)
+                nd = nd._parent_node
+            if nd is not None and nd in node_depths:
+                depth = node_depths[nd]
+            elif nd is None and path and path[-1] is seed_node:
+                depth = -1
+            else:
+                removed_nodes.update(path)
+                continue
+            for nd in reversed(path):
+                depth += 1
+                node_depths[nd] = depth
+        return node_depths, list(removed_nodes)
+
     def encode_splits(self, *args, **kwargs):
         """
         Recalculates bipartition hashes for tree.
@@ -5454,11 +6166,34 @@ class Tree(
             if not self.bipartition_encoding:
                 self.encode_bipartitions()
             self._bipartition_edge_map = {}
+            # number of edges with each split, to keep the map in step with
+            # incremental updates (see ``_update_bipartitions()``)
+            self._bipartition_edge_counts = {}
             for edge in self.postorder_edge_iter():
                 self._bipartition_edge_map[edge.bipartition] = edge
+                split_bitmask = edge.bipartition._split_bitmask
+                self._bipartition_edge_counts[split_bitmask] = self._bipartition_edge_counts.get(split_bitmask, 0) + 1
         return self._bipartition_edge_map
     bipartition_edge_map = property(_get_bipartition_edge_map)
 
+    ###########################################################################
+    ### Flat Representation
+
+    def to_flat(self):
+        """
+        Returns an immutable, array-based representation of the structure,
+        edge lengths, taxa and node labels of this tree, for computations
+        (e.g., of node ages, distances or bipartitions) that do not need
+        |Node| and |Edge| objects.
+
+        Returns
+        -------
+        t : |FlatTree|
+            A new |FlatTree| object.
+        """
+        from dendropy.datamodel import flattreemodel
+        return flattreemodel.FlatTree.from_tree(self)
+
     ###########################################################################
     ### Metrics -- Unary
 
@@ -5591,8 +6326,8 @@ class Tree(
         """
         self.comments = []
         for nd in self.postorder_node_iter():
-            nd.comments = []
-            nd.edge.comments = []
+            nd.comments = None
+            nd.edge.comments = None
 
     ###########################################################################
     ### Representation
@@ -5802,8 +6537,11 @@ class Tree(
 
         kwargs:
             ``check_bipartitions`` if True specifies that the bipartition attributes are checked.
+            ``check_bipartition_encoding`` if True specifies that the bipartitions
+            are checked against those encoded afresh on a copy of the tree.
         """
         check_bipartitions = kwargs.get('check_bipartitions', False)
+        check_bipartition_encoding = kwargs.get('check_bipartition_encoding', False)
         unique_bipartition_edge_mapping = kwargs.get('unique_bipartition_edge_mapping', False)
         taxon_namespace = kwargs.get('taxon_namespace')
         if taxon_namespace is None:
@@ -5866,6 +6604,29 @@ class Tree(
                 assert e in edges, "{}: {} => {}".format(e, e.tail_node, e.head_node)
                 if unique_bipartition_edge_mapping:
                     assert b is e.bipartition
+        if check_bipartition_encoding:
+            tree = self.taxon_namespace_scoped_copy()
+            encoded_bipartitions = tree.encode_bipartitions(
+                    suppress_unifurcations=False,
+                    collapse_unrooted_basal_bifurcation=False)
+            edges = list(self.postorder_edge_iter())
+            assert len(edges) == len(encoded_bipartitions), \
+                    "{} edges, but {} bipartitions encoded".format(len(edges), len(encoded_bipartitions))
+            for edge, b in zip(edges, encoded_bipartitions):
+                b2 = edge.bipartition
+                assert (b2._split_bitmask, b2._leafset_bitmask, b2._tree_leafset_bitmask, b2._is_rooted) \
+                        == (b._split_bitmask, b._leafset_bitmask, b._tree_leafset_bitmask, b._is_rooted), \
+                        "Bipartition of edge {} is {}, but {} is encoded".format(edge, b2, b)
+            bipartitions = self.bipartition_encoding
+            assert bipartitions is not None, "Bipartitions not encoded"
+            assert sorted(b._split_bitmask for b in bipartitions) == sorted(b._split_bitmask for b in encoded_bipartitions), \
+                    "Bipartition encoding differs from bipartitions encoded afresh"
+            edges = set(edges)
+            for b, e in self.bipartition_edge_map.items():
+                assert e in edges and e.bipartition == b, \
+                        "Bipartition {} mapped to edge {}, with bipartition {}".format(b, e, e.bipartition)
+            assert len(self.bipartition_edge_map) == len(set(encoded_bipartitions)), \
+                    "{} bipartitions mapped to edges, but {} encoded".format(len(self.bipartition_edge_map), len(set(encoded_bipartitions)))
         return True
 
     def _as_newick_string(self, **kwargs):
@@ -6129,6 +6890,312 @@ class AsciiTreePlot(object):
         except:
             pass
 
+###############################################################################
+### Traversal Caching
+
+class _TraversalCache(object):
+    """
+    The pre-order and post-order sequences of the nodes of a tree (the
+    latter built as needed), valid for as long as ``is_current`` is |True|.
+    Each sequence is accompanied by the position in the sequence of the
+    parent of each node (-1 for the seed node), and the post-order sequence
+    also by the positions of the leaves.
+
+    The cache is registered with each node of the tree, so that it can be
+    discarded on a change to the parent or child nodes of any of them (see
+    ``_invalidate_traversal_cache()``). A node belongs to at most one current
+    cache: the cache of any other tree sharing nodes with this tree is
+    discarded.
+    """
+
+    __slots__ = ("seed_node", "is_current", "_preorder", "_postorder", "_lca_index")
+
+    def __init__(self, seed_node):
+        self.seed_node = seed_node
+        self.is_current = True
+        self._preorder = None
+        self._postorder = None
+        self._lca_index = None
+        for node in self.preorder()[0]:
+            other = node._traversal_cache
+            if other is not None and other is not self:
+                other.is_current = False
+            node._traversal_cache = self
+
+    def __deepcopy__(self, memo=None):
+        # cached traversals are not copied, but rebuilt when needed
+        return None
+
+    def lca_index(self):
+        if self._lca_index is None:
+            nodes, parent_positions = self.preorder()
+            self._lca_index = _LowestCommonAncestorIndex(nodes, parent_positions)
+        return self._lca_index
+
+    def preorder(self):
+        if self._preorder is None:
+            nodes = []
+            parent_positions = array.array("l")
+            stack = [(self.seed_node, -1)]
+            while stack:
+                node, parent_position = stack.pop()
+                position = len(nodes)
+                nodes.append(node)
+                parent_positions.append(parent_position)
+                if node._child_nodes:
+                    stack.extend([(ch, position) for ch in reversed(node._child_nodes)])
+            self._preorder = (nodes, parent_positions)
+        return self._preorder
+
+    def postorder(self):
+        if self._postorder is None:
+            # the post-order sequence is the reverse of the pre-order
+            # sequence obtained by visiting children last to first
+            nodes = []
+            parent_positions = []
+            stack = [(self.seed_node, -1)]
+            while stack:
+                node, parent_position = stack.pop()
+                position = len(nodes)
+                nodes.append(node)
+                parent_positions.append(parent_position)
+                if node._child_nodes:
+                    stack.extend([(ch, position) for ch in node._child_nodes])
+            nodes.reverse()
+            last = len(nodes) - 1
+            parent_positions = array.array("l", [last - p if p >= 0 else -1 for p in reversed(parent_positions)])
+            leaf_positions = array.array("l", [idx for idx, nd in enumerate(nodes) if not nd._child_nodes])
+            self._postorder = (nodes, parent_positions, leaf_positions)
+        return self._postorder
+
+def _iter_cached_preorder(nodes, parent_positions, cache, filter_fn):
+    """
+    Yields the nodes of the pre-order sequence ``nodes`` (of the traversal
+    cache ``cache``) passing ``filter_fn``, exactly as
+    :meth:`Node.preorder_iter()` would yield them: if the structure of the tree
+    changes during the iteration, the traversal is continued over the nodes
+    themselves from where it got to.
+    """
+    if not cache.is_current:
+        stack = [nodes[0]]
+    else:
+        for position, node in enumerate(nodes):
+            if filter_fn is None or filter_fn(node):
+                yield node
+            if not cache.is_current:
+                # the nodes yet to be visited are the remaining children
+                # of the ancestors of the current node, then its children
+                ancestor_positions = set()
+                idx = parent_positions[position]
+                while idx >= 0:
+                    ancestor_positions.add(idx)
+                    idx = parent_positions[idx]
+                stack = [nodes[idx] for idx in range(position + 1, len(nodes))
+                        if parent_positions[idx] in ancestor_positions]
+                stack.reverse()
+                stack.extend(reversed(node._child_nodes))
+                break
+        else:
+            return
+    while stack:
+        node = stack.pop()
+        if filter_fn is None or filter_fn(node):
+            yield node
+        stack.extend(reversed(node._child_nodes))
+
+def _iter_cached_postorder(nodes, parent_positions, positions, cache, filter_fn, traversal_filter_fn):
+    """
+    Yields the nodes at ``positions`` of the post-order sequence ``nodes``
+    (of the traversal cache ``cache``) passing ``filter_fn``, exactly
+    as :meth:`Node.postorder_iter()` would yield the nodes passing
+    ``traversal_filter_fn`` (which must reject the nodes not at
+    ``positions``): if the structure of the tree changes during the
+    iteration, the traversal is continued over the nodes themselves from
+    where it got to.
+    """
+    if not cache.is_current:
+        stack = [(nodes[-1], False)]
+    else:
+        for position in positions:
+            node = nodes[position]
+            if filter_fn is None or filter_fn(node):
+                yield node
+            if not cache.is_current:
+                # the nodes yet to be visited are, for each ancestor of the
+                # current node (from the seed node down), the ancestor itself
+                # and (before it) its remaining children
+                ancestor_positions = []
+                idx = parent_positions[position]
+                while idx >= 0:
+                    ancestor_positions.append(idx)
+                    idx = parent_positions[idx]
+                remaining_children = dict((idx, []) for idx in ancestor_positions)
+                for idx in range(position + 1, len(nodes)):
+                    if parent_positions[idx] in remaining_children and idx not in remaining_children:
+                        remaining_children[parent_positions[idx]].append(nodes[idx])
+                stack = []
+                for idx in reversed(ancestor_positions):
+                    stack.append((nodes[idx], True))
+                    stack.extend([(ch, False) for ch in reversed(remaining_children[idx])])
+                break
+        else:
+            return
+    filter_fn = traversal_filter_fn
+    while stack:
+        node, state = stack.pop()
+        if state:
+            if filter_fn is None or filter_fn(node):
+                yield node
+        else:
+            stack.append((node, True))
+            stack.extend([(n, False) for n in reversed(node._child_nodes)])
+
+###############################################################################
+### Lowest Common Ancestor Index
+
+class _LowestCommonAncestorIndex(object):
+    """
+    Answers queries for the most-recent common ancestor (MRCA, or lowest
+    common ancestor) of two nodes, and for the depth (number of ancestors) of
+    a node, in constant time, given the pre-order sequence ``nodes`` of the
+    nodes of a tree and the position in the sequence of the parent of each.
+
+    For nodes at positions ``i < j`` of the pre-order sequence, the MRCA is
+    the parent of the shallowest node at positions ``i + 1`` to ``j`` (or the
+    node at ``i``, if it is an ancestor of the node at ``j``). The shallowest
+    node of every range of positions of a length that is a power of two is
+    tabulated (in a "sparse table"), and any range is covered by two of these
+    ranges. The MRCA of more than two nodes is that of the first and last of
+    them in pre-order.
+    """
+
+    __slots__ = (
+            "nodes",
+            "parent_positions",
+            "_positions",
+            "_sparse_table",
+            "_shift",
+            "_mask",
+            "_subtree_ends",
+            "_leaf_counts",
+            "_taxon_leaf_nodes",
+            )
+
+    def __init__(self, nodes, parent_positions):
+        self.nodes = nodes
+        self.parent_positions = parent_positions
+        num_nodes = len(nodes)
+        self._positions = dict(zip(nodes, range(num_nodes)))
+        # each entry is the depth of a node shifted above its position, so
+        # that the minimum entry over a range is that of the shallowest node
+        self._shift = num_nodes.bit_length()
+        self._mask = (1 << self._shift) - 1
+        depths = [0] * num_nodes
+        for position in range(1, num_nodes):
+            depths[position] = depths[parent_positions[position]] + 1
+        shift = self._shift
+        entries = [(depth << shift) | position for position, depth in enumerate(depths)]
+        self._sparse_table = [entries]
+        half_length = 1
+        while 2 * half_length <= num_nodes:
+            entries = [min(a, b) for a, b in zip(entries, entries[half_length:])]
+            self._sparse_table.append(entries)
+            half_length *= 2
+        self._subtree_ends = None
+        self._leaf_counts = None
+        self._taxon_leaf_nodes = None
+
+    def depth(self, node):
+        return self._sparse_table[0][self._positions[node]] >> self._shift
+
+    def mrca(self, node1, node2):
+        """
+        Returns the MRCA of ``node1`` and ``node2``.
+        """
+        positions = self._positions
+        return self._mrca_of_positions(positions[node1], positions[node2])
+
+    def mrca_of_nodes(self, nodes):
+        """
+        Returns the MRCA of ``nodes``, which must not be empty.
+        """
+        positions = self._positions
+        node_positions = [positions[nd] for nd in nodes]
+        return self._mrca_of_positions(min(node_positions), max(node_positions))
+
+    def _mrca_of_positions(self, position1, position2):
+        if position1 == position2:
+            return self.nodes[position1]
+        if position1 > position2:
+            position1, position2 = position2, position1
+        start = position1 + 1
+        level = (position2 - position1).bit_length() - 1
+        entries = self._sparse_table[level]
+        entry = min(entries[start], entries[position2 - (1 << level) + 1])
+        return self.nodes[self.parent_positions[entry & self._mask]]
+
+    def is_ancestor(self, node1, node2):
+        """
+        Returns |True| if ``node1`` is ``node2`` or one of its ancestors.
+        """
+        position1 = self._positions[node1]
+        return position1 <= self._positions[node2] <= self._get_subtree_ends()[position1]
+
+    def num_leaf_nodes(self, node):
+        """
+        Returns the number of leaf nodes descending from (or being) ``node``.
+        """
+        if self._leaf_counts is None:
+            # number of leaf nodes before each position
+            leaf_counts = array.array("l", [0]) * (len(self.nodes) + 1)
+            count = 0
+            for position, nd in enumerate(self.nodes):
+                if not nd._child_nodes:
+                    count += 1
+                leaf_counts[position + 1] = count
+            self._leaf_counts = leaf_counts
+        position = self._positions[node]
+        return self._leaf_counts[self._get_subtree_ends()[position] + 1] - self._leaf_counts[position]
+
+    def _get_subtree_ends(self):
+        """
+        Returns the position of the last node of the subtree of the node at
+        each position.
+        """
+        if self._subtree_ends is None:
+            parent_positions = self.parent_positions
+            subtree_ends = array.array("l", range(len(self.nodes)))
+            for position in range(len(self.nodes) - 1, 0, -1):
+                parent_position = parent_positions[position]
+                if subtree_ends[position] > subtree_ends[parent_position]:
+                    subtree_ends[parent_position] = subtree_ends[position]
+            self._subtree_ends = subtree_ends
+        return self._subtree_ends
+
+    def leaf_nodes_for_taxa(self, taxa):
+        """
+        Returns a list of the leaf nodes associated with ``taxa``, or |None|
+        if any taxon is not associated with a leaf node.
+        """
+        for is_rebuilt in (False, True):
+            if is_rebuilt or self._taxon_leaf_nodes is None:
+                # taxa may be reassigned without changing the structure of
+                # the tree, so the map is rebuilt if found to be out of date
+                taxon_leaf_nodes = {}
+                for nd in self.nodes:
+                    if not nd._child_nodes and nd.taxon is not None:
+                        taxon_leaf_nodes.setdefault(nd.taxon, []).append(nd)
+                self._taxon_leaf_nodes = taxon_leaf_nodes
+            leaf_nodes = []
+            for taxon in taxa:
+                taxon_nodes = self._taxon_leaf_nodes.get(taxon)
+                if taxon_nodes is None or taxon_nodes[0].taxon is not taxon:
+                    break
+                leaf_nodes.extend(taxon_nodes)
+            else:
+                return leaf_nodes
+        return None
+
 ###############################################################################
 ### Helper Functions
 
@@ -476,7 +476,7 @@ class ContainingTree(dendropy.Tree):
 
 def reconciliation_discordance(gene_tree, species_tree):
     """
-    Given two trees (with splits encoded), this returns the number of gene
+    Given two trees, this returns the number of gene
     duplications implied by the gene tree reconciled on the species tree, based
     on the algorithm described here:
 
@@ -489,29 +489,26 @@ def reconciliation_discordance(gene_tree, species_tree):
         523-536.
 
     This function requires that the gene tree and species tree *have the same
-    leaf set*. Note that for correct results,
-
-        (a) trees must be rooted (i.e., is_rooted = True)
-        (b) split masks must have been added as rooted (i.e., when
-            encode_splits was called, is_rooted must have been set to True)
+    leaf set*. Note that for correct results, trees must be rooted (i.e.,
+    is_rooted = True).
 
     """
     taxa_mask = species_tree.taxon_namespace.all_taxa_bitmask()
+    taxon_species_nodes = {}
+    for snd in species_tree.preorder_node_iter():
+        taxon_species_nodes.setdefault(snd.taxon, snd)
     species_node_gene_nodes = {}
     gene_node_species_nodes = {}
     for gnd in gene_tree.postorder_node_iter():
         gn_children = gnd.child_nodes()
         if len(gn_children) > 0:
-            ssplit = 0
-            for gn_child in gn_children:
-                ssplit = ssplit | gene_node_species_nodes[gn_child].edge.leafset_bitmask
-            sanc = species_tree.mrca(start_node=species_tree.seed_node, leafset_bitmask=ssplit)
+            sanc = species_tree.mrca(nodes=[gene_node_species_nodes[gn_child] for gn_child in gn_children])
             gene_node_species_nodes[gnd] = sanc
             if sanc not in species_node_gene_nodes:
                 species_node_gene_nodes[sanc] = []
             species_node_gene_nodes[sanc].append(gnd)
         else:
-            gene_node_species_nodes[gnd] = species_tree.find_node(lambda x : x.taxon == gnd.taxon)
+            gene_node_species_nodes[gnd] = taxon_species_nodes.get(gnd.taxon)
     contained_gene_lineages = {}
     for snd in species_tree.postorder_node_iter():
         if snd in species_node_gene_nodes:
@@ -0,0 +1,107 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+Benchmarking the updating of bipartitions after edits to a tree.
+
+A coalescent tree is simulated and repeatedly edited (reseeded, rerooted or
+randomly reoriented), with bipartitions updated along with each edit, and the
+time taken per edit is compared with that of the same edits followed by
+encoding all bipartitions afresh.
+"""
+
+import sys
+import time
+import random
+import argparse
+from dendropy.utility import messaging
+from dendropy.model import coalescent
+
+import dendropy
+
+def time_edits(tree, edit, num_edits, is_incremental):
+    rng = random.Random(1)
+    tree.encode_bipartitions()
+    start = time.time()
+    for i in range(num_edits):
+        nodes = tree.internal_nodes()
+        edit(tree, rng.choice(nodes), rng, is_incremental)
+        if not is_incremental:
+            tree.encode_bipartitions()
+    return (time.time() - start) / num_edits
+
+def reseed(tree, node, rng, is_incremental):
+    tree.reseed_at(node, update_bipartitions=is_incremental)
+
+def reroot_at_edge(tree, node, rng, is_incremental):
+    if node is not tree.seed_node:
+        tree.reroot_at_edge(node.edge, update_bipartitions=is_incremental)
+
+def randomly_reorient(tree, node, rng, is_incremental):
+    tree.randomly_reorient(rng=rng, update_bipartitions=is_incremental)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-l", "--num-leaves",
+            type=int,
+            default=10000,
+            help="Number of leaves of the tree (default=%(default)s).")
+    parser.add_argument("-n", "--num-edits",
+            type=int,
+            default=50,
+            help="Number of edits of each kind (default=%(default)s).")
+    parser.add_argument("--delimited-output",
+            action="store_true",
+            default=False,
+            help="Output in tab-delimited instead of aligned format")
+    args = parser.parse_args()
+
+    messenger = messaging.ConsoleMessenger(name="-benchmark")
+    messenger.info("Simulating tree of {} leaves".format(args.num_leaves))
+    taxon_namespace = dendropy.TaxonNamespace(
+            ["T{}".format(i) for i in range(args.num_leaves)],
+            label="taxa")
+    source_tree = coalescent.pure_kingman_tree(
+            taxon_namespace=taxon_namespace,
+            rng=random.Random(1))
+
+    results = []
+    for description, edit in (
+            ("reseed_at()", reseed),
+            ("reroot_at_edge()", reroot_at_edge),
+            ("randomly_reorient()", randomly_reorient),
+            ):
+        messenger.info("Timing: {}".format(description))
+        full_time = time_edits(source_tree.clone(1), edit, args.num_edits, False)
+        incremental_time = time_edits(source_tree.clone(1), edit, args.num_edits, True)
+        results.append((description, full_time, incremental_time, full_time / incremental_time))
+
+    messenger.info("Benchmarking complete")
+
+    if args.delimited_output:
+        result_template = "{}\t{:.5f}\t{:.5f}\t{:.1f}\n"
+        header_template = "{}\t{}\t{}\t{}\n"
+    else:
+        result_template = "{:20}  {:12.5f}  {:12.5f}  {:8.1f}\n"
+        header_template = "{:20}  {:>12}  {:>12}  {:>8}\n"
+    sys.stdout.write(header_template.format("Edit", "Re-encoded", "Updated", "Speed-up"))
+    for result in results:
+        sys.stdout.write(result_template.format(*result))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+Benchmarking computations on large trees represented as |Tree| and as
+|FlatTree| objects.
+
+A coalescent tree is simulated, and the time taken by each computation (and
+the memory used by each representation) is reported.
+"""
+
+import sys
+import time
+import random
+import argparse
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+from dendropy.utility import messaging
+from dendropy.model import coalescent
+
+import dendropy
+
+def time_fn(fn, repeats):
+    start = time.time()
+    for i in range(repeats):
+        fn()
+    return (time.time() - start) / repeats
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-l", "--num-leaves",
+            type=int,
+            default=20000,
+            help="Number of leaves of the tree (default=%(default)s).")
+    parser.add_argument("-r", "--repeats",
+            type=int,
+            default=5,
+            help="Number of times each computation is repeated (default=%(default)s).")
+    parser.add_argument("--delimited-output",
+            action="store_true",
+            default=False,
+            help="Output in tab-delimited instead of aligned format")
+    args = parser.parse_args()
+
+    messenger = messaging.ConsoleMessenger(name="-benchmark")
+    messenger.info("Simulating tree of {} leaves".format(args.num_leaves))
+    taxon_namespace = dendropy.TaxonNamespace(
+            ["T{}".format(i) for i in range(args.num_leaves)],
+            label="taxa")
+    if tracemalloc is not None:
+        tracemalloc.start()
+    tree = coalescent.pure_kingman_tree(
+            taxon_namespace=taxon_namespace,
+            rng=random.Random(1))
+    if tracemalloc is not None:
+        tree_memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        tracemalloc.start()
+    flat_tree = tree.to_flat()
+    if tracemalloc is not None:
+        flat_tree_memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    else:
+        tree_memory = flat_tree_memory = float("nan")
+
+    computations = (
+        ("to_flat()", lambda: tree.to_flat(), None),
+        ("to_tree()", None, lambda: flat_tree.to_tree()),
+        ("calc_node_ages()", lambda: tree.calc_node_ages(), lambda: flat_tree.calc_node_ages()),
+        ("calc_node_root_distances()", lambda: tree.calc_node_root_distances(), lambda: flat_tree.calc_node_root_distances()),
+        ("length()", lambda: tree.length(), lambda: flat_tree.length()),
+        ("coalescence_intervals()", lambda: tree.coalescence_intervals(), lambda: flat_tree.coalescence_intervals()),
+        ("leaf iteration", lambda: [nd.taxon for nd in tree.leaf_node_iter()], lambda: flat_tree.leaf_taxa()),
+        ("encode_bipartitions()", lambda: tree.encode_bipartitions(), lambda: flat_tree.encode_bipartitions()),
+        )
+    results = []
+    for description, tree_fn, flat_tree_fn in computations:
+        messenger.info("Timing: {}".format(description))
+        tree_time = float("nan") if tree_fn is None else time_fn(tree_fn, args.repeats)
+        flat_tree_time = float("nan") if flat_tree_fn is None else time_fn(flat_tree_fn, args.repeats)
+        results.append((description, tree_time, flat_tree_time, tree_time / flat_tree_time))
+
+    messenger.info("Benchmarking complete")
+
+    if args.delimited_output:
+        result_template = "{}\t{:.4f}\t{:.4f}\t{:.1f}\n"
+        header_template = "{}\t{}\t{}\t{}\n"
+    else:
+        result_template = "{:28}  {:10.4f}  {:10.4f}  {:8.1f}\n"
+        header_template = "{:28}  {:>10}  {:>10}  {:>8}\n"
+    sys.stdout.write("Memory (MB): Tree: {:.2f}, FlatTree: {:.2f}\n".format(tree_memory / 1e6, flat_tree_memory / 1e6))
+    sys.stdout.write(header_template.format("Computation", "Tree", "FlatTree", "Speed-up"))
+    for result in results:
+        sys.stdout.write(result_template.format(*result))
+
+if __name__ == "__main__":
+    main()
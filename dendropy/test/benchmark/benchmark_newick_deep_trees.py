@@ -0,0 +1,124 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+Benchmarking parsing and writing of very deep (caterpillar-shaped) trees.
+"""
+
+import sys
+import timeit
+import argparse
+from dendropy.utility import messaging
+
+import dendropy
+
+DEFAULT_NUM_TIPS = [
+    100000,
+    1000000,
+        ]
+
+def caterpillar_tree_newick(num_tips, with_comments=False):
+    """
+    Returns a NEWICK string describing a fully-pectinate tree with
+    ``num_tips`` tips, i.e. a tree with a depth of ``num_tips``-1. If
+    ``with_comments`` is |True|, then a comment is added to the tree statement
+    so that it is processed by the full token-by-token parser.
+    """
+    parts = ["(" * (num_tips - 1), "t0"]
+    if with_comments:
+        parts.append("[&comment]")
+    for i in range(1, num_tips):
+        parts.append(",t{}:1.0)".format(i))
+    parts.append(";")
+    return "".join(parts)
+
+def tree_parsing_fn_factory(tree_str, fast_tree_parsing):
+    def f():
+        dendropy.Tree.get(
+                data=tree_str,
+                schema="newick",
+                fast_tree_parsing=fast_tree_parsing)
+    return f
+
+def tree_writing_fn_factory(tree):
+    def f():
+        tree.as_string(schema="newick")
+    return f
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--num-tips",
+            type=int,
+            dest="num_tips",
+            default=[],
+            action="append",
+            help="""Number of tips in tree to be benchmarked; option may be specified multiple times for multiple trees. If not specified, default sizes will be used.""")
+    parser.add_argument("-r", "--repeat",
+            type=int,
+            default=3,
+            help="Repeat each operation this number of times (default=%(default)s).")
+    parser.add_argument("--delimited-output",
+            action="store_true",
+            default=False,
+            help="Output in tab-delimited instead of aligned format")
+    args = parser.parse_args()
+
+    messenger = messaging.ConsoleMessenger(name="-benchmark")
+
+    num_tips_list = args.num_tips if args.num_tips else DEFAULT_NUM_TIPS
+    result_descs = []
+    results = []
+
+    for num_tips in num_tips_list:
+        messenger.info("Processing: caterpillar tree with {} tips".format(num_tips))
+        tasks = []
+        for desc, with_comments, fast_tree_parsing in (
+                ("Read (fast)", False, True),
+                ("Read (full)", True, False),
+                ):
+            tree_str = caterpillar_tree_newick(num_tips, with_comments=with_comments)
+            tasks.append((desc, tree_parsing_fn_factory(tree_str, fast_tree_parsing)))
+        tree = dendropy.Tree.get(
+                data=caterpillar_tree_newick(num_tips),
+                schema="newick")
+        tasks.append(("Write", tree_writing_fn_factory(tree)))
+        for desc, fn in tasks:
+            t = timeit.Timer(fn)
+            result = min(t.repeat(args.repeat, 1))
+            messenger.info("{}: best time (of {} repetions): {:.10f} seconds".format(desc, args.repeat, result))
+            result_descs.append( (desc, str(num_tips)) )
+            results.append(result)
+
+    messenger.info("Benchmarking complete: all trees processed")
+
+    if args.delimited_output:
+        result_template = "{}\t{}\t{:.10f}\n"
+        header_template = "{}\t{}\t{}\n"
+    else:
+        max_len1 = max(len(r[0]) for r in result_descs)
+        max_len2 = max(len(r[1]) for r in result_descs + [("", "Tips")])
+        col1 = "{{:{}}}".format(max_len1)
+        col2 = "{{:{}}}".format(max_len2)
+        result_template = "[" + col1 + "]  " + col2 + "  {:.10f}\n"
+        header_template = col1 + "    " + col2 + "  {}\n"
+    sys.stdout.write(header_template.format("Operation", "Tips", "Seconds"))
+    for result, result_desc in zip(results, result_descs):
+        sys.stdout.write(result_template.format(result_desc[0], result_desc[1], result))
+
+if __name__ == "__main__":
+    main()
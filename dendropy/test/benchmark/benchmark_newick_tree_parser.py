@@ -42,13 +42,13 @@ TREE_FILENAMES = [
     "Smith_2001_angiosperms.newick",
         ]
 
-def tree_parsing_fn_factory(src_paths, verbose=False):
+def tree_parsing_fn_factory(src_paths, verbose=False, fast_tree_parsing=True):
     def f():
         trees = dendropy.TreeList()
         for src_path in src_paths:
             if verbose:
                 sys.stderr.write("  .. {}\n".format(src_path))
-            trees.read_from_path(src_path, "newick")
+            trees.read_from_path(src_path, "newick", fast_tree_parsing=fast_tree_parsing)
     return f
 
 def main():
@@ -63,6 +63,11 @@ def main():
             type=int,
             default=10,
             help="Repeat each tokenization this number of times (default=%(default)s).")
+    parser.add_argument("--no-fast-tree-parsing",
+            action="store_false",
+            dest="fast_tree_parsing",
+            default=True,
+            help="Process all tree statements using the full token-by-token parser.")
     parser.add_argument("--delimited_output",
             action="store_true",
             default=False,
@@ -93,7 +98,8 @@ def main():
 
     for src_path, src_desc in zip(src_paths, src_descs):
         messenger.info("Processing: '{}'".format(src_desc[1]))
-        t = timeit.Timer(tree_parsing_fn_factory([src_path]))
+        t = timeit.Timer(tree_parsing_fn_factory([src_path],
+            fast_tree_parsing=args.fast_tree_parsing))
         result = min(t.repeat(args.repeat, 1))
         messenger.info("Best time (of {} repetions): {:.10f} seconds".format(args.repeat, result))
         results.append(result)
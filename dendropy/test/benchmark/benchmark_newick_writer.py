@@ -0,0 +1,109 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+Benchmarking writing of tree collections in NEWICK and NEXUS formats.
+"""
+
+import sys
+import random
+import timeit
+import argparse
+try:
+    from StringIO import StringIO # Python 2 legacy support: StringIO in this module is the one needed (not io)
+except ImportError:
+    from io import StringIO # Python 3
+from dendropy.utility import messaging
+from dendropy.model import coalescent
+
+import dendropy
+
+def random_tree_list(num_taxa, num_trees, rng):
+    """
+    Returns a |TreeList| of ``num_trees`` coalescent trees over a namespace of
+    ``num_taxa`` taxa, with labels that need quoting in NEWICK.
+    """
+    taxon_namespace = dendropy.TaxonNamespace(
+            ["Taxon_{} sp.".format(i) for i in range(num_taxa)])
+    tree_list = dendropy.TreeList(taxon_namespace=taxon_namespace)
+    for i in range(num_trees):
+        tree_list.append(coalescent.pure_kingman_tree(
+            taxon_namespace=taxon_namespace,
+            rng=rng))
+    return tree_list
+
+def tree_writing_fn_factory(tree_list, schema, **kwargs):
+    def f():
+        tree_list.write(file=StringIO(), schema=schema, **kwargs)
+    return f
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-t", "--num-taxa",
+            type=int,
+            default=2000,
+            help="Number of taxa in each tree (default=%(default)s).")
+    parser.add_argument("-n", "--num-trees",
+            type=int,
+            default=100,
+            help="Number of trees written (default=%(default)s).")
+    parser.add_argument("-r", "--repeat",
+            type=int,
+            default=3,
+            help="Repeat each operation this number of times (default=%(default)s).")
+    parser.add_argument("--delimited-output",
+            action="store_true",
+            default=False,
+            help="Output in tab-delimited instead of aligned format")
+    args = parser.parse_args()
+
+    messenger = messaging.ConsoleMessenger(name="-benchmark")
+
+    messenger.info("Generating {} trees with {} taxa".format(args.num_trees, args.num_taxa))
+    tree_list = random_tree_list(args.num_taxa, args.num_trees, random.Random(1))
+
+    result_descs = []
+    results = []
+    for desc, schema, kwargs in (
+            ("NEWICK", "newick", {}),
+            ("NEXUS", "nexus", {}),
+            ("NEXUS (translate)", "nexus", {"translate_tree_taxa": True}),
+            ):
+        num_bytes = len(tree_list.as_string(schema=schema, **kwargs))
+        t = timeit.Timer(tree_writing_fn_factory(tree_list, schema, **kwargs))
+        result = min(t.repeat(args.repeat, 1))
+        messenger.info("{}: best time (of {} repetions): {:.10f} seconds".format(desc, args.repeat, result))
+        result_descs.append(desc)
+        results.append((result, args.num_trees / result, num_bytes / result / 1e6))
+
+    messenger.info("Benchmarking complete: all trees written")
+
+    if args.delimited_output:
+        result_template = "{}\t{:.10f}\t{:.1f}\t{:.2f}\n"
+        header_template = "{}\t{}\t{}\t{}\n"
+    else:
+        max_len = max(len(r) for r in result_descs)
+        col1 = "{{:{}}}".format(max_len)
+        result_template = "[" + col1 + "]  {:14.10f}  {:12.1f}  {:10.2f}\n"
+        header_template = col1 + "    {:>14}  {:>12}  {:>10}\n"
+    sys.stdout.write(header_template.format("Operation", "Seconds", "Trees/second", "MB/second"))
+    for result, result_desc in zip(results, result_descs):
+        sys.stdout.write(result_template.format(result_desc, *result))
+
+if __name__ == "__main__":
+    main()
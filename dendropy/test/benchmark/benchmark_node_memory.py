@@ -0,0 +1,124 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+Benchmarking memory used by the nodes, edges and bipartitions of trees.
+
+A large tree and a collection of smaller trees are read from NEWICK strings,
+and the memory allocated in the process (beyond that of the taxa, which are
+created beforehand) is reported per node; the memory allocated in encoding
+the bipartitions of the trees is reported per edge.
+"""
+
+import sys
+import random
+import argparse
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+from dendropy.utility import messaging
+
+import dendropy
+
+def random_newick(taxon_labels, rng):
+    """
+    Returns a NEWICK string of a random binary tree (with edge lengths) over
+    ``taxon_labels``.
+    """
+    subtrees = ["{}:{:.5f}".format(label, rng.random()) for label in taxon_labels]
+    while len(subtrees) > 2:
+        idx = rng.randrange(len(subtrees) - 1)
+        subtrees[idx:idx+2] = ["({},{}):{:.5f}".format(subtrees[idx], subtrees[idx+1], rng.random())]
+    return "({},{});".format(*subtrees)
+
+def encode_bipartitions(trees):
+    return [tree.encode_bipartitions() for tree in trees]
+
+def measure(fn, *args, **kwargs):
+    """
+    Calls ``fn`` with ``args`` and ``kwargs``, returning its result and the
+    memory (in bytes) allocated, and still in use, in the process.
+    """
+    tracemalloc.start()
+    result = fn(*args, **kwargs)
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, allocated
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-l", "--num-leaves",
+            type=int,
+            default=100000,
+            help="Number of leaves of the large tree (default=%(default)s).")
+    parser.add_argument("-n", "--num-trees",
+            type=int,
+            default=10000,
+            help="Number of trees in the collection (default=%(default)s).")
+    parser.add_argument("-t", "--num-taxa",
+            type=int,
+            default=50,
+            help="Number of taxa of the trees in the collection (default=%(default)s).")
+    parser.add_argument("--delimited-output",
+            action="store_true",
+            default=False,
+            help="Output in tab-delimited instead of aligned format")
+    args = parser.parse_args()
+
+    messenger = messaging.ConsoleMessenger(name="-benchmark")
+    if tracemalloc is None:
+        messenger.error("Module 'tracemalloc' not available (Python 3.4 or later required)")
+        sys.exit(1)
+
+    rng = random.Random(1)
+    results = []
+    for description, num_leaves, num_trees in (
+            ("Large tree", args.num_leaves, 1),
+            ("Tree collection", args.num_taxa, args.num_trees),
+            ):
+        messenger.info("{}: {} trees of {} leaves".format(description, num_trees, num_leaves))
+        taxon_labels = ["T{}".format(i) for i in range(num_leaves)]
+        taxon_namespace = dendropy.TaxonNamespace(taxon_labels, label="taxa")
+        newick = "\n".join(random_newick(taxon_labels, rng) for i in range(num_trees))
+        trees, allocated = measure(dendropy.TreeList.get,
+                data=newick,
+                schema="newick",
+                rooting="force-rooted",
+                taxon_namespace=taxon_namespace)
+        num_nodes = sum(1 for tree in trees for nd in tree)
+        results.append((description, "node", num_nodes, allocated / num_nodes))
+        bipartitions, allocated = measure(encode_bipartitions, trees)
+        num_edges = sum(len(b) for b in bipartitions)
+        results.append((description, "bipartition", num_edges, allocated / num_edges))
+        del trees, bipartitions
+
+    messenger.info("Benchmarking complete")
+
+    if args.delimited_output:
+        result_template = "{}\t{}\t{}\t{:.1f}\n"
+        header_template = "{}\t{}\t{}\t{}\n"
+    else:
+        result_template = "{:16}  {:12}  {:>10}  {:>14.1f}\n"
+        header_template = "{:16}  {:12}  {:>10}  {:>14}\n"
+    sys.stdout.write(header_template.format("Data", "Object", "Count", "Bytes/object"))
+    for result in results:
+        sys.stdout.write(result_template.format(*result))
+
+if __name__ == "__main__":
+    main()
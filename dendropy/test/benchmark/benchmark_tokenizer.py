@@ -49,13 +49,13 @@ CHAR_FILENAMES = [
     "angiosperms.chars.nexus",
         ]
 
-def tokenizing_fn_factory(src_paths, verbose=False):
+def tokenizing_fn_factory(src_paths, buffer_size=None, verbose=False):
     def f():
         for src_path in src_paths:
             if verbose:
                 sys.stderr.write("  .. {}\n".format(src_path))
             src = open(src_path, "rU")
-            nt = nexusprocessing.NexusTokenizer(src)
+            nt = nexusprocessing.NexusTokenizer(src, buffer_size=buffer_size)
             for token in nt:
                 pass
     return f
@@ -79,6 +79,10 @@ def main():
             type=int,
             default=10,
             help="Repeat each tokenization this number of times (default=%(default)s).")
+    parser.add_argument("-b", "--buffer-size",
+            type=int,
+            default=None,
+            help="Number of characters read from the source stream at a time by the tokenizer (default: tokenizer default).")
     parser.add_argument("--delimited-output",
             action="store_true",
             default=False,
@@ -115,7 +119,7 @@ def main():
 
     for src_path, src_desc in zip(src_paths, src_descs):
         messenger.info("Processing: '{}'".format(src_desc[1]))
-        t = timeit.Timer(tokenizing_fn_factory([src_path]))
+        t = timeit.Timer(tokenizing_fn_factory([src_path], buffer_size=args.buffer_size))
         result = min(t.repeat(args.repeat, 1))
         messenger.info("Best time (of {} repetions): {:.10f} seconds".format(args.repeat, result))
         results.append(result)
@@ -0,0 +1,113 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+Benchmarking most-recent common ancestor (MRCA) queries on large trees.
+
+A coalescent tree is simulated, and the time taken to build the index used to
+answer MRCA queries is reported, along with the time taken per query for pairs
+and larger sets of taxa and nodes. Queries for pairs of nodes are also
+answered by comparing the paths from the nodes to the root, for reference.
+"""
+
+import sys
+import time
+import random
+import argparse
+from dendropy.utility import messaging
+from dendropy.model import coalescent
+
+import dendropy
+
+def path_mrca(node1, node2):
+    ancestors = set(node1.ancestor_iter(inclusive=True))
+    for nd in node2.ancestor_iter(inclusive=True):
+        if nd in ancestors:
+            return nd
+
+def time_queries(fn, queries):
+    start = time.time()
+    for query in queries:
+        fn(query)
+    return (time.time() - start) / len(queries)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-l", "--num-leaves",
+            type=int,
+            default=10000,
+            help="Number of leaves of the tree (default=%(default)s).")
+    parser.add_argument("-q", "--num-queries",
+            type=int,
+            default=2000,
+            help="Number of queries of each kind (default=%(default)s).")
+    parser.add_argument("-k", "--num-taxa",
+            type=int,
+            default=20,
+            help="Number of taxa per query of sets of taxa (default=%(default)s).")
+    parser.add_argument("--delimited-output",
+            action="store_true",
+            default=False,
+            help="Output in tab-delimited instead of aligned format")
+    args = parser.parse_args()
+
+    messenger = messaging.ConsoleMessenger(name="-benchmark")
+    messenger.info("Simulating tree of {} leaves".format(args.num_leaves))
+    taxon_namespace = dendropy.TaxonNamespace(
+            ["T{}".format(i) for i in range(args.num_leaves)],
+            label="taxa")
+    tree = coalescent.pure_kingman_tree(
+            taxon_namespace=taxon_namespace,
+            rng=random.Random(1))
+    rng = random.Random(1)
+    nodes = list(tree.preorder_node_iter())
+    taxa = list(taxon_namespace)
+    node_pairs = [rng.sample(nodes, 2) for i in range(args.num_queries)]
+    taxon_pairs = [rng.sample(taxa, 2) for i in range(args.num_queries)]
+    taxon_sets = [rng.sample(taxa, args.num_taxa) for i in range(args.num_queries)]
+
+    messenger.info("Timing: index construction")
+    start = time.time()
+    tree._get_lca_index()
+    build_time = time.time() - start
+
+    results = []
+    for description, fn, queries in (
+            ("mrca(nodes=) (pairs)", lambda q: tree.mrca(nodes=q), node_pairs),
+            ("root paths (pairs)", lambda q: path_mrca(q[0], q[1]), node_pairs),
+            ("mrca(taxa=) (pairs)", lambda q: tree.mrca(taxa=q), taxon_pairs),
+            ("mrca(taxa=) (k={})".format(args.num_taxa), lambda q: tree.mrca(taxa=q), taxon_sets),
+            ):
+        messenger.info("Timing: {}".format(description))
+        results.append((description, time_queries(fn, queries) * 1e6))
+
+    messenger.info("Benchmarking complete")
+
+    if args.delimited_output:
+        result_template = "{}\t{:.2f}\n"
+        header_template = "{}\t{}\n"
+    else:
+        result_template = "{:24}  {:16.2f}\n"
+        header_template = "{:24}  {:>16}\n"
+    sys.stdout.write("Index construction (s): {:.4f}\n".format(build_time))
+    sys.stdout.write(header_template.format("Query", "Time/query (us)"))
+    for result in results:
+        sys.stdout.write(result_template.format(*result))
+
+if __name__ == "__main__":
+    main()
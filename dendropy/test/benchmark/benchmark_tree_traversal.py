@@ -0,0 +1,109 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+Benchmarking repeated traversals of a large tree.
+
+A coalescent tree is simulated, and the time taken by each traversal (or
+computation based on traversals) is reported, both when traversing the nodes
+themselves (as with the first traversal of the tree, or one following a change
+to its structure) and when the traversal has been cached (as with any further
+traversal of an unchanged tree).
+"""
+
+import sys
+import time
+import random
+import argparse
+from dendropy.utility import messaging
+from dendropy.model import coalescent
+
+import dendropy
+
+def time_fn(fn, repeats, setup_fn=None):
+    elapsed = 0.0
+    for i in range(repeats):
+        if setup_fn is not None:
+            setup_fn()
+        start = time.time()
+        fn()
+        elapsed += time.time() - start
+    return elapsed / repeats
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-l", "--num-leaves",
+            type=int,
+            default=20000,
+            help="Number of leaves of the tree (default=%(default)s).")
+    parser.add_argument("-r", "--repeats",
+            type=int,
+            default=10,
+            help="Number of times each traversal is repeated (default=%(default)s).")
+    parser.add_argument("--delimited-output",
+            action="store_true",
+            default=False,
+            help="Output in tab-delimited instead of aligned format")
+    args = parser.parse_args()
+
+    messenger = messaging.ConsoleMessenger(name="-benchmark")
+    messenger.info("Simulating tree of {} leaves".format(args.num_leaves))
+    taxon_namespace = dendropy.TaxonNamespace(
+            ["T{}".format(i) for i in range(args.num_leaves)],
+            label="taxa")
+    tree = coalescent.pure_kingman_tree(
+            taxon_namespace=taxon_namespace,
+            rng=random.Random(1))
+
+    # changing the structure of the tree (here, of a node in another tree)
+    # invalidates the cached traversals
+    other_node = dendropy.Node()
+    def invalidate():
+        other_node.new_child()
+        other_node.clear_child_nodes()
+
+    traversals = (
+        ("preorder_node_iter()", lambda: [nd for nd in tree.preorder_node_iter()]),
+        ("postorder_node_iter()", lambda: [nd for nd in tree.postorder_node_iter()]),
+        ("leaf_node_iter()", lambda: [nd for nd in tree.leaf_node_iter()]),
+        ("postorder_edge_iter()", lambda: [e for e in tree.postorder_edge_iter()]),
+        ("calc_node_ages()", lambda: tree.calc_node_ages()),
+        ("length()", lambda: tree.length()),
+        )
+    results = []
+    for description, fn in traversals:
+        messenger.info("Timing: {}".format(description))
+        uncached_time = time_fn(fn, args.repeats, setup_fn=invalidate)
+        fn()
+        cached_time = time_fn(fn, args.repeats)
+        results.append((description, uncached_time, cached_time, uncached_time / cached_time))
+
+    messenger.info("Benchmarking complete")
+
+    if args.delimited_output:
+        result_template = "{}\t{:.4f}\t{:.4f}\t{:.1f}\n"
+        header_template = "{}\t{}\t{}\t{}\n"
+    else:
+        result_template = "{:24}  {:10.4f}  {:10.4f}  {:8.1f}\n"
+        header_template = "{:24}  {:>10}  {:>10}  {:>8}\n"
+    sys.stdout.write(header_template.format("Traversal", "Uncached", "Cached", "Speed-up"))
+    for result in results:
+        sys.stdout.write(result_template.format(*result))
+
+if __name__ == "__main__":
+    main()
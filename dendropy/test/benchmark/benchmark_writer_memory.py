@@ -0,0 +1,158 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+Benchmarking memory used when writing data sets of increasing size in NEXUS
+and NeXML formats.
+
+For each size, a data set of a DNA character matrix and a collection of trees
+is written to a file, and the peak memory allocated while writing (beyond the
+memory of the data set itself) is reported. As the writers write to the
+stream as they go, this stays flat as the size of the data set grows.
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import tempfile
+import argparse
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+from dendropy.utility import messaging
+from dendropy.model import coalescent
+
+import dendropy
+
+# approximate number of bytes of a NeXML document per character state (marked
+# up as cells) and per node (with its edge) of a tree
+NEXML_BYTES_PER_STATE = 55
+NEXML_BYTES_PER_NODE = 140
+
+def random_data_set(size, num_taxa, num_trees, rng):
+    """
+    Returns a |DataSet| with a DNA character matrix and a collection of
+    ``num_trees`` coalescent trees over ``num_taxa`` taxa, with the number of
+    characters chosen so that the data set written in NeXML format is about
+    ``size`` bytes.
+    """
+    taxon_namespace = dendropy.TaxonNamespace(
+            ["Taxon_{}".format(i) for i in range(num_taxa)],
+            label="taxa")
+    data_set = dendropy.DataSet()
+    data_set.attach_taxon_namespace(taxon_namespace)
+    tree_list = data_set.new_tree_list(taxon_namespace=taxon_namespace)
+    for i in range(num_trees):
+        tree_list.append(coalescent.pure_kingman_tree(
+            taxon_namespace=taxon_namespace,
+            rng=rng))
+    tree_size = num_trees * (2 * num_taxa - 1) * NEXML_BYTES_PER_NODE
+    nchar = max(1, (size - tree_size) // (num_taxa * NEXML_BYTES_PER_STATE))
+    char_matrix = data_set.new_char_matrix(
+            char_matrix_type="dna",
+            taxon_namespace=taxon_namespace)
+    states = [char_matrix.default_state_alphabet[s] for s in "ACGT"]
+    for taxon in taxon_namespace:
+        char_matrix.new_sequence(taxon, [rng.choice(states) for i in range(nchar)])
+    return data_set
+
+def measure_write(data_set, path, schema):
+    """
+    Writes ``data_set`` to ``path`` in ``schema``, returning the time taken
+    and the peak memory (in bytes) allocated in the process.
+    """
+    if tracemalloc is not None:
+        tracemalloc.start()
+    start = time.time()
+    data_set.write(path=path, schema=schema)
+    elapsed = time.time() - start
+    if tracemalloc is not None:
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    else:
+        peak_memory = None
+    return elapsed, peak_memory
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-s", "--size",
+            type=int,
+            default=1024,
+            help="Approximate size (in MB, as a NeXML document) of the largest data set written (default=%(default)s).")
+    parser.add_argument("--num-sizes",
+            type=int,
+            default=4,
+            help="Number of data set sizes, halving from the largest one (default=%(default)s).")
+    parser.add_argument("-t", "--num-taxa",
+            type=int,
+            default=100,
+            help="Number of taxa (default=%(default)s).")
+    parser.add_argument("-n", "--num-trees",
+            type=int,
+            default=100,
+            help="Number of trees (default=%(default)s).")
+    parser.add_argument("--delimited-output",
+            action="store_true",
+            default=False,
+            help="Output in tab-delimited instead of aligned format")
+    args = parser.parse_args()
+
+    messenger = messaging.ConsoleMessenger(name="-benchmark")
+    if tracemalloc is None:
+        messenger.warning("Module 'tracemalloc' not available (Python 3.4 or later required): memory will not be measured")
+
+    rng = random.Random(1)
+    temp_dir = tempfile.mkdtemp()
+    results = []
+    try:
+        for size_idx in range(args.num_sizes - 1, -1, -1):
+            size = (args.size << 20) >> size_idx
+            messenger.info("Generating data set of about {} MB".format(size >> 20))
+            data_set = random_data_set(size, args.num_taxa, args.num_trees, rng)
+            for schema in ("nexus", "nexml"):
+                path = os.path.join(temp_dir, "data.{}".format(schema))
+                elapsed, peak_memory = measure_write(data_set, path, schema)
+                num_bytes = os.path.getsize(path)
+                os.remove(path)
+                messenger.info("{}: {:.1f} MB written in {:.2f} seconds".format(schema.upper(), num_bytes / 1e6, elapsed))
+                results.append((
+                    schema.upper(),
+                    num_bytes / 1e6,
+                    elapsed,
+                    float("nan") if peak_memory is None else peak_memory / 1e6))
+            del data_set
+    finally:
+        shutil.rmtree(temp_dir)
+
+    messenger.info("Benchmarking complete: all data sets written")
+
+    if args.delimited_output:
+        result_template = "{}\t{:.1f}\t{:.2f}\t{:.2f}\n"
+        header_template = "{}\t{}\t{}\t{}\n"
+    else:
+        result_template = "[{:6}]  {:12.1f}  {:10.2f}  {:16.2f}\n"
+        header_template = "{:8}  {:>12}  {:>10}  {:>16}\n"
+    sys.stdout.write(header_template.format("Schema", "MB written", "Seconds", "Peak memory (MB)"))
+    for result in results:
+        sys.stdout.write(result_template.format(*result))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+Tests for the SumTrees application.
+"""
+
+import os
+import sys
+import subprocess
+import unittest
+import dendropy
+from dendropy.test.support import dendropytest
+from dendropy.test.support import pathmap
+
+class SumTreesTestCase(dendropytest.ExtendedTestCase):
+
+    def run_sumtrees(self, args):
+        env = dict(os.environ)
+        package_dir = os.path.dirname(os.path.dirname(os.path.abspath(dendropy.__file__)))
+        env["PYTHONPATH"] = os.pathsep.join(p for p in (package_dir, env.get("PYTHONPATH")) if p)
+        p = subprocess.Popen(
+                [sys.executable, pathmap.application_source_path(os.path.join("sumtrees", "sumtrees.py"))] + args,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env=env)
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 0, stderr.decode("utf-8"))
+        # exclude the timing details
+        return [line for line in stdout.decode("utf-8").split("\n")
+                if not line.startswith(("Started at:", "Ended at:", "Total elapsed time:", "Actual analysis time:"))]
+
+    def test_serial_and_parallel_with_burnin(self):
+        args = [
+                "-q",
+                "-b", "7",
+                "--summary-target", "mcct",
+                "--edges", "mean-length",
+                "--no-annotations",
+                pathmap.tree_source_path("feb032009.trees.newick"),
+                ]
+        serial = self.run_sumtrees(["-m", "1"] + args)
+        parallel = self.run_sumtrees(["-m", "4"] + args)
+        self.assertEqual(serial, parallel)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,264 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+Tests for reading and writing the DendroPy binary format.
+"""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import dendropy
+from dendropy.dataio import binaryprocessing
+from dendropy.test.support import dendropytest
+from dendropy.test.support import pathmap
+
+class BinaryFormatTestCase(dendropytest.ExtendedTestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def round_trip(self, data_object, **kwargs):
+        path = os.path.join(self.tempdir, "data.dpy")
+        data_object.write(path=path, schema="dendropy-binary")
+        return data_object.__class__.get(path=path, schema="dendropy-binary", **kwargs)
+
+    def tree_strings(self, trees):
+        return [t.as_string(schema="newick", suppress_rooting=False) for t in trees]
+
+    def tree_array_splits(self, tree_array):
+        # splits as the pairs of labels of the taxa on either side, so as
+        # to be independent of the order of the taxa
+        taxa = list(tree_array.taxon_namespace)
+        trees = []
+        for split_bitmasks, edge_lengths, leafset_bitmask in zip(
+                tree_array._tree_split_bitmasks,
+                tree_array._tree_edge_lengths,
+                tree_array._tree_leafset_bitmasks):
+            splits = set()
+            for split_bitmask, edge_length in zip(split_bitmasks, edge_lengths):
+                sides = []
+                for bitmask in (split_bitmask, leafset_bitmask & ~split_bitmask):
+                    sides.append(frozenset(t.label for idx, t in enumerate(taxa) if bitmask & (1 << idx)))
+                splits.add((frozenset(sides), edge_length))
+            trees.append(splits)
+        return trees
+
+    def annotation_values(self, annotated):
+        return sorted((a.name, str(a.value), a.datatype_hint, a.is_attribute == False and a.annotate_as_reference)
+                for a in annotated.annotations)
+
+    def test_tree_list_round_trip(self):
+        for filename in (
+                "dendropy-test-trees-multifurcating-rooted-annotated.nexml",
+                "dendropy-test-trees-n33-unrooted-annotated-x10a.nexml",
+                "pythonidae.reference-trees.nexus",
+                ):
+            expected = dendropy.TreeList.get(
+                    path=pathmap.tree_source_path(filename),
+                    schema="nexml" if filename.endswith("nexml") else "nexus")
+            trees = self.round_trip(expected)
+            self.assertEqual(self.tree_strings(trees), self.tree_strings(expected))
+            self.assertEqual([t.label for t in trees.taxon_namespace],
+                    [t.label for t in expected.taxon_namespace])
+            for tree, expected_tree in zip(trees, expected):
+                self.assertEqual(tree.label, expected_tree.label)
+                self.assertEqual(tree.is_rooted, expected_tree.is_rooted)
+                self.assertEqual(self.annotation_values(tree), self.annotation_values(expected_tree))
+                for node, expected_node in zip(tree.preorder_node_iter(), expected_tree.preorder_node_iter()):
+                    self.assertEqual(node.label, expected_node.label)
+                    self.assertEqual(self.annotation_values(node), self.annotation_values(expected_node))
+                    self.assertEqual(self.annotation_values(node.edge), self.annotation_values(expected_node.edge))
+
+    def test_list_annotation_round_trip(self):
+        expected = dendropy.Tree.get(
+                data="[&R] ((a:1[&height=0.5,hpd={0.5,1.5}],b:2[&hpd={0.25,2}]):1[&set={x,y,{1,2}}],c:2);",
+                schema="newick")
+        expected.seed_node.annotations.add_new(name="pair", value=(1, 2.5, None))
+        tree = self.round_trip(expected)
+        for node, expected_node in zip(tree.preorder_node_iter(), expected.preorder_node_iter()):
+            values = [(a.name, a.value, type(a.value)) for a in node.annotations]
+            expected_values = [(a.name, a.value, type(a.value)) for a in expected_node.annotations]
+            self.assertEqual(values, expected_values)
+        self.assertEqual(tree.seed_node.annotations.get_value("pair"), (1, 2.5, None))
+        leaf = tree.find_node_with_taxon_label("a")
+        self.assertEqual(leaf.annotations.get_value("hpd"), ["0.5", "1.5"])
+
+    def test_unrepresentable_annotation_value(self):
+        tree = dendropy.Tree.get(data="((a,b),c);", schema="newick")
+        for value in ({"x": 1}, tree.taxon_namespace[0]):
+            tree.seed_node.annotations.clear()
+            tree.seed_node.annotations.add_new(name="x", value=value)
+            with self.assertRaises(ValueError):
+                tree.write(file=io.BytesIO(), schema="dendropy-binary")
+
+    def test_char_matrix_round_trip(self):
+        for filename, char_matrix_type in (
+                ("standard-test-chars-dna.basic.nexus", dendropy.DnaCharacterMatrix),
+                ("standard-test-chars-protein.basic.nexus", dendropy.ProteinCharacterMatrix),
+                ("standard-test-chars-generic.basic.nexus", dendropy.StandardCharacterMatrix),
+                ("angiosperms.chars.nexus", dendropy.StandardCharacterMatrix),
+                ("pythonidae_continuous.chars.nexml", dendropy.ContinuousCharacterMatrix),
+                ):
+            expected = char_matrix_type.get(
+                    path=pathmap.char_source_path(filename),
+                    schema="nexml" if filename.endswith("nexml") else "nexus")
+            char_matrix = self.round_trip(expected)
+            self.assertEqual(type(char_matrix), type(expected))
+            self.assertEqual([t.label for t in char_matrix],
+                    [t.label for t in expected])
+            for taxon, expected_taxon in zip(char_matrix, expected):
+                if char_matrix_type is dendropy.ContinuousCharacterMatrix:
+                    self.assertEqual(list(char_matrix[taxon].values()), list(expected[expected_taxon].values()))
+                else:
+                    self.assertEqual(char_matrix[taxon].symbols_as_string(),
+                            expected[expected_taxon].symbols_as_string())
+                    self.assertEqual(
+                            [s.index for s in char_matrix[taxon]],
+                            [s.index for s in expected[expected_taxon]])
+
+    def test_dataset_round_trip(self):
+        expected = dendropy.DataSet.get(
+                path=pathmap.mixed_source_path("reference_single_taxonset_dataset.nex"),
+                schema="nexus")
+        expected.annotations.add_new("source", "test")
+        expected.annotations.add_new("count", 2**70)
+        expected.annotations.add_new("ratio", 0.25)
+        expected.taxon_namespaces[0][0].annotations.add_new("flag", True)
+        dataset = self.round_trip(expected)
+        self.assertEqual(len(dataset.taxon_namespaces), len(expected.taxon_namespaces))
+        self.assertEqual(len(dataset.tree_lists), len(expected.tree_lists))
+        self.assertEqual(len(dataset.char_matrices), len(expected.char_matrices))
+        for tree_list, expected_tree_list in zip(dataset.tree_lists, expected.tree_lists):
+            self.assertIs(tree_list.taxon_namespace, dataset.taxon_namespaces[0])
+            self.assertEqual(tree_list.label, expected_tree_list.label)
+            self.assertEqual(self.tree_strings(tree_list), self.tree_strings(expected_tree_list))
+        for char_matrix, expected_char_matrix in zip(dataset.char_matrices, expected.char_matrices):
+            self.assertIs(char_matrix.taxon_namespace, dataset.taxon_namespaces[0])
+            self.assertEqual(char_matrix.label, expected_char_matrix.label)
+            self.assertEqual(char_matrix.as_string("fasta"), expected_char_matrix.as_string("fasta"))
+        self.assertEqual(self.annotation_values(dataset), self.annotation_values(expected))
+        self.assertEqual(self.annotation_values(dataset.taxon_namespaces[0][0]),
+                self.annotation_values(expected.taxon_namespaces[0][0]))
+        counts = [a.value for a in dataset.annotations if a.name == "count"]
+        self.assertEqual(counts, [2**70])
+        dataset = self.round_trip(expected, suppress_annotations=True)
+        self.assertFalse(dataset.has_annotations)
+
+    def test_tree_array_round_trip(self):
+        trees = dendropy.TreeList.get(
+                path=pathmap.tree_source_path("pythonidae.reference-trees.nexus"),
+                schema="nexus")
+        expected = dendropy.TreeArray.from_tree_list(trees)
+        path = os.path.join(self.tempdir, "trees.dpy")
+        expected.write(path=path, schema="dendropy-binary")
+        # taxa are read in a different order
+        taxon_namespace = dendropy.TaxonNamespace([t.label for t in reversed(trees.taxon_namespace)])
+        tree_array = dendropy.TreeArray(taxon_namespace=taxon_namespace)
+        tree_array.read(path=path, schema="dendropy-binary")
+        self.assertEqual(len(tree_array), len(expected))
+        self.assertEqual(tree_array._tree_weights, expected._tree_weights)
+        self.assertEqual(self.tree_array_splits(tree_array), self.tree_array_splits(expected))
+        tree_array = dendropy.TreeArray(taxon_namespace=dendropy.TaxonNamespace())
+        tree_array.read(path=path, schema="dendropy-binary", tree_offset=3)
+        self.assertEqual(tree_array._tree_split_bitmasks, expected._tree_split_bitmasks[3:])
+        # trees can also be read as a tree list
+        tree_list = dendropy.TreeList.get(path=path, schema="dendropy-binary")
+        self.assertEqual(self.tree_strings(tree_list),
+                self.tree_strings(expected.restore_tree(idx) for idx in range(len(expected))))
+        with self.assertRaises(NotImplementedError):
+            expected.write(path=path, schema="newick")
+
+    def test_yield_from_files(self):
+        expected = dendropy.TreeList.get(
+                path=pathmap.tree_source_path("pythonidae.reference-trees.nexus"),
+                schema="nexus")
+        paths = []
+        for idx in range(2):
+            path = os.path.join(self.tempdir, "trees{}.dpy".format(idx))
+            expected.write(path=path, schema="dendropy-binary")
+            paths.append(path)
+        taxon_namespace = dendropy.TaxonNamespace()
+        trees = list(dendropy.Tree.yield_from_files(
+                files=paths,
+                schema="dendropy-binary",
+                taxon_namespace=taxon_namespace,
+                tree_offset=2))
+        self.assertEqual(self.tree_strings(trees), self.tree_strings(expected[2:]) * 2)
+        for tree in trees:
+            self.assertIs(tree.taxon_namespace, taxon_namespace)
+        self.assertEqual(len(taxon_namespace), len(expected.taxon_namespace))
+        # split bitmask encodings are computed as by the NEWICK reader
+        for schema_paths, schema in (
+                (paths, "dendropy-binary"),
+                ([pathmap.tree_source_path("pythonidae.reference-trees.nexus")] * 2, "nexus"),
+                ):
+            tree_array = dendropy.TreeArray(taxon_namespace=taxon_namespace)
+            tree_array.read_from_files(files=schema_paths, schema=schema, tree_offset=2)
+            if schema == "nexus":
+                self.assertEqual(tree_array._tree_split_bitmasks, expected_split_bitmasks)
+                self.assertEqual(tree_array._tree_edge_lengths, expected_edge_lengths)
+            expected_split_bitmasks = tree_array._tree_split_bitmasks
+            expected_edge_lengths = tree_array._tree_edge_lengths
+
+    def test_streams(self):
+        expected = dendropy.TreeList.get(
+                path=pathmap.tree_source_path("pythonidae.reference-trees.nexus"),
+                schema="nexus")
+        dest = io.BytesIO()
+        expected.write(file=dest, schema="dendropy-binary")
+        data = dest.getvalue()
+        self.assertTrue(data.startswith(binaryprocessing.SIGNATURE))
+        trees = dendropy.TreeList.get(file=io.BytesIO(data), schema="dendropy-binary")
+        self.assertEqual(self.tree_strings(trees), self.tree_strings(expected))
+        with self.assertRaises(binaryprocessing.BinaryFormatError):
+            dendropy.TreeList.get(file=io.BytesIO(data[:len(data) // 2]), schema="dendropy-binary")
+        with self.assertRaises(binaryprocessing.BinaryFormatError):
+            dendropy.TreeList.get(file=io.BytesIO(b"(a,b);"), schema="dendropy-binary")
+        with self.assertRaises(binaryprocessing.BinaryFormatError):
+            dendropy.TreeList.get(file=io.BytesIO(b""), schema="dendropy-binary")
+
+    def test_tree_stream_writer(self):
+        path = pathmap.tree_source_path("pythonidae.reference-trees.nexus")
+        expected = dendropy.TreeList.get(path=path, schema="nexus")
+        taxon_namespace = dendropy.TaxonNamespace()
+        dest = io.BytesIO()
+        # taxa are added to the namespace as the trees are yielded
+        with dendropy.Tree.get_tree_stream_writer(dest, "dendropy-binary", taxon_namespace=taxon_namespace) as writer:
+            writer.write_trees(dendropy.Tree.yield_from_files([path], "nexus", taxon_namespace=taxon_namespace))
+        self.assertEqual(writer.num_trees_written, len(expected))
+        trees = dendropy.TreeList.get(file=io.BytesIO(dest.getvalue()), schema="dendropy-binary")
+        self.assertEqual(self.tree_strings(trees), self.tree_strings(expected))
+        self.assertEqual([t.label for t in trees.taxon_namespace], [t.label for t in taxon_namespace])
+        tree_array = dendropy.TreeArray.from_tree_list(expected)
+        dest = io.BytesIO()
+        with dendropy.Tree.get_tree_stream_writer(dest, "dendropy-binary") as writer:
+            writer.write_tree_array(tree_array)
+        trees = dendropy.TreeList.get(file=io.BytesIO(dest.getvalue()), schema="dendropy-binary")
+        self.assertEqual(len(trees), len(expected))
+        for tree_idx, tree in enumerate(trees):
+            self.assertEqual(tree.as_string(schema="newick"),
+                    tree_array.restore_tree(tree_idx).as_string(schema="newick"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+Tests for reading and writing of compressed files.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import dendropy
+from dendropy.dataio import treeindex
+from dendropy.utility import filesys
+from dendropy.test.support import dendropytest
+from dendropy.test.support import pathmap
+
+if filesys.lzma is None:
+    COMPRESSION_FORMATS = ("gzip", "bz2")
+else:
+    COMPRESSION_FORMATS = ("gzip", "bz2", "xz")
+
+class CompressedFileTestCase(dendropytest.ExtendedTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.trees = dendropy.TreeList.get(
+                path=pathmap.tree_source_path("pythonidae.reference-trees.nexus"),
+                schema="nexus")
+        cls.expected = cls.tree_strings(cls.trees)
+
+    @staticmethod
+    def tree_strings(trees):
+        return [t.as_string(schema="newick", suppress_rooting=False) for t in trees]
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def write_trees(self, schema, compression):
+        path = os.path.join(self.tempdir, "trees.{}.{}".format(schema, compression))
+        self.trees.write(path=path, schema=schema, compression=compression)
+        return path
+
+    def test_compression_detected(self):
+        for compression in COMPRESSION_FORMATS:
+            path = self.write_trees("nexus", compression)
+            self.assertEqual(filesys.get_path_compression(path), compression)
+        self.assertIs(filesys.get_path_compression(pathmap.tree_source_path("pythonidae.reference-trees.nexus")), None)
+
+    def test_get_from_path(self):
+        for schema in ("nexus", "newick", "nexml", "dendropy-binary"):
+            expected = self.tree_strings(dendropy.TreeList.get(
+                    path=self.write_trees(schema, None),
+                    schema=schema))
+            for compression in COMPRESSION_FORMATS:
+                path = self.write_trees(schema, compression)
+                trees = dendropy.TreeList.get(path=path, schema=schema)
+                self.assertEqual(self.tree_strings(trees), expected)
+
+    def test_read_from_path(self):
+        for compression in COMPRESSION_FORMATS:
+            path = self.write_trees("nexus", compression)
+            trees = dendropy.TreeList()
+            trees.read(path=path, schema="nexus")
+            trees.read(path=path, schema="nexus")
+            self.assertEqual(self.tree_strings(trees), self.expected * 2)
+
+    def test_yield_from_files(self):
+        for schema in ("nexus", "newick", "dendropy-binary"):
+            paths = [self.write_trees(schema, compression) for compression in COMPRESSION_FORMATS]
+            for read_ahead in (False, True):
+                trees = dendropy.Tree.yield_from_files(paths, schema, read_ahead=read_ahead)
+                self.assertEqual(self.tree_strings(trees), self.expected * len(paths))
+
+    def test_sequences(self):
+        char_matrix = dendropy.DnaCharacterMatrix.get(
+                path=pathmap.char_source_path("standard-test-chars-dna.fasta"),
+                schema="fasta")
+        expected = char_matrix.as_string(schema="fasta")
+        for compression in COMPRESSION_FORMATS:
+            path = os.path.join(self.tempdir, "chars.fasta.{}".format(compression))
+            char_matrix.write(path=path, schema="fasta", compression=compression)
+            self.assertEqual(dendropy.DnaCharacterMatrix.get(path=path, schema="fasta").as_string(schema="fasta"), expected)
+            self.assertEqual(
+                    [label for label, sequence in dendropy.DnaCharacterMatrix.yield_sequences_from_files([path], "fasta")],
+                    [taxon.label for taxon in char_matrix])
+
+    def test_unsupported_compression(self):
+        with self.assertRaises(ValueError):
+            self.trees.write(path=os.path.join(self.tempdir, "trees.nex"), schema="nexus", compression="zip")
+
+    @unittest.skipIf(not hasattr(os, "mkfifo"), "named pipes not supported")
+    def test_get_from_pipe(self):
+        for compression in (None,) + COMPRESSION_FORMATS:
+            path = self.write_trees("nexus", compression)
+            with open(path, "rb") as src:
+                payload = src.read()
+            fifo_path = os.path.join(self.tempdir, "pipe")
+            os.mkfifo(fifo_path)
+            def write_pipe():
+                with open(fifo_path, "wb") as dest:
+                    dest.write(payload)
+            writer = threading.Thread(target=write_pipe)
+            writer.start()
+            try:
+                trees = dendropy.TreeList.get(path=fifo_path, schema="nexus")
+            finally:
+                writer.join()
+                os.remove(fifo_path)
+            self.assertEqual(self.tree_strings(trees), self.expected)
+
+    def test_index_compressed_file(self):
+        path = self.write_trees("nexus", "gzip")
+        with self.assertRaises(ValueError):
+            treeindex.TreeFileIndex.build(path)
+
+if __name__ == "__main__":
+    unittest.main()
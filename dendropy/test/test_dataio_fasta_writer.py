@@ -74,6 +74,28 @@ class FastaWriterCharactersTestCase(
                 d2 = matrix_type.get_from_string(s, "fasta")
                 self.verify_char_matrix(d2, src_matrix_checker_type)
 
+    def test_wrap_by_states(self):
+        for src_filename, matrix_type in (
+                ("apternodus.chars.nexus", dendropy.StandardCharacterMatrix),
+                ("standard-test-chars-continuous.mesquite.nexus", dendropy.ContinuousCharacterMatrix),
+                ):
+            char_matrix = matrix_type.get(
+                    path=pathmap.char_source_path(src_filename),
+                    schema="nexus")
+            for wrap_width in (3, 70):
+                # each state is written as a unit, however many characters
+                # its symbol is
+                expected = []
+                for taxon in char_matrix:
+                    expected.append(">{}\n".format(taxon.label))
+                    for idx, state in enumerate(char_matrix[taxon]):
+                        if idx > 0 and idx % wrap_width == 0:
+                            expected.append("\n")
+                        expected.append(str(state))
+                    expected.append("\n\n")
+                s = char_matrix.as_string(schema="fasta", wrap_width=wrap_width)
+                self.assertEqual(s, "".join(expected))
+
 if __name__ == "__main__":
     unittest.main()
 
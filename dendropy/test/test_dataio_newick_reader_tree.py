@@ -599,6 +599,54 @@ class CommentMetaDataTests(dendropytest.ExtendedTestCase):
         for idx, nd in enumerate(tree.postorder_node_iter()):
             self.assertEqual(nd.annotations.values_as_dict(), expected[idx])
 
+    def test_deferred_metadata(self):
+        for s in (self.figtree_metadata_str, self.nhx_metadata_str):
+            tree = dendropy.Tree.get_from_string(
+                    s,
+                    "newick",
+                    suppress_internal_node_taxa=True,
+                    suppress_leaf_node_taxa=True,
+                    extract_comment_metadata=True,
+                    defer_comment_metadata=True)
+            for nd in tree:
+                self.assertFalse(hasattr(nd, "_annotations"))
+            tree2 = tree.clone(depth=2)
+            self.check_results(tree)
+            self.check_results(tree2)
+
+    def test_deferred_incomplete_metadata(self):
+        s = """(A[&region=Asia][cryptic],B[&&]);"""
+        tree = dendropy.Tree.get_from_string(
+                s,
+                "newick",
+                defer_comment_metadata=True)
+        a, b = tree.leaf_nodes()
+        self.assertEqual(a.comments, ["cryptic"])
+        self.assertTrue(a.has_annotations)
+        self.assertEqual(a.annotations.values_as_dict(), {'region': 'Asia'})
+        self.assertFalse(b.has_annotations)
+        self.assertEqual(b.comments, ["&&"])
+
+    def test_metadata_attributes(self):
+        s = """([&height=1.5,rate=0.1,height_95%_HPD={1.0,2.0}]A,B[&rate=0.2,other=x])[&height=3];"""
+        for extract_comment_metadata in (True, False):
+            tree = dendropy.Tree.get_from_string(
+                    s,
+                    "newick",
+                    extract_comment_metadata=extract_comment_metadata,
+                    comment_metadata_attributes={"height": float, "height_95%_HPD": float, "rate": None})
+            a, b = tree.leaf_nodes()
+            self.assertEqual(a.height, 1.5)
+            self.assertEqual(a.rate, "0.1")
+            self.assertEqual(getattr(a, "height_95%_HPD"), [1.0, 2.0])
+            self.assertFalse(hasattr(b, "height"))
+            self.assertEqual(b.rate, "0.2")
+            self.assertFalse(hasattr(b, "other"))
+            self.assertEqual(tree.seed_node.height, 3.0)
+            self.assertEqual(a.has_annotations, extract_comment_metadata)
+            if not extract_comment_metadata:
+                self.assertEqual(b.comments, ["&rate=0.2,other=x"])
+
 # class NewickTreeTaxonNamespaceTest(dendropytest.ExtendedTestCase):
 
 #     def test_namespace_passing(self):
@@ -707,6 +755,104 @@ class NewickTreeLabelParsingTest(dendropytest.ExtendedTestCase):
         for nd in tree:
             self.assertEqual(nd.edge.length, expected[nd.taxon.label])
 
+class NewickTreeFastParsingTest(dendropytest.ExtendedTestCase):
+
+    def get_tree_summaries(self, tree_statements, **kwargs):
+        trees = dendropy.TreeList.get(
+                data=tree_statements,
+                schema="newick",
+                **kwargs)
+        summaries = []
+        for tree in trees:
+            nodes = []
+            for nd in tree.preorder_node_iter():
+                nodes.append((
+                    nd.taxon.label if nd.taxon is not None else None,
+                    nd.label,
+                    nd.edge.length,
+                    nd.parent_node.taxon.label if nd.parent_node is not None and nd.parent_node.taxon is not None else None,
+                    len(nd._child_nodes),
+                    ))
+            summaries.append((tree.is_rooted, tree.label, nodes))
+        return [t.label for t in trees.taxon_namespace], summaries
+
+    def test_same_results_as_full_parser(self):
+        tree_statements = "\n".join([
+            "(a1:3.14e-2,(b2:1.2,(c3:0.5,d4:0.7)e5:111)f6:222)g7:333;",
+            "[&R] ((a_1, b_2)x, (c3:1, d4:2):3);",
+            "(a1,(b2,(c3,d4)));",
+            "((c3, a1), (d4, b2)) ;",
+            "((('a1', b2), c3), [note] d4);",
+            "(a1:1[&x=1],b2:2,(c3,d4):1e-3):0;",
+            "(A1,B2,(C3,D4)E5)F6;",
+            "((a1,b2),(c3,(d4,9)));",
+            "(a1\n,\n(b2\t,c3)\n)\n;",
+            "('a_1':1,('b 2','c(3)')'x y');",
+            "('a''1',(b2,'x,y'),'[c3]');",
+            ])
+        for kwargs in (
+                {},
+                {"suppress_internal_node_taxa": False},
+                {"suppress_leaf_node_taxa": True},
+                {"suppress_edge_lengths": True},
+                {"preserve_underscores": True},
+                ):
+            expected = self.get_tree_summaries(tree_statements, fast_tree_parsing=False, **kwargs)
+            observed = self.get_tree_summaries(tree_statements, fast_tree_parsing=True, **kwargs)
+            self.assertEqual(observed, expected)
+
+    def test_finish_node_fn_order(self):
+        s = "((a,b)x,(c,(d,e)y)z)r;"
+        for fast_tree_parsing in (True, False):
+            visited = []
+            tree = dendropy.Tree.get(
+                    data=s,
+                    schema="newick",
+                    suppress_internal_node_taxa=True,
+                    fast_tree_parsing=fast_tree_parsing,
+                    finish_node_fn=lambda nd: visited.append(nd.label if nd.taxon is None else nd.taxon.label))
+            self.assertEqual(visited, ["a", "b", "x", "c", "d", "e", "y", "z", "r"])
+
+    def test_invalid_trees(self):
+        invalid_tree_statements = (
+            "(a,(b,c))a",
+            "(a,(b,c)));",
+            "(a,(b,c)):;",
+            "(a,(b,c):x);",
+            "(a,(b,c);",
+            "(a,b)(c,d);",
+            "((a,b)c,(b,c)a)d;",
+            )
+        for s in invalid_tree_statements:
+            with self.assertRaises(error.DataParseError):
+                dendropy.Tree.get(data=s, schema="newick", fast_tree_parsing=True)
+
+class NewickTreeDeepTreeTest(dendropytest.ExtendedTestCase):
+
+    def test_tree_deeper_than_recursion_limit(self):
+        num_tips = sys.getrecursionlimit() + 1000
+        tree_statement = "{}t0{};".format(
+                "(" * (num_tips - 1),
+                "".join(",t{}:{})".format(i, i) for i in range(1, num_tips)))
+        for kwargs in (
+                {"data": tree_statement, "fast_tree_parsing": True},
+                {"data": tree_statement, "fast_tree_parsing": False},
+                {"data": tree_statement.replace("t0", "t0[&x=0]"), "fast_tree_parsing": True},
+                ):
+            tree = dendropy.Tree.get(schema="newick", **kwargs)
+            leaves = tree.leaf_nodes()
+            self.assertEqual(len(leaves), num_tips)
+            nd = tree.find_node_with_taxon_label("t0")
+            depth = 0
+            while nd.parent_node is not None:
+                nd = nd.parent_node
+                depth += 1
+            self.assertEqual(depth, num_tips - 1)
+            for nd in leaves:
+                i = int(nd.taxon.label[1:])
+                if i > 0:
+                    self.assertEqual(nd.edge.length, i)
+
 class NewickTreeReaderOffsetTreeTest(
         standard_file_test_trees.NewickTestTreesChecker,
         dendropytest.ExtendedTestCase):
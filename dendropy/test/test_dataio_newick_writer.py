@@ -20,10 +20,15 @@
 Tests for NEWICK writing.
 """
 
+import sys
 import collections
 import unittest
 import dendropy
 import re
+try:
+    from StringIO import StringIO # Python 2 legacy support: StringIO in this module is the one needed (not io)
+except ImportError:
+    from io import StringIO # Python 3
 from dendropy.test.support import pathmap
 from dendropy.test.support import standard_file_test_trees
 from dendropy.test.support import compare_and_validate
@@ -440,5 +445,52 @@ class NewickTreeWriterGeneralOptionsTests(
         for nd in tree2:
             self.assertEqual(nd.edge.length, 1000)
 
+class NewickTreeWriterTaxonTokenCacheTest(dendropytest.ExtendedTestCase):
+
+    def test_tokens_escaped_once_per_taxon(self):
+        trees = dendropy.TreeList.get(
+                data="(('a b','c_d'),('e''f',g));\n(('a b',('c_d','e''f')),g);",
+                schema="newick")
+        writer = dendropy.dataio.newickwriter.NewickWriter(suppress_rooting=True)
+        expected = [
+                "((a_b,'c_d'),('e''f',g));",
+                "((a_b,('c_d','e''f')),g);",
+                ]
+        for tree, expected_str in zip(trees, expected):
+            out = StringIO()
+            writer._write_tree(out, tree)
+            self.assertEqual(out.getvalue(), expected_str)
+        self.assertEqual(len(writer._taxon_tree_tag_cache), 4)
+
+    def test_taxon_and_node_labels(self):
+        tree = dendropy.Tree.get(data="((a,b)x,(c,d)y);", schema="newick",
+                suppress_internal_node_taxa=False)
+        tree.seed_node.label = "root label"
+        for nd in tree.leaf_node_iter():
+            nd.label = "leaf"
+        s = tree.as_string(schema="newick",
+                suppress_rooting=True,
+                suppress_leaf_node_labels=False,
+                suppress_internal_taxon_labels=True)
+        self.assertEqual(s.strip(), "((a_leaf,b_leaf),(c_leaf,d_leaf))root_label;")
+
+class NewickTreeWriterDeepTreeTest(dendropytest.ExtendedTestCase):
+
+    def test_tree_deeper_than_recursion_limit(self):
+        num_tips = sys.getrecursionlimit() + 1000
+        tree = dendropy.Tree()
+        nd = tree.seed_node
+        for i in range(num_tips - 1, 0, -1):
+            nd.new_child(
+                    taxon=tree.taxon_namespace.require_taxon(label="t{}".format(i)),
+                    edge_length=1)
+            nd = nd.new_child()
+        nd.taxon = tree.taxon_namespace.require_taxon(label="t0")
+        expected = "{}t0{};".format(
+                "".join("(t{}:1,".format(i) for i in range(num_tips - 1, 0, -1)),
+                ")" * (num_tips - 1))
+        s = tree.as_string(schema="newick", suppress_rooting=True)
+        self.assertEqual(s.strip(), expected)
+
 if __name__ == "__main__":
     unittest.main()
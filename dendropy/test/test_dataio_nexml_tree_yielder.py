@@ -0,0 +1,75 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+Tests for NEXML tree yielding.
+"""
+
+import unittest
+from xml.etree import ElementTree
+import dendropy
+from dendropy.test.support import dendropytest
+from dendropy.test.support import pathmap
+try:
+    from StringIO import StringIO # Python 2 legacy support: StringIO in this module is the one needed (not io)
+except ImportError:
+    from io import StringIO # Python 3
+
+class NexmlTreeYielderTestCase(dendropytest.ExtendedTestCase):
+
+    def get_tree_strings(self, trees):
+        return [t.as_string(schema="newick", suppress_rooting=False) for t in trees]
+
+    def test_yielded_trees_match_read_trees(self):
+        for filename in (
+                "dendropy-test-trees-n33-unrooted-annotated-x10a.nexml",
+                "dendropy-test-trees-multifurcating-rooted-annotated.nexml",
+                "pythonidae.annotated.nexml",
+                ):
+            path = pathmap.tree_source_path(filename)
+            expected = dendropy.TreeList.get(path=path, schema="nexml")
+            trees = list(dendropy.Tree.yield_from_files(
+                    files=[path],
+                    schema="nexml",
+                    taxon_namespace=expected.taxon_namespace))
+            self.assertEqual(self.get_tree_strings(trees), self.get_tree_strings(expected))
+            for tree, expected_tree in zip(trees, expected):
+                self.assertIs(tree.taxon_namespace, expected.taxon_namespace)
+                self.assertEqual(len(tree.annotations), len(expected_tree.annotations))
+
+    def test_trees_yielded_as_read(self):
+        tree_list = dendropy.TreeList.get(
+                path=pathmap.tree_source_path("dendropy-test-trees-n33-unrooted-x100a.nexml"),
+                schema="nexml")
+        data = tree_list.as_string(schema="nexml")
+        # truncated document: the trees preceding the truncation are still
+        # yielded before the error is raised
+        data = data[:data.index("<tree ", len(data) // 2)]
+        trees = []
+        with self.assertRaises(ElementTree.ParseError):
+            for tree in dendropy.Tree.yield_from_files(
+                    files=[StringIO(data)],
+                    schema="nexml"):
+                trees.append(tree)
+        self.assertTrue(len(trees) > 0)
+        self.assertEqual(
+                self.get_tree_strings(trees),
+                self.get_tree_strings(tree_list[:len(trees)]))
+
+if __name__ == "__main__":
+    unittest.main()
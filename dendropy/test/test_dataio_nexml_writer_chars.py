@@ -20,12 +20,17 @@
 Tests for NEXML tree list writing.
 """
 
+import random
 import unittest
 import dendropy
 from dendropy.test.support import dendropytest
 from dendropy.test.support import compare_and_validate
 from dendropy.test.support import pathmap
 from dendropy.test.support import standard_file_test_chars
+try:
+    from StringIO import StringIO # Python 2 legacy support: StringIO in this module is the one needed (not io)
+except ImportError:
+    from io import StringIO # Python 3
 
 class NexmlWriterCharactersTestCase(
         compare_and_validate.ValidateWriteable,
@@ -79,5 +84,72 @@ class NexmlWriterCharactersTestCase(
                 d2 = matrix_type.get_from_string(s, "nexml")
                 self.verify_char_matrix(d2, src_matrix_checker_type)
 
+class WriteRecordingStream(StringIO):
+
+    def __init__(self):
+        StringIO.__init__(self)
+        self.max_write_size = 0
+
+    def write(self, s):
+        self.max_write_size = max(self.max_write_size, len(s))
+        return StringIO.write(self, s)
+
+class NexmlWriterStreamingTestCase(dendropytest.ExtendedTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(1)
+        cls.sequences = dict(("t{}".format(i), "".join(rng.choice("ACGT-") for j in range(2000)))
+                for i in range(20))
+
+    def test_dna_round_trip(self):
+        char_matrix = dendropy.DnaCharacterMatrix.from_dict(self.sequences)
+        for markup_as_sequences in (False, True):
+            s = char_matrix.as_string(schema="nexml", markup_as_sequences=markup_as_sequences)
+            # character types are given by column
+            self.assertEqual(s.count("<char "), 2000)
+            char_matrix2 = dendropy.DnaCharacterMatrix.get(data=s, schema="nexml")
+            self.assertEqual(len(char_matrix2), len(self.sequences))
+            for taxon in char_matrix2:
+                self.assertEqual(char_matrix2[taxon].symbols_as_string(), self.sequences[taxon.label])
+            # nexml-read character types are kept
+            self.assertEqual(char_matrix2.as_string(schema="nexml", markup_as_sequences=markup_as_sequences), s)
+
+    def test_continuous_round_trip(self):
+        values = {"a": [1.5, -2.0, 3.25], "b": [4.0, 5.5, -6.75]}
+        char_matrix = dendropy.ContinuousCharacterMatrix.from_dict(values)
+        s = char_matrix.as_string(schema="nexml")
+        self.assertEqual(s.count("<char "), 3)
+        char_matrix2 = dendropy.ContinuousCharacterMatrix.get(data=s, schema="nexml")
+        for taxon in char_matrix2:
+            self.assertEqual(char_matrix2[taxon].values(), values[taxon.label])
+
+    def test_annotation_namespaces(self):
+        char_matrix = dendropy.DnaCharacterMatrix.from_dict({"a": "ACGT", "b": "ACGA"})
+        char_matrix[0].annotations.add_new(
+                name="source",
+                value="pipeline",
+                name_prefix="ex",
+                namespace="http://example.org/terms/")
+        s = char_matrix.as_string(schema="nexml")
+        self.assertLess(s.index('xmlns:ex="http://example.org/terms/"'), s.index("<otus"))
+        char_matrix2 = dendropy.DnaCharacterMatrix.get(data=s, schema="nexml")
+        self.assertEqual(char_matrix2[0].annotations.get_value("source"), "pipeline")
+
+    def test_bounded_writes(self):
+        data_set = dendropy.DataSet()
+        char_matrix = dendropy.DnaCharacterMatrix.from_dict(self.sequences)
+        data_set.add_char_matrix(char_matrix)
+        data_set.new_tree_list(taxon_namespace=char_matrix.taxon_namespace).read(
+                data="(({}),t0);".format(",".join(sorted(self.sequences)[1:])),
+                schema="newick")
+        expected = data_set.as_string(schema="nexml")
+        for markup_as_sequences in (False, True):
+            stream = WriteRecordingStream()
+            data_set.write(file=stream, schema="nexml", markup_as_sequences=markup_as_sequences)
+            self.assertLess(stream.max_write_size, 1000)
+            if not markup_as_sequences:
+                self.assertEqual(stream.getvalue(), expected)
+
 if __name__ == "__main__":
     unittest.main()
@@ -203,6 +203,83 @@ class NexusTooManyTaxaTest(
                 data_str,
                 'nexus')
 
+class NexusCharacterStateRunsTest(
+        dendropytest.ExtendedTestCase):
+
+    def get_symbols(self, char_matrix):
+        return [(taxon.label, char_matrix[taxon].symbols_as_string()) for taxon in char_matrix]
+
+    def testMatchCharAndMultistatesInterleaved(self):
+        data_str = """\
+        #NEXUS
+        BEGIN CHARACTERS;
+            DIMENSIONS NTAX=3 NCHAR=12;
+            FORMAT DATATYPE=DNA GAP=- MISSING=? MATCHCHAR=. INTERLEAVE;
+            MATRIX
+                AAA ACGT{AG}C
+                BBB ..-.{CT}N
+                CCC a.g.{AG}.
+
+                AAA ?TTACG
+                BBB ..A.T.
+                CCC .-....
+            ;
+        END;
+        """
+        char_matrix = dendropy.DnaCharacterMatrix.get(data=data_str, schema="nexus")
+        self.assertEqual(self.get_symbols(char_matrix), [
+            ("AAA", "ACGTRC?TTACG"),
+            ("BBB", "AC-TYN?TAATG"),
+            ("CCC", "ACGTRC?-TACG"),
+            ])
+        for taxon in char_matrix:
+            self.assertEqual(len(char_matrix[taxon]), 12)
+
+    def testMatchCharAndMultistatesStandard(self):
+        data_str = """\
+        #NEXUS
+        BEGIN CHARACTERS;
+            DIMENSIONS NTAX=2 NCHAR=6;
+            FORMAT DATATYPE=STANDARD SYMBOLS="012" MISSING=? MATCHCHAR=.;
+            MATRIX
+                AAA 0(01)1{12}?2
+                BBB .(01)2.{01}.
+            ;
+        END;
+        """
+        char_matrix = dendropy.StandardCharacterMatrix.get(data=data_str, schema="nexus")
+        s1, s2 = [char_matrix[taxon] for taxon in char_matrix]
+        self.assertIs(s2[0], s1[0])
+        self.assertIs(s2[1], s1[1])
+        self.assertIs(s2[3], s1[3])
+        self.assertEqual(s1[1].state_denomination, char_matrix.default_state_alphabet.POLYMORPHIC_STATE)
+        self.assertEqual(sorted(s.symbol for s in s1[1].member_states), ["0", "1"])
+        self.assertEqual(sorted(s.symbol for s in s2[4].member_states), ["0", "1"])
+        self.assertEqual(s2[2].symbol, "2")
+
+    def testErrors(self):
+        template = """\
+        #NEXUS
+        BEGIN CHARACTERS;
+            DIMENSIONS NTAX=2 NCHAR=4;
+            FORMAT DATATYPE=DNA GAP=- MISSING=? MATCHCHAR=.;
+            MATRIX
+                AAA {}
+                BBB {}
+            ;
+        END;
+        """
+        for rows, exception_type in (
+                (("ACGTA", "ACGT"), nexusreader.NexusReader.TooManyCharactersError),
+                (("ACJT", "ACGT"), nexusreader.NexusReader.InvalidCharacterStateSymbolError),
+                (("A.GT", "ACGT"), nexusreader.NexusReader.NexusReaderError),
+                (("ACGT", "AC.TA"), nexusreader.NexusReader.TooManyCharactersError),
+                ):
+            with self.assertRaises(exception_type):
+                dendropy.DnaCharacterMatrix.get(
+                        data=template.format(*rows),
+                        schema="nexus")
+
 class NexusCharsSubsetsTest(
         compare_and_validate.Comparator,
         dendropytest.ExtendedTestCase):
@@ -28,6 +28,10 @@ from dendropy.test.support import standard_file_test_datasets
 from dendropy.utility import messaging
 import unittest
 import dendropy
+try:
+    from StringIO import StringIO # Python 2 legacy support: StringIO in this module is the one needed (not io)
+except ImportError:
+    from io import StringIO # Python 3
 _LOG = messaging.get_logger(__name__)
 
 class DataSetNexusSingleCharsTestCase(dendropytest.ExtendedTestCase):
@@ -339,6 +343,63 @@ class NexusDataSetMultiTreesBlockTestCase(dendropytest.ExtendedTestCase):
             self.assertEqual(len(tt), 2)
             self.assertIs(tt.taxon_namespace, ds.taxon_namespaces[0])
 
+class NexusDataSetExcludedBlocksTestCase(dendropytest.ExtendedTestCase):
+
+    data_str = """\
+    #NEXUS
+    BEGIN TAXA;
+        DIMENSIONS NTAX=3;
+        TAXLABELS a b 'c;d';
+    END;
+    BEGIN CHARACTERS;
+        DIMENSIONS NCHAR=4;
+        FORMAT DATATYPE=DNA GAP=- MISSING=?;
+        [ comment with 'END;' and [a nested; END;] comment ]
+        MATRIX
+            a ACGT
+            b AC-T
+            'c;d' ACG?
+        ;
+    END;
+    BEGIN SETS;
+        CHARSET x = 1-2;
+    END;
+    BEGIN PAUP;
+        LOG FILE='end;';
+    ENDBLOCK;
+    BEGIN TREES;
+        TREE t1 = (a,(b,'c;d'));
+        TREE t2 = ((a,b),'c;d');
+    END;
+    """
+
+    def test_exclude_chars(self):
+        ds = dendropy.DataSet.get(data=self.data_str, schema="nexus", exclude_chars=True)
+        self.assertEqual(len(ds.char_matrices), 0)
+        self.assertEqual(len(ds.tree_lists), 1)
+        self.assertEqual([t.label for t in ds.tree_lists[0]], ["t1", "t2"])
+        self.assertEqual([t.label for t in ds.taxon_namespaces[0]], ["a", "b", "c;d"])
+        tree_list = dendropy.TreeList.get(data=self.data_str, schema="nexus")
+        self.assertEqual(
+                [t.as_string(schema="newick") for t in tree_list],
+                [t.as_string(schema="newick") for t in ds.tree_lists[0]])
+
+    def test_exclude_trees(self):
+        ds = dendropy.DataSet.get(data=self.data_str, schema="nexus", exclude_trees=True)
+        self.assertEqual(len(ds.tree_lists), 0)
+        self.assertEqual(len(ds.char_matrices), 1)
+        char_matrix = ds.char_matrices[0]
+        self.assertEqual(
+                [char_matrix[taxon].symbols_as_string() for taxon in char_matrix],
+                ["ACGT", "AC-T", "ACG?"])
+        self.assertIn("x", char_matrix.character_subsets)
+
+    def test_yield_trees(self):
+        trees = list(dendropy.Tree.yield_from_files(
+                files=[StringIO(self.data_str)],
+                schema="nexus"))
+        self.assertEqual([t.label for t in trees], ["t1", "t2"])
+
 class DataSetNexusReaderMesquiteMultipleTaxonNamespacesTest(
         standard_file_test_datasets.MultipleTaxonNamespaceDataSet,
         dendropytest.ExtendedTestCase):
@@ -26,6 +26,10 @@ import dendropy
 from dendropy.test.support import dendropytest
 from dendropy.test.support import standard_file_test_trees
 from dendropy.test.support import pathmap
+try:
+    from StringIO import StringIO # Python 2 legacy support: StringIO in this module is the one needed (not io)
+except ImportError:
+    from io import StringIO # Python 3
 
 if not (sys.version_info.major >= 3 and sys.version_info.minor >= 4):
     from dendropy.utility.filesys import pre_py34_open as open
@@ -80,6 +84,108 @@ class NexusTreeYielderDefaultTestCase(
             self.assertIs(tree.taxon_namespace, tns)
             self.compare_to_reference_tree(tree, ref_tree)
 
+    def test_tree_offset(self):
+        tree_file_titles = [
+            "dendropy-test-trees-n12-x2",
+            "dendropy-test-trees-n33-unrooted-x10a",
+            "dendropy-test-trees-n33-unrooted-annotated-x10a",
+        ]
+        tree_offset = 3
+        tree_files = []
+        expected_tree_references = []
+        for tree_file_title in tree_file_titles:
+            tree_files.append(self.schema_tree_filepaths[tree_file_title])
+            num_trees = self.tree_references[tree_file_title]["num_trees"]
+            for tree_idx in range(tree_offset, num_trees):
+                expected_tree_references.append(self.tree_references[tree_file_title][str(tree_idx)])
+        tns = dendropy.TaxonNamespace()
+        tree_sources = dendropy.Tree.yield_from_files(
+                files=tree_files,
+                schema="nexus",
+                taxon_namespace=tns,
+                tree_offset=tree_offset)
+        collected_trees = list(tree_sources)
+        self.assertEqual(len(collected_trees), len(expected_tree_references))
+        for tree, ref_tree in zip(collected_trees, expected_tree_references):
+            self.compare_to_reference_tree(tree, ref_tree)
+
+class TreeYielderTreeOffsetTestCase(dendropytest.ExtendedTestCase):
+
+    newick_trees = [
+        "[&R] (a,('b;c',d)[;]);",
+        "[a comment; with [nested; ] semi-colons] ('e''f;',g);",
+        "(h'i,j'k);",
+        ";",
+        "(l,m);",
+        "((n,o),p);",
+    ]
+
+    def get_tree_strings(self, trees):
+        return [t.as_string(schema="newick", suppress_rooting=False) for t in trees]
+
+    def get_sources(self, data):
+        return [StringIO(data), StringIO(data)]
+
+    def verify_tree_offsets(self, data, schema, yielder_schema=None):
+        if yielder_schema is None:
+            yielder_schema = schema
+        expected = self.get_tree_strings(dendropy.TreeList.get(data=data, schema=schema))
+        for tree_offset in (0, 1, 2, 3, len(expected), len(expected) + 1):
+            trees = dendropy.Tree.yield_from_files(
+                    files=self.get_sources(data),
+                    schema=yielder_schema,
+                    tree_offset=tree_offset)
+            self.assertEqual(
+                    self.get_tree_strings(trees),
+                    expected[tree_offset:] * 2)
+
+    def test_newick(self):
+        self.verify_tree_offsets("\n".join(self.newick_trees), "newick")
+
+    def test_newick_taxon_namespace(self):
+        # taxa referenced by skipped trees are added to the namespace in the
+        # same order as they are when all the trees are built
+        data = "\n".join(self.newick_trees + [
+            "((q:1,r_s:2)t:3,(u:1,'v w':1)[&x=1]:2);",
+            "(l,(y,z)1:1);",
+        ])
+        for yielder_schema in ("newick", "nexus/newick"):
+            expected = [t.label for t in dendropy.TreeList.get(data=data, schema="newick").taxon_namespace]
+            for tree_offset in (1, 3, 7, 9):
+                tns = dendropy.TaxonNamespace()
+                for tree in dendropy.Tree.yield_from_files(
+                        files=[StringIO(data)],
+                        schema=yielder_schema,
+                        taxon_namespace=tns,
+                        tree_offset=tree_offset):
+                    pass
+                self.assertEqual([t.label for t in tns], expected)
+
+    def test_nexus(self):
+        data = ["#NEXUS", "BEGIN TREES;"]
+        for idx, tree in enumerate(self.newick_trees):
+            if tree == ";":
+                continue
+            data.append("    TREE 'tree; {}' = {}".format(idx, tree))
+        data.append("END;")
+        data = "\n".join(data)
+        self.verify_tree_offsets(data, "nexus")
+        self.verify_tree_offsets(data, "nexus", "nexus/newick")
+        self.verify_tree_offsets("\n".join(self.newick_trees), "newick", "nexus/newick")
+
+    def test_nexml(self):
+        data = dendropy.TreeList.get(
+                data="\n".join(self.newick_trees),
+                schema="newick").as_string(schema="nexml")
+        self.verify_tree_offsets(data, "nexml")
+
+    def test_negative_offset(self):
+        with self.assertRaises(ValueError):
+            dendropy.Tree.yield_from_files(
+                    files=self.get_sources("(a,b);"),
+                    schema="newick",
+                    tree_offset=-1)
+
 ## TODO:
 # - test multiple trees blocks
 # - mix of newick/nexus
@@ -20,12 +20,18 @@
 Tests for NEXUS tree list writing.
 """
 
+import random
 import unittest
 import dendropy
+from dendropy.dataio import nexuswriter
 from dendropy.test.support import dendropytest
 from dendropy.test.support import compare_and_validate
 from dendropy.test.support import pathmap
 from dendropy.test.support import standard_file_test_chars
+try:
+    from StringIO import StringIO # Python 2 legacy support: StringIO in this module is the one needed (not io)
+except ImportError:
+    from io import StringIO # Python 3
 
 class NexusWriterCharactersTestCase(
         compare_and_validate.ValidateWriteable,
@@ -75,5 +81,52 @@ class NexusWriterCharactersTestCase(
             d2 = matrix_type.get_from_string(s, "nexus")
             self.verify_char_matrix(d2, src_matrix_checker_type)
 
+class WriteRecordingStream(StringIO):
+
+    def __init__(self):
+        StringIO.__init__(self)
+        self.max_write_size = 0
+
+    def write(self, s):
+        self.max_write_size = max(self.max_write_size, len(s))
+        return StringIO.write(self, s)
+
+class NexusWriterStreamingTestCase(dendropytest.ExtendedTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(1)
+        cls.sequences = dict(("t{}".format(i), "".join(rng.choice("ACGT-") for j in range(5000)))
+                for i in range(10))
+
+    def setUp(self):
+        self.chunk_size = nexuswriter.NexusWriter.MATRIX_ROW_CHUNK_SIZE
+
+    def tearDown(self):
+        nexuswriter.NexusWriter.MATRIX_ROW_CHUNK_SIZE = self.chunk_size
+
+    def test_chunked_rows(self):
+        char_matrix = dendropy.DnaCharacterMatrix.from_dict(self.sequences)
+        expected = char_matrix.as_string(schema="nexus")
+        for chunk_size in (1, 7, 1000):
+            nexuswriter.NexusWriter.MATRIX_ROW_CHUNK_SIZE = chunk_size
+            stream = WriteRecordingStream()
+            char_matrix.write(file=stream, schema="nexus")
+            self.assertEqual(stream.getvalue(), expected)
+            self.assertLessEqual(stream.max_write_size, max(chunk_size, 200))
+        char_matrix2 = dendropy.DnaCharacterMatrix.get(data=expected, schema="nexus")
+        for taxon in char_matrix2:
+            self.assertEqual(char_matrix2[taxon].symbols_as_string(), self.sequences[taxon.label])
+
+    def test_continuous_rows(self):
+        values = {"a": [1.5, -2.0, 3.25], "b": [4.0, 5.5, -6.75]}
+        char_matrix = dendropy.ContinuousCharacterMatrix.from_dict(values)
+        expected = char_matrix.as_string(schema="nexus")
+        nexuswriter.NexusWriter.MATRIX_ROW_CHUNK_SIZE = 2
+        self.assertEqual(char_matrix.as_string(schema="nexus"), expected)
+        char_matrix2 = dendropy.ContinuousCharacterMatrix.get(data=expected, schema="nexus")
+        for taxon in char_matrix2:
+            self.assertEqual(char_matrix2[taxon].values(), values[taxon.label])
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,286 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+Tests for the on-disk cache of parsed data objects.
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import unittest
+import dendropy
+from dendropy.dataio import parsecache
+from dendropy.test.support import dendropytest
+from dendropy.test.support import pathmap
+
+class ParseCacheTestCase(dendropytest.ExtendedTestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.cache = parsecache.ParseCache(os.path.join(self.tempdir, "cache"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def copy_source(self, path):
+        dest = os.path.join(self.tempdir, os.path.basename(path))
+        shutil.copy(path, dest)
+        return dest
+
+    def tree_strings(self, trees):
+        return [t.as_string(schema="newick", suppress_rooting=False) for t in trees]
+
+    def num_entries(self):
+        return len(self.cache._entries())
+
+    def test_tree_list(self):
+        path = self.copy_source(pathmap.tree_source_path("pythonidae.reference-trees.nexus"))
+        expected = dendropy.TreeList.get(path=path, schema="nexus")
+        for idx in range(2):
+            trees = dendropy.TreeList.get(path=path, schema="nexus", parse_cache=self.cache)
+            self.assertEqual(self.num_entries(), 1)
+            self.assertEqual(self.tree_strings(trees), self.tree_strings(expected))
+            self.assertEqual([t.label for t in trees.taxon_namespace], [t.label for t in expected.taxon_namespace])
+            for tree in trees:
+                self.assertIs(tree.taxon_namespace, trees.taxon_namespace)
+
+    def test_hit_is_not_parsed(self):
+        path = self.copy_source(pathmap.tree_source_path("pythonidae.reference-trees.nexus"))
+        dendropy.TreeList.get(path=path, schema="nexus", parse_cache=self.cache)
+        key = self.cache.entry_key(path, "nexus", dendropy.TreeList, {})
+        entry_path = self.cache.lookup(key)
+        self.assertTrue(os.path.exists(entry_path))
+        # the entry is used instead of the file as long as the file has the
+        # same size and modification time
+        st = os.stat(path)
+        with open(path, "r") as src:
+            data = src.read()
+        with open(path, "w") as dest:
+            dest.write(data.replace("Python_regius", "Python_regiuz"))
+        os.utime(path, (st.st_atime, st.st_mtime))
+        trees = dendropy.TreeList.get(path=path, schema="nexus", parse_cache=self.cache)
+        self.assertIsNot(trees.taxon_namespace.get_taxon("Python regius"), None)
+
+    def annotation_values(self, trees):
+        values = []
+        for tree in trees:
+            for nd in tree:
+                values.append([(a.name, a.value, type(a.value)) for a in nd.annotations])
+                values.append([(a.name, a.value, type(a.value)) for a in nd.edge.annotations])
+        return values
+
+    def test_hit_equals_miss_with_annotations(self):
+        path = os.path.join(self.tempdir, "trees.nex")
+        with open(path, "w") as dest:
+            dest.write("#NEXUS\nbegin trees;\n")
+            dest.write("    tree t1 = [&R] ((a:1[&height=0.5,hpd={0.5,1.5}],b:2[&hpd={0.25,2}]):1[&rate=1.2],c:2);\n")
+            dest.write("    tree t2 = [&R] (a:1[&hpd={0.1,0.2}],(b:1,c:1)[&set={x,{1,2}}]:1);\n")
+            dest.write("end;\n")
+        expected = dendropy.TreeList.get(path=path, schema="nexus", extract_comment_metadata=True)
+        self.assertEqual(expected[0].find_node_with_taxon_label("a").annotations.get_value("hpd"), ["0.5", "1.5"])
+        for idx in range(2):
+            trees = dendropy.TreeList.get(path=path, schema="nexus", extract_comment_metadata=True, parse_cache=self.cache)
+            self.assertEqual(self.num_entries(), 1)
+            self.assertEqual(self.tree_strings(trees), self.tree_strings(expected))
+            self.assertEqual(self.annotation_values(trees), self.annotation_values(expected))
+        tree_array = dendropy.TreeArray()
+        tree_array.read_from_files([path], "nexus", parse_cache=self.cache)
+        self.assertEqual(self.num_entries(), 2)
+
+    def test_unstorable_annotations(self):
+        tree = dendropy.Tree.get(data="((a,b),c);", schema="newick")
+        tree.seed_node.annotations.add_new(name="x", value={"y": 1})
+        self.assertIs(self.cache.store("0" * 40, tree), None)
+        self.assertEqual(self.num_entries(), 0)
+        self.assertEqual(os.listdir(self.cache.cache_dir), [])
+
+    def test_comments_and_subsets_not_cached(self):
+        path = os.path.join(self.tempdir, "trees.nex")
+        with open(path, "w") as dest:
+            dest.write("#NEXUS\nbegin trees;\n")
+            dest.write("    tree t1 = [&R] [tree comment] ((a:1[node comment],b:2):1,c:2);\n")
+            dest.write("end;\n")
+        for idx in range(2):
+            tree = dendropy.Tree.get(path=path, schema="nexus", parse_cache=self.cache)
+            self.assertEqual(tree.comments, ["tree comment"])
+            self.assertEqual(tree.find_node_with_taxon_label("a").comments, ["node comment"])
+        self.assertEqual(self.num_entries(), 0)
+        path = self.copy_source(pathmap.char_source_path("interleaved-charsets-all.nex"))
+        for idx in range(2):
+            char_matrix = dendropy.DnaCharacterMatrix.get(path=path, schema="nexus", parse_cache=self.cache)
+            self.assertTrue(char_matrix.character_subsets)
+        self.assertEqual(self.num_entries(), 0)
+
+    def test_tree_array_source_larger_than_cache(self):
+        path = self.copy_source(pathmap.tree_source_path("pythonidae.reference-trees.nexus"))
+        expected = dendropy.TreeArray()
+        expected.read_from_files([path], "nexus")
+        self.cache.max_size = os.path.getsize(path) - 1
+        tree_array = dendropy.TreeArray()
+        tree_array.read_from_files([path], "nexus", parse_cache=self.cache)
+        self.assertEqual(self.num_entries(), 0)
+        self.assertEqual(tree_array._tree_split_bitmasks, expected._tree_split_bitmasks)
+        # storing stops once the trees stored exceed the maximum size
+        self.cache.max_size = 2000
+        taxon_namespace = dendropy.TaxonNamespace()
+        num_trees_yielded = []
+        def trees():
+            for tree in dendropy.Tree.yield_from_files([path], "nexus", taxon_namespace=taxon_namespace):
+                num_trees_yielded.append(tree)
+                yield tree
+        self.assertIs(self.cache.store_trees("0" * 40, trees(), taxon_namespace), None)
+        self.assertTrue(len(num_trees_yielded) < len(expected))
+        self.assertEqual(os.listdir(self.cache.cache_dir), [])
+
+    def test_modified_file(self):
+        path = os.path.join(self.tempdir, "trees.nex")
+        with open(path, "w") as dest:
+            dest.write("(a,(b,c));")
+        tree = dendropy.Tree.get(path=path, schema="newick", parse_cache=self.cache)
+        self.assertEqual(tree.as_string(schema="newick"), "(a,(b,c));\n")
+        with open(path, "w") as dest:
+            dest.write("((a,b),c,d);")
+        st = os.stat(path)
+        os.utime(path, (st.st_atime, st.st_mtime + 10))
+        tree = dendropy.Tree.get(path=path, schema="newick", parse_cache=self.cache)
+        self.assertEqual(tree.as_string(schema="newick"), "((a,b),c,d);\n")
+        self.assertEqual(self.num_entries(), 2)
+
+    def test_kwargs_in_key(self):
+        path = self.copy_source(pathmap.tree_source_path("pythonidae.reference-trees.nexus"))
+        for tree_offset in (0, 3, 0, 3):
+            tree = dendropy.Tree.get(path=path, schema="nexus", tree_offset=tree_offset, parse_cache=self.cache)
+            expected = dendropy.Tree.get(path=path, schema="nexus", tree_offset=tree_offset)
+            self.assertEqual(tree.as_string(schema="newick"), expected.as_string(schema="newick"))
+        self.assertEqual(self.num_entries(), 2)
+
+    def test_parsing_kwargs_in_key(self):
+        path = os.path.join(self.tempdir, "trees.tre")
+        with open(path, "w") as dest:
+            dest.write("(a_1,(b_2,c_3));")
+        for preserve_underscores in (False, True, False, True):
+            tree = dendropy.Tree.get(path=path, schema="newick", preserve_underscores=preserve_underscores, parse_cache=self.cache)
+            self.assertEqual(
+                    tree.taxon_namespace.labels(),
+                    ["a_1", "b_2", "c_3"] if preserve_underscores else ["a 1", "b 2", "c 3"])
+        self.assertEqual(self.num_entries(), 2)
+
+    def test_uncacheable_kwargs(self):
+        path = self.copy_source(pathmap.tree_source_path("pythonidae.reference-trees.nexus"))
+        trees = dendropy.TreeList.get(path=path, schema="nexus", edge_length_type=str, parse_cache=self.cache)
+        self.assertTrue(isinstance(trees[0].seed_node.child_nodes()[0].edge.length, str))
+        self.assertEqual(self.num_entries(), 0)
+
+    def test_taxon_namespace(self):
+        path = self.copy_source(pathmap.tree_source_path("pythonidae.reference-trees.nexus"))
+        dendropy.TreeList.get(path=path, schema="nexus", parse_cache=self.cache)
+        tns = dendropy.TaxonNamespace()
+        t1 = tns.new_taxon("Python regius")
+        trees = dendropy.TreeList.get(path=path, schema="nexus", taxon_namespace=tns, parse_cache=self.cache)
+        self.assertIs(trees.taxon_namespace, tns)
+        self.assertIs(tns.get_taxon("Python regius"), t1)
+        self.assertEqual(len(tns), 33)
+
+    def test_populated_taxon_namespace(self):
+        path = os.path.join(self.tempdir, "tree.tre")
+        with open(path, "w") as dest:
+            dest.write("((a,b),c);")
+        def read(labels, parse_cache):
+            tns = dendropy.TaxonNamespace()
+            for label in labels:
+                tns.new_taxon(label)
+            tree = dendropy.Tree.get(path=path, schema="newick", taxon_namespace=tns, parse_cache=parse_cache)
+            return tns.labels(), tree.as_string(schema="newick")
+        for labels in (["x", "y", "z", "A"], [], ["A", "B", "C"], []):
+            self.assertEqual(read(labels, self.cache), read(labels, None))
+        self.assertEqual(self.num_entries(), 1)
+
+    def test_tree_array_populated_taxon_namespace(self):
+        path = os.path.join(self.tempdir, "trees.tre")
+        with open(path, "w") as dest:
+            dest.write("((a,b),(c,d));\n((a,c),(b,d));\n")
+        def read(parse_cache):
+            tree_array = dendropy.TreeArray(taxon_namespace=dendropy.TaxonNamespace(["A", "B", "C", "D"]))
+            for idx in range(2):
+                tree_array.read_from_files([path], "newick", parse_cache=parse_cache)
+            return tree_array.taxon_namespace.labels(), tree_array._tree_split_bitmasks
+        for idx in range(2):
+            self.assertEqual(read(self.cache), read(None))
+        self.assertEqual(self.num_entries(), 1)
+
+    def test_char_matrix(self):
+        path = self.copy_source(pathmap.char_source_path("standard-test-chars-dna.simple.nexus"))
+        expected = dendropy.DnaCharacterMatrix.get(path=path, schema="nexus")
+        for idx in range(2):
+            char_matrix = dendropy.DnaCharacterMatrix.get(path=path, schema="nexus", parse_cache=self.cache)
+            self.assertEqual(char_matrix.as_string(schema="fasta"), expected.as_string(schema="fasta"))
+        self.assertEqual(self.num_entries(), 1)
+
+    def test_tree_array(self):
+        path = self.copy_source(pathmap.tree_source_path("pythonidae.reference-trees.nexus"))
+        expected = dendropy.TreeArray(ignore_node_ages=False)
+        expected.read_from_files([path, path], "nexus", tree_offset=2)
+        for idx in range(2):
+            tree_array = dendropy.TreeArray(ignore_node_ages=False)
+            tree_array.read_from_files([path, path], "nexus", tree_offset=2, parse_cache=self.cache)
+            self.assertEqual(self.num_entries(), 1)
+            self.assertEqual(len(tree_array), len(expected))
+            self.assertEqual(
+                    [t.label for t in tree_array.taxon_namespace],
+                    [t.label for t in expected.taxon_namespace])
+            self.assertEqual(tree_array._tree_split_bitmasks, expected._tree_split_bitmasks)
+            self.assertEqual(tree_array._tree_edge_lengths, expected._tree_edge_lengths)
+            self.assertEqual(tree_array.split_distribution.split_counts, expected.split_distribution.split_counts)
+            for split in expected.split_distribution.split_node_ages:
+                self.assertEqual(
+                        tree_array.split_distribution.split_node_ages[split],
+                        expected.split_distribution.split_node_ages[split])
+
+    def test_eviction(self):
+        paths = []
+        for idx in range(3):
+            path = os.path.join(self.tempdir, "trees{}.nex".format(idx))
+            with open(path, "w") as dest:
+                dest.write("({},(b,c));".format("a" * (idx + 1)))
+            paths.append(path)
+        for path in paths[:2]:
+            dendropy.Tree.get(path=path, schema="newick", parse_cache=self.cache)
+        entry_size = self.cache.size() // 2
+        self.cache.max_size = entry_size * 2 + entry_size // 2
+        # mark first entry as used more recently than the second one
+        entry_paths = [self.cache.entry_path(self.cache.entry_key(path, "newick", dendropy.Tree, {})) for path in paths]
+        now = time.time()
+        os.utime(entry_paths[1], (now - 100, now - 100))
+        os.utime(entry_paths[0], (now - 50, now - 50))
+        dendropy.Tree.get(path=paths[2], schema="newick", parse_cache=self.cache)
+        self.assertTrue(os.path.exists(entry_paths[0]))
+        self.assertFalse(os.path.exists(entry_paths[1]))
+        self.assertTrue(os.path.exists(entry_paths[2]))
+        self.cache.clear()
+        self.assertEqual(self.num_entries(), 0)
+
+    def test_get_parse_cache(self):
+        self.assertIs(parsecache.get_parse_cache(self.cache), self.cache)
+        self.assertEqual(parsecache.get_parse_cache(self.tempdir).cache_dir, os.path.abspath(self.tempdir))
+        with self.assertRaises(TypeError):
+            parsecache.get_parse_cache(1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -251,6 +251,67 @@ AAACCATTGC CGGTACGCTT AA
             self.assertEqual(taxon.label, expected_taxon)
             self.assertEqual(char_matrix[taxon].symbols_as_string(), self.expected_seqs[expected_taxon])
 
+    def test_relaxed_interleaved(self):
+        s = """\
+5 42
+Turkey AAGCTNGGGC ATTTCAGGGT
+Salmo_gair AAGCCTTGGC AGTGCAGGGT
+H._Sapiens ACCGGTTGGC CGTTCAGGGT
+Chimp AAACCCTTGC CGTTACGCTT
+Gorilla AAACCCTTGC CGGTACGCTT
+
+GAGCCCGGGC AATACAG
+GAGCCGTGGC CGGGCAC
+ACAGGTTGGC CGTTCAG
+AAACCGAGGC CGGGACA
+AAACCATTGC CGGTACG
+
+GGT AT
+GGT AT
+GGT AA
+CTC AT
+CTT AA
+"""
+        for max_pending_symbols in (3, 50, phylipreader.PhylipReader.MAX_PENDING_SYMBOLS):
+            saved_max_pending_symbols = phylipreader.PhylipReader.MAX_PENDING_SYMBOLS
+            phylipreader.PhylipReader.MAX_PENDING_SYMBOLS = max_pending_symbols
+            try:
+                for line_break in ("\n", "\r\n", "\r"):
+                    char_matrix = dendropy.DnaCharacterMatrix.get_from_string(
+                            s.replace("\n", line_break),
+                            "phylip",
+                            interleaved=True,
+                            underscores_to_spaces=True)
+                    self.assertEqual([taxon.label for taxon in char_matrix], list(self.expected_seqs))
+                    for taxon in char_matrix:
+                        self.assertEqual(char_matrix[taxon].symbols_as_string(), self.expected_seqs[taxon.label])
+            finally:
+                phylipreader.PhylipReader.MAX_PENDING_SYMBOLS = saved_max_pending_symbols
+
+    def test_sequential_with_bad_chars(self):
+        s = """\
+5 42
+Turkey AAGCTNGGGC ATTTCAGGGT GAGCCCGGGC AATACAGG
+GT AT
+Salmo_gair AAGCCTTGGC AGTGCAGGGT GAGCCGTGGC
+CGGGCACGGT AT
+H._Sapiens ACCGGTTGGC CGTTCAGGGT ACAGGTTGGC CGTTCAGGGT AA
+Chimp AAACCCTTGC CGTTACGCTT AAACCGAGGC CGGGACACTC AT
+Gorilla AAACCCTTGC CGGTAC3828GCTT AAACCATTGC CGGTACGC
+TT AA
+"""
+        char_matrix = dendropy.DnaCharacterMatrix.get_from_string(
+                s,
+                "phylip",
+                underscores_to_spaces=True,
+                ignore_invalid_chars=True)
+        self.assertEqual([taxon.label for taxon in char_matrix], list(self.expected_seqs))
+        for taxon in char_matrix:
+            self.assertEqual(char_matrix[taxon].symbols_as_string(), self.expected_seqs[taxon.label])
+        with self.assertRaises(phylipreader.PhylipReader.PhylipStrictSequentialError) as cm:
+            dendropy.DnaCharacterMatrix.get_from_string(s, "phylip")
+        self.assertEqual(cm.exception.line_num, 8)
+
 class PhylipContinuousVariantsTestCases(dendropytest.ExtendedTestCase):
 
     @classmethod
@@ -0,0 +1,189 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+Tests for reading ahead of parsing by data yielders.
+"""
+
+import gc
+import os
+import gzip
+import shutil
+import tempfile
+import threading
+import unittest
+import dendropy
+from dendropy.dataio import ioservice
+from dendropy.test.support import dendropytest
+from dendropy.test.support import pathmap
+try:
+    from StringIO import StringIO # Python 2 legacy support: StringIO in this module is the one needed (not io)
+except ImportError:
+    from io import StringIO # Python 3
+
+class ReadAheadStreamTestCase(dendropytest.ExtendedTestCase):
+
+    data = "first line\nsecond line\n\nlast line without newline"
+
+    def test_read(self):
+        for block_size in (1, 3, 7, 1000):
+            stream = ioservice.ReadAheadStream(StringIO(self.data), max_blocks=2, block_size=block_size)
+            parts = []
+            while True:
+                s = stream.read(5)
+                if not s:
+                    break
+                self.assertTrue(len(s) == 5 or "".join(parts) + s == self.data)
+                parts.append(s)
+            self.assertEqual("".join(parts), self.data)
+            stream.close()
+
+    def test_read_all(self):
+        stream = ioservice.ReadAheadStream(StringIO(self.data), block_size=4)
+        self.assertEqual(stream.read(6), self.data[:6])
+        self.assertEqual(stream.read(), self.data[6:])
+        self.assertEqual(stream.read(), "")
+
+    def test_lines(self):
+        for block_size in (1, 4, 1000):
+            with ioservice.ReadAheadStream(StringIO(self.data), block_size=block_size) as stream:
+                self.assertEqual(list(stream), StringIO(self.data).readlines())
+            self.assertTrue(stream.closed)
+
+    def test_source_left_open(self):
+        # file-like objects are closed by the caller
+        for read_size in (2, -1):
+            src = StringIO(self.data)
+            stream = ioservice.ReadAheadStream(src, max_blocks=1, block_size=1)
+            stream.read(read_size)
+            stream.close()
+            self.assertFalse(src.closed)
+
+    def test_error(self):
+        stream = ioservice.ReadAheadStream(os.path.join(tempfile.gettempdir(), "dendropy-no-such-file.nex"))
+        with self.assertRaises(EnvironmentError):
+            stream.read()
+        stream.close()
+
+class DataYielderReadAheadTestCase(dendropytest.ExtendedTestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def tree_strings(self, trees):
+        return [t.as_string(schema="newick", suppress_rooting=False) for t in trees]
+
+    def gzip_source(self, filename):
+        path = os.path.join(self.tempdir, filename + ".gz")
+        with open(pathmap.tree_source_path(filename), "rb") as src:
+            with gzip.GzipFile(path, "wb") as dest:
+                dest.write(src.read())
+        return path
+
+    def test_trees(self):
+        for filename, schema in (
+                ("pythonidae.reference-trees.nexus", "nexus"),
+                ("pythonidae.reference-trees.newick", "newick"),
+                ("dendropy-test-trees-n12-x2.nexml", "nexml"),
+                ("multitreeblocks.nex", "nexus"),
+                ):
+            paths = [pathmap.tree_source_path(filename), pathmap.tree_source_path(filename)]
+            expected = self.tree_strings(dendropy.Tree.yield_from_files(paths, schema))
+            for kwargs in (
+                    {"read_ahead": True},
+                    {"read_ahead": 1},
+                    {"prefetch_files": True},
+                    {"read_ahead": 2, "prefetch_files": True},
+                    ):
+                trees = dendropy.Tree.yield_from_files(paths, schema, **kwargs)
+                self.assertEqual(self.tree_strings(trees), expected)
+
+    def test_current_file_name(self):
+        paths = [
+            pathmap.tree_source_path("pythonidae.reference-trees.newick"),
+            pathmap.tree_source_path("pythonidae.reference-trees.nexus"),
+            ]
+        expected = []
+        for path in paths:
+            expected.extend([path] * len(dendropy.TreeList.get(path=path, schema=path.rsplit(".", 1)[-1])))
+        tree_yielder = dendropy.Tree.yield_from_files(paths, "nexus/newick", prefetch_files=True)
+        file_names = [tree_yielder.current_file_name for tree in tree_yielder]
+        self.assertEqual(file_names, expected)
+
+    def test_gzipped_source(self):
+        filename = "pythonidae.reference-trees.nexus"
+        expected = self.tree_strings(dendropy.Tree.yield_from_files([pathmap.tree_source_path(filename)], "nexus"))
+        trees = dendropy.Tree.yield_from_files(
+                [self.gzip_source(filename), pathmap.tree_source_path(filename)],
+                "nexus",
+                read_ahead=True)
+        self.assertEqual(self.tree_strings(trees), expected * 2)
+
+    def test_file_objects(self):
+        data = "(a,(b,c));\n((a,b),c);\n"
+        expected = self.tree_strings(dendropy.TreeList.get(data=data * 3, schema="newick"))
+        trees = dendropy.Tree.yield_from_files(
+                [StringIO(data), StringIO(data), StringIO(data)],
+                "newick",
+                prefetch_files=True)
+        self.assertEqual(self.tree_strings(trees), expected)
+
+    def test_parse_error(self):
+        trees = dendropy.Tree.yield_from_files(
+                [StringIO("(a,(b,c));\n(a,(b,c);\n")],
+                "newick",
+                read_ahead=True)
+        with self.assertRaises(dendropy.dataio.newickreader.NewickReader.NewickReaderMalformedStatementError):
+            list(trees)
+
+    def test_partial_iteration(self):
+        num_threads = threading.active_count()
+        src = StringIO("(a,b);\n" * 10000)
+        tree_yielder = dendropy.Tree.yield_from_files([src], "newick", read_ahead=1)
+        trees = iter(tree_yielder)
+        next(trees)
+        trees.close()
+        self.assertEqual(threading.active_count(), num_threads)
+        self.assertFalse(src.closed)
+
+    def test_partial_iteration_of_prefetched_files(self):
+        num_threads = threading.active_count()
+        for i in range(3):
+            srcs = [StringIO("(a,b);\n" * 10000) for j in range(4)]
+            for tree in dendropy.Tree.yield_from_files(srcs, "newick", prefetch_files=True, read_ahead=1):
+                break
+            gc.collect()
+            self.assertEqual([src.closed for src in srcs], [False] * 4)
+        self.assertEqual(threading.active_count(), num_threads)
+
+    def test_sequences(self):
+        for filename, schema in (
+                ("standard-test-chars-dna.fasta", "fasta"),
+                ("standard-test-chars-dna.relaxed.phylip", "phylip"),
+                ):
+            paths = [pathmap.char_source_path(filename)]
+            expected = list(dendropy.DnaCharacterMatrix.yield_sequences_from_files(paths, schema))
+            self.assertEqual(
+                    list(dendropy.DnaCharacterMatrix.yield_sequences_from_files(paths, schema, read_ahead=True)),
+                    expected)
+
+if __name__ == "__main__":
+    unittest.main()
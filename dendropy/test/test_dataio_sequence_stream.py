@@ -0,0 +1,274 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+Tests for streaming of sequences from and to FASTA and PHYLIP sources.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import dendropy
+from dendropy.dataio import phylipreader
+from dendropy.utility import error
+from dendropy.test.support import dendropytest
+from dendropy.test.support import pathmap
+try:
+    from StringIO import StringIO # Python 2 legacy support: StringIO in this module is the one needed (not io)
+except ImportError:
+    from io import StringIO # Python 3
+
+class SequenceYielderTestCase(dendropytest.ExtendedTestCase):
+
+    def verify_against_matrix(self, matrix_type, path, schema, **kwargs):
+        char_matrix = matrix_type.get(path=path, schema=schema, **kwargs)
+        alphabet = char_matrix.default_state_alphabet
+        records = list(matrix_type.yield_sequences_from_files(
+                files=[path],
+                schema=schema,
+                **kwargs))
+        self.assertEqual([r.label for r in records], [t.label for t in char_matrix])
+        for record, taxon in zip(records, char_matrix):
+            self.assertEqual([alphabet[c] for c in record.sequence], list(char_matrix[taxon]))
+        records = list(matrix_type.yield_sequences_from_files(
+                files=[open(path)],
+                schema=schema,
+                as_state_indexes=True,
+                **kwargs))
+        self.assertEqual([r.label for r in records], [t.label for t in char_matrix])
+        for record, taxon in zip(records, char_matrix):
+            self.assertEqual(list(record.sequence), [s.index for s in char_matrix[taxon]])
+
+    def test_fasta(self):
+        for matrix_type, filename in (
+                (dendropy.DnaCharacterMatrix, "standard-test-chars-dna.fasta"),
+                (dendropy.DnaCharacterMatrix, "pythonidae.chars.fasta"),
+                (dendropy.ProteinCharacterMatrix, "standard-test-chars-protein.fasta"),
+                ):
+            self.verify_against_matrix(matrix_type, pathmap.char_source_path(filename), "fasta")
+
+    def test_phylip(self):
+        for matrix_type, filename in (
+                (dendropy.DnaCharacterMatrix, "standard-test-chars-dna.relaxed.phylip"),
+                (dendropy.DnaCharacterMatrix, "pythonidae.chars.phylip"),
+                (dendropy.ProteinCharacterMatrix, "standard-test-chars-protein.relaxed.phylip"),
+                ):
+            self.verify_against_matrix(matrix_type, pathmap.char_source_path(filename), "phylip")
+
+    def test_phylip_interleaved_and_strict(self):
+        data = "\n".join([
+            "3 12",
+            "a_1       ACGT ACGT",
+            "b_2       AAAA CCCC",
+            "c_3       GGGG TTTT",
+            "",
+            "AC-T",
+            "????",
+            "NNNN",
+            ])
+        records = list(dendropy.DnaCharacterMatrix.yield_sequences_from_files(
+                files=[StringIO(data)],
+                schema="phylip",
+                interleaved=True,
+                strict=True,
+                underscores_to_spaces=True))
+        self.assertEqual(records, [
+            ("a 1", "ACGTACGTAC-T"),
+            ("b 2", "AAAACCCC????"),
+            ("c 3", "GGGGTTTTNNNN"),
+            ])
+        char_matrix = dendropy.DnaCharacterMatrix.get(
+                data=data,
+                schema="phylip",
+                interleaved=True,
+                strict=True,
+                underscores_to_spaces=True)
+        self.assertEqual(
+                [(t.label, char_matrix[t].symbols_as_string()) for t in char_matrix],
+                [(r.label, r.sequence) for r in records])
+
+    def test_phylip_continuous(self):
+        for filename, interleaved in (
+                ("standard-test-chars-continuous.relaxed.phylip", False),
+                ("standard-test-chars-continuous.interleaved.phylip", True),
+                ):
+            path = pathmap.char_source_path(filename)
+            char_matrix = dendropy.ContinuousCharacterMatrix.get(
+                    path=path,
+                    schema="phylip",
+                    interleaved=interleaved)
+            records = list(dendropy.ContinuousCharacterMatrix.yield_sequences_from_files(
+                    files=[path],
+                    schema="phylip",
+                    data_type="continuous",
+                    interleaved=interleaved))
+            self.assertEqual([r.label for r in records], [t.label for t in char_matrix])
+            for record, taxon in zip(records, char_matrix):
+                self.assertEqual(record.sequence, list(char_matrix[taxon].values()))
+        data = "2 3\na 0.5 -1.25\n1e-3\nb 10 20 30\n"
+        records = list(dendropy.ContinuousCharacterMatrix.yield_sequences_from_files(
+                files=[StringIO(data)],
+                schema="phylip",
+                data_type="continuous"))
+        self.assertEqual(records, [("a", [0.5, -1.25, 0.001]), ("b", [10.0, 20.0, 30.0])])
+        with self.assertRaises(error.DataParseError):
+            list(dendropy.ContinuousCharacterMatrix.yield_sequences_from_files(
+                files=[StringIO("1 2\na 0.5 x\n")],
+                schema="phylip",
+                data_type="continuous"))
+
+    def test_invalid_symbols(self):
+        data = ">a\nACGT\n>b\nAC!T\n"
+        records = iter(dendropy.DnaCharacterMatrix.yield_sequences_from_files(
+                files=[StringIO(data)],
+                schema="fasta",
+                as_state_indexes=True))
+        self.assertEqual(next(records).label, "a")
+        with self.assertRaises(error.DataParseError):
+            next(records)
+        records = list(dendropy.DnaCharacterMatrix.yield_sequences_from_files(
+                files=[StringIO(data)],
+                schema="fasta",
+                as_state_indexes=True,
+                ignore_invalid_chars=True))
+        self.assertEqual(len(records[1].sequence), 3)
+        with self.assertRaises(error.DataParseError):
+            list(dendropy.DnaCharacterMatrix.yield_sequences_from_files(
+                files=[StringIO(">a\nACGT\n>a\nACGT\n")],
+                schema="fasta"))
+        with self.assertRaises(phylipreader.PhylipReader.PhylipRelaxedSequentialError):
+            list(dendropy.DnaCharacterMatrix.yield_sequences_from_files(
+                files=[StringIO("2 x\na ACGT\nb ACGT\n")],
+                schema="phylip"))
+        with self.assertRaises(error.DataParseError):
+            list(dendropy.DnaCharacterMatrix.yield_sequences_from_files(
+                files=[StringIO("")],
+                schema="phylip"))
+        with self.assertRaises(TypeError):
+            dendropy.StandardCharacterMatrix.yield_sequences_from_files(
+                files=[StringIO(data)],
+                schema="fasta",
+                as_state_indexes=True)
+
+    def test_typed_fasta_schemas(self):
+        for schema, data_type, filename in (
+                ("dnafasta", "dna", "pythonidae.chars.fasta"),
+                ("proteinfasta", "protein", "standard-test-chars-protein.fasta"),
+                ):
+            path = pathmap.char_source_path(filename)
+            expected = list(dendropy.CharacterMatrix.yield_sequences_from_files(
+                    files=[path],
+                    schema="fasta"))
+            for kwargs in ({"schema": schema}, {"schema": "fasta", "data_type": data_type}):
+                records = list(dendropy.CharacterMatrix.yield_sequences_from_files(
+                        files=[path],
+                        **kwargs))
+                self.assertEqual(records, expected)
+        data = ">a\nACGU\n>b\nAC!U\n"
+        with self.assertRaises(error.DataParseError):
+            list(dendropy.CharacterMatrix.yield_sequences_from_files(
+                files=[StringIO(data)],
+                schema="rnafasta"))
+        records = list(dendropy.CharacterMatrix.yield_sequences_from_files(
+                files=[StringIO(data)],
+                schema="rnafasta",
+                ignore_invalid_chars=True))
+        self.assertEqual(records, [("a", "ACGU"), ("b", "ACU")])
+
+class SequenceStreamWriterTestCase(dendropytest.ExtendedTestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.char_matrix = dendropy.DnaCharacterMatrix.get(
+                path=pathmap.char_source_path("pythonidae.chars.fasta"),
+                schema="fasta")
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_fasta_writer_matches_matrix_writer(self):
+        for kwargs in ({}, {"wrap": False}):
+            dest = StringIO()
+            with dendropy.DnaCharacterMatrix.get_sequence_stream_writer(
+                    dest,
+                    schema="fasta",
+                    **kwargs) as writer:
+                for taxon in self.char_matrix:
+                    writer.write_sequence(taxon.label, [s.index for s in self.char_matrix[taxon]])
+            self.assertEqual(dest.getvalue(), self.char_matrix.as_string(schema="fasta", **kwargs))
+
+    def test_typed_fasta_writer(self):
+        dest = StringIO()
+        with dendropy.CharacterMatrix.get_sequence_stream_writer(dest, schema="dnafasta") as writer:
+            for taxon in self.char_matrix:
+                writer.write_sequence(taxon.label, [s.index for s in self.char_matrix[taxon]])
+        self.assertEqual(dest.getvalue(), self.char_matrix.as_string(schema="fasta"))
+
+    def test_phylip_round_trip(self):
+        path = os.path.join(self.tempdir, "seqs.phylip")
+        records = dendropy.DnaCharacterMatrix.yield_sequences_from_files(
+                files=[pathmap.char_source_path("pythonidae.chars.fasta")],
+                schema="fasta",
+                as_state_indexes=True)
+        with open(path, "w") as dest:
+            with dendropy.DnaCharacterMatrix.get_sequence_stream_writer(
+                    dest,
+                    schema="phylip",
+                    spaces_to_underscores=True) as writer:
+                writer.write_sequences(r for r in records if not r.label.startswith("Python"))
+        char_matrix = dendropy.DnaCharacterMatrix.get(
+                path=path,
+                schema="phylip",
+                underscores_to_spaces=True)
+        expected = [t for t in self.char_matrix if not t.label.startswith("Python")]
+        self.assertEqual(len(char_matrix), len(expected))
+        for taxon, expected_taxon in zip(char_matrix, expected):
+            self.assertEqual(taxon.label, expected_taxon.label)
+            self.assertEqual(
+                    char_matrix[taxon].symbols_as_string(),
+                    self.char_matrix[expected_taxon].symbols_as_string())
+
+    def test_phylip_writer_errors(self):
+        class Unseekable(object):
+            def write(self, s):
+                pass
+        with self.assertRaises(ValueError):
+            dendropy.DnaCharacterMatrix.get_sequence_stream_writer(Unseekable(), schema="phylip")
+        writer = dendropy.DnaCharacterMatrix.get_sequence_stream_writer(
+                Unseekable(),
+                schema="phylip",
+                ntax=2,
+                nchar=4)
+        writer.write_sequence("a", "ACGT")
+        with self.assertRaises(ValueError):
+            writer.write_sequence("b", "ACG")
+        with self.assertRaises(ValueError):
+            writer.close()
+        dest = StringIO()
+        writer = dendropy.DnaCharacterMatrix.get_sequence_stream_writer(
+                dest,
+                schema="phylip",
+                strict=True)
+        writer.write_sequences([("a", "ACGT"), ("b", "AC-T")])
+        writer.close()
+        self.assertEqual(dest.getvalue().split("\n")[1:], ["a         ACGT", "b         AC-T", ""])
+        self.assertEqual(dest.getvalue().split("\n")[0].strip(), "2 4")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -159,5 +159,107 @@ class NexusTokenizerTestCase(unittest.TestCase):
         self.assertEqual(expected_comments, {})
         self.assertEqual(observed_tokens, expected_tokens)
 
+class NexusTokenizerBufferingTestCase(unittest.TestCase):
+    """
+    Unit tests for NexusTokenizer with tokens, quotes and comments spanning
+    buffer boundaries.
+    """
+
+    def get_tokens(self, input_str, buffer_size, **kwargs):
+        tk = nexusprocessing.NexusTokenizer(
+                src=StringIO(input_str),
+                buffer_size=buffer_size,
+                **kwargs)
+        tokens = []
+        comments = []
+        for token in tk:
+            tokens.append(token)
+            comments.append(tk.pull_captured_comments())
+        return tokens, comments
+
+    def test_tokens_across_buffer_boundaries(self):
+        input_str = "([the [nested] quick]apple_tree:1.5e-3,'banjo''s friend'[fox],  (cucumber_one:2, dogwood)eggplant)rhubarb;"
+        expected_tokens, expected_comments = self.get_tokens(input_str, None)
+        self.assertEqual(expected_tokens, [
+            "(", "apple tree", ":", "1.5e-3", ",", "banjo's friend", ",",
+            "(", "cucumber one", ":", "2", ",", "dogwood", ")", "eggplant",
+            ")", "rhubarb", ";"])
+        self.assertEqual(expected_comments[1], ["the nested quick"])
+        for buffer_size in (1, 2, 3, 5, 8, 13):
+            tokens, comments = self.get_tokens(input_str, buffer_size)
+            self.assertEqual(tokens, expected_tokens)
+            self.assertEqual(comments, expected_comments)
+
+    def test_preserve_underscores(self):
+        input_str = "a_b 'c_d' e_f[x_y]g_h"
+        for buffer_size in (1, 2, None):
+            tokens, comments = self.get_tokens(input_str,
+                    buffer_size,
+                    preserve_unquoted_underscores=True)
+            self.assertEqual(tokens, ["a_b", "c_d", "e_fg_h"])
+            self.assertEqual(comments, [None, None, ["x_y"]])
+
+    def test_capture_eol(self):
+        for buffer_size in (1, 4, None):
+            tk = nexusprocessing.NexusTokenizer(
+                    src=StringIO("a b\nc\n d"),
+                    buffer_size=buffer_size)
+            self.assertEqual(tk.next_token(), "a")
+            tk.set_capture_eol(True)
+            self.assertEqual(tk.next_token(), "b")
+            self.assertEqual(tk.next_token(), "\n")
+            self.assertEqual(tk.next_token(), "c")
+            tk.set_capture_eol(False)
+            self.assertEqual(tk.next_token(), "d")
+            self.assertEqual(tk.next_token(), None)
+            self.assertTrue(tk.is_eof())
+
+    def test_token_location(self):
+        input_str = "first line\n  second [comment\nspanning lines] third\n\n'fourth'"
+        expected = [
+            ("first", 1, 1),
+            ("line", 1, 7),
+            ("second", 2, 4),
+            ("third", 3, 18),
+            ("fourth", 5, 2),
+        ]
+        for buffer_size in (1, 3, 7, None):
+            tk = nexusprocessing.NexusTokenizer(
+                    src=StringIO(input_str),
+                    buffer_size=buffer_size)
+            for token, line_num, col_num in expected:
+                self.assertEqual(tk.next_token(), token)
+                self.assertEqual(tk.token_line_num, line_num)
+                self.assertEqual(tk.token_column_num, col_num)
+            self.assertEqual(tk.next_token(), None)
+            self.assertEqual(tk.current_line_num, 5)
+            self.assertEqual(tk.current_column_num, 9)
+
+    def test_unterminated_quote(self):
+        for buffer_size in (1, 4, None):
+            tk = nexusprocessing.NexusTokenizer(
+                    src=StringIO("abc\n'def ghi"),
+                    buffer_size=buffer_size)
+            self.assertEqual(tk.next_token(), "abc")
+            with self.assertRaises(nexusprocessing.NexusTokenizer.UnterminatedQuoteError) as cm:
+                tk.next_token()
+            self.assertEqual(cm.exception.line_num, 2)
+            self.assertEqual(cm.exception.col_num, 9)
+
+    def test_skip_statement(self):
+        input_str = "(a,'b;c'[;])x'y;z;[x;[y;]];'d''e;'[;]f;g"
+        for buffer_size in (1, 2, 3, 5, None):
+            tk = nexusprocessing.NexusTokenizer(
+                    src=StringIO(input_str),
+                    buffer_size=buffer_size)
+            self.assertTrue(tk.skip_statement(";"))
+            self.assertEqual(tk.next_token(), "z")
+            self.assertEqual(tk.next_token(), ";")
+            self.assertTrue(tk.skip_statement(";"))
+            self.assertTrue(tk.skip_statement(";"))
+            self.assertEqual(tk.next_token(), "g")
+            self.assertFalse(tk.skip_statement(";"))
+            self.assertEqual(tk.pull_captured_comments(), None)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,276 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+Tests for byte-offset indexing of tree files.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import dendropy
+from dendropy.dataio import treeindex
+from dendropy.test.support import dendropytest
+from dendropy.test.support import pathmap
+
+class TreeFileIndexTestCase(dendropytest.ExtendedTestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def copy_source(self, filename):
+        path = os.path.join(self.tempdir, filename)
+        shutil.copy(pathmap.tree_source_path(filename), path)
+        return path
+
+    def write_source(self, filename, data):
+        path = os.path.join(self.tempdir, filename)
+        with open(path, "w") as dest:
+            dest.write(data)
+        return path
+
+    def tree_strings(self, trees):
+        return [t.as_string(schema="newick", suppress_rooting=False) for t in trees]
+
+    def test_index_matches_full_parse(self):
+        for filename, schema in (
+                ("pythonidae.reference-trees.nexus", "nexus"),
+                ("pythonidae.reference-trees.newick", "newick"),
+                ("multitreeblocks.nex", "nexus"),
+                ("curated-with-translate-block-and-no-taxa-block.nex", "nexus"),
+                ):
+            path = self.copy_source(filename)
+            tree_index = treeindex.TreeFileIndex.build(path, schema="nexus/newick")
+            self.assertEqual(tree_index.schema, schema)
+            dataset = dendropy.DataSet.get(path=path, schema=schema)
+            self.assertEqual(tree_index.num_collections, len(dataset.tree_lists))
+            for collection_offset, tree_list in enumerate(dataset.tree_lists):
+                self.assertEqual(tree_index.num_trees(collection_offset), len(tree_list))
+                expected = self.tree_strings(tree_list)
+                for tree_offset in range(len(tree_list)):
+                    tree = tree_index.read_tree(tree_offset, collection_offset)
+                    self.assertEqual(self.tree_strings([tree]), [expected[tree_offset]])
+                trees = tree_index.read_trees(range(len(tree_list)-1, -1, -2), collection_offset)
+                self.assertEqual(self.tree_strings(trees), expected[::-2])
+
+    def test_quotes_and_comments(self):
+        data = "\n".join([
+            "[&R] (a,('b;c',d)[;]);",
+            "[a comment; with [nested; ] semi-colons] ('e''f;',g);",
+            "(h'i,j'k);",
+            ";",
+            "(l,m);",
+            ])
+        path = self.write_source("trees.tre", data)
+        tree_index = treeindex.TreeFileIndex.build(path, schema="newick")
+        self.assertEqual(tree_index.num_trees(), 4)
+        expected = self.tree_strings(dendropy.TreeList.get(
+                data=data,
+                schema="newick"))
+        observed = self.tree_strings(tree_index.read_trees())
+        self.assertEqual(observed, expected)
+
+    def test_tree_get(self):
+        path = self.copy_source("multitreeblocks.nex")
+        dataset = dendropy.DataSet.get(path=path, schema="nexus")
+        for collection_offset, tree_offset in ((0, 0), (1, 1), (2, -1)):
+            tree = dendropy.Tree.get(
+                    path=path,
+                    schema="nexus",
+                    collection_offset=collection_offset,
+                    tree_offset=tree_offset,
+                    tree_index=True)
+            self.assertEqual(
+                    self.tree_strings([tree]),
+                    self.tree_strings([dataset.tree_lists[collection_offset][tree_offset]]))
+            self.assertEqual(tree.label, None)
+
+    def test_tree_list_get(self):
+        path = self.copy_source("pythonidae.reference-trees.nexus")
+        tree_index = treeindex.TreeFileIndex.build(path, schema="nexus")
+        full = dendropy.TreeList.get(path=path, schema="nexus")
+        for tree_offset in (0, 5, -3):
+            trees = dendropy.TreeList.get(
+                    path=path,
+                    schema="nexus",
+                    tree_offset=tree_offset,
+                    tree_index=tree_index)
+            self.assertEqual(self.tree_strings(trees), self.tree_strings(full[tree_offset:]))
+        with self.assertRaises(IndexError):
+            dendropy.TreeList.get(
+                    path=path,
+                    schema="nexus",
+                    tree_offset=len(full),
+                    tree_index=tree_index)
+
+    def test_yield_from_files(self):
+        paths = [
+            self.copy_source("pythonidae.reference-trees.nexus"),
+            self.copy_source("pythonidae.reference-trees.newick"),
+        ]
+        expected = []
+        for path in paths:
+            expected.extend(self.tree_strings(dendropy.TreeList.get(
+                path=path,
+                schema="newick" if path.endswith("newick") else "nexus")[8:]))
+        trees = dendropy.Tree.yield_from_files(
+                files=paths,
+                schema="nexus/newick",
+                tree_index=True,
+                tree_offset=8)
+        self.assertEqual(self.tree_strings(trees), expected)
+        trees = dendropy.Tree.yield_from_files(
+                files=paths,
+                schema="nexus/newick",
+                tree_offset=8)
+        self.assertEqual(self.tree_strings(trees), expected)
+        with self.assertRaises(ValueError):
+            list(dendropy.Tree.yield_from_files(
+                files=paths,
+                schema="nexus",
+                tree_index=True,
+                tree_offset=8))
+
+    def test_yield_from_files_shorter_than_offset(self):
+        paths = [
+            self.copy_source("pythonidae.reference-trees.nexus"),
+            os.path.join(self.tempdir, "short.tre"),
+            self.copy_source("pythonidae.reference-trees.newick"),
+        ]
+        with open(paths[1], "w") as dest:
+            dest.write("(a,(b,c));\n((a,b),c);\n")
+        for kwargs in ({"tree_index": True}, {}):
+            trees = dendropy.Tree.yield_from_files(
+                    files=paths,
+                    schema="nexus/newick",
+                    tree_offset=8,
+                    **kwargs)
+            self.assertEqual(len(list(trees)), 6)
+        tree_index = treeindex.TreeFileIndex.build(paths[1], schema="newick")
+        self.assertEqual(len(tree_index.tree_offsets_from(2)), 0)
+        with self.assertRaises(IndexError):
+            tree_index.read_tree(2)
+        with self.assertRaises(IndexError):
+            dendropy.Tree.get(path=paths[1], schema="newick", tree_offset=2, tree_index=True)
+
+    def test_open_trees_streams(self):
+        path = self.copy_source("pythonidae.reference-trees.nexus")
+        tree_index = treeindex.TreeFileIndex.build(path, schema="nexus")
+        stream = tree_index.open_trees(tree_index.tree_offsets_from(3))
+        # the text is read from the file as needed
+        self.assertIsInstance(stream, treeindex._TreeFileSegmentReader)
+        self.assertEqual(len(stream.read(64)), 64)
+        stream.close()
+        trees = dendropy.TreeList.get(
+                file=tree_index.open_trees(tree_index.tree_offsets_from(3)),
+                schema="nexus")
+        expected = dendropy.TreeList.get(path=path, schema="nexus")
+        self.assertEqual(self.tree_strings(trees), self.tree_strings(expected[3:]))
+
+    def test_split(self):
+        for filename, schema in (
+                ("pythonidae.reference-trees.nexus", "nexus"),
+                ("pythonidae.reference-trees.newick", "newick"),
+                ("multitreeblocks.nex", "nexus"),
+                ("curated-with-translate-block-and-no-taxa-block.nex", "nexus"),
+                ):
+            path = self.copy_source(filename)
+            tree_index = treeindex.TreeFileIndex.build(path, schema=schema)
+            taxon_namespace = dendropy.TaxonNamespace()
+            expected = self.tree_strings(dendropy.Tree.yield_from_files(
+                    files=[path],
+                    schema=schema,
+                    taxon_namespace=taxon_namespace))
+            for num_segments in (1, 2, 4, 100):
+                for tree_offset in (0, 2, 5, 100):
+                    segments = tree_index.split(num_segments, tree_offset=tree_offset)
+                    self.assertTrue(len(segments) <= num_segments + tree_index.num_collections - 1)
+                    observed = []
+                    for segment in segments:
+                        self.assertEqual(segment.tree_offset, tree_offset + len(observed))
+                        trees = self.tree_strings(dendropy.Tree.yield_from_files(
+                                files=[segment.open()],
+                                schema=segment.schema,
+                                taxon_namespace=taxon_namespace))
+                        self.assertEqual(len(trees), len(segment))
+                        observed.extend(trees)
+                    self.assertEqual(observed, expected[tree_offset:])
+        with self.assertRaises(ValueError):
+            tree_index.split(0)
+        with self.assertRaises(ValueError):
+            tree_index.split(2, tree_offset=-1)
+
+    def test_locate_and_scan(self):
+        for filename, schema in (
+                ("pythonidae.reference-trees.nexus", "nexus"),
+                ("pythonidae.reference-trees.newick", "newick"),
+                ("curated-with-translate-block-and-no-taxa-block.nex", "nexus"),
+                ):
+            path = self.copy_source(filename)
+            taxon_namespace = dendropy.TaxonNamespace()
+            expected = self.tree_strings(dendropy.Tree.yield_from_files(
+                    files=[path],
+                    schema=schema,
+                    taxon_namespace=taxon_namespace))
+            for num_segments in (1, 2, 4, 100):
+                segments = treeindex.TreeFileSegment.locate(path, num_segments, schema=schema)
+                self.assertTrue(1 <= len(segments) <= num_segments)
+                observed = []
+                for segment in segments:
+                    self.assertIs(segment.scan(), segment)
+                    trees = self.tree_strings(dendropy.Tree.yield_from_files(
+                            files=[segment.open()],
+                            schema=segment.schema,
+                            taxon_namespace=taxon_namespace))
+                    self.assertEqual(len(trees), len(segment))
+                    observed.extend(trees)
+                self.assertEqual(observed, expected)
+        # segments spanning more than one collection cannot be scanned
+        path = self.copy_source("multitreeblocks.nex")
+        segments = treeindex.TreeFileSegment.locate(path, 1, schema="nexus")
+        with self.assertRaises(ValueError):
+            segments[0].scan()
+        with self.assertRaises(ValueError):
+            treeindex.TreeFileSegment.locate(path, 0)
+
+    def test_sidecar_file(self):
+        path = self.copy_source("pythonidae.reference-trees.newick")
+        index_path = treeindex.TreeFileIndex.sidecar_path(path)
+        tree_index = treeindex.TreeFileIndex.get_for_path(path, schema="newick")
+        self.assertTrue(os.path.exists(index_path))
+        loaded = treeindex.TreeFileIndex.get_for_path(path, schema="newick")
+        self.assertEqual(loaded.file_size, tree_index.file_size)
+        self.assertEqual(loaded._collections, tree_index._collections)
+        # index is rebuilt if file changes
+        with open(path, "a") as dest:
+            dest.write("\n(x,(y,z));\n")
+        self.assertFalse(loaded.is_current())
+        with self.assertRaises(ValueError):
+            loaded.open_trees([0])
+        rebuilt = treeindex.TreeFileIndex.get_for_path(path, schema="newick")
+        self.assertEqual(rebuilt.num_trees(), tree_index.num_trees() + 1)
+        self.assertEqual(
+                treeindex.TreeFileIndex.load(index_path).num_trees(),
+                rebuilt.num_trees())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+
+"""
+Tests for streaming of trees to NEWICK and NEXUS destinations.
+"""
+
+import unittest
+import dendropy
+from dendropy.calculate import treecompare
+from dendropy.utility import error
+from dendropy.test.support import dendropytest
+from dendropy.test.support import pathmap
+try:
+    from StringIO import StringIO # Python 2 legacy support: StringIO in this module is the one needed (not io)
+except ImportError:
+    from io import StringIO # Python 3
+
+class TreeStreamWriterTestCase(dendropytest.ExtendedTestCase):
+
+    def setUp(self):
+        self.tree_list = dendropy.TreeList.get(
+                path=pathmap.tree_source_path("pythonidae.reference-trees.nexus"),
+                schema="nexus")
+
+    def write_stream(self, schema, write_fn, **kwargs):
+        dest = StringIO()
+        with dendropy.Tree.get_tree_stream_writer(dest, schema=schema, **kwargs) as writer:
+            write_fn(writer)
+        self.assertEqual(writer.num_trees_written, len(self.tree_list))
+        return dest.getvalue()
+
+    def assert_same_trees(self, trees1, trees2):
+        self.assertEqual(len(trees1), len(trees2))
+        for tree1, tree2 in zip(trees1, trees2):
+            self.assertEqual(treecompare.symmetric_difference(tree1, tree2), 0)
+            self.assertAlmostEqual(treecompare.euclidean_distance(tree1, tree2), 0)
+
+    def test_writer_matches_tree_list_writer(self):
+        for schema, kwargs in (
+                ("newick", {}),
+                ("newick", {"suppress_edge_lengths": True, "suppress_rooting": True}),
+                ("nexus", {}),
+                ("nexus", {"translate_tree_taxa": True}),
+                ):
+            data = self.write_stream(
+                    schema,
+                    lambda writer: writer.write_trees(tree for tree in self.tree_list),
+                    **kwargs)
+            self.assertEqual(data, self.tree_list.as_string(schema=schema, **kwargs))
+
+    def test_nexus_header_from_taxon_namespace(self):
+        dest = StringIO()
+        taxon_namespace = self.tree_list.taxon_namespace
+        with dendropy.Tree.get_tree_stream_writer(
+                dest,
+                schema="nexus",
+                taxon_namespace=taxon_namespace,
+                translate_tree_taxa=True) as writer:
+            pass
+        trees = dendropy.TreeList.get(data=dest.getvalue(), schema="nexus")
+        self.assertEqual(len(trees), 0)
+        self.assertEqual([t.label for t in trees.taxon_namespace],
+                [t.label for t in taxon_namespace])
+        self.assertEqual(dest.getvalue().count("Translate"), 1)
+
+    def test_tree_array(self):
+        for rooting in ("force-rooted", "force-unrooted"):
+            tree_list = dendropy.TreeList.get(
+                    path=pathmap.tree_source_path("pythonidae.reference-trees.nexus"),
+                    schema="nexus",
+                    rooting=rooting)
+            tree_array = dendropy.TreeArray(
+                    taxon_namespace=tree_list.taxon_namespace,
+                    is_rooted_trees=tree_list[0].is_rooted)
+            tree_array.add_trees(tree_list)
+            for schema in ("newick", "nexus"):
+                data = self.write_stream(schema,
+                        lambda writer: writer.write_tree_array(tree_array),
+                        translate_tree_taxa=True if schema == "nexus" else None,
+                        ignore_unrecognized_keyword_arguments=True)
+                trees = dendropy.TreeList.get(
+                        data=data,
+                        schema=schema,
+                        taxon_namespace=tree_list.taxon_namespace)
+                self.assertEqual(len(trees.taxon_namespace), len(tree_list.taxon_namespace))
+                self.assert_same_trees(trees, tree_list)
+                for tree in trees:
+                    self.assertEqual(tree.is_rooted, tree_list[0].is_rooted)
+
+    def test_split_bitmask_encodings(self):
+        taxon_namespace = dendropy.TaxonNamespace()
+        encodings = list(dendropy.Tree.yield_from_files(
+                files=[pathmap.tree_source_path("pythonidae.reference-trees.newick")],
+                schema="newick",
+                taxon_namespace=taxon_namespace,
+                encode_split_bitmasks=True))
+        dest = StringIO()
+        with dendropy.Tree.get_tree_stream_writer(
+                dest,
+                schema="newick",
+                taxon_namespace=taxon_namespace) as writer:
+            for encoding in encodings:
+                writer.write_split_bitmasks(*encoding)
+        trees = dendropy.TreeList.get(
+                data=dest.getvalue(),
+                schema="newick",
+                taxon_namespace=taxon_namespace)
+        expected = dendropy.TreeList.get(
+                path=pathmap.tree_source_path("pythonidae.reference-trees.newick"),
+                schema="newick",
+                taxon_namespace=taxon_namespace)
+        self.assert_same_trees(trees, expected)
+
+    def test_errors(self):
+        dest = StringIO()
+        writer = dendropy.Tree.get_tree_stream_writer(dest, schema="newick")
+        with self.assertRaises(TypeError):
+            writer.write_split_bitmasks([3, 1, 2])
+        writer.write_tree(self.tree_list[0])
+        with self.assertRaises(error.TaxonNamespaceIdentityError):
+            writer.write_tree(dendropy.Tree.get(data="(a,(b,c));", schema="newick"))
+        with self.assertRaises(ValueError):
+            writer.write_split_bitmasks([3, 6], is_rooted=True)
+        with self.assertRaises(NotImplementedError):
+            dendropy.Tree.get_tree_stream_writer(dest, schema="fasta")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+#! /usr/bin/env python
+
+##############################################################################
+##  DendroPy Phylogenetic Computing Library.
+##
+##  Copyright 2010-2015 Jeet Sukumaran and Mark T. Holder.
+##  All rights reserved.
+##
+##  See "LICENSE.rst" for terms and conditions of usage.
+##
+##  If you use this work or any portion thereof in published work,
+##  please cite it as:
+##
+##     Sukumaran, J. and M. T. Holder. 2010. DendroPy: a Python library
+##     for phylogenetic computing. Bioinformatics 26: 1569-1571.
+##
+##############################################################################
+
+"""
+Tests for the array-based representation of trees.
+"""
+
+import random
+import unittest
+import dendropy
+from dendropy.model import coalescent
+from dendropy.utility import error
+from dendropy.test.support import dendropytest
+from dendropy.test.support import pathmap
+
+class FlatTreeTestCase(dendropytest.ExtendedTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.trees = dendropy.TreeList.get(
+                path=pathmap.tree_source_path("pythonidae.reference-trees.nexus"),
+                schema="nexus")
+        rng = random.Random(1)
+        cls.taxon_namespace = dendropy.TaxonNamespace(
+                ["T{}".format(i) for i in range(30)],
+                label="taxa")
+        cls.ultrametric_trees = [coalescent.pure_kingman_tree(taxon_namespace=cls.taxon_namespace, rng=rng) for i in range(5)]
+
+    def tree_string(self, tree):
+        return tree.as_string(schema="newick", suppress_rooting=False)
+
+    def test_structure(self):
+        tree = dendropy.Tree.get(data="[&R] ((a:1,b:2)x:3,(c:4,d:5,e:6)y:7,f:8)z;", schema="newick")
+        flat_tree = tree.to_flat()
+        self.assertEqual(len(flat_tree), 9)
+        self.assertEqual(list(flat_tree.parent_indices), [-1, 0, 0, 0, 1, 1, 2, 2, 2])
+        self.assertEqual(list(flat_tree.child_offsets), [1, 4, 6, 9, 9, 9, 9, 9, 9, 9])
+        self.assertEqual(list(flat_tree.edge_lengths), [0.0, 3.0, 7.0, 8.0, 1.0, 2.0, 4.0, 5.0, 6.0])
+        self.assertEqual(list(flat_tree.postorder), [4, 5, 1, 6, 7, 8, 2, 3, 0])
+        self.assertEqual(flat_tree.node_labels, ["z", "x", "y", None, None, None, None, None, None])
+        self.assertEqual(list(flat_tree.child_indices(2)), [6, 7, 8])
+        self.assertTrue(flat_tree.is_leaf(3))
+        self.assertFalse(flat_tree.is_leaf(1))
+        self.assertIs(flat_tree.taxon(3), tree.taxon_namespace.get_taxon("f"))
+        self.assertIs(flat_tree.taxon(0), None)
+        self.assertTrue(flat_tree.is_rooted)
+
+    def test_round_trip(self):
+        for tree in list(self.trees) + self.ultrametric_trees:
+            flat_tree = tree.to_flat()
+            tree2 = flat_tree.to_tree()
+            self.assertIs(tree2.taxon_namespace, tree.taxon_namespace)
+            self.assertEqual(self.tree_string(tree2), self.tree_string(tree))
+        tree = dendropy.Tree.get(data="[&U] ((a,b:2)x,c:1,(d)y);", schema="newick")
+        tree2 = tree.to_flat().to_tree()
+        self.assertEqual(self.tree_string(tree2), self.tree_string(tree))
+        self.assertIs(tree2.seed_node.edge.length, None)
+
+    def test_iteration_order(self):
+        for tree in self.trees:
+            flat_tree = tree.to_flat()
+            self.assertEqual(
+                    [flat_tree.taxon(idx) for idx in flat_tree.postorder],
+                    [nd.taxon for nd in tree.postorder_node_iter()])
+            self.assertEqual(
+                    [flat_tree.edge_lengths[idx] for idx in flat_tree.postorder],
+                    [nd.edge.length or 0.0 for nd in tree.postorder_node_iter()])
+            self.assertEqual(
+                    [flat_tree.taxon(idx) for idx in flat_tree.leaf_index_iter()],
+                    [nd.taxon for nd in tree.leaf_node_iter()])
+            self.assertEqual(flat_tree.leaf_taxa(), [nd.taxon for nd in tree.leaf_node_iter()])
+
+    def test_node_ages(self):
+        for tree in self.ultrametric_trees:
+            flat_tree = tree.to_flat()
+            ages = flat_tree.calc_node_ages()
+            tree.calc_node_ages()
+            self.assertEqual(
+                    [ages[idx] for idx in flat_tree.postorder],
+                    [nd.age for nd in tree.postorder_node_iter()])
+            self.assertEqual(flat_tree.node_ages(), tree.node_ages())
+            self.assertEqual(flat_tree.internal_node_ages(), tree.internal_node_ages())
+            self.assertEqual(flat_tree.coalescence_intervals(), tree.coalescence_intervals())
+
+    def test_non_ultrametric_node_ages(self):
+        rng = random.Random(1)
+        for tree in self.trees:
+            tree = tree.clone(1)
+            for nd in tree:
+                nd.edge.length = rng.uniform(0.1, 1.0)
+            flat_tree = tree.to_flat()
+            with self.assertRaises(error.UltrametricityError):
+                flat_tree.calc_node_ages()
+            for kwargs in (
+                    {"force_max_age": True},
+                    {"force_min_age": True},
+                    {"ultrametricity_precision": False},
+                    ):
+                ages = flat_tree.calc_node_ages(**kwargs)
+                tree.calc_node_ages(**kwargs)
+                self.assertEqual(
+                        [ages[idx] for idx in flat_tree.postorder],
+                        [nd.age for nd in tree.postorder_node_iter()])
+            with self.assertRaises(ValueError):
+                flat_tree.calc_node_ages(force_max_age=True, force_min_age=True)
+
+    def test_distances_and_length(self):
+        for tree in self.trees:
+            flat_tree = tree.to_flat()
+            distances = flat_tree.calc_node_root_distances()
+            tree.calc_node_root_distances()
+            for idx, nd in zip(flat_tree.postorder, tree.postorder_node_iter()):
+                self.assertAlmostEqual(distances[idx], nd.root_distance)
+            self.assertAlmostEqual(flat_tree.length(), tree.length())
+
+    def test_encode_bipartitions(self):
+        tree_strings = [self.tree_string(tree) for tree in self.trees]
+        tree_strings.extend([
+            "[&U] ((a,b),(c,d));",
+            "[&U] (a,(b,(c,d)));",
+            "[&U] ((a,b),c,d);",
+            "[&R] ((a,b),(c,d));",
+            "[&R] ((a,((b)),c),(d));",
+            "[&U] (((a,b),(c,d)));",
+            "((a,b),(c,(d,e)));",
+            ])
+        for tree_string in tree_strings:
+            tree = dendropy.Tree.get(data=tree_string, schema="newick")
+            flat_tree = tree.to_flat()
+            bipartitions = flat_tree.encode_bipartitions()
+            expected = tree.encode_bipartitions()
+            self.assertEqual(
+                    [(b.split_bitmask, b.leafset_bitmask, b.tree_leafset_bitmask, b.is_rooted) for b in bipartitions],
+                    [(b.split_bitmask, b.leafset_bitmask, b.tree_leafset_bitmask, b.is_rooted) for b in expected])
+            for b in bipartitions:
+                self.assertFalse(b.is_mutable)
+            self.assertEqual(set(bipartitions), set(expected))
+
+    def test_taxa_not_in_namespace(self):
+        tree = dendropy.Tree.get(data="((a,b),c);", schema="newick")
+        tree.seed_node.new_child(taxon=dendropy.Taxon("d"))
+        with self.assertRaises(ValueError):
+            tree.to_flat()
+
+if __name__ == "__main__":
+    unittest.main()
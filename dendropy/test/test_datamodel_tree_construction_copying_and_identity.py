@@ -23,6 +23,7 @@ Tests basic Tree copying etc.
 import unittest
 import dendropy
 import copy
+import pickle
 from dendropy.test.support import curated_test_tree
 from dendropy.test.support import compare_and_validate
 
@@ -157,6 +158,30 @@ class TestTreeCopying(
                 compare_tree_annotations=True,
                 compare_taxon_annotations=False)
 
+    def test_pickle(self):
+        tree1, anodes1, lnodes1, inodes1 = self.get_tree(suppress_internal_node_taxa=False,
+                suppress_leaf_node_taxa=False)
+        self.add_annotations(tree1)
+        tree1.encode_bipartitions()
+        for idx, nd in enumerate(tree1):
+            nd.custom_value = idx
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            tree2 = pickle.loads(pickle.dumps(tree1, protocol))
+            self.compare_distinct_trees(tree1, tree2,
+                    taxon_namespace_scoped=False,
+                    compare_tree_annotations=True,
+                    compare_taxon_annotations=True)
+            nodes1 = [nd for nd in tree1]
+            nodes2 = [nd for nd in tree2]
+            self.assertEqual(len(nodes1), len(nodes2))
+            for nd1, nd2 in zip(nodes1, nodes2):
+                self.assertIsNot(nd1, nd2)
+                self.assertEqual(nd2.custom_value, nd1.custom_value)
+                self.assertEqual(nd2.edge.length, nd1.edge.length)
+                self.assertEqual(nd2.edge.bipartition, nd1.edge.bipartition)
+                self.assertEqual(nd2.edge.bipartition.leafset_bitmask,
+                        nd1.edge.bipartition.leafset_bitmask)
+
 class TestSpecialTreeConstruction(
         curated_test_tree.CuratedTestTree,
         unittest.TestCase):
@@ -23,6 +23,7 @@ Tests basic Node child management.
 import unittest
 import dendropy
 import copy
+from dendropy.datamodel import basemodel
 from dendropy.test.support import compare_and_validate
 
 class TestNodeConstruction(unittest.TestCase):
@@ -135,6 +136,44 @@ class NodeCloning(compare_and_validate.Comparator, unittest.TestCase):
                     taxon_namespace_scoped=False,
                     compare_tree_annotations=True)
 
+class NodeSlots(unittest.TestCase):
+
+    def test_lazy_state(self):
+        nd = dendropy.Node(label="a")
+        for obj in (nd, nd.edge):
+            self.assertFalse(hasattr(obj, "_annotations"))
+            self.assertIs(obj._comments, None)
+            self.assertFalse(obj.has_comments)
+            self.assertFalse(obj.has_annotations)
+            self.assertEqual(obj.comments, [])
+            obj.comments.append("x")
+            self.assertTrue(obj.has_comments)
+            self.assertEqual(obj.comments, ["x"])
+
+    def test_extension_attributes(self):
+        nd = dendropy.Node(label="a")
+        nd.edge.length = 1.0
+        for obj in (nd, nd.edge, dendropy.Bipartition(bitmask=3)):
+            obj.some_value = 1
+            self.assertEqual(obj.some_value, 1)
+            self.assertEqual(obj.__dict__, {"some_value": 1})
+        nd.annotations.add_bound_attribute("some_value")
+        nd2 = copy.deepcopy(nd)
+        self.assertEqual(nd2.label, "a")
+        self.assertEqual(nd2.edge.length, 1.0)
+        self.assertEqual(nd2.some_value, 1)
+        nd2.some_value = 2
+        self.assertEqual(nd2.annotations.get_value("some_value"), 2)
+        self.assertEqual(nd.annotations.get_value("some_value"), 1)
+
+    def test_deepcopy_without_extension_attributes(self):
+        tree = dendropy.Tree.get(data="((a,b)x,c);", schema="newick")
+        tree2 = copy.deepcopy(tree)
+        for nd in tree2:
+            self.assertIs(basemodel._get_instance_state(nd)[0], None)
+            self.assertIs(basemodel._get_instance_state(nd.edge)[0], None)
+        self.assertEqual(tree2.as_string(schema="newick"), tree.as_string(schema="newick"))
+
 class TestNodeSetChildNodes(unittest.TestCase):
 
     def test_set_child_nodes(self):
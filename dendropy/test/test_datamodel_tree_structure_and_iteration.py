@@ -547,6 +547,192 @@ class TestTreeIterators(curated_test_tree.CuratedTestTree, unittest.TestCase):
             ancestors = [ch.label for ch in nd.ancestor_iter(inclusive=True, filter_fn=filter_fn)]
             self.assertEqual(ancestors, expected_ancestors)
 
+class TestTreeTraversalCaching(curated_test_tree.CuratedTestTree, unittest.TestCase):
+
+    def traversal_labels(self, tree):
+        return (
+            [nd.label for nd in tree.preorder_node_iter()],
+            [nd.label for nd in tree.postorder_node_iter()],
+            [nd.label for nd in tree.leaf_node_iter()],
+            [e.head_node.label for e in tree.postorder_edge_iter()],
+            )
+
+    def expected_traversal_labels(self, tree):
+        return (
+            [nd.label for nd in tree.seed_node.preorder_iter()],
+            [nd.label for nd in tree.seed_node.postorder_iter()],
+            [nd.label for nd in tree.seed_node.leaf_iter()],
+            [nd.label for nd in tree.seed_node.postorder_iter()],
+            )
+
+    def test_repeated_iteration(self):
+        tree, anodes, lnodes, inodes = self.get_tree()
+        for i in range(3):
+            self.assertSequenceEqual([nd.label for nd in tree], self.preorder_sequence)
+            self.assertSequenceEqual([nd.label for nd in tree.postorder_node_iter()], self.postorder_sequence)
+            self.assertSequenceEqual([nd.label for nd in tree.leaf_node_iter()], self.leaf_sequence)
+        cache = tree._traversal_cache
+        list(tree.preorder_node_iter())
+        self.assertIs(tree._traversal_cache, cache)
+
+    def test_iteration_after_structural_changes(self):
+        tree, anodes, lnodes, inodes = self.get_tree()
+        mutators = [
+            lambda: tree.find_node_with_label("g").new_child(label="q"),
+            lambda: tree.find_node_with_label("b").remove_child(tree.find_node_with_label("i")),
+            lambda: tree.find_node_with_label("f").insert_child(0, tree.find_node_with_label("h")),
+            lambda: tree.reseed_at(tree.find_node_with_label("c")),
+            lambda: tree.ladderize(),
+            lambda: tree.find_node_with_label("e").edge.collapse(),
+            lambda: tree.find_node_with_label("h").edge.invert(),
+            lambda: setattr(tree.find_node_with_label("o"), "parent_node", tree.find_node_with_label("n")),
+            lambda: tree.prune_subtree(tree.find_node_with_label("g")),
+            lambda: tree.suppress_unifurcations(),
+            ]
+        for mutator in mutators:
+            self.traversal_labels(tree)
+            mutator()
+            self.assertEqual(self.traversal_labels(tree), self.expected_traversal_labels(tree))
+
+    def test_structural_changes_during_iteration(self):
+        def prune_labelled(nd):
+            if nd.label in ("b", "i", "g", "o", "h"):
+                if nd.parent_node is not None:
+                    nd.parent_node.remove_child(nd)
+        def add_child(nd):
+            if nd.label in ("c", "e", "n"):
+                nd.new_child(label=nd.label + "2")
+        for change in (prune_labelled, add_child):
+            for iter_name, node_iter_name in (
+                    ("preorder_node_iter", "preorder_iter"),
+                    ("postorder_node_iter", "postorder_iter"),
+                    ("leaf_node_iter", "leaf_iter"),
+                    ):
+                observed = []
+                tree1, anodes, lnodes, inodes = self.get_tree()
+                list(getattr(tree1, iter_name)())
+                for nd in getattr(tree1, iter_name)():
+                    observed.append(nd.label)
+                    change(nd)
+                expected = []
+                tree2, anodes, lnodes, inodes = self.get_tree()
+                for nd in getattr(tree2.seed_node, node_iter_name)():
+                    expected.append(nd.label)
+                    change(nd)
+                self.assertEqual(observed, expected)
+                self.assertEqual(self.traversal_labels(tree1), self.expected_traversal_labels(tree2))
+
+    def test_changes_to_other_trees(self):
+        tree1, anodes, lnodes, inodes = self.get_tree()
+        list(tree1.preorder_node_iter())
+        cache = tree1._traversal_cache
+        tree2, anodes, lnodes, inodes = self.get_tree()
+        list(tree2.preorder_node_iter())
+        tree2.find_node_with_label("g").new_child(label="q")
+        tree2.reseed_at(tree2.find_node_with_label("c"))
+        tree3 = dendropy.Tree.get(data="((a,b),(c,d));", schema="newick")
+        for nd in tree1:
+            self.assertIs(tree1._traversal_cache, cache)
+        self.assertTrue(cache.is_current)
+        self.assertEqual(self.traversal_labels(tree1), self.expected_traversal_labels(tree1))
+        self.assertEqual(self.traversal_labels(tree2), self.expected_traversal_labels(tree2))
+        tree1.find_node_with_label("g").new_child(label="q")
+        self.assertFalse(cache.is_current)
+        self.assertEqual(self.traversal_labels(tree1), self.expected_traversal_labels(tree1))
+
+    def test_copying(self):
+        tree1, anodes, lnodes, inodes = self.get_tree()
+        list(tree1.postorder_node_iter())
+        tree2 = tree1.clone(2)
+        self.assertIs(tree2._traversal_cache, None)
+        self.assertEqual(self.traversal_labels(tree2), self.traversal_labels(tree1))
+        nodes2 = set(tree2.preorder_node_iter())
+        for nd in tree1:
+            self.assertNotIn(nd, nodes2)
+
+
+class TestTreeMrca(curated_test_tree.CuratedTestTree, unittest.TestCase):
+
+    def expected_mrca(self, nodes):
+        ancestors = None
+        for nd in nodes:
+            nd_ancestors = list(nd.ancestor_iter(inclusive=True))
+            if ancestors is None:
+                ancestors = nd_ancestors
+            else:
+                ancestors = [anc for anc in ancestors if anc in nd_ancestors]
+        return ancestors[0]
+
+    def test_node_mrca(self):
+        tree, anodes, lnodes, inodes = self.get_tree()
+        lca_index = tree._get_lca_index()
+        for nd1 in anodes:
+            self.assertEqual(lca_index.depth(nd1), nd1.level())
+            for nd2 in anodes:
+                expected = self.expected_mrca([nd1, nd2])
+                self.assertIs(lca_index.mrca(nd1, nd2), expected)
+                self.assertIs(tree.mrca(nodes=[nd1, nd2]), expected)
+                self.assertEqual(lca_index.is_ancestor(nd1, nd2), expected is nd1)
+        nodes = sorted(anodes, key=lambda nd: nd.label)
+        for i in range(len(nodes)):
+            for j in range(i+1, len(nodes)):
+                self.assertIs(tree.mrca(nodes=nodes[i:j]), self.expected_mrca(nodes[i:j]))
+
+    def test_taxon_mrca(self):
+        tree, anodes, lnodes, inodes = self.get_tree(suppress_leaf_node_taxa=False)
+        taxon_leaf_map = dict((nd.taxon, nd) for nd in lnodes)
+        taxa = sorted(taxon_leaf_map, key=lambda t: t.label)
+        for i in range(len(taxa)):
+            for j in range(i+1, len(taxa)+1):
+                expected = self.expected_mrca([taxon_leaf_map[t] for t in taxa[i:j]])
+                self.assertIs(tree.mrca(taxa=taxa[i:j]), expected)
+                self.assertIs(tree.mrca(taxon_labels=[t.label for t in taxa[i:j]]), expected)
+                bitmask = tree.taxon_namespace.taxa_bitmask(taxa=taxa[i:j])
+                self.assertIs(tree.mrca(leafset_bitmask=bitmask), expected)
+        c = tree.find_node_with_label("c")
+        self.assertIs(tree.mrca(taxon_labels=["o", "p"], start_node=c), tree.find_node_with_label("h"))
+        self.assertIs(tree.mrca(taxon_labels=["i", "p"], start_node=c), None)
+        self.assertIs(tree.mrca(taxa=[dendropy.Taxon("x")]), None)
+        with self.assertRaises(KeyError):
+            tree.mrca(taxon_labels=["x"])
+        with self.assertRaises(ValueError):
+            tree.mrca(leafset_bitmask=0)
+
+    def test_mrca_after_structural_changes(self):
+        tree, anodes, lnodes, inodes = self.get_tree(suppress_leaf_node_taxa=False)
+        lca_index = tree._get_lca_index()
+        self.assertIs(tree._get_lca_index(), lca_index)
+        o = tree.find_node_with_label("o")
+        j = tree.find_node_with_label("j")
+        self.assertIs(tree.mrca(taxa=[o.taxon, j.taxon]), tree.seed_node)
+        o.parent_node.remove_child(o)
+        tree.find_node_with_label("k").add_child(o)
+        self.assertIsNot(tree._get_lca_index(), lca_index)
+        self.assertIs(tree.mrca(taxa=[o.taxon, j.taxon]), tree.find_node_with_label("e"))
+        tree.reseed_at(tree.find_node_with_label("k"))
+        self.assertIs(tree.mrca(taxa=[o.taxon, j.taxon]), tree.find_node_with_label("k"))
+        # reassigning taxa does not change the structure of the tree
+        o.taxon, j.taxon = j.taxon, o.taxon
+        self.assertIs(tree.mrca(taxa=[o.taxon]), o)
+        for nd in tree:
+            for nd2 in tree:
+                self.assertIs(tree.mrca(nodes=[nd, nd2]), self.expected_mrca([nd, nd2]))
+
+    def test_mrca_with_unifurcations(self):
+        tree = dendropy.Tree.get(
+                data="((((a,b,c)x)y,d)z)r;",
+                schema="newick",
+                suppress_internal_node_taxa=True)
+        # the shallowest node with exactly the leafset of the taxa
+        self.assertIs(tree.mrca(taxon_labels=["a", "b", "c"]), tree.find_node_with_label("y"))
+        self.assertIs(tree.mrca(taxon_labels=["a", "b", "c", "d"]), tree.find_node_with_label("r"))
+        self.assertIs(tree.mrca(taxon_labels=["a", "b", "c", "d"], start_node=tree.find_node_with_label("z")),
+                tree.find_node_with_label("z"))
+        # not an ancestor of a unifurcation if the leafset is not exact
+        self.assertIs(tree.mrca(taxon_labels=["a", "b"]), tree.find_node_with_label("x"))
+        self.assertIs(tree.mrca(taxon_labels=["a", "d"]), tree.find_node_with_label("z"))
+        self.assertIs(tree.mrca(taxon_labels=["a"]), tree.find_node_with_taxon_label("a"))
+
 class TreeRootingState(dendropytest.ExtendedTestCase):
 
     def test_is_rooted(self):
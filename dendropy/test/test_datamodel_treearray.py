@@ -19,6 +19,10 @@
 import unittest
 from dendropy.test.support import pathmap
 import dendropy
+try:
+    from StringIO import StringIO # Python 2 legacy support: StringIO in this module is the one needed (not io)
+except ImportError:
+    from io import StringIO # Python 3
 
 class TreeArrayBasicTreeAccession(unittest.TestCase):
 
@@ -54,6 +58,104 @@ class TreeArrayBasicTreeAccession(unittest.TestCase):
             tree_array.add_tree(tree)
         self.verify_tree_array(tree_array, trees)
 
+    def test_read_from_files_with_split_bitmask_encoding(self):
+        trees = self.get_trees()
+        tree_array = dendropy.TreeArray(taxon_namespace=trees.taxon_namespace)
+        tree_array.read_from_files(
+                files=[pathmap.tree_source_path("pythonidae.reference-trees.nexus")],
+                schema="nexus",
+                encode_split_bitmasks=True)
+        self.verify_tree_array(tree_array, trees)
+
+class TreeArraySplitBitmaskEncodingTestCase(unittest.TestCase):
+
+    def get_tree_array(self, sources, schema, encode_split_bitmasks, **kwargs):
+        tree_array = dendropy.TreeArray(
+                taxon_namespace=dendropy.TaxonNamespace(),
+                ignore_edge_lengths=kwargs.pop("ignore_edge_lengths", False))
+        tree_array.read_from_files(
+                files=sources,
+                schema=schema,
+                encode_split_bitmasks=encode_split_bitmasks,
+                **kwargs)
+        return tree_array
+
+    def tree_array_contents(self, tree_array):
+        split_distribution = tree_array.split_distribution
+        return (
+                list(tree_array._tree_split_bitmasks),
+                list(tree_array._tree_edge_lengths),
+                list(tree_array._tree_leafset_bitmasks),
+                list(tree_array._tree_weights),
+                tree_array.is_rooted_trees,
+                dict(split_distribution.split_counts),
+                dict(split_distribution.split_edge_lengths),
+                split_distribution.total_trees_counted,
+                split_distribution.sum_of_tree_weights,
+                [t.label for t in tree_array.taxon_namespace],
+                )
+
+    def verify_encoding(self, source_factory, schema, **kwargs):
+        expected = self.tree_array_contents(self.get_tree_array(
+                source_factory(), schema, False, **dict(kwargs)))
+        observed = self.tree_array_contents(self.get_tree_array(
+                source_factory(), schema, True, **dict(kwargs)))
+        self.assertEqual(observed, expected)
+
+    def test_tree_statements(self):
+        tree_strings = [
+            "((a:1,b:2):3,(c:4,d:5):6);",
+            "((a:1,b:2):3,c:4,(d,e));",
+            "(((a:1):2,b:2):3,((c:4):1):6);",
+            "((((a:1):2):3):4,(b,(c,d)));",
+            "((a:1,b:2):3,(c:4):6);",
+            "((a,b)x:1,(c,d)y:2)r:3;",
+            "(((a,b)));",
+            "('a b':1,'c':2,d_e:3);",
+            "[&W 1/2] ((a,b),(c,d));\n[&W 0.25][&R] ((a,c),(b,d));",
+        ]
+        for tree_string in tree_strings:
+            for rooting in (None, "force-rooted", "force-unrooted", "default-rooted"):
+                for ignore_edge_lengths in (False, True):
+                    self.verify_encoding(
+                            lambda: [StringIO(tree_string)],
+                            "newick",
+                            rooting=rooting,
+                            ignore_edge_lengths=ignore_edge_lengths,
+                            store_tree_weights=True)
+
+    def test_tree_files(self):
+        for filename, schema in (
+                ("pythonidae.reference-trees.nexus", "nexus"),
+                ("pythonidae.reference-trees.newick", "newick"),
+                ("curated-with-translate-block-and-no-taxa-block.nex", "nexus"),
+                ):
+            for rooting in (None, "force-rooted"):
+                self.verify_encoding(
+                        lambda: [pathmap.tree_source_path(filename)],
+                        schema,
+                        rooting=rooting)
+
+    def test_split_bitmask_encoding(self):
+        tree_yielder = dendropy.Tree.yield_from_files(
+                files=[StringIO("[&W 0.5][&R] ((a:1,b:2):3,(c:4,d:5):6);")],
+                schema="newick",
+                store_tree_weights=True,
+                encode_split_bitmasks=True)
+        encodings = list(tree_yielder)
+        self.assertEqual(len(encodings), 1)
+        encoding = encodings[0]
+        self.assertTrue(isinstance(encoding, dendropy.dataio.newickreader.SplitBitmaskEncoding))
+        self.assertEqual(encoding.leafset_bitmask, 15)
+        self.assertEqual(encoding.weight, 0.5)
+        self.assertEqual(sorted(encoding.split_bitmasks), [1, 2, 3, 4, 8, 12, 15])
+        # statements with comments are built as trees
+        tree_yielder = dendropy.Tree.yield_from_files(
+                files=[StringIO("((a:1,b:2)[&x=1]:3,(c:4,d:5):6);")],
+                schema="newick",
+                encode_split_bitmasks=True)
+        self.assertTrue(isinstance(list(tree_yielder)[0], dendropy.Tree))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -850,12 +850,14 @@ class PhylogeneticDistanceMatrixCloneTest(unittest.TestCase):
         for src, dest in (
                     (pdm0._taxon_phylogenetic_distances, pdm1._taxon_phylogenetic_distances,),
                     (pdm0._taxon_phylogenetic_path_steps, pdm1._taxon_phylogenetic_path_steps,),
-                    (pdm0._mrca, pdm1._mrca,),
                 ):
             self.assertIsNot(src, dest)
             for t1 in src:
                 self.assertIn(t1, dest)
                 self.assertIsNot(src[t1], dest[t1])
+        self.assertIsNot(pdm0._taxon_leaf_nodes, pdm1._taxon_leaf_nodes)
+        self.assertEqual(pdm0._taxon_leaf_nodes, pdm1._taxon_leaf_nodes)
+        self.assertIs(pdm0._lca_index, pdm1._lca_index)
         for t1 in self.tree.taxon_namespace:
             for t2 in self.tree.taxon_namespace:
                 self.assertEqual(pdm0.patristic_distance(t1, t2), pdm1.patristic_distance(t1, t2))
@@ -103,7 +103,7 @@ class RandomlyReorientTest(unittest.TestCase):
         for i in range(50):
             changing.randomly_reorient(rng=rng, update_bipartitions=True)
             self.assertNotEqual(str(changing), n)
-            changing._debug_check_tree(logger_obj=_LOG, check_bipartitions=True)
+            changing._debug_check_tree(logger_obj=_LOG, check_bipartitions=True, check_bipartition_encoding=True)
             d = treecompare.symmetric_difference(ref, changing, is_bipartitions_updated=False)
             if d != 0:
                 self.fail("\n{}\n!=\n{}\nRF={}".format(str(ref), str(changing), d))
@@ -680,11 +680,13 @@ class TreeRerootingTests(dendropytest.ExtendedTestCase):
                         tree._debug_check_tree(
                                 logger_obj=_LOG,
                                 check_bipartitions=True,
+                                check_bipartition_encoding=True,
                                 unique_bipartition_edge_mapping=True)
                     else:
                         tree._debug_check_tree(
                                 logger_obj=_LOG,
                                 check_bipartitions=True,
+                                check_bipartition_encoding=True,
                                 unique_bipartition_edge_mapping=False)
 
                     # check that traversal is as expected
@@ -768,6 +770,175 @@ class ResolvePolytomiesTestCase(dendropytest.ExtendedTestCase):
                 for rng in (MockRandom(), None):
                     self.verify_resolve_polytomies(tree_string2, rng)
 
+class IncrementalBipartitionUpdateTestCase(dendropytest.ExtendedTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.trees = dendropy.TreeList.get(
+                path=pathmap.tree_source_path("pythonidae.reference-trees.nexus"),
+                schema="nexus")
+
+    def get_tree_pair(self, tree, is_rooted):
+        tree1 = tree.clone(1)
+        tree1.is_rooted = is_rooted
+        tree1.encode_bipartitions()
+        tree1.bipartition_edge_map
+        tree2 = tree1.clone(1)
+        return tree1, tree2, list(tree1.preorder_node_iter()), list(tree2.preorder_node_iter())
+
+    def verify_update(self, tree1, tree2):
+        # ``tree1`` is updated incrementally, ``tree2`` encoded afresh
+        tree2.encode_bipartitions()
+        self.assertEqual(
+                tree1.as_string(schema="newick", suppress_rooting=False),
+                tree2.as_string(schema="newick", suppress_rooting=False))
+        self.assertEqual(tree1.is_rooted, tree2.is_rooted)
+        self.assertEqual(
+                [(b.split_bitmask, b.leafset_bitmask, b.tree_leafset_bitmask, b.is_rooted) for b in tree1.bipartition_encoding],
+                [(b.split_bitmask, b.leafset_bitmask, b.tree_leafset_bitmask, b.is_rooted) for b in tree2.bipartition_encoding])
+        tree1._debug_check_tree(
+                logger_obj=_LOG,
+                check_bipartitions=True,
+                check_bipartition_encoding=True,
+                unique_bipartition_edge_mapping=True)
+
+    def test_rerooting(self):
+        for tree in self.trees[:3]:
+            for is_rooted in (True, False):
+                for idx in range(1, 40, 3):
+                    tree1, tree2, nodes1, nodes2 = self.get_tree_pair(tree, is_rooted)
+                    if nodes1[idx].is_internal():
+                        tree1.reseed_at(nodes1[idx], update_bipartitions=True)
+                        tree2.reseed_at(nodes2[idx], update_bipartitions=False)
+                        self.verify_update(tree1, tree2)
+                        tree1.reroot_at_node(nodes1[idx - 1], update_bipartitions=True)
+                        tree2.reroot_at_node(nodes2[idx - 1], update_bipartitions=False)
+                        self.verify_update(tree1, tree2)
+                    else:
+                        tree1.to_outgroup_position(nodes1[idx], update_bipartitions=True)
+                        tree2.to_outgroup_position(nodes2[idx], update_bipartitions=False)
+                        self.verify_update(tree1, tree2)
+                        if nodes1[idx - 1] is tree1.seed_node:
+                            continue
+                        tree1.reroot_at_edge(nodes1[idx - 1].edge, 0.1, 0.2, update_bipartitions=True)
+                        tree2.reroot_at_edge(nodes2[idx - 1].edge, 0.1, 0.2, update_bipartitions=False)
+                        self.verify_update(tree1, tree2)
+
+    def test_randomly_reorient(self):
+        for tree in self.trees[:3]:
+            for is_rooted in (True, False):
+                tree1, tree2, nodes1, nodes2 = self.get_tree_pair(tree, is_rooted)
+                rng1 = MockRandom()
+                rng2 = MockRandom()
+                for i in range(20):
+                    tree1.randomly_reorient(rng=rng1, update_bipartitions=True)
+                    tree2.randomly_reorient(rng=rng2, update_bipartitions=False)
+                    self.verify_update(tree1, tree2)
+
+    def test_prune_taxa(self):
+        rng = MockRandom()
+        for tree in self.trees[:3]:
+            for is_rooted in (True, False):
+                tree1, tree2, nodes1, nodes2 = self.get_tree_pair(tree, is_rooted)
+                taxa = rng.sample(list(tree1.taxon_namespace), 10)
+                tree1.prune_taxa(taxa, update_bipartitions=True)
+                tree2.prune_taxa(taxa, update_bipartitions=False)
+                self.verify_update(tree1, tree2)
+
+    def test_collapse_and_resolve(self):
+        for tree in self.trees[:3]:
+            for is_rooted in (True, False):
+                tree1, tree2, nodes1, nodes2 = self.get_tree_pair(tree, is_rooted)
+                for nodes in (nodes1, nodes2):
+                    for nd in nodes[::4]:
+                        nd.edge.length = 0.0
+                tree1.encode_bipartitions()
+                tree1.collapse_unweighted_edges(update_bipartitions=True)
+                tree2.collapse_unweighted_edges(update_bipartitions=False)
+                self.verify_update(tree1, tree2)
+                for rng1, rng2 in ((None, None), (MockRandom(), MockRandom())):
+                    tree1.resolve_polytomies(rng=rng1, update_bipartitions=True)
+                    tree2.resolve_polytomies(rng=rng2, update_bipartitions=False)
+                    self.verify_update(tree1, tree2)
+
+    def test_duplicate_bipartitions(self):
+        # unifurcations left in the tree give edges with equal bipartitions
+        tree = dendropy.Tree.get(
+                data="[&R] (((T2:0.4,(T5:0.1,T3:0.1):0.3):0.28,T1:0.69):0.34,(T4:0.29,T0:0.29):0.74):1.4;",
+                schema="newick")
+        tree.encode_bipartitions()
+        tree.bipartition_edge_map
+        for label in ("T5", "T4"):
+            tree.to_outgroup_position(
+                    tree.find_node_with_taxon_label(label),
+                    update_bipartitions=True,
+                    suppress_unifurcations=False)
+        for i in range(2):
+            tree.collapse_unweighted_edges(0.3, update_bipartitions=True)
+        tree._debug_check_tree(
+                logger_obj=_LOG,
+                check_bipartitions=True,
+                check_bipartition_encoding=True,
+                unique_bipartition_edge_mapping=False)
+        # as when the map is built afresh
+        expected = {}
+        for edge in tree.postorder_edge_iter():
+            expected[edge.bipartition] = edge
+        self.assertEqual(len(tree.bipartition_edge_map), len(expected))
+        for bipartition, edge in expected.items():
+            self.assertIs(tree.bipartition_edge_map[bipartition], edge)
+
+    def test_unifurcations_left_before_update(self):
+        # unifurcations left elsewhere in the tree are suppressed too
+        for is_rooted in (True, False):
+            tree1 = dendropy.Tree.get(
+                    data="(((A:1,B:1):1,((C:1,D:1):1):1):1,(E:1,F:1):1,((G:1,H:1):1):1);",
+                    schema="newick",
+                    rooting="force-rooted" if is_rooted else "force-unrooted")
+            tree1.encode_bipartitions(suppress_unifurcations=False)
+            tree1.bipartition_edge_map
+            tree2 = tree1.clone(1)
+            tree1.reroot_at_edge(tree1.find_node_with_taxon_label("E").edge, 0.5, 0.5, update_bipartitions=True)
+            tree2.reroot_at_edge(tree2.find_node_with_taxon_label("E").edge, 0.5, 0.5, update_bipartitions=False)
+            self.verify_update(tree1, tree2)
+            self.assertFalse([nd for nd in tree1 if len(nd.child_nodes()) == 1])
+        for tree in self.trees[:3]:
+            for is_rooted in (True, False):
+                for idx in range(2, 40, 5):
+                    tree1, tree2, nodes1, nodes2 = self.get_tree_pair(tree, is_rooted)
+                    if not nodes1[idx].is_internal():
+                        continue
+                    tree1.reroot_at_node(nodes1[idx], update_bipartitions=True, suppress_unifurcations=False)
+                    tree2.reroot_at_node(nodes2[idx], update_bipartitions=True, suppress_unifurcations=False)
+                    leaf_idx = [i for i, nd in enumerate(nodes1) if nd.is_leaf()][-1]
+                    tree1.reroot_at_edge(nodes1[leaf_idx].edge, 0.1, 0.2, update_bipartitions=True)
+                    tree2.reroot_at_edge(nodes2[leaf_idx].edge, 0.1, 0.2, update_bipartitions=False)
+                    self.verify_update(tree1, tree2)
+
+    def test_mutable_bipartitions_before_update(self):
+        # bipartitions last encoded as mutable are encoded afresh
+        for tree in self.trees[:3]:
+            for is_rooted in (True, False):
+                for idx in range(2, 40, 5):
+                    tree1, tree2, nodes1, nodes2 = self.get_tree_pair(tree, is_rooted)
+                    if not nodes1[idx].is_internal():
+                        continue
+                    tree1.encode_bipartitions(is_bipartitions_mutable=True)
+                    tree1.reroot_at_node(nodes1[idx], update_bipartitions=True)
+                    tree2.reroot_at_node(nodes2[idx], update_bipartitions=False)
+                    self.verify_update(tree1, tree2)
+                    self.assertEqual(len(tree1.bipartition_edge_map), len(tree2.bipartition_edge_map))
+                    self.assertFalse([b for b in tree1.bipartition_encoding if b.is_mutable])
+
+    def test_tree_changed_since_encoding(self):
+        tree1, tree2, nodes1, nodes2 = self.get_tree_pair(self.trees[0], True)
+        for nodes in (nodes1, nodes2):
+            leaf = [nd for nd in nodes if nd.is_leaf()][5]
+            leaf.parent_node.remove_child(leaf)
+        tree1.reroot_at_node(nodes1[3], update_bipartitions=True)
+        tree2.reroot_at_node(nodes2[3], update_bipartitions=False)
+        self.verify_update(tree1, tree2)
+
 class TreeRestructuring(dendropytest.ExtendedTestCase):
 
     def test_collapse_basal_bifurcation(self):
@@ -25,6 +25,14 @@ import time
 import os
 import sys
 import re
+import io
+import gzip
+import bz2
+import zlib
+try:
+    import lzma
+except ImportError:
+    lzma = None
 from threading import Event, Thread, Lock
 
 from dendropy.utility import messaging
@@ -59,6 +67,198 @@ def pre_py34_open(file,
             mode=mode,
             buffering=buffering)
 
+###############################################################################
+## Compressed Files
+
+# Magic bytes at the start of files compressed in the supported formats.
+COMPRESSION_MAGIC = (
+    ("gzip", b"\x1f\x8b"),
+    ("bz2", b"BZh"),
+    ("xz", b"\xfd7zXZ\x00"),
+)
+COMPRESSION_FORMATS = tuple(compression for compression, magic in COMPRESSION_MAGIC)
+
+# Size of the buffer of data read from or written to compressed files: the
+# (de)compressors are called once per buffer-full instead of for every small
+# read or write of the text layer above them.
+COMPRESSED_STREAM_BUFFER_SIZE = 1 << 20
+
+def _get_magic_compression(head):
+    for compression, magic in COMPRESSION_MAGIC:
+        if head.startswith(magic):
+            return compression
+    return None
+
+def get_path_compression(path):
+    """
+    Returns the name of the compression format ("gzip", "bz2", or "xz") of the
+    file at ``path``, as given by its leading magic bytes, or |None| if the
+    file is not compressed in a supported format.
+    """
+    max_magic_len = max(len(magic) for compression, magic in COMPRESSION_MAGIC)
+    with open(path, "rb") as src:
+        head = src.read(max_magic_len)
+    return _get_magic_compression(head)
+
+def _open_compressed_file(path, compression, mode):
+    if compression == "gzip":
+        return gzip.GzipFile(path, mode)
+    elif compression == "bz2":
+        return bz2.BZ2File(path, mode)
+    elif compression == "xz":
+        if lzma is None:
+            raise NotImplementedError("'xz' compression requires the 'lzma' module")
+        return lzma.LZMAFile(path, mode)
+    else:
+        raise ValueError("Unsupported compression format: '{}' (expecting one of: {})".format(compression, ", ".join(COMPRESSION_FORMATS)))
+
+class _DecompressingSourceReader(io.RawIOBase):
+    """
+    Decompresses the data read from a binary stream with decompressors
+    created by ``decompressor_factory`` (one for each of a concatenation of
+    compressed streams). On Python 2, ``gzip.GzipFile`` requires seekable
+    files, and ``bz2.BZ2File`` can only read files given by path.
+    """
+
+    def __init__(self, src, decompressor_factory):
+        io.RawIOBase.__init__(self)
+        self.src = src
+        self._decompressor_factory = decompressor_factory
+        self._decompressor = decompressor_factory()
+        self._pending = b""
+        self._data = b""
+
+    def readable(self):
+        return True
+
+    def fileno(self):
+        return self.src.fileno()
+
+    def readinto(self, b):
+        while not self._data:
+            if self._pending:
+                block, self._pending = self._pending, b""
+            else:
+                block = self.src.read(COMPRESSED_STREAM_BUFFER_SIZE)
+            if not block:
+                return 0
+            try:
+                self._data = self._decompressor.decompress(block)
+            except EOFError:
+                # the block starts another compressed stream
+                self._decompressor = self._decompressor_factory()
+                self._pending = block
+                continue
+            if self._decompressor.unused_data:
+                self._pending = self._decompressor.unused_data
+                self._decompressor = self._decompressor_factory()
+        size = min(len(b), len(self._data))
+        b[:size] = self._data[:size]
+        self._data = self._data[size:]
+        return size
+
+def _open_compressed_source(src, compression):
+    if compression == "gzip":
+        if sys.version_info.major < 3:
+            return _DecompressingSourceReader(src, lambda: zlib.decompressobj(16 + zlib.MAX_WBITS))
+        return gzip.GzipFile(fileobj=src, mode="rb")
+    elif compression == "bz2":
+        if sys.version_info.major < 3:
+            return _DecompressingSourceReader(src, bz2.BZ2Decompressor)
+        return bz2.BZ2File(src, "rb")
+    elif compression == "xz":
+        if lzma is None:
+            raise NotImplementedError("'xz' compression requires the 'lzma' module")
+        return lzma.LZMAFile(src, "rb")
+    else:
+        raise ValueError("Unsupported compression format: '{}' (expecting one of: {})".format(compression, ", ".join(COMPRESSION_FORMATS)))
+
+def _get_compressed_file_types():
+    compressed_file_types = [gzip.GzipFile, bz2.BZ2File, _DecompressingSourceReader]
+    if lzma is not None:
+        compressed_file_types.append(lzma.LZMAFile)
+    return tuple(compressed_file_types)
+
+class _CompressedSourceReader(io.BufferedReader):
+    """
+    Buffered reader of the data decompressed from ``src`` by ``raw``, which
+    closes ``src`` (which the decompressing file objects leave open) when
+    closed.
+    """
+
+    def __init__(self, raw, src):
+        io.BufferedReader.__init__(self, raw, buffer_size=COMPRESSED_STREAM_BUFFER_SIZE)
+        self._src = src
+
+    def close(self):
+        try:
+            io.BufferedReader.close(self)
+        finally:
+            self._src.close()
+
+def open_source_path(path):
+    """
+    Returns a text stream, with universal newlines, over the contents of the
+    file at ``path``, which are decompressed on the fly if the file is
+    compressed in one of the supported formats (as given by its leading
+    magic bytes). The file is opened only once, so that it can be a pipe.
+    On Python 2, the stream yields byte strings, and line endings are only
+    translated for uncompressed regular files.
+    """
+    src = io.open(path, "rb")
+    try:
+        max_magic_len = max(len(magic) for compression, magic in COMPRESSION_MAGIC)
+        compression = _get_magic_compression(src.peek(max_magic_len)[:max_magic_len])
+        if compression is None:
+            if sys.version_info.major >= 3:
+                return io.TextIOWrapper(src, newline=None)
+            if src.seekable():
+                src.close()
+                return pre_py34_open(path, "r")
+            return src
+        stream = _CompressedSourceReader(_open_compressed_source(src, compression), src)
+    except:
+        src.close()
+        raise
+    if sys.version_info.major < 3:
+        return stream
+    return io.TextIOWrapper(stream, newline=None)
+
+def _open_compressed_byte_stream(path, compression, mode):
+    # On Python 2, the writers work with byte strings, as with uncompressed
+    # files; the 'bz2' module there is not compatible with the 'io' module,
+    # but buffers its data itself.
+    compressed_file = _open_compressed_file(path, compression, mode)
+    if not isinstance(compressed_file, io.IOBase):
+        return compressed_file
+    return io.BufferedWriter(compressed_file, buffer_size=COMPRESSED_STREAM_BUFFER_SIZE)
+
+def open_destination_path(path, compression=None):
+    """
+    Returns a text stream writing to the file at ``path``, which is
+    compressed on the fly in the format given by ``compression`` ("gzip",
+    "bz2", or "xz"), unless this is |None|.
+    """
+    if compression is None:
+        return open(path, "w")
+    stream = _open_compressed_byte_stream(path, compression, "wb")
+    if sys.version_info.major < 3:
+        return stream
+    return io.TextIOWrapper(stream)
+
+def is_compressed_stream(stream):
+    """
+    Returns |True| if ``stream`` (or a stream underlying it) decompresses or
+    compresses the data of a file, i.e., if the data of the stream is not
+    that of the file descriptor of the stream (if any).
+    """
+    compressed_file_types = _get_compressed_file_types()
+    while stream is not None:
+        if isinstance(stream, compressed_file_types):
+            return True
+        stream = getattr(stream, "buffer", None) or getattr(stream, "raw", None)
+    return False
+
 ###############################################################################
 ## LineReadingThread
 
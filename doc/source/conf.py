@@ -231,10 +231,16 @@ rst_prolog = """
 .. |Node| replace:: :class:`~dendropy.datamodel.treemodel.Node`
 .. |Edge| replace:: :class:`~dendropy.datamodel.treemodel.Edge`
 .. |Bipartition| replace:: :class:`~dendropy.datamodel.treemodel.Bipartition`
+.. |FlatTree| replace:: :class:`~dendropy.datamodel.flattreemodel.FlatTree`
 .. |TreeList| replace:: :class:`~dendropy.datamodel.treecollectionmodel.TreeList`
 .. |TreeArray| replace:: :class:`~dendropy.datamodel.treecollectionmodel.TreeArray`
 .. |SplitDistribution| replace:: :class:`~dendropy.datamodel.treecollectionmodel.SplitDistribution`
 .. |SplitDistributionSummarizer| replace:: :class:`~dendropy.datamodel.treecollectionmodel.SplitDistributionSummarizer`
+.. |SplitBitmaskEncoding| replace:: :class:`~dendropy.dataio.newickreader.SplitBitmaskEncoding`
+.. |TreeFileIndex| replace:: :class:`~dendropy.dataio.treeindex.TreeFileIndex`
+.. |TreeFileSegment| replace:: :class:`~dendropy.dataio.treeindex.TreeFileSegment`
+.. |SequenceRecord| replace:: :class:`~dendropy.dataio.ioservice.SequenceRecord`
+.. |SequenceDataYielder| replace:: :class:`~dendropy.dataio.ioservice.SequenceDataYielder`
 .. |DataSet| replace:: :class:`~dendropy.datamodel.datasetmodel.DataSet`
 .. |StateIdentity| replace:: :class:`~dendropy.datamodel.charstatemodel.StateIdentity`
 .. |StateAlphabet| replace:: :class:`~dendropy.datamodel.charstatemodel.StateAlphabet`
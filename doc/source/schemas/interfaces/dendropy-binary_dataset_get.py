@@ -0,0 +1,6 @@
+d = dendropy.DataSet.get(
+    path="path/to/file",
+    schema="dendropy-binary",
+    suppress_annotations=False,
+    ignore_unrecognized_keyword_arguments=False,
+    )
@@ -0,0 +1,7 @@
+tree_array = dendropy.TreeArray()
+tree_array.read(
+    path="path/to/file",
+    schema="dendropy-binary",
+    tree_offset=None,
+    ignore_unrecognized_keyword_arguments=False,
+    )
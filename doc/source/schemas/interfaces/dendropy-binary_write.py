@@ -0,0 +1,6 @@
+d.write(
+        path='data.dpy',
+        schema='dendropy-binary',
+        suppress_annotations=False,
+        ignore_unrecognized_keyword_arguments=False,
+        )